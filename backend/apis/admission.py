@@ -0,0 +1,242 @@
+"""
+Admission control: per-organization and per-user rate limits, and load shedding.
+
+`AdmissionMiddleware` runs before routing for every `/api/v1` HTTP request,
+with the app's `Admission` (`app.state.admission`):
+
+- Token buckets per user and per organization. A request takes a token from
+  both, or gets a 429 with `Retry-After` set to when the emptier one refills.
+  The organization is the `X-Organization-Id` header or the token's `org`
+  claim. The user is the token's `sub`, or `X-User-Id` while authentication is
+  off, or else the client address. The organization is not checked for
+  membership here (the dependency that does needs the database), so a caller
+  can spend another organization's budget, but only at their own user rate.
+- An adaptive limit on concurrent requests. Past it the request gets a 503
+  with `Retry-After`. The limit grows by one per window of completed requests
+  while it is in use, and is cut by a quarter, at most once per
+  `DECREASE_INTERVAL`, while getting a database connection takes longer than
+  POOL_WAIT_TARGET_SECONDS on average. So a saturated pool sheds new work at
+  the door instead of queueing it until every request times out.
+
+Long-lived streams (`/api/v1/events`) are rate limited but not counted as in
+flight. WebSockets, health checks and docs are left alone.
+
+All state is owned by the event loop the middleware runs on, so it takes no
+lock. A bucket is one float, its theoretical arrival time (GCRA), and a check
+is a dict lookup and some arithmetic. Only `PoolWaitMeter.observe` runs in
+worker threads; it may lose an update to a race, which an average tolerates.
+"""
+
+import math
+import os
+import time
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.apis import auth
+from backend.apis.metrics import ADMISSION_REJECTIONS
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+
+# Sustained requests per second, and how many may come at once.
+USER_RATE = float(os.getenv("RATE_LIMIT_USER_RPS", "20"))
+USER_BURST = float(os.getenv("RATE_LIMIT_USER_BURST", "100"))
+ORGANIZATION_RATE = float(os.getenv("RATE_LIMIT_ORGANIZATION_RPS", "100"))
+ORGANIZATION_BURST = float(os.getenv("RATE_LIMIT_ORGANIZATION_BURST", "500"))
+
+CONCURRENCY_LIMIT_INITIAL = int(os.getenv("CONCURRENCY_LIMIT_INITIAL", "64"))
+CONCURRENCY_LIMIT_MIN = int(os.getenv("CONCURRENCY_LIMIT_MIN", "8"))
+CONCURRENCY_LIMIT_MAX = int(os.getenv("CONCURRENCY_LIMIT_MAX", "512"))
+POOL_WAIT_TARGET = float(os.getenv("POOL_WAIT_TARGET_SECONDS", "0.05"))
+
+# Seconds between two cuts of the concurrency limit, so one slow spell cuts it once.
+DECREASE_INTERVAL = 1.0
+
+# Fraction of the concurrency limit kept on a cut.
+BACKOFF = 0.75
+
+# Retry-After of a shed request, in seconds.
+SHED_RETRY_AFTER = 1
+
+_THROTTLED = ADMISSION_REJECTIONS.labels("rate_limit")
+_SHED = ADMISSION_REJECTIONS.labels("overload")
+
+# Buckets kept before full ones are dropped; a full bucket is the same as none.
+MAX_BUCKETS = 100_000
+
+API_PREFIX = "/api/v1"
+LONG_LIVED_PATHS = frozenset({"/api/v1/events"})
+
+
+class RateLimiter:
+    """
+    Token buckets by key, as GCRA: each key holds the time its bucket would be
+    full again, and a request fits if that is at most `burst` requests ahead.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = MAX_BUCKETS) -> None:
+        self.interval = 1.0 / rate
+        self.tolerance = burst * self.interval
+        self.max_keys = max_keys
+        self._full_at: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._full_at)
+
+    def wait(self, key: str, now: float) -> float:
+        """Seconds until `key` has a token; 0 if it has one now."""
+        full_at = max(self._full_at.get(key, now), now) + self.interval
+        return max(0.0, full_at - now - self.tolerance)
+
+    def take(self, key: str, now: float) -> None:
+        """Spend a token of `key`; check `wait` first."""
+        self._full_at[key] = max(self._full_at.get(key, now), now) + self.interval
+        if len(self._full_at) > self.max_keys:
+            self._full_at = {k: full_at for k, full_at in self._full_at.items() if full_at > now}
+
+
+class PoolWaitMeter:
+    """Moving average of the seconds requests wait for a database connection."""
+
+    def __init__(self, weight: float = 0.1) -> None:
+        self.weight = weight
+        self.average = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.average += self.weight * (seconds - self.average)
+
+
+# Fed by the session dependencies (`backend.apis.dependencies`), which check
+# out their connection up front to time it.
+pool_wait = PoolWaitMeter()
+
+
+class ConcurrencyLimit:
+    """An additive-increase, multiplicative-decrease limit on requests in flight."""
+
+    def __init__(
+        self,
+        initial: int = CONCURRENCY_LIMIT_INITIAL,
+        minimum: int = CONCURRENCY_LIMIT_MIN,
+        maximum: int = CONCURRENCY_LIMIT_MAX,
+        target_wait: float = POOL_WAIT_TARGET,
+        meter: PoolWaitMeter = pool_wait,
+    ) -> None:
+        self.limit = float(initial)
+        self.minimum, self.maximum = minimum, maximum
+        self.target_wait = target_wait
+        self.meter = meter
+        self.in_flight = 0
+        self._next_decrease = 0.0
+
+    def acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, now: float) -> None:
+        """End a request and adjust the limit to the pool wait seen so far."""
+        busy = self.in_flight >= self.limit / 2
+        self.in_flight -= 1
+        if self.meter.average > self.target_wait:
+            if now >= self._next_decrease:
+                self.limit = max(self.minimum, self.limit * BACKOFF)
+                self._next_decrease = now + DECREASE_INTERVAL
+        elif busy:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+
+def _claims(authorization: Optional[bytes]) -> Optional[dict[str, Any]]:
+    scheme, _, token = (authorization or b"").decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return auth.decode_token(token)
+    except HTTPException:
+        # Rejected by the dependencies later; until then the caller is its address.
+        return None
+
+
+def identify(scope: Scope) -> tuple[Optional[str], str]:
+    """(organization, user) bucket keys of a request."""
+    headers = dict(scope["headers"])
+    organization = headers.get(b"x-organization-id", b"").decode("latin-1")
+    user = ""
+    if auth.auth_enabled():
+        claims = _claims(headers.get(b"authorization"))
+        if claims is not None:
+            user = claims["sub"]
+            organization = organization or str(claims.get("org") or "")
+    else:
+        user = headers.get(b"x-user-id", b"").decode("latin-1")
+    if not user:
+        client = scope.get("client")
+        user = f"client:{client[0] if client else ''}"
+    return organization.lower() or None, user
+
+
+class Admission:
+    """One app's buckets and concurrency limit."""
+
+    def __init__(
+        self,
+        users: Optional[RateLimiter] = None,
+        organizations: Optional[RateLimiter] = None,
+        concurrency: Optional[ConcurrencyLimit] = None,
+    ) -> None:
+        self.users = users if users is not None else RateLimiter(USER_RATE, USER_BURST)
+        self.organizations = (
+            organizations if organizations is not None else RateLimiter(ORGANIZATION_RATE, ORGANIZATION_BURST)
+        )
+        self.concurrency = concurrency if concurrency is not None else ConcurrencyLimit()
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying an `Admission` (see module docstring)."""
+
+    def __init__(self, app: ASGIApp, admission: Admission, clock: Callable[[], float] = time.monotonic) -> None:
+        self.app = app
+        self.admission = admission
+        self._clock = clock
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(API_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        admission, now = self.admission, self._clock()
+        organization, user = identify(scope)
+        wait = admission.users.wait(user, now)
+        if organization is not None:
+            wait = max(wait, admission.organizations.wait(organization, now))
+        if wait > 0:
+            _THROTTLED.inc()
+            await _reject(429, "Rate limit exceeded", wait, scope, receive, send)
+            return
+        long_lived = scope["path"] in LONG_LIVED_PATHS
+        if not long_lived and not admission.concurrency.acquire():
+            _SHED.inc()
+            await _reject(503, "Server is busy", SHED_RETRY_AFTER, scope, receive, send)
+            return
+        admission.users.take(user, now)
+        if organization is not None:
+            admission.organizations.take(organization, now)
+        if long_lived:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.concurrency.release(self._clock())
+
+
+def _retry_after(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+async def _reject(status_code: int, detail: str, retry_after: float, scope: Scope, receive: Receive, send: Send) -> None:
+    response = JSONResponse({"detail": detail}, status_code, headers={"Retry-After": _retry_after(retry_after)})
+    await response(scope, receive, send)
@@ -0,0 +1,166 @@
+"""
+Bearer token authentication and membership resolution.
+
+Requests carry `Authorization: Bearer <JWT>`, HS256-signed by the identity
+provider. The token's `sub` is the user id. Verifying it is an HMAC over the
+token with a key from JWT_SIGNING_KEYS, parsed once at import: either a single
+secret, or a JSON object of key id (`kid` header) to secret so keys can be
+rotated (sign with the new id, keep the old one until its tokens expire).
+`exp` is required; `iss` and `aud` are checked when JWT_ISSUER / JWT_AUDIENCE
+are set.
+
+The caller's role in an organization comes from the token's `orgs` claim
+({organization id: role}) when the issuer includes it, with no lookup at all;
+such a role holds until the token expires, so those tokens should be short-lived.
+Otherwise it comes from the caller's active memberships, read once per user
+into a bounded TTL/LRU cache. The membership endpoints invalidate a user's
+entry when they write; other workers drop theirs on the `person.updated`
+realtime event those writes publish, and the TTL bounds staleness if an event
+is lost. A warm request does no database round trip for authentication.
+
+With no signing keys configured authentication is off and the `X-User-Id`
+header stub applies, for local runs and tests.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+
+from backend.apis.cache import TTLCache
+from backend.database.entities.membership import Membership
+from backend.database.session import SessionLocal
+from backend.realtime.events import Event
+
+ALGORITHM = "HS256"
+
+# Seconds of clock difference tolerated on `exp` and `nbf`.
+CLOCK_SKEW = 30
+
+JWT_ISSUER = os.getenv("JWT_ISSUER") or None
+JWT_AUDIENCE = os.getenv("JWT_AUDIENCE") or None
+
+MEMBERSHIP_CACHE_TTL = float(os.getenv("MEMBERSHIP_CACHE_TTL_SECONDS", "60"))
+MEMBERSHIP_CACHE_SIZE = int(os.getenv("MEMBERSHIP_CACHE_SIZE", "10000"))
+
+
+def load_signing_keys(raw: str) -> dict[Optional[str], bytes]:
+    """`{kid: secret}` from JWT_SIGNING_KEYS; a plain secret is stored under None (tokens without `kid`)."""
+    raw = raw.strip()
+    if not raw:
+        return {}
+    if raw.startswith("{"):
+        return {kid: secret.encode() for kid, secret in json.loads(raw).items()}
+    return {None: raw.encode()}
+
+
+SIGNING_KEYS = load_signing_keys(os.getenv("JWT_SIGNING_KEYS", ""))
+
+# Active memberships per user, {organization id: role}.
+_memberships: TTLCache[str, dict[str, str]] = TTLCache(maxsize=MEMBERSHIP_CACHE_SIZE, ttl=MEMBERSHIP_CACHE_TTL)
+
+
+def auth_enabled() -> bool:
+    return bool(SIGNING_KEYS)
+
+
+def unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(signing_input: bytes, key: bytes) -> bytes:
+    return hmac.new(key, signing_input, hashlib.sha256).digest()
+
+
+def encode_token(claims: dict[str, Any], key: bytes, kid: Optional[str] = None) -> str:
+    """An HS256 token for `claims`; for tests and tools, tokens are normally issued elsewhere."""
+    header = {"alg": ALGORITHM, "typ": "JWT", **({"kid": kid} if kid is not None else {})}
+    signing_input = ".".join(_b64encode(json.dumps(part, separators=(",", ":")).encode()) for part in (header, claims))
+    return f"{signing_input}.{_b64encode(_sign(signing_input.encode(), key))}"
+
+
+def decode_token(token: str, now: Optional[float] = None) -> dict[str, Any]:
+    """The claims of a valid token; raises 401 otherwise."""
+    try:
+        header_b64, claims_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64decode(header_b64))
+        signature = _b64decode(signature_b64)
+    except ValueError:
+        raise unauthorized("Malformed token")
+    if not isinstance(header, dict) or header.get("alg") != ALGORITHM:
+        raise unauthorized("Unsupported token algorithm")
+    key = SIGNING_KEYS.get(header.get("kid"))
+    if key is None or not hmac.compare_digest(_sign(f"{header_b64}.{claims_b64}".encode(), key), signature):
+        raise unauthorized("Invalid token signature")
+    try:
+        claims = json.loads(_b64decode(claims_b64))
+        claims["sub"] = str(UUID(claims["sub"]))
+        expires, not_before = float(claims["exp"]), float(claims.get("nbf", 0))
+    except (ValueError, TypeError, KeyError):
+        raise unauthorized("Malformed token claims")
+    now = time.time() if now is None else now
+    if expires < now - CLOCK_SKEW:
+        raise unauthorized("Token expired")
+    if not_before > now + CLOCK_SKEW:
+        raise unauthorized("Token not yet valid")
+    if JWT_ISSUER is not None and claims.get("iss") != JWT_ISSUER:
+        raise unauthorized("Invalid token issuer")
+    if JWT_AUDIENCE is not None and JWT_AUDIENCE not in _audiences(claims.get("aud")):
+        raise unauthorized("Invalid token audience")
+    return claims
+
+
+def _audiences(aud: Any) -> list[Any]:
+    return aud if isinstance(aud, list) else [aud]
+
+
+def membership_roles(user_id: str) -> dict[str, str]:
+    """The user's active memberships, {organization id: role}, from the cache or the database."""
+    cached = _memberships.get(user_id)
+    if cached is not None:
+        return cached
+    version = _memberships.version(user_id)
+    stmt = select(Membership.organization_id, Membership.role).where(
+        Membership.user_id == UUID(user_id), Membership.status == "active"
+    )
+    with SessionLocal() as db:
+        roles = {str(organization_id): role for organization_id, role in db.execute(stmt)}
+    _memberships.put(user_id, roles, version)
+    return roles
+
+
+def role_in(claims: dict[str, Any], organization_id: str) -> Optional[str]:
+    """The caller's role in the organization, or None if they are not an active member."""
+    claimed = claims.get("orgs")
+    if isinstance(claimed, dict) and organization_id in claimed:
+        return claimed[organization_id]
+    return membership_roles(claims["sub"]).get(organization_id)
+
+
+def invalidate_memberships(user_id: Any) -> None:
+    _memberships.invalidate(str(user_id))
+
+
+def on_event(event: Event) -> None:
+    """Hub listener: drop a user's cached memberships when they change in any worker."""
+    if event.type == "person.updated":
+        invalidate_memberships(event.data["user_id"])
@@ -0,0 +1,87 @@
+"""
+Small in-process caches for read-mostly lookups.
+
+`TTLCache` is a thread-safe LRU map whose entries also expire after a fixed
+time. Writers call `invalidate` after they commit; invalidation only reaches
+the current process, so the TTL bounds how stale another worker's copy can
+get.
+
+A reader that loads from the database races with writers: it can read the old
+rows, then a writer commits and invalidates, then the reader stores what it
+read. To rule that out, readers take a `version` before querying and pass it to
+`put`, which drops the value if the key was invalidated in between.
+
+Versions are stamps from one counter, kept for at most `maxsize` recently
+invalidated keys. A key whose stamp is dropped reads as the newest dropped
+stamp, so a version taken before that invalidation still fails the check;
+at worst a value loaded while another key's stamp was dropped is not cached.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        # Invalidation stamp per key, oldest first; unlisted keys read as `_floor`.
+        self._versions: OrderedDict[K, int] = OrderedDict()
+        self._stamp = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        """The cached value, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def version(self, key: K) -> int:
+        """Take before loading a value that will be `put` under `key`."""
+        with self._lock:
+            return self._versions.get(key, self._floor)
+
+    def put(self, key: K, value: V, version: Optional[int] = None) -> bool:
+        """Store `value` unless `key` was invalidated after `version` was taken."""
+        with self._lock:
+            if version is not None and self._versions.get(key, self._floor) != version:
+                return False
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._stamp += 1
+            self._versions[key] = self._stamp
+            self._versions.move_to_end(key)
+            while len(self._versions) > self.maxsize:
+                _, self._floor = self._versions.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._stamp += 1
+            self._floor = self._stamp
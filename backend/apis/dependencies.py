@@ -1,41 +1,113 @@
 """
 Shared API dependencies: DB session, current user, current organization.
 
-Replace stubs with real auth (JWT, session) and DB session injection.
+With JWT_SIGNING_KEYS set, the user comes from a verified bearer token and the
+organization must be one the user is an active member of; see
+`backend.apis.auth`. Without keys, both fall back to header stubs.
 """
 
-from typing import Annotated
+import time
+from typing import Annotated, Any, Optional
+from uuid import UUID
 
-from fastapi import Depends, Header
+from fastapi import Depends, Header, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.database.session import get_db
+from backend.apis import auth, permissions
+from backend.apis.admission import pool_wait
+from backend.apis.metrics import POOL_WAIT
+from backend.apis.permissions import CareScope
+from backend.database.session import get_async_db, get_db
+
+PLACEHOLDER_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def _header_id(value: Optional[str], detail: str) -> UUID:
+    """A header stub's id as a UUID, so it binds like a token's on every database."""
+    try:
+        return UUID(value or PLACEHOLDER_ID)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def get_token_claims(
+    authorization: Annotated[str | None, Header()] = None,
+) -> Optional[dict[str, Any]]:
+    """
+    Verified claims of the request's bearer token, or None while authentication is off.
+
+    Verification is local (HMAC with a configured key), so it costs no round trip.
+    """
+    if not auth.auth_enabled():
+        return None
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise auth.unauthorized("Missing bearer token")
+    return auth.decode_token(token)
 
 
-# Stub: in production, resolve from JWT or session
 def get_current_user_id(
+    claims: Annotated[Optional[dict[str, Any]], Depends(get_token_claims)],
     x_user_id: Annotated[str | None, Header(alias="X-User-Id")] = None,
-) -> str:
+) -> UUID:
     """
     Current authenticated user ID.
 
-    For now this is a simple stub that reads the `X-User-Id` header or falls back
-    to a fixed UUID so that the rest of the backend can be exercised without
-    full auth in place.
+    The token's `sub`, as a UUID. Without authentication this reads the `X-User-Id` header
+    or falls back to a fixed UUID so that the rest of the backend can be
+    exercised without full auth in place.
     """
-    return x_user_id or "00000000-0000-0000-0000-000000000000"
+    if claims is not None:
+        return UUID(claims["sub"])
+    return _header_id(x_user_id, "Invalid user id")
 
 
-# Stub: in production, resolve from context (e.g. selected org for the user)
 def get_current_organization_id(
+    claims: Annotated[Optional[dict[str, Any]], Depends(get_token_claims)],
     x_organization_id: Annotated[str | None, Header(alias="X-Organization-Id")] = None,
-) -> str:
+) -> UUID:
     """
     Current organization context for scoped queries.
 
-    Reads `X-Organization-Id` header or uses a fixed UUID placeholder.
+    The `X-Organization-Id` header, or else the token's `org` claim, as a UUID.
+    With authentication on, the caller must be an active member of it (403
+    otherwise); the role lookup is cached, see `backend.apis.auth`. Without
+    authentication the header is trusted or a fixed UUID placeholder is used.
     """
-    return x_organization_id or "00000000-0000-0000-0000-000000000000"
+    if claims is None:
+        return _header_id(x_organization_id, "Invalid organization id")
+    requested = x_organization_id or claims.get("org")
+    if not requested:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="X-Organization-Id header is required")
+    try:
+        organization_id = UUID(str(requested))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid organization id")
+    if auth.role_in(claims, str(organization_id)) is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this organization")
+    return organization_id
+
+
+def get_care_scope(
+    claims: Annotated[Optional[dict[str, Any]], Depends(get_token_claims)],
+    organization_id: Annotated[str | UUID, Depends(get_current_organization_id)],
+) -> CareScope:
+    """
+    Care recipients the caller may see in the current organization.
+
+    From the cached care circle (`backend.apis.permissions`); unrestricted while
+    authentication is off.
+    """
+    if claims is None:
+        return permissions.UNRESTRICTED
+    role = auth.role_in(claims, str(organization_id))
+    return permissions.scope_for(organization_id, claims["sub"], role)
+
+
+def _observe_pool_wait(seconds: float) -> None:
+    pool_wait.observe(seconds)
+    POOL_WAIT.observe(seconds)
 
 
 def get_db_session(db: Annotated[Session, Depends(get_db)]) -> Session:
@@ -43,6 +115,23 @@ def get_db_session(db: Annotated[Session, Depends(get_db)]) -> Session:
     Provide a SQLAlchemy Session to route handlers.
 
     This is a thin wrapper around `backend.database.session.get_db` so that
-    routes can depend on a concrete `Session` type.
+    routes can depend on a concrete `Session` type. The connection is checked
+    out here, to time the pool wait for admission control
+    (`backend.apis.admission`) and metrics.
+    """
+    started = time.perf_counter()
+    db.connection()
+    _observe_pool_wait(time.perf_counter() - started)
+    return db
+
+
+async def get_async_db_session(db: Annotated[AsyncSession, Depends(get_async_db)]) -> AsyncSession:
+    """
+    Provide a SQLAlchemy AsyncSession to async route handlers.
+
+    Counterpart of `get_db_session` for the `backend.apis.routes.aio` routers.
     """
+    started = time.perf_counter()
+    await db.connection()
+    _observe_pool_wait(time.perf_counter() - started)
     return db
@@ -2,23 +2,115 @@
 FastAPI application factory and router aggregation.
 
 Mount all route modules under /api/v1. Health and readiness live at root.
+Requests to /api/v1 pass admission control first (`backend.apis.admission`).
+Prometheus metrics are served at /metrics (`backend.apis.metrics`).
+When `DATABASE_ASYNC=true` the hot resources are served by the async
+(`routes.aio`) routers instead of their threadpool counterparts.
 """
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
 
-from backend.apis.routes import health, persons, organizations
+from backend.apis import auth, permissions
+from backend.apis.admission import RATE_LIMIT_ENABLED, Admission, AdmissionMiddleware
+from backend.apis.metrics import METRICS_ENABLED, MetricsMiddleware, instrument
+from backend.apis.routes import (
+    aio,
+    calendar,
+    dashboard,
+    health,
+    persons,
+    organizations,
+    memberships,
+    care_relationships,
+    care_arrangements,
+    conversations,
+    locations,
+    metrics,
+    notifications,
+    realtime,
+    search,
+    visits,
+    visit_notes,
+    tasks,
+)
+from backend.apis.typeahead import TYPEAHEAD_INDEX, directory
+from backend.database.session import USE_ASYNC_DB, async_engine, engine
+from backend.notifications.scheduler import REMINDER_WINDOW, scheduler
+from backend.realtime.backends import make_backend
+from backend.realtime.hub import hub
+from backend.scheduling.roller import ROLLER_INTERVAL, run_roller
+from backend.scheduling.sweeper import SWEEP_INTERVAL, run_sweeper
+from backend.stats.reconciler import RECONCILE_INTERVAL, run_reconciler
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Startup/shutdown: connect DB, run migrations, etc."""
+    """Startup/shutdown: connect DB, run migrations, start the realtime hub and background jobs."""
+    await hub.start(make_backend())
+    hub.add_listener(auth.on_event)
+    hub.add_listener(permissions.on_event)
+    jobs = []
+    if TYPEAHEAD_INDEX:
+        jobs.append(asyncio.create_task(directory.run()))
+    if REMINDER_WINDOW:
+        jobs.append(asyncio.create_task(scheduler.run()))
+    if ROLLER_INTERVAL > 0:
+        jobs.append(asyncio.create_task(run_roller()))
+    if RECONCILE_INTERVAL > 0:
+        jobs.append(asyncio.create_task(run_reconciler()))
+    if SWEEP_INTERVAL > 0:
+        jobs.append(asyncio.create_task(run_sweeper()))
     yield
+    for job in jobs:
+        job.cancel()
+        with suppress(asyncio.CancelledError):
+            await job
+    hub.remove_listener(permissions.on_event)
+    hub.remove_listener(auth.on_event)
+    await hub.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
-def create_app() -> FastAPI:
+def _resource_routers(use_async_db: bool) -> list[APIRouter]:
+    """Routers mounted under /api/v1, picking async variants when enabled."""
+    if use_async_db:
+        hot = [
+            aio.persons.router,
+            aio.memberships.router,
+            aio.care_relationships.router,
+            aio.visits.router,
+            aio.tasks.router,
+            aio.calendar.router,
+            aio.dashboard.router,
+        ]
+    else:
+        hot = [
+            persons.router,
+            memberships.router,
+            care_relationships.router,
+            visits.router,
+            tasks.router,
+            calendar.router,
+            dashboard.router,
+        ]
+    return hot + [
+        organizations.router,
+        care_arrangements.router,
+        locations.router,
+        visit_notes.router,
+        conversations.router,
+        notifications.router,
+        realtime.router,
+        search.router,
+    ]
+
+
+def create_app(use_async_db: bool = USE_ASYNC_DB) -> FastAPI:
     """Create and configure the FastAPI application."""
     app = FastAPI(
         title="Home Care Management API",
@@ -28,8 +120,19 @@ def create_app() -> FastAPI:
     )
 
     app.include_router(health.router, tags=["Health"])
-    app.include_router(persons.router, prefix="/api/v1")
-    app.include_router(organizations.router, prefix="/api/v1")
+    for router in _resource_routers(use_async_db):
+        app.include_router(router, prefix="/api/v1")
+
+    if RATE_LIMIT_ENABLED:
+        app.state.admission = Admission()
+        app.add_middleware(AdmissionMiddleware, admission=app.state.admission)
+    if METRICS_ENABLED:
+        app.include_router(metrics.router, tags=["Metrics"])
+        # Added last, so it is outermost and also times admission rejections.
+        app.add_middleware(MetricsMiddleware)
+        instrument(engine)
+        if async_engine is not None:
+            instrument(async_engine.sync_engine)
 
     return app
 
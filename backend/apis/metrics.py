@@ -0,0 +1,348 @@
+"""
+Prometheus metrics, served at `GET /metrics` in the text exposition format.
+
+- `http_request_duration_seconds` (histogram) and `http_requests_total` by
+  method and route template, and `http_requests_in_flight`.
+- `db_statements_total` and `db_statement_seconds_total` by the route that
+  ran them (`background` outside requests), from engine events, and a
+  `db_statement_duration_seconds` histogram.
+- `db_pool_checkout_wait_seconds` (timed by the session dependencies), and the
+  pool's size, checked-out and overflow connections at scrape time.
+- `threadpool_threads_busy`, `threadpool_threads_max` and
+  `threadpool_tasks_waiting`: the threadpool sync handlers run in.
+- `admission_rejections_total` and the concurrency limit of
+  `backend.apis.admission`.
+
+Instruments are process-wide, like the engines they watch. `labels` returns a
+child bound to one label set, created on first use and cached, so recording
+is a dict lookup and an addition under an uncontended lock. Statements are
+tallied on the request's own `RequestTally` and added to the route's
+counters once, when the request ends. A statement's start time is kept on its
+execution context, so one that fails leaves nothing behind on the connection;
+it is recorded when the error is handled. Set METRICS_ENABLED=false to turn
+recording and the endpoint off.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Generic, Optional, Sequence, TypeVar
+
+import anyio.to_thread
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Route label of requests no route matched (404s, admission rejections).
+UNMATCHED = "unmatched"
+# Route label of statements run outside a request (background jobs).
+BACKGROUND = "background"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Value:
+    """One counter or gauge sample."""
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Buckets:
+    """One histogram sample: a count per bucket, the sum and the count."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[i] += 1
+            self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        with self._lock:
+            counts = list(self._counts)
+        total, out = 0, []
+        for bound, count in zip([*map(_format_value, self._bounds), "+Inf"], counts):
+            total += count
+            out.append((bound, total))
+        return out
+
+
+S = TypeVar("S", Value, Buckets)
+
+
+class _Metric(Generic[S]):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], S] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _new_child(self) -> S:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> S:
+        """The sample of one label set; keep it to record without the lookup."""
+        child = self._children.get(values)
+        if child is None:
+            assert len(values) == len(self.labelnames), (self.name, values)
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self, values: tuple[str, ...], child: S) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            lines += self._samples(values, child)
+        return lines
+
+
+class Counter(_Metric[Value]):
+    kind = "counter"
+
+    def _new_child(self) -> Value:
+        return Value()
+
+    def _samples(self, values: tuple[str, ...], child: Value) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+
+class Histogram(_Metric[Buckets]):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self) -> Buckets:
+        return Buckets(self.buckets)
+
+    def _samples(self, values: tuple[str, ...], child: Buckets) -> list[str]:
+        labels = _format_labels(self.labelnames, values)
+        lines = [
+            f"{self.name}_bucket{_format_labels((*self.labelnames, 'le'), (*values, le))} {count}"
+            for le, count in child.cumulative()
+        ]
+        return lines + [f"{self.name}_sum{labels} {_format_value(child.sum)}", f"{self.name}_count{labels} {child.count}"]
+
+
+REGISTRY: list[_Metric[Any]] = []
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to serve a request, by route template.", ("method", "route")
+)
+REQUESTS = Counter("http_requests_total", "Requests served, by route template and status.", ("method", "route", "status"))
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being served.").labels()
+
+SQL_STATEMENTS = Counter("db_statements_total", "SQL statements executed, by route template.", ("route",))
+SQL_SECONDS = Counter("db_statement_seconds_total", "Time spent in SQL statements, by route template.", ("route",))
+SQL_DURATION = Histogram(
+    "db_statement_duration_seconds", "Time to execute one SQL statement.", buckets=SQL_BUCKETS
+).labels()
+
+POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time a request waited for a database connection.", buckets=SQL_BUCKETS
+).labels()
+POOL_SIZE = Gauge("db_pool_size", "Connections the pool keeps open.", ("engine",))
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections in use.", ("engine",))
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond the pool size.", ("engine",))
+
+THREADS_BUSY = Gauge("threadpool_threads_busy", "Threadpool threads running sync handlers.").labels()
+THREADS_MAX = Gauge("threadpool_threads_max", "Threadpool size.").labels()
+THREADS_WAITING = Gauge("threadpool_tasks_waiting", "Sync handlers waiting for a thread.").labels()
+
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total", "Requests turned away by admission control.", ("reason",)
+)
+CONCURRENCY_LIMIT = Gauge("admission_concurrency_limit", "Current adaptive limit on requests in flight.").labels()
+
+
+@dataclass
+class RequestTally:
+    """SQL statements of the current request."""
+
+    statements: int = 0
+    seconds: float = 0.0
+
+
+_tally: ContextVar[Optional[RequestTally]] = ContextVar("request_tally", default=None)
+
+_BACKGROUND_STATEMENTS = SQL_STATEMENTS.labels(BACKGROUND)
+_BACKGROUND_SECONDS = SQL_SECONDS.labels(BACKGROUND)
+
+_STARTED = "_metrics_statement_started"
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    # None only for the dialect's own special-case statements, which go untimed.
+    if context is not None:
+        setattr(context, _STARTED, time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    _finish(context)
+
+
+def _handle_error(exception_context: Any) -> None:
+    # Also raised for failures outside a statement (connect, fetch); only a started one is recorded.
+    _finish(exception_context.execution_context)
+
+
+def _finish(context: Any) -> None:
+    """Record the statement started on `context`, if one is still open."""
+    started = None if context is None else context.__dict__.pop(_STARTED, None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    SQL_DURATION.observe(elapsed)
+    tally = _tally.get()
+    if tally is None:
+        _BACKGROUND_STATEMENTS.inc()
+        _BACKGROUND_SECONDS.inc(elapsed)
+    else:
+        tally.statements += 1
+        tally.seconds += elapsed
+
+
+def instrument(engine: Engine) -> None:
+    """Time the statements of `engine` (the `sync_engine` of an async one). Idempotent."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def route_template(scope: Scope) -> str:
+    """The path template of the route that served a request, with the prefix it is mounted under."""
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        return UNMATCHED
+    # Routes of an included router carry their own path only; the prefix is
+    # the part of the request path before it.
+    path, start = scope["path"], 0
+    while start != -1:
+        if route.path_regex.match(path[start:]):
+            return path[:start] + path_format
+        start = path.find("/", start + 1)
+    return path_format
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency, status and SQL work by route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        tally = RequestTally()
+        token = _tally.set(tally)
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            _tally.reset(token)
+            route = route_template(scope)
+            method = scope["method"]
+            REQUEST_DURATION.labels(method, route).observe(elapsed)
+            REQUESTS.labels(method, route, str(status)).inc()
+            if tally.statements:
+                SQL_STATEMENTS.labels(route).inc(tally.statements)
+                SQL_SECONDS.labels(route).inc(tally.seconds)
+
+
+def _sample_pool(label: str, engine: Optional[Engine]) -> None:
+    pool = getattr(engine, "pool", None)
+    # Only queue pools have a size; SQLite's in-memory and null pools do not.
+    if pool is None or not hasattr(pool, "overflow"):
+        return
+    POOL_SIZE.labels(label).set(pool.size())
+    POOL_CHECKED_OUT.labels(label).set(pool.checkedout())
+    POOL_OVERFLOW.labels(label).set(max(0, pool.overflow()))
+
+
+def scrape(engines: dict[str, Optional[Engine]], admission: Any = None) -> str:
+    """
+    Sample the point-in-time gauges and render every metric.
+
+    Call from the event loop: the threadpool limiter belongs to it.
+    """
+    for label, engine in engines.items():
+        _sample_pool(label, engine)
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    THREADS_BUSY.set(limiter.borrowed_tokens)
+    THREADS_MAX.set(limiter.total_tokens)
+    THREADS_WAITING.set(limiter.statistics().tasks_waiting)
+    if admission is not None:
+        CONCURRENCY_LIMIT.set(int(admission.concurrency.limit))
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
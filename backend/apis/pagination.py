@@ -0,0 +1,132 @@
+"""
+Keyset (cursor) pagination shared by the list endpoints.
+
+A `Keyset` describes a list's sort order as a sequence of `SortKey`s ending in a
+unique tiebreaker (the primary key). Instead of OFFSET, each page continues
+strictly after the last row of the previous one:
+
+    WHERE (sort keys) > (cursor values) ORDER BY sort keys LIMIT :limit + 1
+
+so the cost of a page does not depend on how deep the client has paged and the
+query stays on the (filter, sort keys) index. The cursor handed to clients is
+an opaque base64url token holding the last row's sort key values.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, false, or_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import ColumnElement
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+Q = TypeVar("Q")
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """
+    One column of a keyset sort order.
+
+    Nullable keys always sort NULLS LAST, in both directions, so that the
+    ORDER BY matches a default ascending btree index.
+    """
+
+    column: InstrumentedAttribute
+    descending: bool = False
+    nullable: bool = False
+
+    def order_by(self) -> ColumnElement:
+        clause = self.column.desc() if self.descending else self.column.asc()
+        return clause.nulls_last() if self.nullable else clause
+
+    def equals(self, value: Any) -> ColumnElement:
+        return self.column.is_(None) if value is None else self.column == value
+
+    def after(self, value: Any) -> ColumnElement:
+        """Rows that sort strictly after `value` on this key alone."""
+        if value is None:
+            # NULLs are last; nothing sorts after them on this key.
+            return false()
+        clause = self.column < value if self.descending else self.column > value
+        return or_(clause, self.column.is_(None)) if self.nullable else clause
+
+
+class Keyset:
+    """Sort order of a paginated list; the last key must be unique (e.g. id)."""
+
+    def __init__(self, *keys: SortKey) -> None:
+        self.keys = keys
+
+    def apply(self, query: Q, cursor: Optional[str], limit: int) -> Q:
+        """
+        Add the keyset predicate, ORDER BY and LIMIT to a Query or Select.
+
+        One extra row is fetched so `page` can tell whether another page exists.
+        """
+        if cursor is not None:
+            query = query.where(self._after(self.decode(cursor)))
+        return query.order_by(*(key.order_by() for key in self.keys)).limit(limit + 1)
+
+    def page(self, rows: Sequence[Any], limit: int) -> dict[str, Any]:
+        """Build the `Page` payload from rows fetched with `apply`."""
+        items = list(rows[:limit])
+        next_cursor = self.encode(items[-1]) if len(rows) > limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    def encode(self, row: Any) -> str:
+        """Opaque cursor pointing just after `row`."""
+        values = [_to_json(getattr(row, key.column.key)) for key in self.keys]
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    def decode(self, cursor: str) -> list[Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded))
+            if not isinstance(values, list) or len(values) != len(self.keys):
+                raise ValueError("cursor does not match this list")
+            return [_from_json(key, value) for key, value in zip(self.keys, values)]
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    def _after(self, values: list[Any]) -> ColumnElement:
+        # (k1 > v1) OR (k1 = v1 AND k2 > v2) OR (k1 = v1 AND k2 = v2 AND k3 > v3) ...
+        branches = []
+        for i, key in enumerate(self.keys):
+            prefix = [k.equals(v) for k, v in zip(self.keys[:i], values[:i])]
+            branches.append(and_(*prefix, key.after(values[i])))
+        return or_(*branches)
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _from_json(key: SortKey, value: Any) -> Any:
+    if value is None:
+        if not key.nullable:
+            raise ValueError("null value for a non-nullable sort key")
+        return None
+    python_type = key.column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    if not isinstance(value, python_type):
+        raise ValueError("unexpected cursor value type")
+    return value
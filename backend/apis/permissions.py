@@ -0,0 +1,140 @@
+"""
+Care-circle authorization: which care recipients a user may see.
+
+Within an organization, agency admins, supervisors and system admins see every
+care recipient. Everyone else sees the recipients they have an active care
+relationship with, and themselves. Being an active member at all is checked
+by `get_current_organization_id` (`backend.apis.auth`).
+
+`CareCircle` is that adjacency for one organization, user -> {recipient:
+relationship role}, built with one query over the organization's active care
+relationships. Circles are held per organization in a versioned `TTLCache`.
+Care relationship writes invalidate their organization, right after the commit
+in their own worker and in the others on the topic-less `care_circle.updated`
+realtime event; a load that races a write is not cached (see
+`backend.apis.cache`). Membership writes invalidate the role cache in
+`backend.apis.auth`.
+
+Handlers take the caller's `CareScope` (`get_care_scope`) and check a row with
+`require`, or filter a list with `where`, an IN over the precomputed recipient
+ids instead of a join per row. While authentication is off the scope is
+unrestricted.
+"""
+
+import os
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement, select
+
+from backend.apis.cache import TTLCache
+from backend.database.entities.care_relationship import CareRelationship
+from backend.database.session import SessionLocal
+from backend.realtime.events import Event
+
+# Organization roles that see every care recipient of the organization.
+ORGANIZATION_WIDE_ROLES = frozenset({"agency_admin", "supervisor", "system_admin"})
+
+CARE_CIRCLE_CACHE_TTL = float(os.getenv("CARE_CIRCLE_CACHE_TTL_SECONDS", "300"))
+CARE_CIRCLE_CACHE_SIZE = int(os.getenv("CARE_CIRCLE_CACHE_SIZE", "1024"))
+
+
+class CareCircle:
+    """One organization's active care relationships, by related user."""
+
+    def __init__(self, edges: Iterable[tuple[UUID, UUID, str]] = ()) -> None:
+        self._recipients: defaultdict[UUID, dict[UUID, str]] = defaultdict(dict)
+        for user_id, recipient_id, role in edges:
+            self._recipients[user_id][recipient_id] = role
+
+    def __len__(self) -> int:
+        return sum(len(recipients) for recipients in self._recipients.values())
+
+    def recipients_of(self, user_id: UUID) -> Mapping[UUID, str]:
+        """{recipient: relationship role} for the user's active care relationships."""
+        return self._recipients.get(user_id, {})
+
+
+_circles: TTLCache[str, CareCircle] = TTLCache(maxsize=CARE_CIRCLE_CACHE_SIZE, ttl=CARE_CIRCLE_CACHE_TTL)
+
+
+def care_circle(organization_id: Any) -> CareCircle:
+    """The organization's circle, from the cache or the database."""
+    key = str(organization_id)
+    cached = _circles.get(key)
+    if cached is not None:
+        return cached
+    version = _circles.version(key)
+    stmt = select(CareRelationship.related_user_id, CareRelationship.care_recipient_id, CareRelationship.role).where(
+        CareRelationship.organization_id == UUID(key), CareRelationship.status == "active"
+    )
+    with SessionLocal() as db:
+        circle = CareCircle(db.execute(stmt))
+    _circles.put(key, circle, version)
+    return circle
+
+
+def invalidate_care_circle(organization_id: Any) -> None:
+    _circles.invalidate(str(organization_id))
+
+
+def care_circle_event(organization_id: Any) -> Event:
+    """`care_circle.updated`; no topics, it only reaches in-process listeners."""
+    return Event("care_circle.updated", (), {"organization_id": str(organization_id)})
+
+
+def on_event(event: Event) -> None:
+    """Hub listener: drop an organization's circle when a worker changed it."""
+    if event.type == "care_circle.updated":
+        invalidate_care_circle(event.data["organization_id"])
+
+
+@dataclass(frozen=True)
+class CareScope:
+    """The care recipients one user may see in one organization."""
+
+    organization_id: Optional[UUID] = None
+    # None: every recipient of the organization.
+    recipients: Optional[frozenset[UUID]] = None
+
+    @property
+    def restricted(self) -> bool:
+        return self.organization_id is not None
+
+    def can_see(self, organization_id: Any, care_recipient_id: Any) -> bool:
+        if not self.restricted:
+            return True
+        if str(organization_id) != str(self.organization_id):
+            return False
+        return self.recipients is None or UUID(str(care_recipient_id)) in self.recipients
+
+    def visible(self, care_recipient_ids: Iterable[Any]) -> set[UUID]:
+        """The given recipients of this scope's organization that the user may see."""
+        ids = {UUID(str(recipient_id)) for recipient_id in care_recipient_ids}
+        return ids if self.recipients is None else ids & self.recipients
+
+    def require(self, organization_id: Any, care_recipient_id: Any, detail: str) -> None:
+        """404 with `detail` unless the row is visible, so hidden rows look like missing ones."""
+        if not self.can_see(organization_id, care_recipient_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+    def where(self, care_recipient_column: Any) -> list[ColumnElement[bool]]:
+        """Filter clauses limiting `care_recipient_column` to this scope (none if unlimited)."""
+        if self.recipients is None:
+            return []
+        return [care_recipient_column.in_(sorted(self.recipients))]
+
+
+UNRESTRICTED = CareScope()
+
+
+def scope_for(organization_id: Any, user_id: Any, role: Optional[str]) -> CareScope:
+    organization_id, user_id = UUID(str(organization_id)), UUID(str(user_id))
+    if role in ORGANIZATION_WIDE_ROLES:
+        return CareScope(organization_id)
+    recipients = frozenset(care_circle(organization_id).recipients_of(user_id)) | {user_id}
+    return CareScope(organization_id, recipients)
@@ -7,12 +7,20 @@ Each module defines a FastAPI APIRouter for a resource or group of resources.
 from fastapi import APIRouter
 
 from . import (
+    calendar,
+    dashboard,
     health,
     persons,
     organizations,
     memberships,
     care_relationships,
     care_arrangements,
+    conversations,
+    locations,
+    metrics,
+    notifications,
+    realtime,
+    search,
     visits,
     visit_notes,
     tasks,
@@ -22,11 +30,19 @@ from . import (
 router = APIRouter()
 
 router.include_router(health.router)
+router.include_router(metrics.router)
 router.include_router(persons.router)
 router.include_router(organizations.router)
 router.include_router(memberships.router)
 router.include_router(care_relationships.router)
 router.include_router(care_arrangements.router)
+router.include_router(locations.router)
 router.include_router(visits.router)
 router.include_router(visit_notes.router)
 router.include_router(tasks.router)
+router.include_router(calendar.router)
+router.include_router(dashboard.router)
+router.include_router(conversations.router)
+router.include_router(notifications.router)
+router.include_router(realtime.router)
+router.include_router(search.router)
@@ -0,0 +1,28 @@
+"""
+Async (AsyncSession) variants of the high-traffic route modules.
+
+Each module mirrors its sync counterpart in `backend.apis.routes` (same prefix,
+paths, schemas and status codes) but awaits the database instead of holding a
+threadpool worker. `create_app` mounts these in place of the sync routers when
+`DATABASE_ASYNC=true`.
+"""
+
+from . import (
+    calendar,
+    dashboard,
+    persons,
+    memberships,
+    care_relationships,
+    visits,
+    tasks,
+)
+
+__all__ = [
+    "calendar",
+    "dashboard",
+    "persons",
+    "memberships",
+    "care_relationships",
+    "visits",
+    "tasks",
+]
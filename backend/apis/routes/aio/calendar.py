@@ -0,0 +1,45 @@
+"""
+Calendar endpoint (async).
+
+Async mirror of `backend.apis.routes.calendar`.
+"""
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.apis.dependencies import get_async_db_session, get_care_scope, get_current_organization_id
+from backend.apis.permissions import CareScope
+from backend.apis.routes.calendar import (
+    _assignments_stmt,
+    _series_stmt,
+    _validate_window,
+    _visits_stmt,
+    merge_entries,
+)
+from backend.apis.schemas.calendar import CalendarResponse
+
+
+router = APIRouter(prefix="/calendar", tags=["Calendar"])
+
+
+@router.get("", response_model=CalendarResponse, response_model_exclude_none=True)
+async def get_calendar(
+    date_from: datetime = Query(..., alias="from"),
+    date_to: datetime = Query(..., alias="to"),
+    caregiver_id: Optional[UUID] = Query(default=None),
+    care_recipient_id: Optional[UUID] = Query(default=None),
+    db: AsyncSession = Depends(get_async_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> CalendarResponse:
+    """Visits and 24/7 assignments overlapping [from, to), ordered by start."""
+    _validate_window(date_from, date_to)
+    args = (organization_id, date_from, date_to, caregiver_id, care_recipient_id, scope)
+    visits = (await db.execute(_visits_stmt(*args))).all()
+    series = (await db.execute(_series_stmt(*args))).all()
+    assignments = (await db.execute(_assignments_stmt(*args))).all()
+    return {"items": merge_entries(visits, series, assignments, date_from, date_to)}
@@ -0,0 +1,154 @@
+"""
+Care relationship endpoints (async).
+
+Async mirror of `backend.apis.routes.care_relationships`.
+Enforces one 24/7 caregiver per recipient per organization.
+"""
+
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.apis.dependencies import (
+    get_async_db_session,
+    get_current_organization_id,
+)
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from backend.apis.permissions import care_circle_event, invalidate_care_circle
+from backend.apis.routes.care_relationships import (
+    CARE_RELATIONSHIP_ORDER,
+    MAX_24X7_ATTEMPTS,
+    _apply_update,
+    _demote_24x7_stmt,
+    _holds_24x7,
+    _is_24x7_violation,
+    _raise_24x7_contention,
+)
+from backend.apis.schemas.pagination import Page
+from backend.apis.schemas.care_relationship import (
+    CareRelationshipCreate,
+    CareRelationshipUpdate,
+    CareRelationshipResponse,
+)
+from backend.database.entities.care_relationship import CareRelationship
+from backend.realtime import emit
+
+
+router = APIRouter(prefix="/care-relationships", tags=["Care relationships"])
+
+
+async def _save_with_24x7_retry(
+    db: AsyncSession,
+    build: Callable[[], Awaitable[CareRelationship]],
+) -> CareRelationship:
+    """Async `_save_with_24x7_retry`: demote, write, and rebuild on a lost race."""
+    for _ in range(MAX_24X7_ATTEMPTS):
+        rel = await build()
+        if _holds_24x7(rel):
+            await db.execute(_demote_24x7_stmt(rel))
+        db.add(rel)
+        organization_id = rel.organization_id
+        emit(db, care_circle_event(organization_id))
+        try:
+            await db.commit()
+            invalidate_care_circle(organization_id)
+            return rel
+        except IntegrityError as exc:
+            await db.rollback()
+            if not _is_24x7_violation(exc):
+                raise
+    _raise_24x7_contention()
+
+
+@router.get("", response_model=Page[CareRelationshipResponse])
+async def list_care_relationships(
+    care_recipient_id: Optional[UUID] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+) -> Page[CareRelationshipResponse]:
+    """
+    List care relationships, optionally filtered by care recipient.
+    """
+    stmt = select(CareRelationship).where(CareRelationship.organization_id == organization_id)
+    if care_recipient_id is not None:
+        stmt = stmt.where(CareRelationship.care_recipient_id == care_recipient_id)
+    result = await db.scalars(CARE_RELATIONSHIP_ORDER.apply(stmt, cursor, limit))
+    return CARE_RELATIONSHIP_ORDER.page(result.all(), limit)
+
+
+@router.get("/{relationship_id}", response_model=CareRelationshipResponse)
+async def get_care_relationship(
+    relationship_id: UUID,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> CareRelationshipResponse:
+    """Get a single care relationship by ID."""
+    rel = await db.get(CareRelationship, relationship_id)
+    if not rel:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Care relationship not found")
+    return rel
+
+
+@router.post("", response_model=CareRelationshipResponse, status_code=status.HTTP_201_CREATED)
+async def create_care_relationship(
+    payload: CareRelationshipCreate,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> CareRelationshipResponse:
+    """
+    Create a care relationship.
+
+    If the new relationship is an active 24/7 caregiver, any existing one for the
+    same (care_recipient_id, organization_id) is set to `is_24x7_caregiver = False`.
+    """
+
+    async def build() -> CareRelationship:
+        return CareRelationship(
+            care_recipient_id=payload.care_recipient_id,
+            related_user_id=payload.related_user_id,
+            organization_id=payload.organization_id,
+            role=payload.role,
+            is_24x7_caregiver=payload.is_24x7_caregiver,
+            start_date=payload.start_date,
+            end_date=payload.end_date,
+            notes=payload.notes,
+            status=payload.status,
+        )
+
+    return await _save_with_24x7_retry(db, build)
+
+
+@router.patch("/{relationship_id}", response_model=CareRelationshipResponse)
+async def update_care_relationship(
+    relationship_id: UUID,
+    payload: CareRelationshipUpdate,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> CareRelationshipResponse:
+    """
+    Partially update a care relationship.
+
+    When the relationship ends up an active 24/7 caregiver, enforce the single
+    24/7 caregiver rule by clearing it for other active relationships for the
+    same recipient/org.
+    """
+    rel = await db.get(CareRelationship, relationship_id)
+    if not rel:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Care relationship not found")
+    if not _holds_24x7(_apply_update(rel, payload)):
+        organization_id = rel.organization_id
+        emit(db, care_circle_event(organization_id))
+        await db.commit()
+        invalidate_care_circle(organization_id)
+        return rel
+
+    async def build() -> CareRelationship:
+        current = await db.get(CareRelationship, relationship_id)
+        if current is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Care relationship not found")
+        return _apply_update(current, payload)
+
+    return await _save_with_24x7_retry(db, build)
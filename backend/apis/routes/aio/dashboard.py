@@ -0,0 +1,39 @@
+"""
+Dashboard endpoint (async).
+
+Async mirror of `backend.apis.routes.dashboard`.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.apis.dependencies import get_async_db_session, get_current_organization_id
+from backend.apis.routes.dashboard import (
+    _active_care_recipients_stmt,
+    _active_caregivers_stmt,
+    build_stats,
+)
+from backend.apis.schemas.dashboard import DashboardStats
+from backend.stats.rollup import stats_stmt
+
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@router.get("/stats", response_model=DashboardStats)
+async def get_dashboard_stats(
+    stat_date: Optional[date] = Query(default=None, alias="date", description="Defaults to today (UTC)."),
+    db: AsyncSession = Depends(get_async_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+) -> DashboardStats:
+    """Visit and task counts by status for a day, plus active caregivers and care recipients."""
+    stat_date = stat_date or datetime.now(timezone.utc).date()
+    return build_stats(
+        stat_date,
+        (await db.execute(stats_stmt(organization_id, stat_date))).all(),
+        await db.scalar(_active_caregivers_stmt(organization_id)),
+        await db.scalar(_active_care_recipients_stmt(organization_id)),
+    )
@@ -0,0 +1,121 @@
+"""
+Membership endpoints (async).
+
+Async mirror of `backend.apis.routes.memberships`.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.apis.auth import invalidate_memberships
+from backend.apis.dependencies import (
+    get_async_db_session,
+    get_current_organization_id,
+    get_current_user_id,
+)
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from backend.apis.routes.memberships import MEMBERSHIP_ORDER
+from backend.apis.schemas.pagination import Page
+from backend.apis.schemas.membership import (
+    MembershipCreate,
+    MembershipUpdate,
+    MembershipResponse,
+)
+from backend.database.entities.membership import Membership
+from backend.realtime import emit, person_event
+
+
+router = APIRouter(prefix="/memberships", tags=["Memberships"])
+
+
+@router.get("", response_model=Page[MembershipResponse])
+async def list_memberships(
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+) -> Page[MembershipResponse]:
+    """List memberships for the current organization, newest first."""
+    stmt = select(Membership).where(Membership.organization_id == organization_id)
+    result = await db.scalars(MEMBERSHIP_ORDER.apply(stmt, cursor, limit))
+    return MEMBERSHIP_ORDER.page(result.all(), limit)
+
+
+@router.get("/{membership_id}", response_model=MembershipResponse)
+async def get_membership(
+    membership_id: UUID,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> MembershipResponse:
+    """Get a membership by ID."""
+    membership = await db.get(Membership, membership_id)
+    if not membership:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Membership not found")
+    return membership
+
+
+@router.post("", response_model=MembershipResponse, status_code=status.HTTP_201_CREATED)
+async def create_membership(
+    payload: MembershipCreate,
+    db: AsyncSession = Depends(get_async_db_session),
+    invited_by: str = Depends(get_current_user_id),
+) -> MembershipResponse:
+    """
+    Create a membership (link user to organization with role).
+
+    Enforces one membership per (user, organization) via DB unique constraint.
+    """
+    membership = Membership(
+        user_id=payload.user_id,
+        organization_id=payload.organization_id,
+        role=payload.role,
+        title=payload.title,
+        location_id=payload.location_id,
+        status=payload.status,
+        invited_by_id=invited_by,
+    )
+
+    db.add(membership)
+    emit(db, person_event(membership.user_id))
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Membership for this user and organization already exists.",
+        )
+    invalidate_memberships(membership.user_id)
+
+    return membership
+
+
+@router.patch("/{membership_id}", response_model=MembershipResponse)
+async def update_membership(
+    membership_id: UUID,
+    payload: MembershipUpdate,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> MembershipResponse:
+    """Partially update a membership (role, title, status, location)."""
+    membership = await db.get(Membership, membership_id)
+    if not membership:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Membership not found")
+
+    if payload.role is not None:
+        membership.role = payload.role
+    if payload.title is not None:
+        membership.title = payload.title
+    if payload.location_id is not None:
+        membership.location_id = payload.location_id
+    if payload.status is not None:
+        membership.status = payload.status
+
+    db.add(membership)
+    emit(db, person_event(membership.user_id))
+    await db.commit()
+    invalidate_memberships(membership.user_id)
+    return membership
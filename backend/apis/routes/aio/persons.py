@@ -0,0 +1,122 @@
+"""
+Person (user) endpoints (async).
+
+Async mirror of `backend.apis.routes.persons`.
+"""
+
+from typing import List, Optional
+from uuid import UUID
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from backend.apis.schemas.membership import MembershipRole
+from backend.apis.schemas.pagination import Page
+from backend.apis.schemas.person import PersonMatch, PersonResponse, PersonCreate, PersonUpdate
+from backend.apis.dependencies import get_async_db_session, get_current_organization_id
+from backend.apis.routes.persons import MAX_TYPEAHEAD_LIMIT, PERSON_ORDER, TYPEAHEAD_LIMIT
+from backend.apis.typeahead import directory, match_stmt, query_words
+from backend.database.entities.user import User
+from backend.realtime import emit, person_event
+
+router = APIRouter(prefix="/persons", tags=["Persons"])
+logger = logging.getLogger(__name__)
+
+
+@router.get("", response_model=Page[PersonResponse])
+async def list_persons(
+    db: AsyncSession = Depends(get_async_db_session),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+) -> Page[PersonResponse]:
+    """
+    List all persons (users), newest first.
+    """
+    result = await db.scalars(PERSON_ORDER.apply(select(User), cursor, limit))
+    return PERSON_ORDER.page(result.all(), limit)
+
+
+@router.post("", response_model=PersonResponse, status_code=status.HTTP_201_CREATED)
+async def create_person(
+    payload: PersonCreate,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> PersonResponse:
+    """
+    Create a person (user) with status `invited` and no password.
+    """
+    existing = await db.scalar(select(User.id).where(User.email == payload.email).limit(1))
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A user with this email already exists.",
+        )
+
+    user = User(
+        email=payload.email,
+        first_name=payload.first_name,
+        last_name=payload.last_name,
+        display_name=payload.display_name,
+        status="invited",
+    )
+    db.add(user)
+    await db.commit()
+    logger.info("Created user %s (%s)", user.id, user.email)
+    return user
+
+
+@router.get("/search", response_model=List[PersonMatch])
+async def search_persons(
+    q: str = Query(..., min_length=1, max_length=100, description="Starts of names or of the email address"),
+    role: List[MembershipRole] = Query(default=[], description="Only people with these roles (repeatable)"),
+    limit: int = Query(TYPEAHEAD_LIMIT, ge=1, le=MAX_TYPEAHEAD_LIMIT),
+    db: AsyncSession = Depends(get_async_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+) -> List[PersonMatch]:
+    """
+    Members of the current organization matching `q`, by last then first name.
+    """
+    words = query_words(q)
+    roles = {r.value for r in role}
+    matches = directory.search(UUID(str(organization_id)), words, roles, limit)
+    if matches is None:
+        matches = (await db.execute(match_stmt(organization_id, words, roles, limit))).all()
+    return matches
+
+
+@router.get("/{person_id}", response_model=PersonResponse)
+async def get_person(
+    person_id: UUID,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> PersonResponse:
+    """Get a person by ID."""
+    user = await db.get(User, person_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Person not found")
+    return user
+
+
+@router.patch("/{person_id}", response_model=PersonResponse)
+async def update_person(
+    person_id: UUID,
+    payload: PersonUpdate,
+    db: AsyncSession = Depends(get_async_db_session),
+) -> PersonResponse:
+    """Partially update a person."""
+    user = await db.get(User, person_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Person not found")
+
+    if payload.first_name is not None:
+        user.first_name = payload.first_name
+    if payload.last_name is not None:
+        user.last_name = payload.last_name
+    if payload.display_name is not None:
+        user.display_name = payload.display_name
+
+    db.add(user)
+    emit(db, person_event(user.id))
+    await db.commit()
+    return user
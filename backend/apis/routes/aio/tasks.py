@@ -0,0 +1,218 @@
+"""
+Task endpoints (async).
+
+Async mirror of `backend.apis.routes.tasks`.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.apis.dependencies import (
+    get_async_db_session,
+    get_care_scope,
+    get_current_organization_id,
+    get_current_user_id,
+)
+from backend.apis.export import ExportFormat, export_response, stream_rows_async
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from backend.apis.permissions import CareScope
+from backend.apis.routes.tasks import (
+    TASK_ORDER,
+    _batch_insert_stmt,
+    _batch_rows,
+    _export_stmt,
+    _validate_batch,
+    _validate_scope,
+)
+from backend.apis.schemas.batch import BatchResponse
+from backend.apis.schemas.pagination import Page
+from backend.apis.schemas.task import TaskBatchCreate, TaskCreate, TaskUpdate, TaskResponse
+from backend.database.entities.task import Task
+from backend.realtime import emit, task_event
+from backend.stats.rollup import count_tasks, move, task_key
+
+
+router = APIRouter(prefix="/tasks", tags=["Tasks"])
+
+
+@router.get("", response_model=Page[TaskResponse])
+async def list_tasks(
+    care_recipient_id: Optional[UUID] = Query(default=None),
+    visit_id: Optional[UUID] = Query(default=None),
+    assignment_24x7_id: Optional[UUID] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> Page[TaskResponse]:
+    """
+    List tasks, optionally filtered by care recipient, visit, or 24x7 assignment.
+    """
+    stmt = select(Task).where(Task.organization_id == organization_id, *scope.where(Task.care_recipient_id))
+    if care_recipient_id is not None:
+        stmt = stmt.where(Task.care_recipient_id == care_recipient_id)
+    if visit_id is not None:
+        stmt = stmt.where(Task.visit_id == visit_id)
+    if assignment_24x7_id is not None:
+        stmt = stmt.where(Task.assignment_24x7_id == assignment_24x7_id)
+    result = await db.scalars(TASK_ORDER.apply(stmt, cursor, limit))
+    return TASK_ORDER.page(result.all(), limit)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_tasks(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    care_recipient_id: Optional[UUID] = Query(default=None),
+    date_from: Optional[date] = Query(default=None, alias="from"),
+    date_to: Optional[date] = Query(default=None, alias="to"),
+    db: AsyncSession = Depends(get_async_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> StreamingResponse:
+    """Stream tasks dated in [from, to) as NDJSON or CSV."""
+    stmt = _export_stmt(organization_id, care_recipient_id, date_from, date_to, scope)
+    return export_response(stream_rows_async(db, stmt, format), format, "tasks")
+
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task(
+    task_id: UUID,
+    db: AsyncSession = Depends(get_async_db_session),
+    scope: CareScope = Depends(get_care_scope),
+) -> TaskResponse:
+    """Get a single task by ID."""
+    task = await db.get(Task, task_id)
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    scope.require(task.organization_id, task.care_recipient_id, "Task not found")
+    return task
+
+
+@router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
+async def create_task(
+    payload: TaskCreate,
+    db: AsyncSession = Depends(get_async_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> TaskResponse:
+    """
+    Create a task for a visit or for a 24/7 assignment.
+    """
+    _validate_scope(payload.visit_id, payload.assignment_24x7_id)
+
+    task = Task(
+        organization_id=payload.organization_id,
+        care_recipient_id=payload.care_recipient_id,
+        care_plan_id=payload.care_plan_id,
+        visit_id=payload.visit_id,
+        assignment_24x7_id=payload.assignment_24x7_id,
+        task_date=payload.task_date,
+        title=payload.title,
+        description=payload.description,
+        category=payload.category,
+        frequency=payload.frequency,
+        status=payload.status,
+        notes=payload.notes,
+        sort_order=payload.sort_order,
+        completed_by_id=None,
+        completed_at=None,
+    )
+
+    db.add(task)
+    await db.flush()
+    await db.run_sync(count_tasks, [task])
+    emit(db, task_event("created", task))
+    await db.commit()
+    return task
+
+
+@router.post(":batch", response_model=BatchResponse[TaskResponse], status_code=status.HTTP_201_CREATED)
+async def create_tasks_batch(
+    payload: TaskBatchCreate,
+    db: AsyncSession = Depends(get_async_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> BatchResponse[TaskResponse]:
+    """Create many tasks in one transaction with a single multi-row INSERT."""
+    _validate_batch(payload)
+    result = await db.execute(_batch_insert_stmt(), _batch_rows(payload))
+    created = result.mappings().all()
+    await db.run_sync(count_tasks, created)
+    emit(db, *(task_event("created", row) for row in created))
+    await db.commit()
+    return {"items": created}
+
+
+@router.patch("/{task_id}", response_model=TaskResponse)
+async def update_task(
+    task_id: UUID,
+    payload: TaskUpdate,
+    db: AsyncSession = Depends(get_async_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> TaskResponse:
+    """
+    Partially update a task.
+
+    Enforces:
+    - Either visit_id or assignment_24x7_id (not both).
+    - status 'completed' requires completed_at and completed_by_id.
+    """
+    # Locked until commit: a concurrent update would move the counter out of the same old key.
+    task = await db.get(Task, task_id, with_for_update=True)
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    scope.require(task.organization_id, task.care_recipient_id, "Task not found")
+    counted_as = task_key(task)
+
+    if payload.care_plan_id is not None:
+        task.care_plan_id = payload.care_plan_id
+    if payload.visit_id is not None:
+        task.visit_id = payload.visit_id
+    if payload.assignment_24x7_id is not None:
+        task.assignment_24x7_id = payload.assignment_24x7_id
+    if payload.task_date is not None:
+        task.task_date = payload.task_date
+    if payload.title is not None:
+        task.title = payload.title
+    if payload.description is not None:
+        task.description = payload.description
+    if payload.category is not None:
+        task.category = payload.category
+    if payload.frequency is not None:
+        task.frequency = payload.frequency
+    if payload.notes is not None:
+        task.notes = payload.notes
+    if payload.sort_order is not None:
+        task.sort_order = payload.sort_order
+
+    # Handle status and completion fields
+    if payload.status is not None:
+        if payload.status == "completed":
+            task.status = "completed"
+            if task.completed_at is None:
+                task.completed_at = datetime.now(timezone.utc)
+            if task.completed_by_id is None:
+                task.completed_by_id = current_user_id
+        else:
+            task.status = payload.status
+
+    _validate_scope(task.visit_id, task.assignment_24x7_id)
+
+    if task.status == "completed" and (task.completed_at is None or task.completed_by_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Completed tasks must have completed_at and completed_by_id set.",
+        )
+
+    db.add(task)
+    await db.flush()
+    await db.run_sync(move, counted_as, task_key(task))
+    emit(db, task_event("updated", task))
+    await db.commit()
+    return task
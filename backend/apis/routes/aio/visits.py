@@ -0,0 +1,340 @@
+"""
+Visit endpoints (async).
+
+Async mirror of `backend.apis.routes.visits`.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.apis.dependencies import (
+    get_async_db_session,
+    get_care_scope,
+    get_current_organization_id,
+    get_current_user_id,
+)
+from backend.apis.export import ExportFormat, export_response, stream_rows_async
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from backend.apis.permissions import CareScope
+from backend.apis.routes.visits import (
+    VISIT_ORDER,
+    _batch_insert_stmt,
+    _batch_rows,
+    _booking_changed,
+    _end_stmt,
+    _exists_stmt,
+    _export_stmt,
+    _merge_occurrences,
+    _raise_batch_overlaps,
+    _raise_overlap,
+    _raise_transition_error,
+    _start_stmt,
+    _stored_occurrences_stmt,
+    _validate_series_window,
+)
+from backend.apis.schemas.batch import BatchResponse
+from backend.apis.schemas.pagination import Page
+from backend.apis.schemas.visit import (
+    VisitBatchCreate,
+    VisitCreate,
+    VisitOccurrence,
+    VisitResponse,
+    VisitUpdate,
+)
+from backend.database.entities.visit import Visit
+from backend.scheduling.conflicts import (
+    batch_conflicts,
+    batch_window,
+    bookings_stmt,
+    is_booked,
+    is_overlap_violation,
+    overlapping_stmt,
+)
+from backend.scheduling.recurrence import (
+    horizon_end,
+    is_series_head,
+    materialize,
+    reschedule,
+    series_changed,
+    series_state,
+)
+from backend.realtime import emit, visit_event
+from backend.stats.rollup import count_check_in, count_visits, move, visit_key
+
+
+router = APIRouter(prefix="/visits", tags=["Visits"])
+
+
+@asynccontextmanager
+async def _overlap_conflicts(db: AsyncSession) -> AsyncIterator[None]:
+    """Report a write rejected by the caregiver exclusion constraint as the usual 409."""
+    try:
+        yield
+    except IntegrityError as exc:
+        await db.rollback()
+        if is_overlap_violation(exc):
+            _raise_overlap([])
+        raise
+
+
+@router.get("", response_model=Page[VisitResponse])
+async def list_visits(
+    care_recipient_id: Optional[UUID] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> Page[VisitResponse]:
+    """
+    List visits in schedule order, optionally filtered by care recipient.
+    """
+    stmt = select(Visit).where(Visit.organization_id == organization_id, *scope.where(Visit.care_recipient_id))
+    if care_recipient_id is not None:
+        stmt = stmt.where(Visit.care_recipient_id == care_recipient_id)
+    result = await db.scalars(VISIT_ORDER.apply(stmt, cursor, limit))
+    return VISIT_ORDER.page(result.all(), limit)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_visits(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    care_recipient_id: Optional[UUID] = Query(default=None),
+    date_from: Optional[datetime] = Query(default=None, alias="from"),
+    date_to: Optional[datetime] = Query(default=None, alias="to"),
+    db: AsyncSession = Depends(get_async_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> StreamingResponse:
+    """Stream visits scheduled in [from, to) as NDJSON or CSV."""
+    stmt = _export_stmt(organization_id, care_recipient_id, date_from, date_to, scope)
+    return export_response(stream_rows_async(db, stmt, format), format, "visits")
+
+
+@router.get("/{visit_id}", response_model=VisitResponse)
+async def get_visit(
+    visit_id: UUID,
+    db: AsyncSession = Depends(get_async_db_session),
+    scope: CareScope = Depends(get_care_scope),
+) -> VisitResponse:
+    """Get a single visit by ID."""
+    visit = await db.get(Visit, visit_id)
+    if not visit:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Visit not found")
+    scope.require(visit.organization_id, visit.care_recipient_id, "Visit not found")
+    return visit
+
+
+@router.get("/{visit_id}/occurrences", response_model=List[VisitOccurrence])
+async def list_visit_occurrences(
+    visit_id: UUID,
+    date_from: datetime = Query(..., alias="from"),
+    date_to: datetime = Query(..., alias="to"),
+    db: AsyncSession = Depends(get_async_db_session),
+    scope: CareScope = Depends(get_care_scope),
+) -> List[VisitOccurrence]:
+    """List the occurrences of a recurring visit that start in [from, to)."""
+    series = await db.get(Visit, visit_id)
+    _validate_series_window(series, date_from, date_to, scope)
+    stored = (await db.scalars(_stored_occurrences_stmt(visit_id, date_from, date_to))).all()
+    return _merge_occurrences(series, stored, date_from, date_to)
+
+
+@router.post("", response_model=VisitResponse, status_code=status.HTTP_201_CREATED)
+async def create_visit(
+    payload: VisitCreate,
+    db: AsyncSession = Depends(get_async_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> VisitResponse:
+    """
+    Create a scheduled visit.
+    """
+    visit = Visit(
+        organization_id=payload.organization_id,
+        care_recipient_id=payload.care_recipient_id,
+        assigned_caregiver_id=payload.assigned_caregiver_id,
+        visit_type=payload.visit_type,
+        scheduled_start=payload.scheduled_start,
+        scheduled_end=payload.scheduled_end,
+        timezone=payload.timezone,
+        address_street=payload.address_street,
+        address_city=payload.address_city,
+        address_region=payload.address_region,
+        address_postal_code=payload.address_postal_code,
+        address_country=payload.address_country,
+        recurrence_rule=payload.recurrence_rule,
+        parent_visit_id=payload.parent_visit_id,
+        status=payload.status,
+        notes=payload.notes,
+        created_by_id=current_user_id,
+    )
+
+    if visit.scheduled_end <= visit.scheduled_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="scheduled_end must be after scheduled_start",
+        )
+
+    if is_booked(visit.assigned_caregiver_id, visit.status):
+        stmt = overlapping_stmt(visit.assigned_caregiver_id, visit.scheduled_start, visit.scheduled_end)
+        conflicts = (await db.execute(stmt)).all()
+        if conflicts:
+            _raise_overlap(conflicts)
+
+    db.add(visit)
+    async with _overlap_conflicts(db):
+        # The session does not autoflush; write the visit before its children and counters.
+        await db.flush()
+        if is_series_head(visit):
+            await db.run_sync(materialize, visit, horizon_end())
+        await db.run_sync(count_visits, [visit])
+        emit(db, visit_event("created", visit))
+        await db.commit()
+    return visit
+
+
+@router.post(":batch", response_model=BatchResponse[VisitResponse], status_code=status.HTTP_201_CREATED)
+async def create_visits_batch(
+    payload: VisitBatchCreate,
+    db: AsyncSession = Depends(get_async_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> BatchResponse[VisitResponse]:
+    """Create many visits in one transaction with a single multi-row INSERT."""
+    window = batch_window(payload.items)
+    if window is not None:
+        errors = batch_conflicts(payload.items, (await db.execute(bookings_stmt(*window))).all())
+        if errors:
+            _raise_batch_overlaps(errors)
+    async with _overlap_conflicts(db):
+        result = await db.execute(_batch_insert_stmt(), _batch_rows(payload, current_user_id))
+        created = result.all()
+        await db.run_sync(count_visits, created)
+        until = horizon_end()
+        for row in created:
+            if is_series_head(row):
+                await db.run_sync(materialize, row, until)
+        emit(db, *(visit_event("created", row) for row in created))
+        await db.commit()
+    return {"items": created}
+
+
+@router.patch("/{visit_id}", response_model=VisitResponse)
+async def update_visit(
+    visit_id: UUID,
+    payload: VisitUpdate,
+    db: AsyncSession = Depends(get_async_db_session),
+    scope: CareScope = Depends(get_care_scope),
+) -> VisitResponse:
+    """
+    Partially update a visit (not including explicit start/end actions).
+    """
+    # Locked until commit: a concurrent update would move the counter out of the same old key.
+    visit = await db.get(Visit, visit_id, with_for_update=True)
+    if not visit:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Visit not found")
+    scope.require(visit.organization_id, visit.care_recipient_id, "Visit not found")
+    counted_as = visit_key(visit)
+    before = series_state(visit)
+
+    if payload.assigned_caregiver_id is not None:
+        visit.assigned_caregiver_id = payload.assigned_caregiver_id
+    if payload.visit_type is not None:
+        visit.visit_type = payload.visit_type
+    if payload.scheduled_start is not None:
+        visit.scheduled_start = payload.scheduled_start
+    if payload.scheduled_end is not None:
+        visit.scheduled_end = payload.scheduled_end
+    if payload.timezone is not None:
+        visit.timezone = payload.timezone
+    if payload.address_street is not None:
+        visit.address_street = payload.address_street
+    if payload.address_city is not None:
+        visit.address_city = payload.address_city
+    if payload.address_region is not None:
+        visit.address_region = payload.address_region
+    if payload.address_postal_code is not None:
+        visit.address_postal_code = payload.address_postal_code
+    if payload.address_country is not None:
+        visit.address_country = payload.address_country
+    if payload.recurrence_rule is not None:
+        visit.recurrence_rule = payload.recurrence_rule
+    if payload.parent_visit_id is not None:
+        visit.parent_visit_id = payload.parent_visit_id
+    if payload.status is not None:
+        visit.status = payload.status
+    if payload.notes is not None:
+        visit.notes = payload.notes
+
+    if visit.scheduled_end <= visit.scheduled_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="scheduled_end must be after scheduled_start",
+        )
+
+    if _booking_changed(payload) and is_booked(visit.assigned_caregiver_id, visit.status):
+        stmt = overlapping_stmt(visit.assigned_caregiver_id, visit.scheduled_start, visit.scheduled_end, visit.id)
+        conflicts = (await db.execute(stmt)).all()
+        if conflicts:
+            _raise_overlap(conflicts)
+
+    db.add(visit)
+    async with _overlap_conflicts(db):
+        await db.flush()
+        await db.run_sync(move, counted_as, visit_key(visit))
+        if is_series_head(visit) and series_changed(before, visit):
+            await db.run_sync(reschedule, visit, before)
+        emit(db, visit_event("updated", visit))
+        await db.commit()
+    return visit
+
+
+@router.post("/{visit_id}/start", response_model=VisitResponse)
+async def start_visit(
+    visit_id: UUID,
+    db: AsyncSession = Depends(get_async_db_session),
+    scope: CareScope = Depends(get_care_scope),
+) -> VisitResponse:
+    """
+    Start a visit: set status to in_progress and record checked_in_at.
+
+    Single conditional UPDATE ... RETURNING; see the sync `start_visit`.
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.execute(_start_stmt(visit_id, now, scope))
+    row = result.mappings().one_or_none()
+    if row is None:
+        _raise_transition_error(await db.scalar(_exists_stmt(visit_id, scope)), "started")
+    await db.run_sync(count_check_in, row, now)
+    emit(db, visit_event("started", row))
+    await db.commit()
+    return row
+
+
+@router.post("/{visit_id}/end", response_model=VisitResponse)
+async def end_visit(
+    visit_id: UUID,
+    db: AsyncSession = Depends(get_async_db_session),
+    scope: CareScope = Depends(get_care_scope),
+) -> VisitResponse:
+    """
+    End a visit: set status to completed and record checked_out_at.
+
+    Single conditional UPDATE ... RETURNING; see the sync `end_visit`.
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.execute(_end_stmt(visit_id, now, scope))
+    row = result.mappings().one_or_none()
+    if row is None:
+        _raise_transition_error(await db.scalar(_exists_stmt(visit_id, scope)), "ended")
+    await db.run_sync(count_check_in, row, now)
+    emit(db, visit_event("ended", row))
+    await db.commit()
+    return row
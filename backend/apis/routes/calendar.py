@@ -0,0 +1,275 @@
+"""
+Calendar endpoint.
+
+Merges visits (including projected occurrences of recurring visits) and 24/7
+assignments for a date range into one time-ordered stream.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Select, or_, select
+from sqlalchemy.orm import Session
+
+from backend.apis.dependencies import get_care_scope, get_current_organization_id, get_db_session
+from backend.apis.permissions import CareScope
+from backend.apis.schemas.calendar import CalendarResponse
+from backend.database.entities.assignment_24_7 import Assignment24_7
+from backend.database.entities.organization import Organization
+from backend.database.entities.visit import Visit
+from backend.scheduling.conflicts import BOOKED_STATUSES
+from backend.scheduling.recurrence import projected, series_timezone
+from backend.scheduling.timeutils import as_utc
+
+
+router = APIRouter(prefix="/calendar", tags=["Calendar"])
+
+# Widest [from, to) range one request may cover.
+MAX_CALENDAR_WINDOW = timedelta(days=62)
+
+# Visits starting this long before `from` are still read, so a visit that is
+# already running when the range opens shows up while the query stays a bounded
+# range scan on scheduled_start.
+VISIT_LOOKBACK = timedelta(days=1)
+
+# Slack on the start_date/end_date bounds: assignment dates are local to the
+# organization, which can be up to 14 hours off UTC.
+_DATE_SLACK = timedelta(days=1)
+
+
+def _validate_window(date_from: datetime, date_to: datetime) -> None:
+    if not as_utc(date_from) < as_utc(date_to) <= as_utc(date_from) + MAX_CALENDAR_WINDOW:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="to must be after from and at most 62 days later.",
+        )
+
+
+def _visits_stmt(
+    organization_id: UUID,
+    date_from: datetime,
+    date_to: datetime,
+    caregiver_id: Optional[UUID],
+    care_recipient_id: Optional[UUID],
+    scope: CareScope,
+) -> Select:
+    """Stored visits overlapping the range, by start (org/recipient/caregiver + scheduled_start indexes)."""
+    stmt = select(
+        Visit.id,
+        Visit.parent_visit_id,
+        Visit.care_recipient_id,
+        Visit.assigned_caregiver_id,
+        Visit.visit_type,
+        Visit.status,
+        Visit.scheduled_start,
+        Visit.scheduled_end,
+    ).where(
+        Visit.organization_id == organization_id,
+        *scope.where(Visit.care_recipient_id),
+        Visit.scheduled_start >= as_utc(date_from) - VISIT_LOOKBACK,
+        Visit.scheduled_start < as_utc(date_to),
+        Visit.scheduled_end > as_utc(date_from),
+    )
+    if caregiver_id is not None:
+        stmt = stmt.where(Visit.assigned_caregiver_id == caregiver_id)
+    if care_recipient_id is not None:
+        stmt = stmt.where(Visit.care_recipient_id == care_recipient_id)
+    return stmt.order_by(Visit.scheduled_start, Visit.id)
+
+
+def _series_stmt(
+    organization_id: UUID,
+    date_from: datetime,
+    date_to: datetime,
+    caregiver_id: Optional[UUID],
+    care_recipient_id: Optional[UUID],
+    scope: CareScope,
+) -> Select:
+    """
+    Recurring series whose materialized children stop short of the range end.
+
+    Cancelled (or no-show) heads end their series, so they are not projected.
+    """
+    stmt = select(
+        Visit.id,
+        Visit.parent_visit_id,
+        Visit.care_recipient_id,
+        Visit.assigned_caregiver_id,
+        Visit.visit_type,
+        Visit.status,
+        Visit.scheduled_start,
+        Visit.scheduled_end,
+        Visit.timezone,
+        Visit.recurrence_rule,
+        Visit.recurrence_materialized_until,
+    ).where(
+        Visit.organization_id == organization_id,
+        *scope.where(Visit.care_recipient_id),
+        Visit.recurrence_rule.is_not(None),
+        Visit.parent_visit_id.is_(None),
+        Visit.status.in_(BOOKED_STATUSES),
+        Visit.scheduled_start < as_utc(date_to),
+        or_(
+            Visit.recurrence_materialized_until.is_(None),
+            Visit.recurrence_materialized_until < as_utc(date_to),
+        ),
+    )
+    if caregiver_id is not None:
+        stmt = stmt.where(Visit.assigned_caregiver_id == caregiver_id)
+    if care_recipient_id is not None:
+        stmt = stmt.where(Visit.care_recipient_id == care_recipient_id)
+    return stmt
+
+
+def _assignments_stmt(
+    organization_id: UUID,
+    date_from: datetime,
+    date_to: datetime,
+    caregiver_id: Optional[UUID],
+    care_recipient_id: Optional[UUID],
+    scope: CareScope,
+) -> Select:
+    """
+    24/7 assignments whose dates overlap the range (org + start_date index).
+
+    Carries the organization's timezone, in which the assignment's dates and
+    times are wall-clock values.
+    """
+    stmt = select(
+        Assignment24_7.id,
+        Assignment24_7.care_recipient_id,
+        Assignment24_7.caregiver_id,
+        Assignment24_7.type,
+        Assignment24_7.status,
+        Assignment24_7.start_date,
+        Assignment24_7.start_time,
+        Assignment24_7.end_date,
+        Assignment24_7.end_time,
+        Organization.timezone,
+    ).outerjoin(
+        Organization, Organization.id == Assignment24_7.organization_id
+    ).where(
+        Assignment24_7.organization_id == organization_id,
+        *scope.where(Assignment24_7.care_recipient_id),
+        Assignment24_7.start_date <= (as_utc(date_to) + _DATE_SLACK).date(),
+        or_(
+            Assignment24_7.end_date.is_(None),
+            Assignment24_7.end_date >= (as_utc(date_from) - _DATE_SLACK).date(),
+        ),
+    )
+    if caregiver_id is not None:
+        stmt = stmt.where(Assignment24_7.caregiver_id == caregiver_id)
+    if care_recipient_id is not None:
+        stmt = stmt.where(Assignment24_7.care_recipient_id == care_recipient_id)
+    return stmt
+
+
+def _assignment_bounds(row: Any) -> tuple[datetime, Optional[datetime]]:
+    """
+    Assignment dates/times as UTC instants.
+
+    They are read in the organization's timezone (UTC when it is unset or
+    unknown); no end_time means through the end of end_date.
+    """
+    try:
+        tz = series_timezone(row.timezone)
+    except ValueError:
+        tz = timezone.utc
+
+    def instant(day: date, at: time) -> datetime:
+        return as_utc(datetime.combine(day, at, tzinfo=tz))
+
+    start = instant(row.start_date, row.start_time or time.min)
+    if row.end_date is None:
+        return start, None
+    if row.end_time is None:
+        return start, instant(row.end_date + timedelta(days=1), time.min)
+    return start, instant(row.end_date, row.end_time)
+
+
+def merge_entries(
+    visits: Iterable[Any],
+    series: Iterable[Any],
+    assignments: Iterable[Any],
+    date_from: datetime,
+    date_to: datetime,
+) -> list[dict[str, Any]]:
+    """
+    Build the calendar stream from the three query results.
+
+    Each source is already in start order, so the final sort only merges the
+    runs (Timsort detects them).
+    """
+    date_from, date_to = as_utc(date_from), as_utc(date_to)
+    entries = [
+        {
+            "kind": "visit",
+            "id": row.id,
+            "series_id": row.parent_visit_id,
+            "care_recipient_id": row.care_recipient_id,
+            "caregiver_id": row.assigned_caregiver_id,
+            "type": row.visit_type,
+            "status": row.status,
+            "start": as_utc(row.scheduled_start),
+            "end": as_utc(row.scheduled_end),
+        }
+        for row in visits
+    ]
+    for row in series:
+        entries.extend(
+            {
+                "kind": "visit",
+                "series_id": row.id,
+                "care_recipient_id": row.care_recipient_id,
+                "caregiver_id": row.assigned_caregiver_id,
+                "type": row.visit_type,
+                "status": "scheduled",
+                "start": occurrence.start,
+                "end": occurrence.end,
+            }
+            for occurrence in projected(row, date_from, date_to)
+        )
+    for row in assignments:
+        start, end = _assignment_bounds(row)
+        if start < date_to and (end is None or end > date_from):
+            entries.append(
+                {
+                    "kind": "assignment_24x7",
+                    "id": row.id,
+                    "care_recipient_id": row.care_recipient_id,
+                    "caregiver_id": row.caregiver_id,
+                    "type": row.type,
+                    "status": row.status,
+                    "start": start,
+                    "end": end,
+                }
+            )
+    entries.sort(key=lambda entry: entry["start"])
+    return entries
+
+
+@router.get("", response_model=CalendarResponse, response_model_exclude_none=True)
+def get_calendar(
+    date_from: datetime = Query(..., alias="from"),
+    date_to: datetime = Query(..., alias="to"),
+    caregiver_id: Optional[UUID] = Query(default=None),
+    care_recipient_id: Optional[UUID] = Query(default=None),
+    db: Session = Depends(get_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> CalendarResponse:
+    """
+    Visits and 24/7 assignments overlapping [from, to), ordered by start.
+
+    One range-bounded query per source (stored visits, recurring series past
+    their materialized horizon, 24/7 assignments); occurrences of recurring
+    visits beyond the horizon are expanded on the fly and have no id.
+    """
+    _validate_window(date_from, date_to)
+    args = (organization_id, date_from, date_to, caregiver_id, care_recipient_id, scope)
+    visits = db.execute(_visits_stmt(*args)).all()
+    series = db.execute(_series_stmt(*args)).all()
+    assignments = db.execute(_assignments_stmt(*args)).all()
+    return {"items": merge_entries(visits, series, assignments, date_from, date_to)}
@@ -3,42 +3,212 @@ Care arrangement endpoints.
 
 Define how care is delivered for a recipient within an organization:
 visits only, 24/7 caregiver only, or both.
+
+Arrangements of one recipient cover disjoint [effective_from, effective_to)
+date ranges (an open end runs forever). On Postgres the
+`ex_care_arrangement_overlap` exclusion constraint guarantees it; the checks
+here run first so callers get a 409 with the conflicting arrangements.
 """
 
-from typing import List, Optional
+import os
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from typing import Any, Iterator, List, NoReturn, Optional, Sequence
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Select, Update, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from backend.apis.dependencies import (
+    get_care_scope,
     get_current_organization_id,
     get_db_session,
 )
+from backend.apis.cache import TTLCache
+from backend.apis.permissions import CareScope
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, SortKey
+from backend.apis.schemas.pagination import Page
 from backend.apis.schemas.care_arrangement import (
     CareArrangementCreate,
     CareArrangementUpdate,
     CareArrangementResponse,
+    EffectiveCareArrangements,
 )
 from backend.database.entities.care_arrangement import CareArrangement
+from backend.scheduling.conflicts import is_overlap_violation
 
 
 router = APIRouter(prefix="/care-arrangements", tags=["Care arrangements"])
 
+CARE_ARRANGEMENT_ORDER = Keyset(
+    SortKey(CareArrangement.created_at, descending=True),
+    SortKey(CareArrangement.id, descending=True),
+)
+
+# Arrangements in effect per organization, {date: [row, ...]}, for the last
+# few dates asked about. Writes in this process invalidate their organization;
+# the TTL bounds staleness from writes served by other processes.
+EFFECTIVE_CACHE_TTL = float(os.getenv("CARE_ARRANGEMENT_CACHE_TTL_SECONDS", "60"))
+EFFECTIVE_CACHE_DATES = 8
+_effective_cache: TTLCache[str, dict[date, list[dict[str, Any]]]] = TTLCache(
+    maxsize=1024,
+    ttl=EFFECTIVE_CACHE_TTL,
+)
+
+OVERLAP_MESSAGE = "The recipient already has a care arrangement in effect for part of this range."
+
+
+def _close_open_stmt(payload: CareArrangementCreate) -> Update:
+    """
+    End the recipient's open-ended arrangement where the new one starts.
+
+    Only one that started earlier is closed; an open-ended arrangement that
+    starts on or after the new one would get an empty or inverted range, so it
+    is left to the overlap check.
+    """
+    return (
+        update(CareArrangement)
+        .where(
+            CareArrangement.care_recipient_id == payload.care_recipient_id,
+            CareArrangement.organization_id == payload.organization_id,
+            CareArrangement.effective_to.is_(None),
+            CareArrangement.effective_from < payload.effective_from,
+        )
+        .values(effective_to=payload.effective_from)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _overlapping_stmt(
+    care_recipient_id: UUID,
+    organization_id: UUID,
+    effective_from: date,
+    effective_to: Optional[date],
+    exclude_id: Optional[UUID] = None,
+) -> Select:
+    """Arrangements of the recipient overlapping [from, to) (recipient/org/from index)."""
+    stmt = select(CareArrangement.id, CareArrangement.effective_from, CareArrangement.effective_to).where(
+        CareArrangement.care_recipient_id == care_recipient_id,
+        CareArrangement.organization_id == organization_id,
+        or_(CareArrangement.effective_to.is_(None), CareArrangement.effective_to > effective_from),
+    )
+    if effective_to is not None:
+        stmt = stmt.where(CareArrangement.effective_from < effective_to)
+    if exclude_id is not None:
+        stmt = stmt.where(CareArrangement.id != exclude_id)
+    return stmt.order_by(CareArrangement.effective_from).limit(10)
+
+
+def _raise_overlap(rows: Sequence[Any]) -> NoReturn:
+    conflicts = [
+        {"arrangement_id": row.id, "effective_from": row.effective_from, "effective_to": row.effective_to}
+        for row in rows
+    ]
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=jsonable_encoder({"message": OVERLAP_MESSAGE, "conflicts": conflicts}),
+    )
+
+
+@contextmanager
+def _overlap_conflicts(db: Session) -> Iterator[None]:
+    """Report a write rejected by `ex_care_arrangement_overlap` as the usual 409."""
+    try:
+        yield
+    except IntegrityError as exc:
+        db.rollback()
+        if is_overlap_violation(exc):
+            _raise_overlap([])
+        raise
 
-@router.get("", response_model=List[CareArrangementResponse])
+
+def _effective_stmt(organization_id: UUID, on: date) -> Select:
+    """Every arrangement of the organization in effect on `on`, latest start first per recipient."""
+    return (
+        select(
+            CareArrangement.care_recipient_id,
+            CareArrangement.id.label("arrangement_id"),
+            CareArrangement.mode,
+            CareArrangement.effective_from,
+            CareArrangement.effective_to,
+        )
+        .where(
+            CareArrangement.organization_id == organization_id,
+            CareArrangement.effective_from <= on,
+            or_(CareArrangement.effective_to.is_(None), CareArrangement.effective_to > on),
+        )
+        .order_by(CareArrangement.care_recipient_id, CareArrangement.effective_from.desc())
+    )
+
+
+def _effective_rows(db: Session, organization_id: UUID, on: date) -> list[dict[str, Any]]:
+    """The organization's arrangements in effect on `on`, one per recipient, cached."""
+    key = str(organization_id)
+    cached = _effective_cache.get(key) or {}
+    if on in cached:
+        return cached[on]
+    version = _effective_cache.version(key)
+    rows: list[dict[str, Any]] = []
+    seen: set[Any] = set()
+    for row in db.execute(_effective_stmt(organization_id, on)).mappings():
+        # Overlaps can only predate the exclusion constraint; the latest start wins.
+        if row["care_recipient_id"] not in seen:
+            seen.add(row["care_recipient_id"])
+            rows.append(dict(row))
+    dates = dict(list(cached.items())[-(EFFECTIVE_CACHE_DATES - 1):])
+    dates[on] = rows
+    _effective_cache.put(key, dates, version)
+    return rows
+
+
+@router.get("", response_model=Page[CareArrangementResponse])
 def list_care_arrangements(
     care_recipient_id: Optional[UUID] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db_session),
     organization_id: str = Depends(get_current_organization_id),
-) -> List[CareArrangementResponse]:
+) -> Page[CareArrangementResponse]:
     """
     List care arrangements, optionally filtered by care recipient and/or organization.
+
+    Newest first, keyset-paginated on (created_at, id).
     """
     q = db.query(CareArrangement).filter(CareArrangement.organization_id == organization_id)
     if care_recipient_id is not None:
         q = q.filter(CareArrangement.care_recipient_id == care_recipient_id)
-    return q.order_by(CareArrangement.created_at.desc()).all()
+    rows = CARE_ARRANGEMENT_ORDER.apply(q, cursor, limit).all()
+    return CARE_ARRANGEMENT_ORDER.page(rows, limit)
+
+
+@router.get("/effective", response_model=EffectiveCareArrangements)
+def get_effective_care_arrangements(
+    on: Optional[date] = Query(default=None, alias="date", description="Defaults to today (UTC)."),
+    care_recipient_id: Optional[List[UUID]] = Query(default=None),
+    db: Session = Depends(get_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> EffectiveCareArrangements:
+    """
+    The care arrangement (mode) in effect on a date for each care recipient.
+
+    Resolves the whole organization with one query and caches it per
+    organization and date; pass `care_recipient_id` (repeatable) to narrow the
+    result. Recipients with no arrangement in effect, or outside the caller's
+    care scope, are omitted.
+    """
+    on = on or datetime.now(timezone.utc).date()
+    rows = _effective_rows(db, organization_id, on)
+    if scope.recipients is not None:
+        visible = scope.visible(row["care_recipient_id"] for row in rows)
+        rows = [row for row in rows if row["care_recipient_id"] in visible]
+    if care_recipient_id:
+        wanted = set(care_recipient_id)
+        rows = [row for row in rows if row["care_recipient_id"] in wanted]
+    return {"date": on, "items": rows}
 
 
 @router.get("/{arrangement_id}", response_model=CareArrangementResponse)
@@ -61,21 +231,18 @@ def create_care_arrangement(
     """
     Create a care arrangement.
 
-    Enforces at most one active arrangement per (care_recipient_id, organization_id)
-    by ending any existing open-ended arrangement when a new one is created.
+    Enforces at most one arrangement in effect per (care_recipient_id,
+    organization_id) and day: an open-ended arrangement that started earlier is
+    ended where the new one starts (one UPDATE), and any other overlap is a 409.
     """
-    # Close existing open-ended arrangements for this recipient/org
-    existing = (
-        db.query(CareArrangement)
-        .filter(
-            CareArrangement.care_recipient_id == payload.care_recipient_id,
-            CareArrangement.organization_id == payload.organization_id,
-            CareArrangement.effective_to.is_(None),
-        )
-        .all()
+    db.execute(_close_open_stmt(payload))
+    stmt = _overlapping_stmt(
+        payload.care_recipient_id, payload.organization_id, payload.effective_from, payload.effective_to
     )
-    for arr in existing:
-        arr.effective_to = payload.effective_from
+    conflicts = db.execute(stmt).all()
+    if conflicts:
+        db.rollback()
+        _raise_overlap(conflicts)
 
     arr = CareArrangement(
         care_recipient_id=payload.care_recipient_id,
@@ -87,8 +254,9 @@ def create_care_arrangement(
     )
 
     db.add(arr)
-    db.commit()
-    db.refresh(arr)
+    with _overlap_conflicts(db):
+        db.commit()
+    _effective_cache.invalidate(str(arr.organization_id))
     return arr
 
 
@@ -117,8 +285,22 @@ def update_care_arrangement(
     if payload.notes is not None:
         arr.notes = payload.notes
 
+    if arr.effective_to is not None and arr.effective_to < arr.effective_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="effective_to cannot be before effective_from",
+        )
+    if payload.effective_from is not None or payload.effective_to is not None:
+        stmt = _overlapping_stmt(
+            arr.care_recipient_id, arr.organization_id, arr.effective_from, arr.effective_to, arr.id
+        )
+        conflicts = db.execute(stmt).all()
+        if conflicts:
+            _raise_overlap(conflicts)
+
     db.add(arr)
-    db.commit()
-    db.refresh(arr)
+    with _overlap_conflicts(db):
+        db.commit()
+    _effective_cache.invalidate(str(arr.organization_id))
     return arr
 
@@ -2,43 +2,131 @@
 Care relationship endpoints.
 
 Link care recipients to related people (family, caregivers) within an organization.
-Enforces one 24/7 caregiver per recipient per organization.
+Enforces one 24/7 caregiver per recipient per organization: the partial unique
+index `uq_care_relationship_24x7_caregiver` is the guard, and a new 24/7
+caregiver demotes the previous one with a single UPDATE in the same
+transaction.
+
+Every write changes the organization's care circle (`backend.apis.permissions`):
+it is invalidated after the commit here and, through `care_circle.updated`, in
+the other workers.
 """
 
-from typing import List, Optional
+from typing import Callable, NoReturn, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Update, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from backend.apis.dependencies import (
     get_current_organization_id,
     get_db_session,
 )
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, SortKey
+from backend.apis.permissions import care_circle_event, invalidate_care_circle
+from backend.apis.schemas.pagination import Page
 from backend.apis.schemas.care_relationship import (
     CareRelationshipCreate,
     CareRelationshipUpdate,
     CareRelationshipResponse,
 )
 from backend.database.entities.care_relationship import CareRelationship
+from backend.realtime import emit
 
 
 router = APIRouter(prefix="/care-relationships", tags=["Care relationships"])
 
+CARE_RELATIONSHIP_ORDER = Keyset(
+    SortKey(CareRelationship.created_at, descending=True),
+    SortKey(CareRelationship.id, descending=True),
+)
+
+ONE_24X7_CAREGIVER_INDEX = "uq_care_relationship_24x7_caregiver"
+
+# Attempts at a 24/7 write that keeps losing the unique index to concurrent writers.
+MAX_24X7_ATTEMPTS = 3
+
+
+def _holds_24x7(rel: CareRelationship) -> bool:
+    """Whether the relationship occupies the recipient's single 24/7 slot."""
+    return bool(rel.is_24x7_caregiver) and getattr(rel.status, "value", rel.status) == "active"
+
+
+def _demote_24x7_stmt(rel: CareRelationship) -> Update:
+    """Clear the 24/7 flag on every other active relationship of the recipient/org."""
+    stmt = update(CareRelationship).where(
+        CareRelationship.care_recipient_id == rel.care_recipient_id,
+        CareRelationship.organization_id == rel.organization_id,
+        CareRelationship.is_24x7_caregiver.is_(True),
+        CareRelationship.status == "active",
+    )
+    if rel.id is not None:
+        stmt = stmt.where(CareRelationship.id != rel.id)
+    return stmt.values(is_24x7_caregiver=False).execution_options(synchronize_session=False)
+
+
+def _is_24x7_violation(exc: IntegrityError) -> bool:
+    """True if a concurrent writer took the 24/7 slot first."""
+    message = str(exc.orig)
+    # Postgres names the index; SQLite lists its columns.
+    return ONE_24X7_CAREGIVER_INDEX in message or (
+        "care_relationship.care_recipient_id, care_relationship.organization_id" in message
+    )
+
+
+def _raise_24x7_contention() -> NoReturn:
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Another 24/7 caregiver was assigned to this care recipient at the same time; retry.",
+    )
+
+
+def _save_with_24x7_retry(db: Session, build: Callable[[], CareRelationship]) -> CareRelationship:
+    """
+    Build the relationship, demote any other 24/7 caregiver and commit.
 
-@router.get("", response_model=List[CareRelationshipResponse])
+    Two requests can both demote and then both write a 24/7 caregiver; the
+    unique index rejects the second one. It is rolled back and rebuilt, and its
+    demote now sees (and clears) the winner, so the last writer takes the slot.
+    """
+    for _ in range(MAX_24X7_ATTEMPTS):
+        rel = build()
+        if _holds_24x7(rel):
+            db.execute(_demote_24x7_stmt(rel))
+        db.add(rel)
+        organization_id = rel.organization_id
+        emit(db, care_circle_event(organization_id))
+        try:
+            db.commit()
+            invalidate_care_circle(organization_id)
+            return rel
+        except IntegrityError as exc:
+            db.rollback()
+            if not _is_24x7_violation(exc):
+                raise
+    _raise_24x7_contention()
+
+
+@router.get("", response_model=Page[CareRelationshipResponse])
 def list_care_relationships(
     care_recipient_id: Optional[UUID] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db_session),
     organization_id: str = Depends(get_current_organization_id),
-) -> List[CareRelationshipResponse]:
+) -> Page[CareRelationshipResponse]:
     """
     List care relationships, optionally filtered by care recipient and/or organization.
+
+    Newest first, keyset-paginated on (created_at, id).
     """
     q = db.query(CareRelationship).filter(CareRelationship.organization_id == organization_id)
     if care_recipient_id is not None:
         q = q.filter(CareRelationship.care_recipient_id == care_recipient_id)
-    return q.order_by(CareRelationship.created_at.desc()).all()
+    rows = CARE_RELATIONSHIP_ORDER.apply(q, cursor, limit).all()
+    return CARE_RELATIONSHIP_ORDER.page(rows, limit)
 
 
 @router.get("/{relationship_id}", response_model=CareRelationshipResponse)
@@ -61,40 +149,41 @@ def create_care_relationship(
     """
     Create a care relationship.
 
-    If `is_24x7_caregiver` is true, enforce that there is at most one active 24/7
-    caregiver per (care_recipient_id, organization_id). Any existing active 24/7
-    relationship is set to `is_24x7_caregiver = False`.
+    If the new relationship is an active 24/7 caregiver, enforce that there is at
+    most one per (care_recipient_id, organization_id): any existing one is set
+    to `is_24x7_caregiver = False` in the same transaction.
     """
-    if payload.is_24x7_caregiver:
-        # Clear existing 24/7 caregiver for this recipient/org
-        existing_24x7 = (
-            db.query(CareRelationship)
-            .filter(
-                CareRelationship.care_recipient_id == payload.care_recipient_id,
-                CareRelationship.organization_id == payload.organization_id,
-                CareRelationship.is_24x7_caregiver.is_(True),
-                CareRelationship.status == "active",
-            )
-            .all()
+
+    def build() -> CareRelationship:
+        return CareRelationship(
+            care_recipient_id=payload.care_recipient_id,
+            related_user_id=payload.related_user_id,
+            organization_id=payload.organization_id,
+            role=payload.role,
+            is_24x7_caregiver=payload.is_24x7_caregiver,
+            start_date=payload.start_date,
+            end_date=payload.end_date,
+            notes=payload.notes,
+            status=payload.status,
         )
-        for rel in existing_24x7:
-            rel.is_24x7_caregiver = False
-
-    rel = CareRelationship(
-        care_recipient_id=payload.care_recipient_id,
-        related_user_id=payload.related_user_id,
-        organization_id=payload.organization_id,
-        role=payload.role,
-        is_24x7_caregiver=payload.is_24x7_caregiver,
-        start_date=payload.start_date,
-        end_date=payload.end_date,
-        notes=payload.notes,
-        status=payload.status,
-    )
 
-    db.add(rel)
-    db.commit()
-    db.refresh(rel)
+    return _save_with_24x7_retry(db, build)
+
+
+def _apply_update(rel: CareRelationship, payload: CareRelationshipUpdate) -> CareRelationship:
+    """Copy the fields set in `payload` onto `rel`."""
+    if payload.role is not None:
+        rel.role = payload.role
+    if payload.start_date is not None:
+        rel.start_date = payload.start_date
+    if payload.end_date is not None:
+        rel.end_date = payload.end_date
+    if payload.notes is not None:
+        rel.notes = payload.notes
+    if payload.status is not None:
+        rel.status = payload.status
+    if payload.is_24x7_caregiver is not None:
+        rel.is_24x7_caregiver = payload.is_24x7_caregiver
     return rel
 
 
@@ -107,43 +196,26 @@ def update_care_relationship(
     """
     Partially update a care relationship.
 
-    When setting `is_24x7_caregiver` to true, enforce the single 24/7 caregiver
-    rule by clearing it for other active relationships for the same recipient/org.
+    When the relationship ends up an active 24/7 caregiver (by setting
+    `is_24x7_caregiver` or by reactivating it), enforce the single 24/7
+    caregiver rule by clearing it for other active relationships for the same
+    recipient/org.
     """
     rel = db.get(CareRelationship, relationship_id)
     if not rel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Care relationship not found")
-
-    if payload.role is not None:
-        rel.role = payload.role
-    if payload.start_date is not None:
-        rel.start_date = payload.start_date
-    if payload.end_date is not None:
-        rel.end_date = payload.end_date
-    if payload.notes is not None:
-        rel.notes = payload.notes
-    if payload.status is not None:
-        rel.status = payload.status
-
-    if payload.is_24x7_caregiver is not None:
-        if payload.is_24x7_caregiver:
-            existing_24x7 = (
-                db.query(CareRelationship)
-                .filter(
-                    CareRelationship.care_recipient_id == rel.care_recipient_id,
-                    CareRelationship.organization_id == rel.organization_id,
-                    CareRelationship.is_24x7_caregiver.is_(True),
-                    CareRelationship.status == "active",
-                    CareRelationship.id != rel.id,
-                )
-                .all()
-            )
-            for other in existing_24x7:
-                other.is_24x7_caregiver = False
-        rel.is_24x7_caregiver = payload.is_24x7_caregiver
-
-    db.add(rel)
-    db.commit()
-    db.refresh(rel)
-    return rel
+    if not _holds_24x7(_apply_update(rel, payload)):
+        emit(db, care_circle_event(rel.organization_id))
+        db.commit()
+        invalidate_care_circle(rel.organization_id)
+        return rel
+
+    def build() -> CareRelationship:
+        # A retry starts from a rolled-back session: reload and reapply.
+        current = db.get(CareRelationship, relationship_id)
+        if current is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Care relationship not found")
+        return _apply_update(current, payload)
+
+    return _save_with_24x7_retry(db, build)
 
@@ -0,0 +1,328 @@
+"""
+Conversation (messaging) endpoints.
+
+Threads between family, caregivers and the agency. Only participants can read
+or post in a conversation; to anyone else it does not exist (404).
+
+- The thread list reads only `conversation` and `conversation_participant`:
+  each conversation carries a copy of its newest message (`last_message_*`,
+  `last_activity_at`), written by the same transaction that stores the message.
+- Read state is one watermark per participant, the newest message they have
+  read, moved forward with a single conditional UPDATE. "Unread" is the thread's
+  newest message differing from the caller's watermark; no per-message status
+  is written.
+- History is keyset-paginated on (created_at, id) within the conversation, on
+  `ix_message_conversation_created_id`.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Any, NoReturn, Optional, Sequence
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Select, Update, and_, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from backend.apis.dependencies import (
+    get_current_organization_id,
+    get_current_user_id,
+    get_db_session,
+)
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, SortKey
+from backend.apis.schemas.pagination import Page
+from backend.apis.schemas.conversation import (
+    ConversationCreate,
+    ConversationParticipantResponse,
+    ConversationResponse,
+    ConversationSummary,
+    ConversationType,
+    ReadReceipt,
+)
+from backend.apis.schemas.message import MessageCreate, MessageResponse
+from backend.database.entities.care_relationship import CareRelationship
+from backend.database.entities.conversation import Conversation, ConversationParticipant
+from backend.database.entities.message import Message
+from backend.realtime import emit, message_event
+
+
+router = APIRouter(prefix="/conversations", tags=["Conversations"])
+
+CONVERSATION_ORDER = Keyset(
+    SortKey(Conversation.last_activity_at, descending=True),
+    SortKey(Conversation.id, descending=True),
+)
+
+MESSAGE_ORDER = Keyset(
+    SortKey(Message.created_at, descending=True),
+    SortKey(Message.id, descending=True),
+)
+
+# Length of the message excerpt shown in the thread list (conversation.last_message_preview).
+PREVIEW_LENGTH = 200
+
+
+def _raise_not_found() -> NoReturn:
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
+
+
+def _is_participant(conversation_id: UUID, user_id: Any) -> ColumnElement:
+    return and_(
+        ConversationParticipant.conversation_id == conversation_id,
+        ConversationParticipant.user_id == user_id,
+    )
+
+
+def _require_participant(db: Session, conversation_id: UUID, user_id: Any) -> ConversationParticipant:
+    """The caller's participant row, or 404 (one lookup on uq_conversation_participant)."""
+    participant = db.scalars(select(ConversationParticipant).where(_is_participant(conversation_id, user_id))).first()
+    if participant is None:
+        _raise_not_found()
+    return participant
+
+
+def _before(at_column: Any, id_column: Any, at: datetime, row_id: UUID) -> ColumnElement:
+    """(at_column, id_column) is unset or sorts before (at, row_id)."""
+    return or_(at_column.is_(None), at_column < at, and_(at_column == at, id_column < row_id))
+
+
+def _inbox_stmt(user_id: Any, organization_id: Any) -> Select:
+    """The user's threads in the organization with their unread flag, from denormalized columns only."""
+    return (
+        select(
+            Conversation.id,
+            Conversation.organization_id,
+            Conversation.care_recipient_id,
+            Conversation.title,
+            Conversation.type,
+            Conversation.last_message_id,
+            Conversation.last_message_sender_id,
+            Conversation.last_message_preview,
+            Conversation.last_message_at,
+            Conversation.last_activity_at,
+            and_(
+                Conversation.last_message_id.is_not(None),
+                Conversation.last_message_id.is_distinct_from(ConversationParticipant.last_read_message_id),
+            ).label("unread"),
+        )
+        .join(ConversationParticipant, ConversationParticipant.conversation_id == Conversation.id)
+        .where(ConversationParticipant.user_id == user_id, Conversation.organization_id == organization_id)
+    )
+
+
+def _bump_thread_stmt(message: Message, sender_id: Any) -> Update:
+    """
+    Make `message` the conversation's newest, if the sender is a participant.
+
+    The ordering guard keeps a send that committed later, but was stamped
+    earlier, from replacing a newer message.
+    """
+    return (
+        update(Conversation)
+        .where(
+            Conversation.id == message.conversation_id,
+            select(ConversationParticipant.id).where(_is_participant(message.conversation_id, sender_id)).exists(),
+            _before(Conversation.last_message_at, Conversation.last_message_id, message.created_at, message.id),
+        )
+        .values(
+            last_message_id=message.id,
+            last_message_sender_id=message.sender_id,
+            last_message_preview=message.body[:PREVIEW_LENGTH],
+            last_message_at=message.created_at,
+            last_activity_at=message.created_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _advance_read_stmt(conversation_id: UUID, user_id: Any, message_id: UUID, at: datetime) -> Update:
+    """Move the participant's read watermark forward to (at, message_id); never backward."""
+    return (
+        update(ConversationParticipant)
+        .where(
+            _is_participant(conversation_id, user_id),
+            _before(
+                ConversationParticipant.last_read_at, ConversationParticipant.last_read_message_id, at, message_id
+            ),
+        )
+        .values(last_read_message_id=message_id, last_read_at=at)
+    )
+
+
+def _circle_members_stmt(payload: ConversationCreate) -> Select:
+    """Everyone with an active care relationship to the recipient."""
+    return (
+        select(CareRelationship.related_user_id)
+        .where(
+            CareRelationship.care_recipient_id == payload.care_recipient_id,
+            CareRelationship.organization_id == payload.organization_id,
+            CareRelationship.status == "active",
+        )
+        .distinct()
+    )
+
+
+def _with_participants(
+    conversation: Conversation, participants: Sequence[ConversationParticipant]
+) -> ConversationResponse:
+    data = {column.key: getattr(conversation, column.key) for column in Conversation.__table__.columns}
+    return ConversationResponse.model_validate({**data, "participants": participants}, from_attributes=True)
+
+
+@router.get("", response_model=Page[ConversationSummary])
+def list_conversations(
+    care_recipient_id: Optional[UUID] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+    current_user_id: str = Depends(get_current_user_id),
+) -> Page[ConversationSummary]:
+    """
+    Thread list of the current user, optionally for one care recipient.
+
+    Most recent activity first, keyset-paginated on (last_activity_at, id).
+    One query, whatever the length of the threads.
+    """
+    stmt = _inbox_stmt(current_user_id, organization_id)
+    if care_recipient_id is not None:
+        stmt = stmt.where(Conversation.care_recipient_id == care_recipient_id)
+    rows = db.execute(CONVERSATION_ORDER.apply(stmt, cursor, limit)).all()
+    return CONVERSATION_ORDER.page(rows, limit)
+
+
+@router.get("/{conversation_id}", response_model=ConversationResponse)
+def get_conversation(
+    conversation_id: UUID,
+    db: Session = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> ConversationResponse:
+    """Get a conversation with its participants and their read watermarks."""
+    participants = db.scalars(
+        select(ConversationParticipant)
+        .where(ConversationParticipant.conversation_id == conversation_id)
+        .order_by(ConversationParticipant.joined_at, ConversationParticipant.id)
+    ).all()
+    if not any(str(p.user_id) == str(current_user_id) for p in participants):
+        _raise_not_found()
+    return _with_participants(db.get(Conversation, conversation_id), participants)
+
+
+@router.post("", response_model=ConversationResponse, status_code=status.HTTP_201_CREATED)
+def create_conversation(
+    payload: ConversationCreate,
+    db: Session = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> ConversationResponse:
+    """
+    Start a conversation.
+
+    The current user joins along with `participant_ids`; a care_circle
+    conversation also adds the recipient's active care relationships.
+    """
+    members = [UUID(str(current_user_id)), *payload.participant_ids]
+    if payload.type == ConversationType.CARE_CIRCLE:
+        members += db.scalars(_circle_members_stmt(payload)).all()
+
+    conversation = Conversation(
+        id=uuid.uuid4(),
+        organization_id=payload.organization_id,
+        care_recipient_id=payload.care_recipient_id,
+        title=payload.title,
+        type=payload.type,
+        last_activity_at=datetime.now(timezone.utc),
+    )
+    participants = [
+        ConversationParticipant(conversation_id=conversation.id, user_id=user_id, role="member")
+        for user_id in dict.fromkeys(members)
+    ]
+
+    db.add(conversation)
+    db.add_all(participants)
+    db.commit()
+    return _with_participants(conversation, participants)
+
+
+@router.get("/{conversation_id}/messages", response_model=Page[MessageResponse])
+def list_messages(
+    conversation_id: UUID,
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> Page[MessageResponse]:
+    """
+    Message history of a conversation.
+
+    Newest first, keyset-paginated on (created_at, id); pass `next_cursor` to
+    page further back.
+    """
+    _require_participant(db, conversation_id, current_user_id)
+    stmt = select(Message).where(Message.conversation_id == conversation_id)
+    rows = db.scalars(MESSAGE_ORDER.apply(stmt, cursor, limit)).all()
+    return MESSAGE_ORDER.page(rows, limit)
+
+
+@router.post("/{conversation_id}/messages", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
+def send_message(
+    conversation_id: UUID,
+    payload: MessageCreate,
+    db: Session = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> MessageResponse:
+    """
+    Post a message as the current user.
+
+    Updates the thread's last-message columns and the sender's read watermark
+    in the same transaction: UPDATE conversation, UPDATE participant, INSERT
+    message.
+    """
+    message = Message(
+        id=uuid.uuid4(),
+        conversation_id=conversation_id,
+        sender_id=current_user_id,
+        body=payload.body,
+        attachments=[a.model_dump() for a in payload.attachments] if payload.attachments else None,
+        status="sent",
+        created_at=datetime.now(timezone.utc),
+    )
+    if db.execute(_bump_thread_stmt(message, current_user_id)).rowcount == 0:
+        # Not a participant (404), or the thread already has a newer message.
+        _require_participant(db, conversation_id, current_user_id)
+    db.execute(
+        _advance_read_stmt(conversation_id, current_user_id, message.id, message.created_at).execution_options(
+            synchronize_session=False
+        )
+    )
+    db.add(message)
+    emit(db, message_event(message, message.body[:PREVIEW_LENGTH]))
+    db.commit()
+    return message
+
+
+@router.post("/{conversation_id}/read", response_model=ConversationParticipantResponse)
+def mark_read(
+    conversation_id: UUID,
+    payload: ReadReceipt,
+    db: Session = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> ConversationParticipantResponse:
+    """
+    Mark everything up to `message_id` as read by the current user.
+
+    The watermark only moves forward; reading an older message again leaves it
+    where it is. Returns the caller's participant row.
+    """
+    read_at = db.scalar(
+        select(Message.created_at).where(Message.id == payload.message_id, Message.conversation_id == conversation_id)
+    )
+    if read_at is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
+    stmt = _advance_read_stmt(conversation_id, current_user_id, payload.message_id, read_at)
+    participant = db.scalars(stmt.returning(ConversationParticipant)).first()
+    if participant is None:
+        # Not a participant (404), or already read further.
+        participant = _require_participant(db, conversation_id, current_user_id)
+    db.commit()
+    return participant
@@ -0,0 +1,78 @@
+"""
+Dashboard endpoint.
+
+Serves the stat cards from the per-day rollup counters in `stat_rollup`
+(maintained by the visit and task write endpoints, see `backend.stats.rollup`)
+plus two index-only counts of active people, so the cost does not grow with the
+organization's history.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Select, distinct, func, select
+from sqlalchemy.orm import Session
+
+from backend.apis.dependencies import get_current_organization_id, get_db_session
+from backend.apis.schemas.dashboard import DashboardStats
+from backend.database.entities.care_relationship import CareRelationship
+from backend.database.entities.membership import Membership
+from backend.stats.rollup import stats_stmt
+
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+def _active_caregivers_stmt(organization_id: UUID) -> Select:
+    """Active caregiver memberships (ix_membership_org_role_status)."""
+    return select(func.count()).where(
+        Membership.organization_id == organization_id,
+        Membership.role == "caregiver",
+        Membership.status == "active",
+    )
+
+
+def _active_care_recipients_stmt(organization_id: UUID) -> Select:
+    """Care recipients with an active care relationship (ix_care_relationship_org_status)."""
+    return select(func.count(distinct(CareRelationship.care_recipient_id))).where(
+        CareRelationship.organization_id == organization_id,
+        CareRelationship.status == "active",
+    )
+
+
+def build_stats(
+    stat_date: date,
+    counters: Iterable[Any],
+    active_caregivers: int,
+    active_care_recipients: int,
+) -> dict[str, Any]:
+    """Group the day's `visits.*`/`tasks.*` counters into the response."""
+    groups: dict[str, dict[str, int]] = {"visits": {}, "tasks": {}}
+    for metric, value in counters:
+        group, _, status_name = metric.partition(".")
+        if group in groups and value:
+            groups[group][status_name] = value
+    return {
+        "date": stat_date,
+        **{name: {"total": sum(counts.values()), "by_status": counts} for name, counts in groups.items()},
+        "active_caregivers": active_caregivers,
+        "active_care_recipients": active_care_recipients,
+    }
+
+
+@router.get("/stats", response_model=DashboardStats)
+def get_dashboard_stats(
+    stat_date: Optional[date] = Query(default=None, alias="date", description="Defaults to today (UTC)."),
+    db: Session = Depends(get_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+) -> DashboardStats:
+    """Visit and task counts by status for a day, plus active caregivers and care recipients."""
+    stat_date = stat_date or datetime.now(timezone.utc).date()
+    return build_stats(
+        stat_date,
+        db.execute(stats_stmt(organization_id, stat_date)).all(),
+        db.scalar(_active_caregivers_stmt(organization_id)),
+        db.scalar(_active_care_recipients_stmt(organization_id)),
+    )
@@ -5,16 +5,18 @@ Locations belong to an organization (typically agencies) and represent offices
 or branches. Queries are scoped to the current organization.
 """
 
-from typing import List
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from backend.apis.dependencies import (
     get_current_organization_id,
     get_db_session,
 )
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, SortKey
+from backend.apis.schemas.pagination import Page
 from backend.apis.schemas.location import (
     LocationCreate,
     LocationUpdate,
@@ -25,22 +27,24 @@ from backend.database.entities.location import Location
 
 router = APIRouter(prefix="/locations", tags=["Locations"])
 
+LOCATION_ORDER = Keyset(
+    SortKey(Location.created_at, descending=True),
+    SortKey(Location.id, descending=True),
+)
+
 
-@router.get("", response_model=List[LocationResponse])
+@router.get("", response_model=Page[LocationResponse])
 def list_locations(
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db_session),
     organization_id: str = Depends(get_current_organization_id),
-) -> List[LocationResponse]:
+) -> Page[LocationResponse]:
     """
-    List locations for the current organization.
+    List locations for the current organization, newest first (keyset-paginated).
     """
-    locations = (
-        db.query(Location)
-        .filter(Location.organization_id == organization_id)
-        .order_by(Location.created_at.desc())
-        .all()
-    )
-    return locations
+    q = db.query(Location).filter(Location.organization_id == organization_id)
+    return LOCATION_ORDER.page(LOCATION_ORDER.apply(q, cursor, limit).all(), limit)
 
 
 @router.get("/{location_id}", response_model=LocationResponse)
@@ -89,7 +93,6 @@ def create_location(
 
     db.add(location)
     db.commit()
-    db.refresh(location)
     return location
 
 
@@ -131,6 +134,5 @@ def update_location(
 
     db.add(location)
     db.commit()
-    db.refresh(location)
     return location
 
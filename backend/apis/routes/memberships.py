@@ -4,42 +4,48 @@ Membership endpoints.
 Link users to organizations with roles and status.
 """
 
-from typing import List
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from backend.apis.auth import invalidate_memberships
 from backend.apis.dependencies import (
     get_current_organization_id,
     get_current_user_id,
     get_db_session,
 )
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, SortKey
+from backend.apis.schemas.pagination import Page
 from backend.apis.schemas.membership import (
     MembershipCreate,
     MembershipUpdate,
     MembershipResponse,
 )
 from backend.database.entities.membership import Membership
+from backend.realtime import emit, person_event
 
 
 router = APIRouter(prefix="/memberships", tags=["Memberships"])
 
+MEMBERSHIP_ORDER = Keyset(
+    SortKey(Membership.created_at, descending=True),
+    SortKey(Membership.id, descending=True),
+)
+
 
-@router.get("", response_model=List[MembershipResponse])
+@router.get("", response_model=Page[MembershipResponse])
 def list_memberships(
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db_session),
     organization_id: str = Depends(get_current_organization_id),
-) -> List[MembershipResponse]:
-    """List all memberships. Later this can be scoped by current user or organization."""
-    memberships = (
-        db.query(Membership)
-        .filter(Membership.organization_id == organization_id)
-        .order_by(Membership.created_at.desc())
-        .all()
-    )
-    return memberships
+) -> Page[MembershipResponse]:
+    """List memberships for the current organization, newest first (keyset-paginated)."""
+    q = db.query(Membership).filter(Membership.organization_id == organization_id)
+    return MEMBERSHIP_ORDER.page(MEMBERSHIP_ORDER.apply(q, cursor, limit).all(), limit)
 
 
 @router.get("/{membership_id}", response_model=MembershipResponse)
@@ -76,6 +82,7 @@ def create_membership(
     )
 
     db.add(membership)
+    emit(db, person_event(membership.user_id))
     try:
         db.commit()
     except IntegrityError:
@@ -84,8 +91,8 @@ def create_membership(
             status_code=status.HTTP_409_CONFLICT,
             detail="Membership for this user and organization already exists.",
         )
+    invalidate_memberships(membership.user_id)
 
-    db.refresh(membership)
     return membership
 
 
@@ -110,7 +117,8 @@ def update_membership(
         membership.status = payload.status
 
     db.add(membership)
+    emit(db, person_event(membership.user_id))
     db.commit()
-    db.refresh(membership)
+    invalidate_memberships(membership.user_id)
     return membership
 
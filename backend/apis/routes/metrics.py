@@ -0,0 +1,19 @@
+"""
+Prometheus scrape endpoint: `GET /metrics` (see `backend.apis.metrics`).
+"""
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from backend.apis import metrics
+from backend.database.session import async_engine, engine
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics(request: Request) -> PlainTextResponse:
+    """This worker's metrics in the Prometheus text format."""
+    engines = {"sync": engine, "async": async_engine.sync_engine if async_engine is not None else None}
+    body = metrics.scrape(engines, getattr(request.app.state, "admission", None))
+    return PlainTextResponse(body, media_type=metrics.CONTENT_TYPE)
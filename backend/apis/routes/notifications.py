@@ -0,0 +1,80 @@
+"""
+Notification endpoints: the current user's in-app notifications and the
+reminder scheduler's metrics.
+
+Notifications are written by `backend.notifications`, never through the API.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from backend.apis.dependencies import get_current_user_id, get_db_session
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, SortKey
+from backend.apis.schemas.notification import NotificationResponse, SchedulerStats
+from backend.apis.schemas.pagination import Page
+from backend.database.entities.notification import Notification
+from backend.notifications.scheduler import scheduler
+
+
+router = APIRouter(prefix="/notifications", tags=["Notifications"])
+
+NOTIFICATION_ORDER = Keyset(
+    SortKey(Notification.created_at, descending=True),
+    SortKey(Notification.id, descending=True),
+)
+
+
+@router.get("", response_model=Page[NotificationResponse])
+def list_notifications(
+    unread: bool = Query(default=False, description="Only notifications not yet read"),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> Page[NotificationResponse]:
+    """In-app notifications of the current user, newest first, on `ix_notification_user_created`."""
+    stmt = select(Notification).where(Notification.user_id == current_user_id, Notification.channel == "in_app")
+    if unread:
+        stmt = stmt.where(Notification.read_at.is_(None))
+    rows = db.scalars(NOTIFICATION_ORDER.apply(stmt, cursor, limit)).all()
+    return NOTIFICATION_ORDER.page(rows, limit)
+
+
+@router.get("/scheduler", response_model=SchedulerStats)
+def get_scheduler_stats() -> SchedulerStats:
+    """Reminder scheduler metrics of the worker that serves the request."""
+    return SchedulerStats(running=scheduler.running, **scheduler.metrics.as_dict())
+
+
+@router.post("/{notification_id}/read", response_model=NotificationResponse)
+def mark_notification_read(
+    notification_id: UUID,
+    db: Session = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> NotificationResponse:
+    """Mark a notification read. Reading it again keeps the first read time."""
+    stmt = (
+        update(Notification)
+        .where(
+            Notification.id == notification_id,
+            Notification.user_id == current_user_id,
+            Notification.read_at.is_(None),
+        )
+        .values(read_at=datetime.now(timezone.utc), status="read")
+        .returning(Notification)
+    )
+    notification = db.scalars(stmt).first()
+    if notification is None:
+        # Someone else's (404), or already read.
+        notification = db.scalars(
+            select(Notification).where(Notification.id == notification_id, Notification.user_id == current_user_id)
+        ).first()
+        if notification is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
+    db.commit()
+    return notification
@@ -5,24 +5,35 @@ List and manage organizations. In a later iteration these should be scoped by
 membership and roles; for now they are global.
 """
 
-from typing import List
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, SortKey
 from backend.apis.schemas.organization import OrganizationResponse
+from backend.apis.schemas.pagination import Page
 from backend.apis.dependencies import get_db_session
 from backend.database.entities.organization import Organization
 
 router = APIRouter(prefix="/organizations", tags=["Organizations"])
 
+ORGANIZATION_ORDER = Keyset(
+    SortKey(Organization.created_at, descending=True),
+    SortKey(Organization.id, descending=True),
+)
 
-@router.get("", response_model=List[OrganizationResponse])
-def list_organizations(db: Session = Depends(get_db_session)) -> List[OrganizationResponse]:
-    """List all organizations."""
-    orgs = db.query(Organization).order_by(Organization.created_at.desc()).all()
-    return orgs
+
+@router.get("", response_model=Page[OrganizationResponse])
+def list_organizations(
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db_session),
+) -> Page[OrganizationResponse]:
+    """List all organizations, newest first (keyset-paginated)."""
+    orgs = ORGANIZATION_ORDER.apply(db.query(Organization), cursor, limit).all()
+    return ORGANIZATION_ORDER.page(orgs, limit)
 
 
 @router.get("/{organization_id}", response_model=OrganizationResponse)
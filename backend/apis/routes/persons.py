@@ -2,46 +2,51 @@
 Person (user) endpoints.
 
 CRUD and listing for people. For MVP we treat `User` as global (not yet
-scoped by organization membership in these endpoints).
+scoped by organization membership in these endpoints), except for the
+typeahead `GET /persons/search`, which only finds members of the current
+organization (see `backend.apis.typeahead`).
 """
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from backend.apis.schemas.person import PersonResponse, PersonCreate, PersonUpdate
-from backend.apis.dependencies import get_db_session
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, SortKey
+from backend.apis.schemas.membership import MembershipRole
+from backend.apis.schemas.pagination import Page
+from backend.apis.schemas.person import PersonMatch, PersonResponse, PersonCreate, PersonUpdate
+from backend.apis.dependencies import get_current_organization_id, get_db_session
+from backend.apis.typeahead import directory, match_stmt, query_words
 from backend.database.entities.user import User
+from backend.realtime import emit, person_event
 
 router = APIRouter(prefix="/persons", tags=["Persons"])
 logger = logging.getLogger(__name__)
 
-MAX_PAGE_SIZE = 100
+PERSON_ORDER = Keyset(SortKey(User.created_at, descending=True), SortKey(User.id, descending=True))
 
+TYPEAHEAD_LIMIT = 10
+MAX_TYPEAHEAD_LIMIT = 50
 
-@router.get("", response_model=List[PersonResponse])
+
+@router.get("", response_model=Page[PersonResponse])
 def list_persons(
     db: Session = Depends(get_db_session),
-    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
-    offset: int = Query(0, ge=0),
-) -> List[PersonResponse]:
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+) -> Page[PersonResponse]:
     """
-    List all persons (users).
+    List all persons (users), newest first.
 
-    In a future iteration this should be scoped by organization membership
-    and the current authenticated user.
+    Keyset-paginated on (created_at, id) rather than OFFSET, so deep pages cost
+    the same as the first one. In a future iteration this should be scoped by
+    organization membership and the current authenticated user.
     """
-    users = (
-        db.query(User)
-        .order_by(User.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
-    return users
+    users = PERSON_ORDER.apply(db.query(User), cursor, limit).all()
+    return PERSON_ORDER.page(users, limit)
 
 
 @router.post("", response_model=PersonResponse, status_code=status.HTTP_201_CREATED)
@@ -71,11 +76,33 @@ def create_person(
     )
     db.add(user)
     db.commit()
-    db.refresh(user)
     logger.info("Created user %s (%s)", user.id, user.email)
     return user
 
 
+@router.get("/search", response_model=List[PersonMatch])
+def search_persons(
+    q: str = Query(..., min_length=1, max_length=100, description="Starts of names or of the email address"),
+    role: List[MembershipRole] = Query(default=[], description="Only people with these roles (repeatable)"),
+    limit: int = Query(TYPEAHEAD_LIMIT, ge=1, le=MAX_TYPEAHEAD_LIMIT),
+    db: Session = Depends(get_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+) -> List[PersonMatch]:
+    """
+    Members of the current organization matching `q`, by last then first name.
+
+    Every word of `q` has to start a word of the person's names or their email
+    address. Served from this worker's in-memory index once it is built,
+    otherwise from the database.
+    """
+    words = query_words(q)
+    roles = {r.value for r in role}
+    matches = directory.search(UUID(str(organization_id)), words, roles, limit)
+    if matches is None:
+        matches = db.execute(match_stmt(organization_id, words, roles, limit)).all()
+    return matches
+
+
 @router.get("/{person_id}", response_model=PersonResponse)
 def get_person(person_id: UUID, db: Session = Depends(get_db_session)) -> PersonResponse:
     """Get a person by ID."""
@@ -104,6 +131,6 @@ def update_person(
         user.display_name = payload.display_name
 
     db.add(user)
+    emit(db, person_event(user.id))
     db.commit()
-    db.refresh(user)
     return user
@@ -0,0 +1,165 @@
+"""
+Realtime push endpoints: `GET /events` (Server-Sent Events) and `/ws` (WebSocket).
+
+Both stream the same JSON events (see `backend.realtime.events`) for the topics
+chosen with query parameters:
+
+- `care_recipient_id` (repeatable): visit and task events of those recipients
+- `conversation_id` (repeatable): new messages; the caller must be a participant
+- `organization=true`: every visit and task event of the current organization,
+  which is also the default when nothing else is asked for
+
+With authentication on, recipients must be in the caller's care scope
+(`backend.apis.permissions`), and callers limited to some recipients follow
+those recipients' topics instead of the organization's.
+
+Events are sent as they are committed, so clients (the dashboard, thread
+views, family apps) refetch on change instead of polling. A keepalive goes out
+every `KEEPALIVE_SECONDS` so dead connections are noticed and proxies keep the
+stream open. A client that falls too far behind is disconnected (SSE stream
+ends; WebSocket closes with 1013) and should reconnect and refetch.
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, WebSocketException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from backend.apis.dependencies import get_care_scope, get_current_organization_id, get_current_user_id
+from backend.apis.permissions import CareScope
+from backend.database.entities.conversation import ConversationParticipant
+from backend.database.session import SessionLocal
+from backend.realtime.events import Event, conversation_topic, organization_topic, recipient_topic
+from backend.realtime.hub import Subscription, hub
+
+
+router = APIRouter(tags=["Realtime"])
+
+KEEPALIVE_SECONDS = 15.0
+
+
+def _participating(user_id: str, conversation_ids: List[UUID]) -> set[UUID]:
+    # A short-lived session rather than a request dependency: a dependency's
+    # session would stay checked out for as long as the stream is open.
+    with SessionLocal() as db:
+        stmt = select(ConversationParticipant.conversation_id).where(
+            ConversationParticipant.user_id == user_id,
+            ConversationParticipant.conversation_id.in_(conversation_ids),
+        )
+        return set(db.scalars(stmt))
+
+
+async def _topics(
+    organization_id: str,
+    user_id: str,
+    organization: bool,
+    care_recipient_ids: List[UUID],
+    conversation_ids: List[UUID],
+    scope: CareScope,
+) -> Optional[set[str]]:
+    """
+    The topics asked for, or None if one is a conversation the user is not in or
+    a care recipient outside their care scope. A user limited to some care
+    recipients cannot follow the organization topic; by default they follow
+    their recipients' topics instead.
+    """
+    if scope.visible(care_recipient_ids) != set(care_recipient_ids):
+        return None
+    if organization and scope.recipients is not None:
+        return None
+    if conversation_ids:
+        joined = await run_in_threadpool(_participating, user_id, conversation_ids)
+        if joined != set(conversation_ids):
+            return None
+    org = UUID(str(organization_id))
+    topics = {recipient_topic(org, r) for r in care_recipient_ids}
+    topics |= {conversation_topic(c) for c in conversation_ids}
+    if not topics and scope.recipients is not None:
+        topics = {recipient_topic(org, r) for r in scope.recipients}
+    elif organization or not topics:
+        topics.add(organization_topic(org))
+    return topics
+
+
+def _sse(event: Event) -> str:
+    """One Server-Sent Events frame."""
+    data = json.dumps(event.to_json(), separators=(",", ":"))
+    return f"id: {event.id}\nevent: {event.type}\ndata: {data}\n\n"
+
+
+async def _events(sub: Subscription) -> AsyncIterator[Optional[Event]]:
+    """Events of `sub` as they arrive, None for a keepalive; ends when the subscription is cut off."""
+    while True:
+        try:
+            event = await asyncio.wait_for(sub.get(), KEEPALIVE_SECONDS)
+        except asyncio.TimeoutError:
+            yield None
+            continue
+        if event is None:
+            return
+        yield event
+
+
+@router.get("/events")
+async def stream_events(
+    organization: bool = Query(default=False),
+    care_recipient_id: List[UUID] = Query(default=[]),
+    conversation_id: List[UUID] = Query(default=[]),
+    organization_id: str = Depends(get_current_organization_id),
+    current_user_id: str = Depends(get_current_user_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> StreamingResponse:
+    """Server-Sent Events stream of the chosen topics (`text/event-stream`)."""
+    if not hub.running:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Realtime push is not running")
+    topics = await _topics(organization_id, current_user_id, organization, care_recipient_id, conversation_id, scope)
+    if topics is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
+    # Subscribe before the response starts so nothing committed from here on is missed.
+    sub = hub.subscribe(topics)
+
+    async def frames() -> AsyncIterator[str]:
+        try:
+            async for event in _events(sub):
+                yield ": keepalive\n\n" if event is None else _sse(event)
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def events_websocket(
+    websocket: WebSocket,
+    organization: bool = Query(default=False),
+    care_recipient_id: List[UUID] = Query(default=[]),
+    conversation_id: List[UUID] = Query(default=[]),
+    organization_id: str = Depends(get_current_organization_id),
+    current_user_id: str = Depends(get_current_user_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> None:
+    """WebSocket stream of the chosen topics, one JSON event per text frame."""
+    if not hub.running:
+        raise WebSocketException(code=status.WS_1013_TRY_AGAIN_LATER, reason="Realtime push is not running")
+    topics = await _topics(organization_id, current_user_id, organization, care_recipient_id, conversation_id, scope)
+    if topics is None:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Topic not found")
+    sub = hub.subscribe(topics)
+    await websocket.accept()
+    try:
+        async for event in _events(sub):
+            await websocket.send_json({"type": "keepalive"} if event is None else event.to_json())
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Stream ended; reconnect")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.unsubscribe(sub)
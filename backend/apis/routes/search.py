@@ -0,0 +1,273 @@
+"""
+Full-text search across visit notes, care notes and messages.
+
+`GET /search?q=` matches words (stemmed, so "falls" finds "fall") in the
+current organization's visit notes (summary, incidents, next steps), care note
+summaries and the messages of conversations the caller takes part in. Notes
+are limited to the caller's care scope; messages only to participation, as
+their threads already are. Results
+are ranked, carry a highlighted snippet and are keyset-paginated on
+(rank, created_at, id).
+
+Snippets are built with private-use characters around the matched words; the
+text is then HTML-escaped and those turned into `<mark>` tags, so stored text
+never reaches a client as markup.
+
+The index is described in `backend.database.search`: generated tsvector
+columns with GIN indexes on Postgres, an FTS5 table on SQLite. Ranks are
+`ts_rank` on Postgres, cast to double precision so a rank in a cursor
+compares equal to the stored one, and the negated `bm25` score on SQLite.
+"""
+
+import html
+import re
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import (
+    DateTime,
+    Double,
+    Float,
+    Select,
+    String,
+    Subquery,
+    cast,
+    column,
+    func,
+    literal,
+    literal_column,
+    null,
+    or_,
+    select,
+    table,
+    type_coerce,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID as PG_UUID
+from sqlalchemy.orm import Session
+
+from backend.apis.dependencies import (
+    get_care_scope,
+    get_current_organization_id,
+    get_current_user_id,
+    get_db_session,
+)
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, SortKey
+from backend.apis.permissions import CareScope
+from backend.apis.schemas.pagination import Page
+from backend.apis.schemas.search import SearchHit, SearchKind
+from backend.database.entities.care_note import CareNote
+from backend.database.entities.conversation import Conversation, ConversationParticipant
+from backend.database.entities.message import Message
+from backend.database.entities.visit import Visit
+from backend.database.entities.visit_note import VisitNote
+from backend.database.search import SEARCH_CONFIG, SEARCH_TABLE
+
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+MARK_START, MARK_END = "<mark>", "</mark>"
+# Around matched words in the raw snippet, until it has been escaped.
+HIT_START, HIT_END = "\ue000", "\ue001"
+HEADLINE_OPTIONS = f"StartSel={HIT_START}, StopSel={HIT_END}, MaxWords=24, MinWords=8, MaxFragments=2"
+SNIPPET_TOKENS = 16
+
+_UUID = PG_UUID(as_uuid=True)
+
+search_document = table(
+    SEARCH_TABLE,
+    column("kind", String),
+    column("doc_id", _UUID),
+    column("organization_id", _UUID),
+    column("care_recipient_id", _UUID),
+    column("visit_id", _UUID),
+    column("conversation_id", _UUID),
+    column("created_at", DateTime(timezone=True)),
+)
+
+
+def _fts_query(q: str) -> str:
+    """FTS5 query requiring every word of `q`; quoting keeps user input from being read as query syntax."""
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", q))
+
+
+def _postgres_hits(
+    q: str,
+    organization_id: str,
+    user_id: str,
+    care_recipient_id: Optional[UUID],
+    kinds: set[SearchKind],
+    scope: CareScope,
+) -> Subquery:
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+    def matches(name: str):
+        return literal_column(f"{name}.search_vector", TSVECTOR).op("@@")(tsquery)
+
+    def rank(name: str):
+        vector = literal_column(f"{name}.search_vector", TSVECTOR)
+        return cast(func.ts_rank(vector, tsquery), Double).label("rank")
+
+    arms = []
+    if SearchKind.VISIT_NOTE in kinds:
+        stmt = (
+            select(
+                literal(SearchKind.VISIT_NOTE.value, String).label("kind"),
+                VisitNote.id,
+                Visit.care_recipient_id,
+                VisitNote.visit_id,
+                cast(null(), _UUID).label("conversation_id"),
+                VisitNote.created_at,
+                rank("visit_note"),
+                func.concat_ws(" ", VisitNote.summary, VisitNote.incidents, VisitNote.next_steps).label("document"),
+            )
+            .join(Visit, Visit.id == VisitNote.visit_id)
+            .where(
+                matches("visit_note"),
+                Visit.organization_id == organization_id,
+                *scope.where(Visit.care_recipient_id),
+            )
+        )
+        if care_recipient_id is not None:
+            stmt = stmt.where(Visit.care_recipient_id == care_recipient_id)
+        arms.append(stmt)
+    if SearchKind.CARE_NOTE in kinds:
+        stmt = select(
+            literal(SearchKind.CARE_NOTE.value, String).label("kind"),
+            CareNote.id,
+            CareNote.care_recipient_id,
+            cast(null(), _UUID).label("visit_id"),
+            cast(null(), _UUID).label("conversation_id"),
+            CareNote.created_at,
+            rank("care_note"),
+            func.coalesce(CareNote.summary, "").label("document"),
+        ).where(
+            matches("care_note"),
+            CareNote.organization_id == organization_id,
+            *scope.where(CareNote.care_recipient_id),
+        )
+        if care_recipient_id is not None:
+            stmt = stmt.where(CareNote.care_recipient_id == care_recipient_id)
+        arms.append(stmt)
+    if SearchKind.MESSAGE in kinds:
+        stmt = (
+            select(
+                literal(SearchKind.MESSAGE.value, String).label("kind"),
+                Message.id,
+                Conversation.care_recipient_id,
+                cast(null(), _UUID).label("visit_id"),
+                Message.conversation_id,
+                Message.created_at,
+                rank("message"),
+                Message.body.label("document"),
+            )
+            .join(Conversation, Conversation.id == Message.conversation_id)
+            .join(
+                ConversationParticipant,
+                (ConversationParticipant.conversation_id == Message.conversation_id)
+                & (ConversationParticipant.user_id == user_id),
+            )
+            .where(matches("message"), Conversation.organization_id == organization_id)
+        )
+        if care_recipient_id is not None:
+            stmt = stmt.where(Conversation.care_recipient_id == care_recipient_id)
+        arms.append(stmt)
+    return union_all(*arms).subquery("hits")
+
+
+def _sqlite_hits(
+    q: str,
+    organization_id: str,
+    user_id: str,
+    care_recipient_id: Optional[UUID],
+    kinds: set[SearchKind],
+    scope: CareScope,
+) -> Subquery:
+    fts = literal_column(SEARCH_TABLE)
+    doc = search_document.c
+    stmt = select(
+        doc.kind,
+        doc.doc_id.label("id"),
+        doc.care_recipient_id,
+        doc.visit_id,
+        doc.conversation_id,
+        doc.created_at,
+        type_coerce(-func.bm25(fts), Float).label("rank"),
+        func.snippet(fts, 0, HIT_START, HIT_END, "…", SNIPPET_TOKENS).label("snippet"),
+    ).where(
+        fts.op("MATCH")(_fts_query(q)),
+        doc.organization_id == organization_id,
+        doc.kind.in_([kind.value for kind in kinds]),
+        or_(
+            doc.kind != SearchKind.MESSAGE.value,
+            doc.conversation_id.in_(
+                select(ConversationParticipant.conversation_id).where(ConversationParticipant.user_id == user_id)
+            ),
+        ),
+    )
+    if scope.recipients is not None:
+        # Messages are scoped by participation above; notes by recipient.
+        stmt = stmt.where(or_(doc.kind == SearchKind.MESSAGE.value, *scope.where(doc.care_recipient_id)))
+    if care_recipient_id is not None:
+        stmt = stmt.where(doc.care_recipient_id == care_recipient_id)
+    return stmt.subquery("hits")
+
+
+def _highlight(snippet: str) -> str:
+    """Escape a raw snippet as HTML, then mark its matched words."""
+    return html.escape(snippet).replace(HIT_START, MARK_START).replace(HIT_END, MARK_END)
+
+
+def _order(hits: Subquery) -> Keyset:
+    return Keyset(
+        SortKey(hits.c.rank, descending=True),
+        SortKey(hits.c.created_at, descending=True),
+        SortKey(hits.c.id, descending=True),
+    )
+
+
+@router.get("", response_model=Page[SearchHit])
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description='Words to find, e.g. "refused meds"'),
+    kind: List[SearchKind] = Query(default=[], alias="type", description="Only these kinds of documents (repeatable)"),
+    care_recipient_id: Optional[UUID] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+    current_user_id: str = Depends(get_current_user_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> Page[SearchHit]:
+    """
+    Ranked matches for `q` in the current organization, optionally for one care recipient.
+
+    Snippets are HTML: the stored text escaped, with the matched words wrapped
+    in `<mark>`.
+    """
+    kinds = set(kind or SearchKind)
+    if db.get_bind().dialect.name == "postgresql":
+        hits = _postgres_hits(q, organization_id, current_user_id, care_recipient_id, kinds, scope)
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        # In the outer query, so headlines are only built for the rows of this page.
+        snippet = func.ts_headline(SEARCH_CONFIG, hits.c.document, tsquery, HEADLINE_OPTIONS)
+    else:
+        if not _fts_query(q):
+            return {"items": [], "next_cursor": None}
+        hits = _sqlite_hits(q, organization_id, current_user_id, care_recipient_id, kinds, scope)
+        snippet = hits.c.snippet
+    order = _order(hits)
+    stmt: Select = select(
+        hits.c.kind,
+        hits.c.id,
+        hits.c.care_recipient_id,
+        hits.c.visit_id,
+        hits.c.conversation_id,
+        hits.c.created_at,
+        hits.c.rank,
+        snippet.label("snippet"),
+    )
+    rows = db.execute(order.apply(stmt, cursor, limit)).all()
+    page = order.page(rows, limit)
+    page["items"] = [dict(row._mapping, snippet=_highlight(row.snippet)) for row in page["items"]]
+    return page
@@ -4,24 +4,54 @@ Task endpoints.
 Tasks can be scoped to a visit or to a 24/7 assignment + day.
 """
 
-from datetime import datetime, timezone
-from typing import List, Optional
+from datetime import date, datetime, timezone
+from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Insert, Select, insert, select
 from sqlalchemy.orm import Session
 
 from backend.apis.dependencies import (
+    get_care_scope,
     get_current_organization_id,
     get_current_user_id,
     get_db_session,
 )
-from backend.apis.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from backend.apis.export import ExportFormat, export_response, stream_rows
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, SortKey
+from backend.apis.permissions import CareScope
+from backend.apis.schemas.batch import BatchResponse
+from backend.apis.schemas.pagination import Page
+from backend.apis.schemas.task import TaskBatchCreate, TaskCreate, TaskUpdate, TaskResponse
 from backend.database.entities.task import Task
+from backend.realtime import emit, task_event
+from backend.stats.rollup import count_tasks, move, task_key
 
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
+TASK_ORDER = Keyset(
+    SortKey(Task.task_date),
+    SortKey(Task.sort_order, nullable=True),
+    SortKey(Task.id),
+)
+
+
+def _scope_error(
+    visit_id: Optional[UUID],
+    assignment_24x7_id: Optional[UUID],
+) -> Optional[str]:
+    """
+    Explain why a task's scope is invalid, or return None if it is valid.
+    """
+    if visit_id and assignment_24x7_id:
+        return "Task must be either visit-scoped or 24x7-scoped, not both."
+    if not visit_id and not assignment_24x7_id:
+        return "Task must be associated with a visit or a 24x7 assignment."
+    return None
+
 
 def _validate_scope(
     visit_id: Optional[UUID],
@@ -30,48 +60,108 @@ def _validate_scope(
     """
     Ensure either visit_id or (assignment_24x7_id) is set, but not both.
     """
-    if visit_id and assignment_24x7_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Task must be either visit-scoped or 24x7-scoped, not both.",
-        )
-    if not visit_id and not assignment_24x7_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Task must be associated with a visit or a 24x7 assignment.",
-        )
+    error = _scope_error(visit_id, assignment_24x7_id)
+    if error is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+
+def _validate_batch(payload: TaskBatchCreate) -> None:
+    """Check every item's scope, reporting all failures by index in one 400."""
+    errors = [
+        {"index": index, "detail": error}
+        for index, item in enumerate(payload.items)
+        if (error := _scope_error(item.visit_id, item.assignment_24x7_id)) is not None
+    ]
+    if errors:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors)
+
+
+def _batch_rows(payload: TaskBatchCreate) -> list[dict]:
+    """INSERT parameters for a batch, one dict per task in request order."""
+    return [item.model_dump() for item in payload.items]
+
 
+def _batch_insert_stmt() -> Insert:
+    """Multi-row INSERT ... RETURNING; rows come back in parameter order."""
+    return insert(Task).returning(*Task.__table__.c, sort_by_parameter_order=True)
 
-@router.get("", response_model=List[TaskResponse])
+
+def _export_stmt(
+    organization_id: UUID,
+    care_recipient_id: Optional[UUID],
+    date_from: Optional[date],
+    date_to: Optional[date],
+    scope: CareScope,
+) -> Select:
+    """Column-level SELECT of the tasks dated in [date_from, date_to), in list order."""
+    columns = [Task.__table__.c[name] for name in TaskResponse.model_fields]
+    stmt = select(*columns).where(Task.organization_id == organization_id, *scope.where(Task.care_recipient_id))
+    if care_recipient_id is not None:
+        stmt = stmt.where(Task.care_recipient_id == care_recipient_id)
+    if date_from is not None:
+        stmt = stmt.where(Task.task_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Task.task_date < date_to)
+    return stmt.order_by(*(key.order_by() for key in TASK_ORDER.keys))
+
+
+@router.get("", response_model=Page[TaskResponse])
 def list_tasks(
     care_recipient_id: Optional[UUID] = Query(default=None),
     visit_id: Optional[UUID] = Query(default=None),
     assignment_24x7_id: Optional[UUID] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db_session),
     organization_id: str = Depends(get_current_organization_id),
-) -> List[TaskResponse]:
+    scope: CareScope = Depends(get_care_scope),
+) -> Page[TaskResponse]:
     """
     List tasks, optionally filtered by care recipient, visit, or 24x7 assignment.
+
+    Keyset-paginated on (task_date, sort_order NULLS LAST, id).
     """
-    q = db.query(Task).filter(Task.organization_id == organization_id)
+    q = db.query(Task).filter(Task.organization_id == organization_id, *scope.where(Task.care_recipient_id))
     if care_recipient_id is not None:
         q = q.filter(Task.care_recipient_id == care_recipient_id)
     if visit_id is not None:
         q = q.filter(Task.visit_id == visit_id)
     if assignment_24x7_id is not None:
         q = q.filter(Task.assignment_24x7_id == assignment_24x7_id)
-    return q.order_by(Task.task_date.asc(), Task.sort_order.asc().nulls_last()).all()
+    return TASK_ORDER.page(TASK_ORDER.apply(q, cursor, limit).all(), limit)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_tasks(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    care_recipient_id: Optional[UUID] = Query(default=None),
+    date_from: Optional[date] = Query(default=None, alias="from"),
+    date_to: Optional[date] = Query(default=None, alias="to"),
+    db: Session = Depends(get_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> StreamingResponse:
+    """
+    Stream tasks dated in [from, to) as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and written as they arrive, so
+    memory stays flat regardless of the size of the range.
+    """
+    stmt = _export_stmt(organization_id, care_recipient_id, date_from, date_to, scope)
+    return export_response(stream_rows(db, stmt, format), format, "tasks")
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 def get_task(
     task_id: UUID,
     db: Session = Depends(get_db_session),
+    scope: CareScope = Depends(get_care_scope),
 ) -> TaskResponse:
     """Get a single task by ID."""
     task = db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    scope.require(task.organization_id, task.care_recipient_id, "Task not found")
     return task
 
 
@@ -105,17 +195,41 @@ def create_task(
     )
 
     db.add(task)
+    db.flush()
+    count_tasks(db, [task])
+    emit(db, task_event("created", task))
     db.commit()
-    db.refresh(task)
     return task
 
 
+@router.post(":batch", response_model=BatchResponse[TaskResponse], status_code=status.HTTP_201_CREATED)
+def create_tasks_batch(
+    payload: TaskBatchCreate,
+    db: Session = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> BatchResponse[TaskResponse]:
+    """
+    Create many tasks in one transaction.
+
+    Every item is validated before anything is written; failures are reported
+    per item (by index) and nothing is created. Valid batches are written with a
+    single multi-row INSERT ... RETURNING.
+    """
+    _validate_batch(payload)
+    created = db.execute(_batch_insert_stmt(), _batch_rows(payload)).mappings().all()
+    count_tasks(db, created)
+    emit(db, *(task_event("created", row) for row in created))
+    db.commit()
+    return {"items": created}
+
+
 @router.patch("/{task_id}", response_model=TaskResponse)
 def update_task(
     task_id: UUID,
     payload: TaskUpdate,
     db: Session = Depends(get_db_session),
     current_user_id: str = Depends(get_current_user_id),
+    scope: CareScope = Depends(get_care_scope),
 ) -> TaskResponse:
     """
     Partially update a task.
@@ -124,9 +238,12 @@ def update_task(
     - Either visit_id or assignment_24x7_id (not both).
     - status 'completed' requires completed_at and completed_by_id.
     """
-    task = db.get(Task, task_id)
+    # Locked until commit: a concurrent update would move the counter out of the same old key.
+    task = db.get(Task, task_id, with_for_update=True)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    scope.require(task.organization_id, task.care_recipient_id, "Task not found")
+    counted_as = task_key(task)
 
     if payload.care_plan_id is not None:
         task.care_plan_id = payload.care_plan_id
@@ -170,7 +287,9 @@ def update_task(
         )
 
     db.add(task)
+    db.flush()
+    move(db, counted_as, task_key(task))
+    emit(db, task_event("updated", task))
     db.commit()
-    db.refresh(task)
     return task
 
@@ -1,47 +1,76 @@
 """
 Visit note endpoints.
 
-One visit note per visit, authored by a caregiver.
+One visit note per visit, authored by a caregiver. Notes are readable by
+whoever may see the visit's care recipient (`backend.apis.permissions`).
 """
 
-from typing import List
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from backend.apis.dependencies import get_db_session, get_current_user_id
+from backend.apis.dependencies import get_care_scope, get_db_session, get_current_user_id
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, SortKey
+from backend.apis.permissions import CareScope
+from backend.apis.schemas.pagination import Page
 from backend.apis.schemas.visit_note import (
     VisitNoteCreate,
     VisitNoteUpdate,
     VisitNoteResponse,
 )
+from backend.database.entities.visit import Visit
 from backend.database.entities.visit_note import VisitNote
 
 
 router = APIRouter(prefix="/visit-notes", tags=["Visit notes"])
 
+VISIT_NOTE_ORDER = Keyset(
+    SortKey(VisitNote.created_at, descending=True),
+    SortKey(VisitNote.id, descending=True),
+)
+
 
-@router.get("", response_model=List[VisitNoteResponse])
+@router.get("", response_model=Page[VisitNoteResponse])
 def list_visit_notes(
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db_session),
-) -> List[VisitNoteResponse]:
+    scope: CareScope = Depends(get_care_scope),
+) -> Page[VisitNoteResponse]:
     """
-    List all visit notes.
+    List all visit notes, newest first (keyset-paginated).
+
+    With authentication on, only notes of visits in the current organization
+    whose care recipient the caller may see.
     """
-    notes = db.query(VisitNote).order_by(VisitNote.created_at.desc()).all()
-    return notes
+    q = db.query(VisitNote)
+    if scope.restricted:
+        visible = select(Visit.id).where(
+            Visit.organization_id == scope.organization_id, *scope.where(Visit.care_recipient_id)
+        )
+        q = q.filter(VisitNote.visit_id.in_(visible))
+    notes = VISIT_NOTE_ORDER.apply(q, cursor, limit).all()
+    return VISIT_NOTE_ORDER.page(notes, limit)
 
 
 @router.get("/{note_id}", response_model=VisitNoteResponse)
 def get_visit_note(
     note_id: UUID,
     db: Session = Depends(get_db_session),
+    scope: CareScope = Depends(get_care_scope),
 ) -> VisitNoteResponse:
     """Get a single visit note by ID."""
     note = db.get(VisitNote, note_id)
     if not note:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Visit note not found")
+    if scope.restricted:
+        visit = db.get(Visit, note.visit_id)
+        if visit is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Visit note not found")
+        scope.require(visit.organization_id, visit.care_recipient_id, "Visit note not found")
     return note
 
 
@@ -76,7 +105,6 @@ def create_visit_note(
 
     db.add(note)
     db.commit()
-    db.refresh(note)
     return note
 
 
@@ -102,6 +130,5 @@ def update_visit_note(
 
     db.add(note)
     db.commit()
-    db.refresh(note)
     return note
 
@@ -5,52 +5,332 @@ Schedule, update, and manage visits for care recipients.
 Includes explicit start and end actions to manage status and timestamps.
 """
 
-from datetime import datetime, timezone
-from typing import List, Optional
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, List, NoReturn, Optional, Sequence
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Insert, Select, Update, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from backend.apis.dependencies import (
+    get_care_scope,
     get_current_organization_id,
     get_current_user_id,
     get_db_session,
 )
-from backend.apis.schemas.visit import VisitCreate, VisitUpdate, VisitResponse
+from backend.apis.export import ExportFormat, export_response, stream_rows
+from backend.apis.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, SortKey
+from backend.apis.permissions import CareScope
+from backend.apis.schemas.batch import BatchResponse
+from backend.apis.schemas.pagination import Page
+from backend.apis.schemas.visit import (
+    VisitBatchCreate,
+    VisitCreate,
+    VisitOccurrence,
+    VisitResponse,
+    VisitUpdate,
+)
 from backend.database.entities.visit import Visit
+from backend.scheduling.conflicts import (
+    batch_conflicts,
+    batch_window,
+    bookings_stmt,
+    is_booked,
+    is_overlap_violation,
+    overlapping_stmt,
+)
+from backend.scheduling.recurrence import (
+    horizon_end,
+    is_series_head,
+    materialize,
+    projected,
+    reschedule,
+    series_changed,
+    series_state,
+)
+from backend.scheduling.timeutils import as_utc
+from backend.realtime import emit, visit_event
+from backend.stats.rollup import count_check_in, count_visits, move, visit_key
 
 
 router = APIRouter(prefix="/visits", tags=["Visits"])
 
 
-@router.get("", response_model=List[VisitResponse])
+VISIT_ORDER = Keyset(SortKey(Visit.scheduled_start), SortKey(Visit.id))
+
+# Widest [from, to) range accepted when listing a series' occurrences.
+MAX_OCCURRENCE_WINDOW = timedelta(days=366)
+
+# Statuses a visit may be started or ended from.
+STARTABLE_STATUSES = ("scheduled", "in_progress")
+ENDABLE_STATUSES = ("scheduled", "in_progress")
+
+
+def _scoped(scope: CareScope) -> list:
+    """WHERE clauses limiting visits to the caller's organization and care scope."""
+    if not scope.restricted:
+        return []
+    return [Visit.organization_id == scope.organization_id, *scope.where(Visit.care_recipient_id)]
+
+
+def _start_stmt(visit_id: UUID, now: datetime, scope: CareScope) -> Update:
+    """UPDATE visit to in_progress if startable, keeping an existing checked_in_at."""
+    return (
+        update(Visit)
+        .where(Visit.id == visit_id, Visit.status.in_(STARTABLE_STATUSES), *_scoped(scope))
+        .values(
+            status="in_progress",
+            checked_in_at=func.coalesce(Visit.checked_in_at, now),
+        )
+        .returning(*Visit.__table__.c)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _end_stmt(visit_id: UUID, now: datetime, scope: CareScope) -> Update:
+    """UPDATE visit to completed if endable, backfilling checked_in_at."""
+    return (
+        update(Visit)
+        .where(Visit.id == visit_id, Visit.status.in_(ENDABLE_STATUSES), *_scoped(scope))
+        .values(
+            status="completed",
+            checked_in_at=func.coalesce(Visit.checked_in_at, now),
+            checked_out_at=now,
+        )
+        .returning(*Visit.__table__.c)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _export_stmt(
+    organization_id: UUID,
+    care_recipient_id: Optional[UUID],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    scope: CareScope,
+) -> Select:
+    """Column-level SELECT of the visits in [date_from, date_to), in schedule order."""
+    columns = [Visit.__table__.c[name] for name in VisitResponse.model_fields]
+    stmt = select(*columns).where(Visit.organization_id == organization_id, *scope.where(Visit.care_recipient_id))
+    if care_recipient_id is not None:
+        stmt = stmt.where(Visit.care_recipient_id == care_recipient_id)
+    if date_from is not None:
+        stmt = stmt.where(Visit.scheduled_start >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Visit.scheduled_start < date_to)
+    return stmt.order_by(Visit.scheduled_start, Visit.id)
+
+
+def _batch_rows(payload: VisitBatchCreate, created_by_id: UUID) -> list[dict]:
+    """INSERT parameters for a batch, one dict per visit in request order."""
+    return [dict(item.model_dump(), created_by_id=created_by_id) for item in payload.items]
+
+
+def _batch_insert_stmt() -> Insert:
+    """Multi-row INSERT ... RETURNING; rows come back in parameter order."""
+    return insert(Visit).returning(*Visit.__table__.c, sort_by_parameter_order=True)
+
+
+def _validate_series_window(
+    series: Optional[Visit], date_from: datetime, date_to: datetime, scope: CareScope
+) -> None:
+    if series is None or not scope.can_see(series.organization_id, series.care_recipient_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Visit not found")
+    if not is_series_head(series):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Visit is not the head of a recurring series.",
+        )
+    if not as_utc(date_from) < as_utc(date_to) <= as_utc(date_from) + MAX_OCCURRENCE_WINDOW:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="to must be after from and at most 366 days later.",
+        )
+
+
+def _stored_occurrences_stmt(series_id: UUID, date_from: datetime, date_to: datetime) -> Select:
+    """The series head and its materialized children starting in [date_from, date_to)."""
+    return (
+        select(Visit)
+        .where(
+            or_(Visit.id == series_id, Visit.parent_visit_id == series_id),
+            Visit.scheduled_start >= as_utc(date_from),
+            Visit.scheduled_start < as_utc(date_to),
+        )
+        .order_by(Visit.scheduled_start, Visit.id)
+    )
+
+
+def _merge_occurrences(
+    series: Visit,
+    stored: Sequence[Visit],
+    date_from: datetime,
+    date_to: datetime,
+) -> list[dict[str, Any]]:
+    """Stored occurrences plus those past the materialization horizon, by start."""
+    items = [
+        {
+            "series_id": series.id,
+            "visit_id": visit.id,
+            "scheduled_start": visit.scheduled_start,
+            "scheduled_end": visit.scheduled_end,
+            "status": visit.status,
+        }
+        for visit in stored
+    ]
+    items.extend(
+        {
+            "series_id": occurrence.series_id,
+            "scheduled_start": occurrence.start,
+            "scheduled_end": occurrence.end,
+            "status": "scheduled",
+        }
+        for occurrence in projected(series, date_from, date_to)
+    )
+    return sorted(items, key=lambda item: as_utc(item["scheduled_start"]))
+
+
+def _exists_stmt(visit_id: UUID, scope: CareScope) -> Select:
+    """SELECT used only on the failure path to tell 404 from 409; hidden visits are missing."""
+    return select(Visit.id).where(Visit.id == visit_id, *_scoped(scope))
+
+
+def _raise_transition_error(existing_id: Optional[UUID], action: str) -> NoReturn:
+    """Raise 404 if the visit does not exist, else 409 for a disallowed transition."""
+    if existing_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Visit not found")
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Visit can only be {action} from scheduled or in_progress status.",
+    )
+
+
+OVERLAP_MESSAGE = "Caregiver is already booked for an overlapping visit."
+
+
+def _raise_overlap(rows: Sequence[Any]) -> NoReturn:
+    """409 listing the caregiver's visits that overlap the requested window."""
+    conflicts = [
+        {"visit_id": row.id, "scheduled_start": as_utc(row.scheduled_start), "scheduled_end": as_utc(row.scheduled_end)}
+        for row in rows
+    ]
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=jsonable_encoder({"message": OVERLAP_MESSAGE, "conflicts": conflicts}),
+    )
+
+
+def _raise_batch_overlaps(errors: list[dict]) -> NoReturn:
+    """409 listing, per batch item, the visits and other items it overlaps."""
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=jsonable_encoder([dict(error, message=OVERLAP_MESSAGE) for error in errors]),
+    )
+
+
+def _booking_changed(payload: VisitUpdate) -> bool:
+    """Whether an update can create a new overlap for the assigned caregiver."""
+    fields = (payload.assigned_caregiver_id, payload.scheduled_start, payload.scheduled_end, payload.status)
+    return any(value is not None for value in fields)
+
+
+@contextmanager
+def _overlap_conflicts(db: Session) -> Iterator[None]:
+    """
+    Report a write rejected by the caregiver exclusion constraint as the usual 409.
+
+    Wraps every flush, INSERT and commit of a booking change: on Postgres the
+    constraint fires as soon as the row is written, not only at commit.
+    """
+    try:
+        yield
+    except IntegrityError as exc:
+        db.rollback()
+        if is_overlap_violation(exc):
+            _raise_overlap([])
+        raise
+
+
+@router.get("", response_model=Page[VisitResponse])
 def list_visits(
     care_recipient_id: Optional[UUID] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db_session),
     organization_id: str = Depends(get_current_organization_id),
-) -> List[VisitResponse]:
+    scope: CareScope = Depends(get_care_scope),
+) -> Page[VisitResponse]:
     """
-    List visits, optionally filtered by care recipient.
+    List visits in schedule order, optionally filtered by care recipient.
+
+    Keyset-paginated on (scheduled_start, id); pass `next_cursor` back as `cursor`.
     """
-    q = db.query(Visit).filter(Visit.organization_id == organization_id)
+    q = db.query(Visit).filter(Visit.organization_id == organization_id, *scope.where(Visit.care_recipient_id))
     if care_recipient_id is not None:
         q = q.filter(Visit.care_recipient_id == care_recipient_id)
-    return q.order_by(Visit.scheduled_start.asc()).all()
+    return VISIT_ORDER.page(VISIT_ORDER.apply(q, cursor, limit).all(), limit)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_visits(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    care_recipient_id: Optional[UUID] = Query(default=None),
+    date_from: Optional[datetime] = Query(default=None, alias="from"),
+    date_to: Optional[datetime] = Query(default=None, alias="to"),
+    db: Session = Depends(get_db_session),
+    organization_id: str = Depends(get_current_organization_id),
+    scope: CareScope = Depends(get_care_scope),
+) -> StreamingResponse:
+    """
+    Stream visits scheduled in [from, to) as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and written as they arrive, so
+    memory stays flat regardless of the size of the range.
+    """
+    stmt = _export_stmt(organization_id, care_recipient_id, date_from, date_to, scope)
+    return export_response(stream_rows(db, stmt, format), format, "visits")
 
 
 @router.get("/{visit_id}", response_model=VisitResponse)
 def get_visit(
     visit_id: UUID,
     db: Session = Depends(get_db_session),
+    scope: CareScope = Depends(get_care_scope),
 ) -> VisitResponse:
     """Get a single visit by ID."""
     visit = db.get(Visit, visit_id)
     if not visit:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Visit not found")
+    scope.require(visit.organization_id, visit.care_recipient_id, "Visit not found")
     return visit
 
 
+@router.get("/{visit_id}/occurrences", response_model=List[VisitOccurrence])
+def list_visit_occurrences(
+    visit_id: UUID,
+    date_from: datetime = Query(..., alias="from"),
+    date_to: datetime = Query(..., alias="to"),
+    db: Session = Depends(get_db_session),
+    scope: CareScope = Depends(get_care_scope),
+) -> List[VisitOccurrence]:
+    """
+    List the occurrences of a recurring visit that start in [from, to).
+
+    Occurrences inside the materialization horizon come from the visit table
+    with their current status; later ones are expanded from the rule on the
+    fly and have no visit_id yet.
+    """
+    series = db.get(Visit, visit_id)
+    _validate_series_window(series, date_from, date_to, scope)
+    stored = db.scalars(_stored_occurrences_stmt(visit_id, date_from, date_to)).all()
+    return _merge_occurrences(series, stored, date_from, date_to)
+
+
 @router.post("", response_model=VisitResponse, status_code=status.HTTP_201_CREATED)
 def create_visit(
     payload: VisitCreate,
@@ -86,24 +366,80 @@ def create_visit(
             detail="scheduled_end must be after scheduled_start",
         )
 
+    if is_booked(visit.assigned_caregiver_id, visit.status):
+        stmt = overlapping_stmt(visit.assigned_caregiver_id, visit.scheduled_start, visit.scheduled_end)
+        conflicts = db.execute(stmt).all()
+        if conflicts:
+            _raise_overlap(conflicts)
+
     db.add(visit)
-    db.commit()
-    db.refresh(visit)
+    with _overlap_conflicts(db):
+        # The session does not autoflush; write the visit before its children and counters.
+        db.flush()
+        if is_series_head(visit):
+            materialize(db, visit, horizon_end())
+        count_visits(db, [visit])
+        emit(db, visit_event("created", visit))
+        db.commit()
     return visit
 
 
+@router.post(":batch", response_model=BatchResponse[VisitResponse], status_code=status.HTTP_201_CREATED)
+def create_visits_batch(
+    payload: VisitBatchCreate,
+    db: Session = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+) -> BatchResponse[VisitResponse]:
+    """
+    Create many visits in one transaction.
+
+    The whole payload is validated against `VisitCreate` first; invalid items
+    are reported by index in the 422 and nothing is created. Valid batches are
+    written with a single multi-row INSERT ... RETURNING. Recurring visits are
+    expanded up to the horizon in the same transaction.
+
+    Caregiver double-booking is checked for the whole batch with one query for
+    the existing bookings plus an in-memory interval tree; every overlapping
+    item is reported in the 409.
+    """
+    window = batch_window(payload.items)
+    if window is not None:
+        errors = batch_conflicts(payload.items, db.execute(bookings_stmt(*window)).all())
+        if errors:
+            _raise_batch_overlaps(errors)
+    with _overlap_conflicts(db):
+        created = db.execute(_batch_insert_stmt(), _batch_rows(payload, current_user_id)).all()
+        count_visits(db, created)
+        until = horizon_end()
+        for row in created:
+            if is_series_head(row):
+                materialize(db, row, until)
+        emit(db, *(visit_event("created", row) for row in created))
+        db.commit()
+    return {"items": created}
+
+
 @router.patch("/{visit_id}", response_model=VisitResponse)
 def update_visit(
     visit_id: UUID,
     payload: VisitUpdate,
     db: Session = Depends(get_db_session),
+    scope: CareScope = Depends(get_care_scope),
 ) -> VisitResponse:
     """
     Partially update a visit (not including explicit start/end actions).
+
+    Changing the rule, timing, timezone, caregiver or status of a series head
+    regenerates (or, when cancelled, cancels) its future unstarted children;
+    children edited since they were generated, or with tasks or notes, are kept.
     """
-    visit = db.get(Visit, visit_id)
+    # Locked until commit: a concurrent update would move the counter out of the same old key.
+    visit = db.get(Visit, visit_id, with_for_update=True)
     if not visit:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Visit not found")
+    scope.require(visit.organization_id, visit.care_recipient_id, "Visit not found")
+    counted_as = visit_key(visit)
+    before = series_state(visit)
 
     if payload.assigned_caregiver_id is not None:
         visit.assigned_caregiver_id = payload.assigned_caregiver_id
@@ -150,9 +486,20 @@ def update_visit(
             detail="scheduled_end must be after scheduled_start",
         )
 
+    if _booking_changed(payload) and is_booked(visit.assigned_caregiver_id, visit.status):
+        stmt = overlapping_stmt(visit.assigned_caregiver_id, visit.scheduled_start, visit.scheduled_end, visit.id)
+        conflicts = db.execute(stmt).all()
+        if conflicts:
+            _raise_overlap(conflicts)
+
     db.add(visit)
-    db.commit()
-    db.refresh(visit)
+    with _overlap_conflicts(db):
+        db.flush()
+        move(db, counted_as, visit_key(visit))
+        if is_series_head(visit) and series_changed(before, visit):
+            reschedule(db, visit, before)
+        emit(db, visit_event("updated", visit))
+        db.commit()
     return visit
 
 
@@ -160,55 +507,41 @@ def update_visit(
 def start_visit(
     visit_id: UUID,
     db: Session = Depends(get_db_session),
+    scope: CareScope = Depends(get_care_scope),
 ) -> VisitResponse:
     """
     Start a visit: set status to in_progress and record checked_in_at.
-    """
-    visit = db.get(Visit, visit_id)
-    if not visit:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Visit not found")
 
-    if visit.status not in {"scheduled", "in_progress"}:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Visit can only be started from scheduled or in_progress status.",
-        )
-
-    if visit.checked_in_at is None:
-        visit.checked_in_at = datetime.now(timezone.utc)
-    visit.status = "in_progress"
-
-    db.add(visit)
+    Check-in is a single conditional UPDATE ... RETURNING, so concurrent taps
+    cannot race; the status guard lives in the WHERE clause. The dashboard
+    counters move in the same transaction.
+    """
+    now = datetime.now(timezone.utc)
+    row = db.execute(_start_stmt(visit_id, now, scope)).mappings().one_or_none()
+    if row is None:
+        _raise_transition_error(db.scalar(_exists_stmt(visit_id, scope)), "started")
+    count_check_in(db, row, now)
+    emit(db, visit_event("started", row))
     db.commit()
-    db.refresh(visit)
-    return visit
+    return row
 
 
 @router.post("/{visit_id}/end", response_model=VisitResponse)
 def end_visit(
     visit_id: UUID,
     db: Session = Depends(get_db_session),
+    scope: CareScope = Depends(get_care_scope),
 ) -> VisitResponse:
     """
     End a visit: set status to completed and record checked_out_at.
-    """
-    visit = db.get(Visit, visit_id)
-    if not visit:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Visit not found")
-
-    if visit.status not in {"in_progress", "scheduled"}:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Visit can only be ended from scheduled or in_progress status.",
-        )
 
-    if visit.checked_in_at is None:
-        visit.checked_in_at = datetime.now(timezone.utc)
-    visit.checked_out_at = datetime.now(timezone.utc)
-    visit.status = "completed"
-
-    db.add(visit)
+    Check-out is a single conditional UPDATE ... RETURNING (see `start_visit`).
+    """
+    now = datetime.now(timezone.utc)
+    row = db.execute(_end_stmt(visit_id, now, scope)).mappings().one_or_none()
+    if row is None:
+        _raise_transition_error(db.scalar(_exists_stmt(visit_id, scope)), "ended")
+    count_check_in(db, row, now)
+    emit(db, visit_event("ended", row))
     db.commit()
-    db.refresh(visit)
-    return visit
-
+    return row
@@ -0,0 +1,19 @@
+"""
+Batch create response schema.
+"""
+
+from typing import Generic, List, TypeVar
+
+from pydantic import BaseModel
+
+# Upper bound on items per batch request; a week of visits and tasks for a
+# couple of hundred care recipients fits comfortably.
+MAX_BATCH_SIZE = 5000
+
+T = TypeVar("T")
+
+
+class BatchResponse(BaseModel, Generic[T]):
+    """Rows created by a batch request, in request order."""
+
+    items: List[T]
@@ -0,0 +1,38 @@
+"""
+Calendar response schemas.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class CalendarEntryKind(str, Enum):
+    VISIT = "visit"
+    ASSIGNMENT_24X7 = "assignment_24x7"
+
+
+class CalendarEntry(BaseModel):
+    """One block on the schedule calendar: only what the calendar draws."""
+
+    kind: CalendarEntryKind
+    id: Optional[UUID] = Field(
+        default=None,
+        description="Null for occurrences of a recurring visit that are not materialized yet.",
+    )
+    series_id: Optional[UUID] = None
+    care_recipient_id: UUID
+    caregiver_id: Optional[UUID] = None
+    type: str
+    status: str
+    start: datetime
+    end: Optional[datetime] = Field(default=None, description="Null for open-ended 24/7 assignments.")
+
+
+class CalendarResponse(BaseModel):
+    """Calendar entries overlapping the requested range, ordered by start."""
+
+    items: List[CalendarEntry]
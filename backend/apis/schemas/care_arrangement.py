@@ -4,10 +4,10 @@ Care arrangement request and response schemas.
 
 from datetime import date, datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
 
 
 class CareArrangementMode(str, Enum):
@@ -31,8 +31,8 @@ class CareArrangementBase(BaseModel):
 
     @field_validator("effective_to")
     @classmethod
-    def validate_effective_range(cls, v: Optional[date], values: dict) -> Optional[date]:
-        start = values.get("effective_from")
+    def validate_effective_range(cls, v: Optional[date], info: ValidationInfo) -> Optional[date]:
+        start = info.data.get("effective_from")
         if v is not None and start is not None and v < start:
             raise ValueError("effective_to cannot be before effective_from")
         return v
@@ -54,8 +54,8 @@ class CareArrangementUpdate(BaseModel):
 
     @field_validator("effective_to")
     @classmethod
-    def validate_effective_range(cls, v: Optional[date], values: dict) -> Optional[date]:
-        start = values.get("effective_from")
+    def validate_effective_range(cls, v: Optional[date], info: ValidationInfo) -> Optional[date]:
+        start = info.data.get("effective_from")
         if v is not None and start is not None and v < start:
             raise ValueError("effective_to cannot be before effective_from")
         return v
@@ -70,3 +70,20 @@ class CareArrangementResponse(CareArrangementBase):
 
     model_config = {"from_attributes": True}
 
+
+
+class EffectiveCareArrangement(BaseModel):
+    """The arrangement in effect for one care recipient on the requested date."""
+
+    care_recipient_id: UUID
+    arrangement_id: UUID
+    mode: CareArrangementMode
+    effective_from: date
+    effective_to: Optional[date] = None
+
+
+class EffectiveCareArrangements(BaseModel):
+    """Arrangements in effect on `date`; recipients without one are omitted."""
+
+    date: date
+    items: List[EffectiveCareArrangement]
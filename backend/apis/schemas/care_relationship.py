@@ -7,7 +7,7 @@ from enum import Enum
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
 
 
 class CareRelationshipRole(str, Enum):
@@ -44,8 +44,8 @@ class CareRelationshipBase(BaseModel):
 
     @field_validator("end_date")
     @classmethod
-    def validate_date_range(cls, v: Optional[date], values: dict) -> Optional[date]:
-        start = values.get("start_date")
+    def validate_date_range(cls, v: Optional[date], info: ValidationInfo) -> Optional[date]:
+        start = info.data.get("start_date")
         if v is not None and start is not None and v < start:
             raise ValueError("end_date cannot be before start_date")
         return v
@@ -69,8 +69,8 @@ class CareRelationshipUpdate(BaseModel):
 
     @field_validator("end_date")
     @classmethod
-    def validate_date_range(cls, v: Optional[date], values: dict) -> Optional[date]:
-        start = values.get("start_date")
+    def validate_date_range(cls, v: Optional[date], info: ValidationInfo) -> Optional[date]:
+        start = info.data.get("start_date")
         if v is not None and start is not None and v < start:
             raise ValueError("end_date cannot be before start_date")
         return v
@@ -0,0 +1,101 @@
+"""
+Conversation (message thread) request and response schemas.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
+
+
+class ConversationType(str, Enum):
+    CARE_CIRCLE = "care_circle"
+    DIRECT = "direct"
+    GROUP = "group"
+
+
+class ConversationParticipantRole(str, Enum):
+    MEMBER = "member"
+    MUTED = "muted"
+
+
+class ConversationBase(BaseModel):
+    """Shared fields for conversation create/response."""
+
+    organization_id: UUID
+    care_recipient_id: Optional[UUID] = Field(
+        default=None,
+        description="Recipient the thread is about; required for care_circle",
+    )
+    title: Optional[str] = Field(default=None, max_length=200)
+    type: ConversationType = Field(..., description="Thread type (care_circle, direct, group)")
+
+
+class ConversationCreate(ConversationBase):
+    """
+    Payload for starting a conversation.
+
+    The current user always joins. A care_circle thread also adds everyone with
+    an active care relationship to `care_recipient_id`.
+    """
+
+    participant_ids: List[UUID] = Field(default_factory=list, validate_default=True, description="Other users to add")
+
+    @field_validator("participant_ids")
+    @classmethod
+    def validate_participants(cls, v: List[UUID], info: ValidationInfo) -> List[UUID]:
+        kind = info.data.get("type")
+        if kind == ConversationType.CARE_CIRCLE and info.data.get("care_recipient_id") is None:
+            raise ValueError("a care_circle conversation needs a care_recipient_id")
+        if kind == ConversationType.DIRECT and len(set(v)) != 1:
+            raise ValueError("a direct conversation has exactly one other participant")
+        return v
+
+
+class ConversationParticipantResponse(BaseModel):
+    """A participant and their read watermark."""
+
+    user_id: UUID
+    role: ConversationParticipantRole
+    joined_at: datetime
+    last_read_message_id: Optional[UUID] = None
+    last_read_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+class ConversationSummary(ConversationBase):
+    """One row of the thread list: the thread, its newest message and the caller's unread flag."""
+
+    id: UUID
+    last_message_id: Optional[UUID] = None
+    last_message_sender_id: Optional[UUID] = None
+    last_message_preview: Optional[str] = None
+    last_message_at: Optional[datetime] = None
+    last_activity_at: datetime
+    unread: bool = Field(..., description="A message newer than the caller's read watermark exists")
+
+    model_config = {"from_attributes": True}
+
+
+class ConversationResponse(ConversationBase):
+    """Conversation in API responses."""
+
+    id: UUID
+    last_message_id: Optional[UUID] = None
+    last_message_sender_id: Optional[UUID] = None
+    last_message_preview: Optional[str] = None
+    last_message_at: Optional[datetime] = None
+    last_activity_at: datetime
+    created_at: datetime
+    participants: List[ConversationParticipantResponse]
+
+    model_config = {"from_attributes": True}
+
+
+class ReadReceipt(BaseModel):
+    """Payload for moving the caller's read watermark."""
+
+    message_id: UUID = Field(..., description="Newest message the caller has read")
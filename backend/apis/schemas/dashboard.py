@@ -0,0 +1,23 @@
+"""
+Dashboard response schemas.
+"""
+
+from datetime import date
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+
+class StatusCounts(BaseModel):
+    total: int
+    by_status: Dict[str, int] = Field(description="Only statuses with a non-zero count are listed.")
+
+
+class DashboardStats(BaseModel):
+    """The counts the dashboard stat cards show for one day."""
+
+    date: date
+    visits: StatusCounts = Field(description="Visits scheduled on the day (UTC), by status.")
+    tasks: StatusCounts = Field(description="Tasks dated on the day, by status.")
+    active_caregivers: int
+    active_care_recipients: int
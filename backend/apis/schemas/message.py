@@ -0,0 +1,37 @@
+"""
+Message request and response schemas.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+MAX_MESSAGE_LENGTH = 4000
+
+
+class MessageAttachment(BaseModel):
+    url: str
+    type: str
+    name: Optional[str] = None
+
+
+class MessageCreate(BaseModel):
+    """Payload for sending a message; the sender is the current user."""
+
+    body: str = Field(..., min_length=1, max_length=MAX_MESSAGE_LENGTH)
+    attachments: Optional[List[MessageAttachment]] = None
+
+
+class MessageResponse(BaseModel):
+    """Message in API responses."""
+
+    id: UUID
+    conversation_id: UUID
+    sender_id: UUID
+    body: str
+    attachments: Optional[List[MessageAttachment]] = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
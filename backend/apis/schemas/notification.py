@@ -0,0 +1,41 @@
+"""
+Notification response schemas.
+"""
+
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class NotificationResponse(BaseModel):
+    """One notification of the current user."""
+
+    id: UUID
+    organization_id: Optional[UUID] = None
+    type: str = Field(..., description="e.g. visit_reminder")
+    title: str
+    body: Optional[str] = None
+    data: Optional[dict[str, Any]] = None
+    channel: str
+    status: str
+    sent_at: Optional[datetime] = None
+    read_at: Optional[datetime] = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class SchedulerStats(BaseModel):
+    """This worker's reminder scheduler: queue size and how late reminders went out."""
+
+    running: bool
+    pending: int = Field(..., description="Reminders loaded and waiting to be due")
+    loaded: int = Field(..., description="Reminders in the last window load")
+    dispatched: int
+    failed_passes: int
+    last_lag_seconds: float = Field(..., description="Lateness of the latest reminder in the last batch")
+    max_lag_seconds: float
+    last_load_at: Optional[datetime] = None
+    last_dispatch_at: Optional[datetime] = None
@@ -3,13 +3,14 @@ Organization request and response schemas.
 """
 
 from typing import Optional
+from uuid import UUID
 from pydantic import BaseModel
 
 
 class OrganizationResponse(BaseModel):
     """Organization in API responses."""
 
-    id: str
+    id: UUID
     name: str
     type: str  # household | agency
     slug: Optional[str] = None
@@ -0,0 +1,19 @@
+"""
+Paginated list response schema.
+"""
+
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a keyset-paginated list."""
+
+    items: List[T]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass as `cursor` to fetch the next page; null on the last page.",
+    )
@@ -4,9 +4,12 @@ Person (user) request and response schemas.
 
 from enum import Enum
 from typing import Optional
+from uuid import UUID
 
 from pydantic import BaseModel, EmailStr
 
+from backend.apis.schemas.membership import MembershipRole
+
 
 class UserStatus(str, Enum):
     ACTIVE = "active"
@@ -41,7 +44,20 @@ class PersonUpdate(BaseModel):
 class PersonResponse(PersonBase):
     """Person in API responses. Excludes password_hash and sensitive fields."""
 
-    id: str
+    id: UUID
     status: UserStatus = UserStatus.ACTIVE
 
     model_config = {"from_attributes": True}
+
+
+class PersonMatch(BaseModel):
+    """Person in typeahead results, with their role in the current organization."""
+
+    id: UUID
+    email: str
+    first_name: str
+    last_name: str
+    display_name: Optional[str] = None
+    role: MembershipRole
+
+    model_config = {"from_attributes": True}
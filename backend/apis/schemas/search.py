@@ -0,0 +1,31 @@
+"""
+Full-text search response schemas.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class SearchKind(str, Enum):
+    VISIT_NOTE = "visit_note"
+    CARE_NOTE = "care_note"
+    MESSAGE = "message"
+
+
+class SearchHit(BaseModel):
+    """One matching document, best match first."""
+
+    kind: SearchKind
+    id: UUID = Field(..., description="Id of the visit note, care note or message")
+    care_recipient_id: Optional[UUID] = None
+    visit_id: Optional[UUID] = Field(default=None, description="Visit of a visit note")
+    conversation_id: Optional[UUID] = Field(default=None, description="Conversation of a message")
+    created_at: datetime
+    rank: float = Field(..., description="Relevance; higher is better")
+    snippet: str = Field(..., description="Matching text, HTML-escaped, with terms wrapped in <mark></mark>")
+
+    model_config = {"from_attributes": True}
@@ -4,11 +4,13 @@ Task request and response schemas.
 
 from datetime import date, datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from backend.apis.schemas.batch import MAX_BATCH_SIZE
+
 
 class TaskCategory(str, Enum):
     ADL = "adl"
@@ -51,6 +53,12 @@ class TaskCreate(TaskBase):
     status: TaskStatus = TaskStatus.PENDING
 
 
+class TaskBatchCreate(BaseModel):
+    """Payload for creating many tasks in one request."""
+
+    items: List[TaskCreate] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
 class TaskUpdate(BaseModel):
     """Payload for partial task update."""
 
@@ -74,6 +82,7 @@ class TaskResponse(TaskBase):
     status: TaskStatus
     completed_at: Optional[datetime] = None
     completed_by_id: Optional[UUID] = None
+    overdue_at: Optional[datetime] = Field(default=None, description="When a pending 24/7 task was flagged overdue")
     created_at: datetime
     updated_at: datetime
 
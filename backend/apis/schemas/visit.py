@@ -4,10 +4,13 @@ Visit request and response schemas.
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
+
+from backend.apis.schemas.batch import MAX_BATCH_SIZE
+from backend.scheduling.recurrence import series_timezone, validate_rule
 
 
 class VisitType(str, Enum):
@@ -26,6 +29,29 @@ class VisitStatus(str, Enum):
     NO_SHOW = "no_show"
 
 
+class RecurrenceValidation(BaseModel):
+    """
+    Validates `timezone` and `recurrence_rule` on request payloads.
+
+    Kept out of `VisitResponse` so rules already stored are never re-parsed on
+    the way out.
+    """
+
+    @field_validator("timezone", check_fields=False)
+    @classmethod
+    def validate_timezone(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None:
+            series_timezone(v)
+        return v
+
+    @field_validator("recurrence_rule", check_fields=False)
+    @classmethod
+    def validate_recurrence_rule(cls, v: Optional[str], info: ValidationInfo) -> Optional[str]:
+        if v is not None:
+            validate_rule(v, info.data.get("timezone"))
+        return v
+
+
 class VisitBase(BaseModel):
     """Shared fields for visit create/update."""
 
@@ -50,20 +76,26 @@ class VisitBase(BaseModel):
 
     @field_validator("scheduled_end")
     @classmethod
-    def validate_time_window(cls, v: datetime, values: dict) -> datetime:
-        start = values.get("scheduled_start")
+    def validate_time_window(cls, v: datetime, info: ValidationInfo) -> datetime:
+        start = info.data.get("scheduled_start")
         if start is not None and v <= start:
             raise ValueError("scheduled_end must be after scheduled_start")
         return v
 
 
-class VisitCreate(VisitBase):
+class VisitCreate(RecurrenceValidation, VisitBase):
     """Payload for creating a visit."""
 
     status: VisitStatus = VisitStatus.SCHEDULED
 
 
-class VisitUpdate(BaseModel):
+class VisitBatchCreate(BaseModel):
+    """Payload for creating many visits in one request."""
+
+    items: List[VisitCreate] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class VisitUpdate(RecurrenceValidation):
     """Payload for partial visit update (not used for start/end)."""
 
     assigned_caregiver_id: Optional[UUID] = None
@@ -82,6 +114,16 @@ class VisitUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class VisitOccurrence(BaseModel):
+    """One occurrence of a recurring visit; visit_id is null until it is materialized."""
+
+    series_id: UUID
+    visit_id: Optional[UUID] = None
+    scheduled_start: datetime
+    scheduled_end: datetime
+    status: VisitStatus
+
+
 class VisitResponse(VisitBase):
     """Visit in API responses."""
 
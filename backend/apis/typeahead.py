@@ -0,0 +1,271 @@
+"""
+Typeahead over the people of an organization, for the person pickers.
+
+A person matches when every word of the query starts one of their words: the
+words of their first, last and display names, or their whole email address
+("jane.d" finds jane.doe@example.com). Matches come back ordered by last name,
+first name and id.
+
+The database answers with word-start LIKE patterns over one expression per
+person, which a pg_trgm index covers on Postgres (`backend.database.search`).
+
+With PERSON_TYPEAHEAD_INDEX on, each worker also keeps a `PrefixIndex` per
+organization in memory. `PersonDirectory.run` builds them at startup and then
+follows the `person.updated` events every worker receives from the hub,
+re-reading the people that changed. Until the build finishes, after a failed
+refresh and while the setting is off, searches go to the database.
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass
+from functools import cached_property
+from operator import attrgetter, itemgetter
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Select, String, func, literal_column, select
+
+from backend.database.entities.membership import Membership
+from backend.database.entities.user import User
+from backend.database.session import SessionLocal
+from backend.realtime.events import Event
+from backend.realtime.hub import hub
+
+logger = logging.getLogger(__name__)
+
+TYPEAHEAD_INDEX = os.getenv("PERSON_TYPEAHEAD_INDEX", "true").lower() == "true"
+
+# Seconds to wait before rebuilding the indexes after a failed refresh.
+RETRY_DELAY = 30.0
+
+# Above every character a token can continue with, to bound a prefix range.
+_PREFIX_END = "\U0010ffff"
+
+_SPACE = literal_column("' '", String)
+
+# Matches `PERSON_DOCUMENT` in backend.database.search, so the trigram index applies.
+person_document: ColumnElement[str] = _SPACE + func.lower(
+    User.first_name
+    + _SPACE
+    + User.last_name
+    + _SPACE
+    + func.coalesce(User.display_name, literal_column("''"))
+    + _SPACE
+    + User.email
+)
+
+
+def query_words(q: str) -> list[str]:
+    return q.lower().split()
+
+
+def _like_word_start(word: str) -> str:
+    escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"% {escaped}%"
+
+
+def members_stmt() -> Select:
+    """People who can be picked in an organization: not archived, membership not inactive."""
+    return (
+        select(
+            Membership.organization_id,
+            User.id,
+            User.email,
+            User.first_name,
+            User.last_name,
+            User.display_name,
+            Membership.role,
+        )
+        .join(User, User.id == Membership.user_id)
+        .where(Membership.status != "inactive", User.status != "archived")
+    )
+
+
+def match_stmt(organization_id: Any, words: list[str], roles: Collection[str], limit: int) -> Select:
+    """Database fallback for `PersonDirectory.search`."""
+    stmt = members_stmt().where(
+        Membership.organization_id == organization_id,
+        *(person_document.like(_like_word_start(word), escape="\\") for word in words),
+    )
+    if roles:
+        stmt = stmt.where(Membership.role.in_(roles))
+    return stmt.order_by(func.lower(User.last_name), func.lower(User.first_name), User.id).limit(limit)
+
+
+@dataclass(frozen=True, eq=False)
+class PersonEntry:
+    id: UUID
+    email: str
+    first_name: str
+    last_name: str
+    display_name: Optional[str]
+    role: str
+
+    @classmethod
+    def from_row(cls, row: Any) -> "PersonEntry":
+        return cls(row.id, row.email, row.first_name, row.last_name, row.display_name, row.role)
+
+    @cached_property
+    def tokens(self) -> frozenset[str]:
+        names = f"{self.first_name} {self.last_name} {self.display_name or ''}"
+        return frozenset(query_words(names)) | {self.email.lower()}
+
+    @cached_property
+    def sort_key(self) -> tuple[str, str, UUID]:
+        return (self.last_name.lower(), self.first_name.lower(), self.id)
+
+
+_person = itemgetter(2)
+_sort_key = attrgetter("sort_key")
+
+
+class PrefixIndex:
+    """
+    The people of one organization by the prefixes of their words.
+
+    A prefix trie flattened into a sorted list of (token, sort key, person):
+    the tokens under a prefix are one contiguous run, found with two binary
+    searches, and a query of several words intersects their runs. A lookup
+    stays around 10 ms for a single letter over 50k people, and well under a
+    millisecond once a word has a few letters, at a fraction of the memory of
+    a node per character. Adding or removing a person shifts the list, which is
+    cheap next to the read it follows. Not thread-safe; `PersonDirectory`
+    locks around it.
+    """
+
+    def __init__(self, entries: Iterable[PersonEntry] = ()) -> None:
+        self._entries = {entry.id: entry for entry in entries}
+        self._tokens = sorted(
+            (token, entry.sort_key, entry) for entry in self._entries.values() for token in entry.tokens
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, person_id: UUID) -> bool:
+        return person_id in self._entries
+
+    def add(self, entry: PersonEntry) -> None:
+        self.remove(entry.id)
+        self._entries[entry.id] = entry
+        for token in entry.tokens:
+            insort(self._tokens, (token, entry.sort_key, entry))
+
+    def remove(self, person_id: UUID) -> None:
+        entry = self._entries.pop(person_id, None)
+        if entry is None:
+            return
+        for token in entry.tokens:
+            del self._tokens[bisect_left(self._tokens, (token, entry.sort_key))]
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        return bisect_left(self._tokens, (prefix,)), bisect_left(self._tokens, (prefix + _PREFIX_END,))
+
+    def search(self, words: list[str], roles: Collection[str] = (), limit: int = 10) -> list[PersonEntry]:
+        """People matching every word, in `match_stmt` order."""
+        if not words:
+            return []
+        # The people under each word's run, intersected; set-building runs at C speed.
+        candidates = set.intersection(
+            *(set(map(_person, self._tokens[slice(*self._range(word))])) for word in set(words))
+        )
+        if roles:
+            candidates = {entry for entry in candidates if entry.role in roles}
+        return heapq.nsmallest(limit, candidates, key=_sort_key)
+
+
+class PersonDirectory:
+    """Per-organization `PrefixIndex`es for this worker, kept current from hub events."""
+
+    def __init__(self) -> None:
+        self.ready = False
+        self._indexes: dict[UUID, PrefixIndex] = {}
+        self._orgs_of: defaultdict[UUID, set[UUID]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._changes: Optional[asyncio.Queue[UUID]] = None
+
+    def search(
+        self, organization_id: UUID, words: list[str], roles: Collection[str] = (), limit: int = 10
+    ) -> Optional[list[PersonEntry]]:
+        """Matches from memory, or None while the directory is not ready (ask the database)."""
+        if not self.ready:
+            return None
+        with self._lock:
+            index = self._indexes.get(organization_id)
+            return index.search(words, roles, limit) if index is not None else []
+
+    def warm(self) -> None:
+        """Build every organization's index from the database. Blocking; runs in a thread."""
+        by_org: defaultdict[UUID, list[PersonEntry]] = defaultdict(list)
+        with SessionLocal() as db:
+            for row in db.execute(members_stmt()):
+                by_org[row.organization_id].append(PersonEntry.from_row(row))
+        indexes = {org: PrefixIndex(entries) for org, entries in by_org.items()}
+        orgs_of: defaultdict[UUID, set[UUID]] = defaultdict(set)
+        for org, entries in by_org.items():
+            for entry in entries:
+                orgs_of[entry.id].add(org)
+        with self._lock:
+            self._indexes, self._orgs_of = indexes, orgs_of
+            self.ready = True
+        logger.info("Person directory loaded %d people in %d organizations", len(orgs_of), len(indexes))
+
+    def refresh(self, user_ids: Collection[UUID]) -> None:
+        """Re-read these people and their memberships into the indexes. Blocking; runs in a thread."""
+        with SessionLocal() as db:
+            rows = db.execute(members_stmt().where(User.id.in_(user_ids))).all()
+        with self._lock:
+            for user_id in user_ids:
+                for org in self._orgs_of.pop(user_id, ()):
+                    self._indexes[org].remove(user_id)
+            for row in rows:
+                self._indexes.setdefault(row.organization_id, PrefixIndex()).add(PersonEntry.from_row(row))
+                self._orgs_of[row.id].add(row.organization_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.ready = False
+            self._indexes, self._orgs_of = {}, defaultdict(set)
+
+    def on_event(self, event: Event) -> None:
+        """Hub listener: queue the person of a `person.updated` event for a refresh."""
+        if event.type == "person.updated" and self._changes is not None:
+            self._changes.put_nowait(UUID(event.data["user_id"]))
+
+    async def _next_changes(self) -> set[UUID]:
+        assert self._changes is not None
+        user_ids = {await self._changes.get()}
+        while not self._changes.empty():
+            user_ids.add(self._changes.get_nowait())
+        return user_ids
+
+    async def run(self) -> None:
+        """Build the indexes, then apply changes as they arrive; until cancelled."""
+        # Listening before the build queues the changes it might miss.
+        self._changes = asyncio.Queue()
+        hub.add_listener(self.on_event)
+        try:
+            while True:
+                try:
+                    if not self.ready:
+                        await asyncio.to_thread(self.warm)
+                    await asyncio.to_thread(self.refresh, await self._next_changes())
+                except Exception:
+                    # A lost change would leave an index stale: serve from the database and rebuild.
+                    logger.exception("Person directory refresh failed")
+                    self.clear()
+                    await asyncio.sleep(RETRY_DELAY)
+        finally:
+            hub.remove_listener(self.on_event)
+            self._changes = None
+            self.clear()
+
+
+directory = PersonDirectory()
@@ -6,7 +6,15 @@ Import Base and get_db for app wiring; import entity classes for repositories.
 """
 
 from backend.database.base import Base
-from backend.database.session import get_db, engine, SessionLocal
+from backend.database.schema import create_schema
+from backend.database.session import (
+    get_db,
+    get_async_db,
+    engine,
+    async_engine,
+    SessionLocal,
+    AsyncSessionLocal,
+)
 from backend.database.entities import (
     User,
     Organization,
@@ -23,13 +31,19 @@ from backend.database.entities import (
     Message,
     VisitNote,
     CareNote,
+    StatRollup,
+    Notification,
 )
 
 __all__ = [
     "Base",
+    "create_schema",
     "engine",
     "SessionLocal",
     "get_db",
+    "async_engine",
+    "AsyncSessionLocal",
+    "get_async_db",
     "User",
     "Organization",
     "Location",
@@ -45,4 +59,5 @@ __all__ = [
     "Message",
     "VisitNote",
     "CareNote",
+    "StatRollup",
 ]
@@ -7,8 +7,9 @@ from datetime import datetime
 from typing import Any
 
 from sqlalchemy import DateTime, func
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 
 
 class Base(DeclarativeBase):
@@ -19,6 +20,18 @@ class Base(DeclarativeBase):
         datetime: DateTime(timezone=True),
     }
 
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict[str, Any]:
+        # Fetch server-generated columns (created_at/updated_at/joined_at) with
+        # RETURNING during the flush, so handlers never need a refresh SELECT.
+        return {"eager_defaults": True}
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_: JSONB, compiler: Any, **kw: Any) -> str:
+    """Render JSONB as JSON so the schema also builds on SQLite (tests, local runs)."""
+    return "JSON"
+
 
 class UUIDMixin:
     """Primary key as UUID, generated by default."""
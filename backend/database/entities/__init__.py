@@ -18,6 +18,8 @@ from backend.database.entities.conversation import Conversation, ConversationPar
 from backend.database.entities.message import Message
 from backend.database.entities.visit_note import VisitNote
 from backend.database.entities.care_note import CareNote
+from backend.database.entities.stat_rollup import StatRollup
+from backend.database.entities.notification import Notification
 
 __all__ = [
     "User",
@@ -35,4 +37,6 @@ __all__ = [
     "Message",
     "VisitNote",
     "CareNote",
+    "StatRollup",
+    "Notification",
 ]
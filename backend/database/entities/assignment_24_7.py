@@ -6,7 +6,7 @@ from datetime import date, time, datetime
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, Date, Time, DateTime, ForeignKey
+from sqlalchemy import String, Date, Time, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.database.base import Base, UUIDMixin, TimestampMixin
@@ -14,6 +14,13 @@ from backend.database.base import Base, UUIDMixin, TimestampMixin
 
 class Assignment24_7(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "assignment_24x7"
+    __table_args__ = (
+        Index("ix_assignment_24x7_recipient", "care_recipient_id"),
+        Index("ix_assignment_24x7_caregiver", "caregiver_id"),
+        Index("ix_assignment_24x7_status", "status"),
+        # Calendar: organization scope, bounded on start_date.
+        Index("ix_assignment_24x7_org_start", "organization_id", "start_date"),
+    )
 
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
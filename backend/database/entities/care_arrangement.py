@@ -6,7 +6,8 @@ from datetime import date
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, Date, ForeignKey
+from sqlalchemy import DDL, String, Date, ForeignKey, Index, event, func
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.database.base import Base, UUIDMixin, TimestampMixin
@@ -14,6 +15,17 @@ from backend.database.base import Base, UUIDMixin, TimestampMixin
 
 class CareArrangement(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "care_arrangement"
+    __table_args__ = (
+        Index(
+            "ix_care_arrangement_recipient_org_from",
+            "care_recipient_id",
+            "organization_id",
+            "effective_from",
+        ),
+        Index("ix_care_arrangement_org_created", "organization_id", "created_at", "id"),
+        # Effective-on-a-date lookup across an organization's recipients.
+        Index("ix_care_arrangement_org_from", "organization_id", "effective_from"),
+    )
 
     care_recipient_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
     organization_id: Mapped[UUID] = mapped_column(
@@ -24,3 +36,29 @@ class CareArrangement(Base, UUIDMixin, TimestampMixin):
     effective_from: Mapped[date] = mapped_column(Date, nullable=False)
     effective_to: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     notes: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+
+
+# A recipient has at most one arrangement in effect on any day within an
+# organization: [effective_from, effective_to) ranges may not overlap (an open
+# end runs forever). Postgres only; GiST equality on uuid needs btree_gist.
+event.listen(
+    CareArrangement.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+CareArrangement.__table__.append_constraint(
+    ExcludeConstraint(
+        (CareArrangement.__table__.c.care_recipient_id, "="),
+        (CareArrangement.__table__.c.organization_id, "="),
+        (
+            func.daterange(
+                CareArrangement.__table__.c.effective_from,
+                CareArrangement.__table__.c.effective_to,
+                "[)",
+            ),
+            "&&",
+        ),
+        name="ex_care_arrangement_overlap",
+        using="gist",
+    ).ddl_if(dialect="postgresql")
+)
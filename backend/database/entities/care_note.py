@@ -6,7 +6,7 @@ from datetime import date
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, Date, ForeignKey
+from sqlalchemy import String, Date, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.database.base import Base, UUIDMixin, TimestampMixin
@@ -14,6 +14,7 @@ from backend.database.base import Base, UUIDMixin, TimestampMixin
 
 class CareNote(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "care_note"
+    __table_args__ = (Index("ix_care_note_recipient_date", "care_recipient_id", "note_date"),)
 
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
@@ -6,7 +6,7 @@ from datetime import date
 from uuid import UUID
 from typing import Optional, Any
 
-from sqlalchemy import String, Date, ForeignKey, Text
+from sqlalchemy import String, Date, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -15,6 +15,10 @@ from backend.database.base import Base, UUIDMixin, TimestampMixin
 
 class CarePlan(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "care_plan"
+    __table_args__ = (
+        Index("ix_care_plan_recipient", "care_recipient_id"),
+        Index("ix_care_plan_status", "status"),
+    )
 
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
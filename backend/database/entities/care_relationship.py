@@ -6,7 +6,7 @@ from datetime import date
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, Boolean, Date, ForeignKey
+from sqlalchemy import String, Boolean, Date, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.database.base import Base, UUIDMixin, TimestampMixin
@@ -14,6 +14,22 @@ from backend.database.base import Base, UUIDMixin, TimestampMixin
 
 class CareRelationship(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "care_relationship"
+    __table_args__ = (
+        Index("ix_care_relationship_recipient_org", "care_recipient_id", "organization_id"),
+        Index("ix_care_relationship_related_user", "related_user_id"),
+        Index("ix_care_relationship_org_created", "organization_id", "created_at", "id"),
+        # Dashboard count of active care recipients (index-only).
+        Index("ix_care_relationship_org_status", "organization_id", "status", "care_recipient_id"),
+        # At most one active 24/7 caregiver per recipient per organization.
+        Index(
+            "uq_care_relationship_24x7_caregiver",
+            "care_recipient_id",
+            "organization_id",
+            unique=True,
+            postgresql_where=text("is_24x7_caregiver AND status = 'active'"),
+            sqlite_where=text("is_24x7_caregiver AND status = 'active'"),
+        ),
+    )
 
     care_recipient_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
     related_user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
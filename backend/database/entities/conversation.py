@@ -1,5 +1,11 @@
 """
 Conversation and conversation_participant tables. Tables 2.11, 2.12 in data-model-mvp1.
+
+The last_message_* and last_activity_at columns on conversation are copies of
+its newest message, kept by the send endpoint, so the thread list never reads
+the message table. A participant's read state is one watermark, the newest
+message they have read (last_read_message_id/last_read_at), instead of a
+status per message.
 """
 
 import uuid
@@ -7,7 +13,7 @@ from datetime import datetime
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, DateTime, func, ForeignKey, UniqueConstraint
+from sqlalchemy import String, DateTime, func, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -27,6 +33,17 @@ class Conversation(Base, UUIDMixin, TimestampMixin):
     )
     title: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     type: Mapped[str] = mapped_column(String(20), nullable=False)
+    # Denormalized newest message; no FK so a message and its thread can be written in either order.
+    last_message_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
+    last_message_sender_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
+    last_message_preview: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    last_message_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Thread list sort key: the newest message, or creation for a thread without one.
+    last_activity_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
 
 
 class ConversationParticipant(Base):
@@ -35,6 +52,8 @@ class ConversationParticipant(Base):
     __tablename__ = "conversation_participant"
     __table_args__ = (
         UniqueConstraint("conversation_id", "user_id", name="uq_conversation_participant"),
+        # Thread list: a user's conversations.
+        Index("ix_conversation_participant_user", "user_id", "conversation_id"),
     )
 
     id: Mapped[UUID] = mapped_column(
@@ -49,3 +68,6 @@ class ConversationParticipant(Base):
     user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
     role: Mapped[str] = mapped_column(String(20), nullable=False, default="member")
     joined_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Read watermark: every message up to (last_read_at, last_read_message_id) has been read.
+    last_read_message_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
+    last_read_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -5,7 +5,7 @@ Location table (agency-only). Table 2.3 in data-model-mvp1.
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, Boolean, ForeignKey
+from sqlalchemy import String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.database.base import Base, UUIDMixin, TimestampMixin
@@ -13,6 +13,7 @@ from backend.database.base import Base, UUIDMixin, TimestampMixin
 
 class Location(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "location"
+    __table_args__ = (Index("ix_location_org_created", "organization_id", "created_at", "id"),)
 
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
@@ -6,7 +6,7 @@ from datetime import datetime
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, DateTime, func, ForeignKey, UniqueConstraint
+from sqlalchemy import String, DateTime, func, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.database.base import Base, UUIDMixin, TimestampMixin
@@ -14,7 +14,12 @@ from backend.database.base import Base, UUIDMixin, TimestampMixin
 
 class Membership(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "membership"
-    __table_args__ = (UniqueConstraint("user_id", "organization_id", name="uq_membership_user_org"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "organization_id", name="uq_membership_user_org"),
+        Index("ix_membership_org_created", "organization_id", "created_at", "id"),
+        # Dashboard count of active caregivers.
+        Index("ix_membership_org_role_status", "organization_id", "role", "status"),
+    )
 
     user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
     organization_id: Mapped[UUID] = mapped_column(
@@ -6,7 +6,7 @@ from datetime import datetime
 from uuid import UUID
 from typing import Optional, Any
 
-from sqlalchemy import String, DateTime, func, ForeignKey, Text
+from sqlalchemy import String, DateTime, func, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -14,9 +14,18 @@ from backend.database.base import Base, UUIDMixin
 
 
 class Message(Base, UUIDMixin):
-    """Message has created_at only (no updated_at in spec)."""
+    """
+    Message has created_at only (no updated_at in spec).
+
+    `status` stays "sent": read state is tracked per participant
+    (ConversationParticipant.last_read_*), not per message.
+    """
 
     __tablename__ = "message"
+    __table_args__ = (
+        # Thread history, keyset-paginated on (created_at, id) within a conversation.
+        Index("ix_message_conversation_created_id", "conversation_id", "created_at", "id"),
+    )
 
     conversation_id: Mapped[UUID] = mapped_column(
         ForeignKey("conversation.id", ondelete="CASCADE"),
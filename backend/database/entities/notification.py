@@ -0,0 +1,47 @@
+"""
+Notification table (requirements section 13.2).
+
+Not part of data-model-mvp1. One row per notification per channel; the in-app
+channel's rows are what the bell icon lists. `dedupe_key` names the event a
+notification is for (e.g. one visit reminder), so every worker may try to send
+it but only the first insert lands.
+"""
+
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.database.base import Base, UUIDMixin
+
+
+class Notification(Base, UUIDMixin):
+    __tablename__ = "notification"
+    __table_args__ = (
+        # Bell icon: a user's notifications, newest first.
+        Index("ix_notification_user_created", "user_id", "created_at", "id"),
+        Index("uq_notification_dedupe", "user_id", "channel", "dedupe_key", unique=True),
+    )
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    organization_id: Mapped[Optional[UUID]] = mapped_column(
+        ForeignKey("organization.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    type: Mapped[str] = mapped_column(String(30), nullable=False)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    data: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    channel: Mapped[str] = mapped_column(String(20), nullable=False, default="in_app")
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    dedupe_key: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    read_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
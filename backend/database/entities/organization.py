@@ -4,7 +4,7 @@ Organization table. Table 2.2 in data-model-mvp1.
 
 from typing import Optional, Any
 
-from sqlalchemy import String, DateTime, func
+from sqlalchemy import String, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +13,7 @@ from backend.database.base import Base, UUIDMixin, TimestampMixin
 
 class Organization(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "organization"
+    __table_args__ = (Index("ix_organization_created", "created_at", "id"),)
 
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     type: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
@@ -6,7 +6,7 @@ from datetime import date, datetime
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, Text
+from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, Index, Text, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.database.base import Base, UUIDMixin, TimestampMixin
@@ -14,6 +14,21 @@ from backend.database.base import Base, UUIDMixin, TimestampMixin
 
 class Task(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "task"
+    __table_args__ = (
+        # list_tasks orders by (task_date, sort_order NULLS LAST); sort_order is
+        # carried in the index so that ordering never needs a sort step.
+        Index("ix_task_org_date", "organization_id", "task_date", "sort_order"),
+        Index("ix_task_recipient_date", "care_recipient_id", "task_date", "sort_order"),
+        Index("ix_task_assignment_date", "assignment_24x7_id", "task_date", "sort_order"),
+        Index("ix_task_visit", "visit_id", "sort_order"),
+        # Overdue sweep: range scan over pending 24/7 tasks not yet flagged.
+        Index(
+            "ix_task_overdue_due",
+            "task_date",
+            postgresql_where=text("status = 'pending' AND assignment_24x7_id IS NOT NULL AND overdue_at IS NULL"),
+            sqlite_where=text("status = 'pending' AND assignment_24x7_id IS NOT NULL AND overdue_at IS NULL"),
+        ),
+    )
 
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
@@ -40,5 +55,7 @@ class Task(Base, UUIDMixin, TimestampMixin):
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     completed_by_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("user.id", ondelete="SET NULL"), nullable=True)
+    # Set by the sweeper on a 24/7 task still pending after its task_date.
+    overdue_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     notes: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     sort_order: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
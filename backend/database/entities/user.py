@@ -6,7 +6,7 @@ from datetime import datetime
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import Boolean, String, DateTime, func
+from sqlalchemy import Boolean, String, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -15,6 +15,7 @@ from backend.database.base import Base, UUIDMixin, TimestampMixin
 
 class User(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "user"
+    __table_args__ = (Index("ix_user_created", "created_at", "id"),)
 
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
     password_hash: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
@@ -6,7 +6,8 @@ from datetime import datetime
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, DateTime, ForeignKey, Text
+from sqlalchemy import DDL, String, DateTime, ForeignKey, Index, Text, event, func, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.database.base import Base, UUIDMixin, TimestampMixin
@@ -14,6 +15,33 @@ from backend.database.base import Base, UUIDMixin, TimestampMixin
 
 class Visit(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "visit"
+    __table_args__ = (
+        # list_visits: organization scope (+ recipient) ordered by scheduled_start.
+        # The leading organization_id column also serves plain org lookups.
+        Index("ix_visit_org_start", "organization_id", "scheduled_start"),
+        Index("ix_visit_org_recipient_start", "organization_id", "care_recipient_id", "scheduled_start"),
+        Index("ix_visit_recipient", "care_recipient_id"),
+        Index("ix_visit_caregiver_start", "assigned_caregiver_id", "scheduled_start"),
+        # Double-booking checks: range scan over a caregiver's visits ending after a start.
+        Index("ix_visit_caregiver_end", "assigned_caregiver_id", "scheduled_end"),
+        Index("ix_visit_scheduled_start", "scheduled_start"),
+        # Recurrence: children of a series by start, and the roller's scan of
+        # series heads whose materialization horizon needs extending.
+        Index("ix_visit_parent_start", "parent_visit_id", "scheduled_start"),
+        Index(
+            "ix_visit_series_horizon",
+            "recurrence_materialized_until",
+            postgresql_where=text("recurrence_rule IS NOT NULL AND parent_visit_id IS NULL"),
+            sqlite_where=text("recurrence_rule IS NOT NULL AND parent_visit_id IS NULL"),
+        ),
+        # No-show sweep: range scan over visits still scheduled, oldest first.
+        Index(
+            "ix_visit_scheduled_due",
+            "scheduled_start",
+            postgresql_where=text("status = 'scheduled'"),
+            sqlite_where=text("status = 'scheduled'"),
+        ),
+    )
 
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organization.id", ondelete="CASCADE"),
@@ -35,8 +63,30 @@ class Visit(Base, UUIDMixin, TimestampMixin):
     address_country: Mapped[Optional[str]] = mapped_column(String(2), nullable=True)
     recurrence_rule: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     parent_visit_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("visit.id", ondelete="SET NULL"), nullable=True)
+    # Series heads only: child visits exist for every occurrence before this instant.
+    recurrence_materialized_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="scheduled")
     checked_in_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     checked_out_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     notes: Mapped[Optional[str]] = mapped_column(String(2000), nullable=True)
     created_by_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("user.id", ondelete="SET NULL"), nullable=True)
+
+
+# A caregiver cannot hold two overlapping booked visits. Postgres only: GiST over
+# (caregiver, tstzrange) needs btree_gist for the uuid equality.
+event.listen(
+    Visit.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+Visit.__table__.append_constraint(
+    ExcludeConstraint(
+        (Visit.__table__.c.assigned_caregiver_id, "="),
+        (func.tstzrange(Visit.__table__.c.scheduled_start, Visit.__table__.c.scheduled_end), "&&"),
+        name="ex_visit_caregiver_overlap",
+        using="gist",
+        where=text(
+            "assigned_caregiver_id IS NOT NULL AND status IN ('scheduled', 'in_progress', 'completed')"
+        ),
+    ).ddl_if(dialect="postgresql")
+)
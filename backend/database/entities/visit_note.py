@@ -5,7 +5,7 @@ Visit note table. Table 2.14 in data-model-mvp1.
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.database.base import Base, UUIDMixin, TimestampMixin
@@ -13,6 +13,7 @@ from backend.database.base import Base, UUIDMixin, TimestampMixin
 
 class VisitNote(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "visit_note"
+    __table_args__ = (Index("ix_visit_note_created", "created_at", "id"),)
 
     visit_id: Mapped[UUID] = mapped_column(
         ForeignKey("visit.id", ondelete="CASCADE"),
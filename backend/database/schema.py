@@ -0,0 +1,109 @@
+"""
+Schema creation for local development, tests, and first deploys.
+
+`create_all` only emits CREATE INDEX for tables it creates itself, so columns
+and indexes added to an entity after its table exists would never be built.
+`create_schema` creates missing tables, adds missing nullable (or
+server-defaulted) columns to existing ones, builds every missing index declared
+on the entities and, on Postgres, adds missing exclusion constraints (such as
+`ex_visit_caregiver_overlap`). It also builds the full-text search index
+(`backend.database.search`). Anything else (type changes, NOT NULL columns
+without a default, dropped columns) still needs a migration.
+
+Run as a script to build the schema on DATABASE_URL:
+
+    python -m backend.database.schema
+
+For production, prefer a migration tool (Alembic).
+"""
+
+import logging
+
+from sqlalchemy import Executable, inspect, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import AddConstraint, CreateColumn
+
+from backend.database.base import Base
+from backend.database.search import search_index_ddl
+import backend.database.entities  # noqa: F401  (registers tables on Base.metadata)
+
+logger = logging.getLogger(__name__)
+
+
+def _add_missing_columns(bind: Engine | Connection) -> None:
+    inspector = inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable and column.server_default is None:
+                raise RuntimeError(
+                    f"{table.name}.{column.name} is NOT NULL without a server default; add it with a migration."
+                )
+            logger.info("Adding column %s to %s", column.name, table.name)
+            table_name = bind.dialect.identifier_preparer.format_table(table)
+            column_ddl = CreateColumn(column).compile(dialect=bind.dialect)
+            _execute(bind, f"ALTER TABLE {table_name} ADD COLUMN {column_ddl}")
+
+
+def _add_missing_exclusion_constraints(bind: Engine | Connection) -> None:
+    """
+    Postgres only. Adding the constraint fails if existing rows already violate
+    it; those have to be resolved first.
+    """
+    if bind.dialect.name != "postgresql":
+        return
+    for table in Base.metadata.sorted_tables:
+        for constraint in table.constraints:
+            if not isinstance(constraint, ExcludeConstraint) or _constraint_exists(bind, constraint.name):
+                continue
+            logger.info("Adding constraint %s to %s", constraint.name, table.name)
+            # GiST equality on uuid columns needs btree_gist.
+            _execute(bind, "CREATE EXTENSION IF NOT EXISTS btree_gist")
+            _execute(bind, AddConstraint(constraint))
+
+
+def _constraint_exists(bind: Engine | Connection, name: str) -> bool:
+    stmt = text("SELECT 1 FROM pg_constraint WHERE conname = :name")
+    if isinstance(bind, Engine):
+        with bind.connect() as conn:
+            return conn.execute(stmt, {"name": name}).first() is not None
+    return bind.execute(stmt, {"name": name}).first() is not None
+
+
+def _execute(bind: Engine | Connection, statement: str | Executable) -> None:
+    if isinstance(statement, str):
+        statement = text(statement)
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            conn.execute(statement)
+    else:
+        bind.execute(statement)
+
+
+def create_schema(bind: Engine | Connection) -> None:
+    """Create all tables, then any columns, indexes and constraints missing from existing tables."""
+    Base.metadata.create_all(bind=bind, checkfirst=True)
+    _add_missing_columns(bind)
+
+    inspector = inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                logger.info("Creating index %s on %s", index.name, table.name)
+                index.create(bind=bind)
+
+    _add_missing_exclusion_constraints(bind)
+
+    for statement in search_index_ddl(bind):
+        _execute(bind, statement)
+
+
+if __name__ == "__main__":
+    from backend.database.session import engine
+
+    logging.basicConfig(level=logging.INFO)
+    create_schema(engine)
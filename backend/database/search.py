@@ -0,0 +1,126 @@
+"""
+Full-text search index over visit notes, care notes and messages, and the
+trigram index behind the person typeahead.
+
+On Postgres each searched table gets a generated `search_vector` tsvector
+column (english configuration) with a GIN index, so the database keeps it in
+sync and a search is an index lookup per table. The columns live outside the
+ORM mappings: they are never written, and SQLite has no tsvector.
+
+On SQLite (tests, local runs) one FTS5 table, `search_document`, stands in. It
+holds the searchable text of every document with the columns needed to scope
+and page results, and triggers keep it in sync with the source tables.
+
+People get a pg_trgm GIN index over `PERSON_DOCUMENT`, the expression the
+person typeahead (`backend.apis.typeahead`) matches word starts in. SQLite
+has no trigram index; the typeahead's LIKE scans an organization's members.
+
+`create_schema` runs `search_index_ddl`, which is idempotent. Adding
+the generated columns to an existing Postgres table rewrites that table.
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+
+SEARCH_CONFIG = "english"
+
+SEARCH_TABLE = "search_document"
+
+# Text searched per table, as a SQL expression over the row.
+_POSTGRES_TEXT = {
+    "visit_note": "coalesce(summary, '') || ' ' || coalesce(incidents, '') || ' ' || coalesce(next_steps, '')",
+    "care_note": "coalesce(summary, '')",
+    "message": "body",
+}
+
+POSTGRES_DDL = [
+    ddl
+    for table, document in _POSTGRES_TEXT.items()
+    for ddl in (
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', {document})) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} USING gin (search_vector)",
+    )
+]
+
+# Names and email of a person, lowercased, each word preceded by a space.
+PERSON_DOCUMENT = "' ' || lower(first_name || ' ' || last_name || ' ' || coalesce(display_name, '') || ' ' || email)"
+
+POSTGRES_DDL += [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f'CREATE INDEX IF NOT EXISTS ix_user_name_trgm ON "user" USING gin (({PERSON_DOCUMENT}) gin_trgm_ops)',
+]
+
+_SQLITE_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    "content, kind UNINDEXED, doc_id UNINDEXED, organization_id UNINDEXED, care_recipient_id UNINDEXED, "
+    "visit_id UNINDEXED, conversation_id UNINDEXED, created_at UNINDEXED, tokenize='porter unicode61')"
+)
+
+# created_at as SQLAlchemy writes DateTime on SQLite; CURRENT_TIMESTAMP server
+# defaults lack the microseconds, which would break keyset comparisons.
+_CREATED_AT = "CASE WHEN length({r}.created_at) = 19 THEN {r}.created_at || '.000000' ELSE {r}.created_at END"
+
+# One SELECT per source producing search_document rows. `{r}` is the source
+# row (NEW in triggers); `{source}` adds the source table for the backfill.
+_SQLITE_ROWS = {
+    "visit_note": (
+        "SELECT coalesce({r}.summary, '') || ' ' || coalesce({r}.incidents, '') || ' ' "
+        "|| coalesce({r}.next_steps, ''), "
+        "'visit_note', {r}.id, v.organization_id, v.care_recipient_id, {r}.visit_id, NULL, {created_at} "
+        "FROM {source}visit AS v WHERE v.id = {r}.visit_id"
+    ),
+    "care_note": (
+        "SELECT coalesce({r}.summary, ''), 'care_note', {r}.id, {r}.organization_id, {r}.care_recipient_id, "
+        "NULL, NULL, {created_at} FROM {source}(SELECT 1)"
+    ),
+    "message": (
+        "SELECT {r}.body, 'message', {r}.id, c.organization_id, c.care_recipient_id, NULL, {r}.conversation_id, "
+        "{created_at} FROM {source}conversation AS c WHERE c.id = {r}.conversation_id"
+    ),
+}
+
+# Columns whose change reindexes a document.
+_SQLITE_WATCHED = {
+    "visit_note": "summary, incidents, next_steps, visit_id",
+    "care_note": "summary, organization_id, care_recipient_id",
+    "message": "body, conversation_id",
+}
+
+_INSERT = (
+    f"INSERT INTO {SEARCH_TABLE} (content, kind, doc_id, organization_id, care_recipient_id, visit_id, "
+    "conversation_id, created_at) "
+)
+
+
+def _sqlite_ddl() -> list[str]:
+    statements = [_SQLITE_TABLE]
+    for table, rows in _SQLITE_ROWS.items():
+        insert = _INSERT + rows.format(r="NEW", source="", created_at=_CREATED_AT.format(r="NEW"))
+        delete = f"DELETE FROM {SEARCH_TABLE} WHERE kind = '{table}' AND doc_id = OLD.id"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN {insert}; END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF {_SQLITE_WATCHED[table]} "
+            f"ON {table} BEGIN {delete}; {insert}; END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN {delete}; END",
+        ]
+    return statements
+
+
+def _sqlite_backfill() -> list[str]:
+    return [
+        _INSERT + rows.format(r=table, source=f"{table}, ", created_at=_CREATED_AT.format(r=table))
+        for table, rows in _SQLITE_ROWS.items()
+    ]
+
+
+def search_index_ddl(bind: Engine | Connection) -> list[str]:
+    """Statements that build whatever is missing of the search index on `bind`."""
+    dialect = bind.dialect.name
+    if dialect == "postgresql":
+        return list(POSTGRES_DDL)
+    if dialect == "sqlite":
+        if inspect(bind).has_table(SEARCH_TABLE):
+            return _sqlite_ddl()
+        return _sqlite_ddl() + _sqlite_backfill()
+    return []
@@ -0,0 +1,565 @@
+"""
+Synthetic agencies for load tests and local runs.
+
+Generates organizations at a configurable scale: locations, staff, caregivers,
+care recipients and their families, memberships, care relationships,
+arrangements, weekly recurring visits (series heads plus their materialized
+children), tasks, visit notes, and a care-circle conversation with messages
+per recipient. Visits cover `weeks_back` weeks before today to `weeks_ahead`
+after; past ones are completed (with check-in times, tasks done, notes) or
+occasionally cancelled or missed, later ones are scheduled.
+
+Data is realistic where the API relies on it: a caregiver's booked visits
+never overlap, series heads carry their RRULE and materialization watermark so
+the roller carries them on, conversations carry their last-message copy, and
+the dashboard rollups are reconciled at the end.
+
+Rows are written in bulk, bypassing the ORM: COPY on Postgres, an executemany
+INSERT elsewhere. Generation is deterministic for a given `--seed`; seeding the
+same seed twice into one database collides on the unique slugs and emails.
+
+    python -m backend.database.seed --organizations 1 --caregivers 500 --recipients 5000
+"""
+
+import argparse
+import csv
+import io
+import logging
+import random
+import time as clock
+from collections import Counter
+from dataclasses import dataclass, fields
+from datetime import date, datetime, time, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Iterator, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Table, insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from backend.database.entities import (
+    CareArrangement,
+    CareRelationship,
+    Conversation,
+    ConversationParticipant,
+    Location,
+    Membership,
+    Message,
+    Organization,
+    Task,
+    User,
+    Visit,
+    VisitNote,
+)
+from backend.scheduling.recurrence import occurrences
+from backend.stats.rollup import reconcile
+
+logger = logging.getLogger(__name__)
+
+# Rows per COPY / INSERT statement.
+BATCH_SIZE = 5000
+
+# Tables in foreign key order.
+TABLES: tuple[Table, ...] = tuple(
+    entity.__table__
+    for entity in (
+        Organization,
+        Location,
+        User,
+        Membership,
+        CareRelationship,
+        CareArrangement,
+        Visit,
+        Task,
+        VisitNote,
+        Conversation,
+        ConversationParticipant,
+        Message,
+    )
+)
+
+FIRST_NAMES = (
+    "Ada", "Ahmed", "Alice", "Ana", "Ben", "Carlos", "Chen", "Dana", "Elena", "Fatima",
+    "Grace", "Hiro", "Ivan", "Jamal", "Julia", "Kofi", "Lena", "Liam", "Maria", "Mei",
+    "Noah", "Olga", "Priya", "Rosa", "Sam", "Sofia", "Tariq", "Uma", "Victor", "Yara",
+)
+LAST_NAMES = (
+    "Adams", "Baker", "Costa", "Diaz", "Evans", "Fischer", "Garcia", "Hughes", "Ito", "Jensen",
+    "Khan", "Lopez", "Martin", "Nguyen", "Okafor", "Patel", "Quinn", "Rossi", "Silva", "Tanaka",
+    "Uddin", "Vargas", "Walsh", "Xu", "Young", "Zhang",
+)
+CITIES = ("Springfield", "Riverside", "Fairview", "Oakland", "Lakewood", "Greenville")
+STREETS = ("Main", "Oak", "Maple", "Cedar", "Pine", "Elm", "Lake", "Hill", "Park", "Church")
+
+VISIT_TYPES = ("personal_care", "personal_care", "personal_care", "companionship", "nursing", "respite")
+TASKS = (
+    ("Assist with bathing", "adl"),
+    ("Assist with dressing", "adl"),
+    ("Prepare breakfast", "household"),
+    ("Light housekeeping", "household"),
+    ("Morning medication", "medication"),
+    ("Evening medication", "medication"),
+    ("Walk around the block", "exercise"),
+    ("Range-of-motion exercises", "exercise"),
+    ("Check blood pressure", "other"),
+)
+MOODS = ("cheerful", "calm", "tired", "anxious", "talkative")
+NOTES = (
+    "Visit went well; all tasks done.",
+    "Client was tired but ate a full meal.",
+    "Took medication with breakfast, no side effects noted.",
+    "Short walk in the garden, good spirits.",
+    "Client asked about the next appointment with the GP.",
+)
+MESSAGES = (
+    "How was today's visit?",
+    "All good, she had a good appetite today.",
+    "Could the next visit start half an hour later?",
+    "Pharmacy delivery is due on Thursday.",
+    "Thanks for the update!",
+    "He mentioned some knee pain, keep an eye on it.",
+    "We'll be away this weekend, call the backup contact if needed.",
+)
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+# Visits start on the hour between these hours (UTC) and last at most an hour,
+# so a caregiver's visits overlap exactly when they share a (weekday, hour) slot.
+FIRST_HOUR, LAST_HOUR = 7, 19
+VISIT_MINUTES = (30, 45, 60)
+VISIT_DAYS_PER_WEEK = (1, 2, 2, 3, 3, 5)
+
+# Caregivers tried for a recipient's slots before the series is left unassigned.
+CAREGIVER_ATTEMPTS = 10
+
+
+@dataclass
+class Scale:
+    """How much to generate; counts other than `organizations` are per organization."""
+
+    organizations: int = 1
+    caregivers: int = 500
+    recipients: int = 5000
+    family_per_recipient: int = 2
+    staff: int = 5
+    locations: int = 3
+    messages_per_conversation: int = 6
+    weeks_back: int = 2
+    weeks_ahead: int = 2
+
+
+def _at(day: date, hour: int = 0) -> datetime:
+    return datetime.combine(day, time(hour), timezone.utc)
+
+
+class _Agency:
+    """The rows of one generated organization, keyed by table name."""
+
+    def __init__(self, rng: random.Random, scale: Scale, now: datetime) -> None:
+        self.rng = rng
+        self.scale = scale
+        self.now = now
+        self.first = (now - timedelta(weeks=scale.weeks_back)).date()
+        self.end = _at((now + timedelta(weeks=scale.weeks_ahead)).date() + timedelta(days=1))
+        self.rows: dict[str, list[dict[str, Any]]] = {table.name: [] for table in TABLES}
+        self.org_id = self.new_id()
+        self._slug = f"agency-{self.org_id.hex[:8]}"
+        self._emails = 0
+
+    def new_id(self) -> UUID:
+        return UUID(int=self.rng.getrandbits(128), version=4)
+
+    def add(self, table: Table, **row: Any) -> dict[str, Any]:
+        self.rows[table.name].append(row)
+        return row
+
+    def address(self) -> dict[str, Any]:
+        return {
+            "address_street": f"{self.rng.randint(1, 999)} {self.rng.choice(STREETS)} St",
+            "address_city": self.rng.choice(CITIES),
+            "address_region": "CA",
+            "address_postal_code": f"9{self.rng.randint(0, 9999):04d}",
+            "address_country": "US",
+        }
+
+    def user(self) -> UUID:
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        self._emails += 1
+        return self.add(
+            User.__table__,
+            id=self.new_id(),
+            email=f"{first}.{last}.{self._emails}@{self._slug}.example.org".lower(),
+            first_name=first,
+            last_name=last,
+            display_name=f"{first} {last}",
+            phone=f"+1555{self.rng.randint(0, 9999999):07d}",
+            timezone="UTC",
+            locale="en-US",
+            mfa_enabled=False,
+            status="active",
+        )["id"]
+
+    def member(self, role: str, location_id: Optional[UUID] = None) -> UUID:
+        user_id = self.user()
+        self.add(
+            Membership.__table__,
+            id=self.new_id(),
+            user_id=user_id,
+            organization_id=self.org_id,
+            role=role,
+            location_id=location_id,
+            status="active",
+        )
+        return user_id
+
+    def relate(self, recipient_id: UUID, user_id: UUID, role: str) -> None:
+        self.add(
+            CareRelationship.__table__,
+            id=self.new_id(),
+            care_recipient_id=recipient_id,
+            related_user_id=user_id,
+            organization_id=self.org_id,
+            role=role,
+            is_24x7_caregiver=False,
+            start_date=self.first - timedelta(days=self.rng.randint(0, 365)),
+            status="active",
+        )
+
+    def generate(self) -> dict[str, list[dict[str, Any]]]:
+        rng, scale = self.rng, self.scale
+        self.add(
+            Organization.__table__,
+            id=self.org_id,
+            name=f"{rng.choice(CITIES)} Home Care {self.org_id.hex[:4].upper()}",
+            type="agency",
+            slug=self._slug,
+            primary_email=f"office@{self._slug}.example.org",
+            timezone="UTC",
+            status="active",
+            **self.address(),
+        )
+        locations = [
+            self.add(
+                Location.__table__,
+                id=self.new_id(),
+                organization_id=self.org_id,
+                name=f"{city} office",
+                timezone="UTC",
+                is_default=i == 0,
+                **self.address(),
+            )["id"]
+            for i, city in enumerate(rng.sample(CITIES, min(scale.locations, len(CITIES))))
+        ]
+        staff = [
+            self.member("agency_admin" if i == 0 else "supervisor", rng.choice(locations or [None]))
+            for i in range(max(1, scale.staff))
+        ]
+        caregivers = [self.member("caregiver", rng.choice(locations or [None])) for _ in range(scale.caregivers)]
+        booked: dict[UUID, set[tuple[int, int]]] = {caregiver: set() for caregiver in caregivers}
+        for _ in range(scale.recipients):
+            self.recipient(caregivers, booked, staff)
+        return self.rows
+
+    def recipient(
+        self,
+        caregivers: Sequence[UUID],
+        booked: dict[UUID, set[tuple[int, int]]],
+        staff: Sequence[UUID],
+    ) -> None:
+        rng = self.rng
+        recipient_id = self.user()
+        family = [
+            self.member("family_editor" if i == 0 else "family_viewer")
+            for i in range(self.scale.family_per_recipient)
+        ]
+        for i, user_id in enumerate(family):
+            self.relate(recipient_id, user_id, "primary_contact" if i == 0 else "family_viewer")
+        self.add(
+            CareArrangement.__table__,
+            id=self.new_id(),
+            care_recipient_id=recipient_id,
+            organization_id=self.org_id,
+            mode="visits_only",
+            effective_from=self.first - timedelta(days=rng.randint(30, 720)),
+            effective_to=None,
+        )
+
+        days = sorted(rng.sample(range(7), rng.choice(VISIT_DAYS_PER_WEEK)))
+        hour = rng.randrange(FIRST_HOUR, LAST_HOUR)
+        slots = {(day, hour) for day in days}
+        caregiver_id = None
+        for candidate in rng.sample(list(caregivers), min(CAREGIVER_ATTEMPTS, len(caregivers))):
+            if not slots & booked[candidate]:
+                caregiver_id = candidate
+                booked[candidate] |= slots
+                break
+        visit_type = rng.choice(VISIT_TYPES)
+        if caregiver_id is not None:
+            self.relate(recipient_id, caregiver_id, "nurse" if visit_type == "nursing" else "aide")
+        self.series(recipient_id, caregiver_id, visit_type, days, hour, rng.choice(staff))
+        self.conversation(recipient_id, family + ([caregiver_id] if caregiver_id else []))
+
+    def series(
+        self,
+        recipient_id: UUID,
+        caregiver_id: Optional[UUID],
+        visit_type: str,
+        days: list[int],
+        hour: int,
+        created_by_id: UUID,
+    ) -> None:
+        """A weekly series from the start of the window: its head and one child per later occurrence."""
+        first_day = next(
+            self.first + timedelta(days=offset)
+            for offset in range(7)
+            if (self.first + timedelta(days=offset)).weekday() in days
+        )
+        head = SimpleNamespace(
+            id=self.new_id(),
+            recurrence_rule=f"RRULE:FREQ=WEEKLY;BYDAY={','.join(WEEKDAYS[day] for day in days)}",
+            scheduled_start=_at(first_day, hour),
+            scheduled_end=_at(first_day, hour) + timedelta(minutes=self.rng.choice(VISIT_MINUTES)),
+            timezone="UTC",
+        )
+        shared = {
+            "organization_id": self.org_id,
+            "care_recipient_id": recipient_id,
+            "assigned_caregiver_id": caregiver_id,
+            "visit_type": visit_type,
+            "timezone": "UTC",
+            "notes": None,
+            "created_by_id": created_by_id,
+            **self.address(),
+        }
+        for occurrence in occurrences(head, head.scheduled_start, self.end):
+            is_head = occurrence.start == head.scheduled_start
+            visit = self.add(
+                Visit.__table__,
+                id=head.id if is_head else self.new_id(),
+                scheduled_start=occurrence.start,
+                scheduled_end=occurrence.end,
+                recurrence_rule=head.recurrence_rule if is_head else None,
+                parent_visit_id=None if is_head else head.id,
+                recurrence_materialized_until=self.end if is_head else None,
+                # A cancelled or missed head would end the series.
+                **self.outcome(occurrence.start, occurrence.end, caregiver_id, can_miss=not is_head),
+                **shared,
+            )
+            self.tasks(visit)
+            if visit["status"] == "completed" and caregiver_id is not None and self.rng.random() < 0.6:
+                self.add(
+                    VisitNote.__table__,
+                    id=self.new_id(),
+                    visit_id=visit["id"],
+                    author_id=caregiver_id,
+                    summary=self.rng.choice(NOTES),
+                    mood=self.rng.choice(MOODS),
+                    incidents=None,
+                    next_steps=None,
+                )
+
+    def outcome(
+        self, start: datetime, end: datetime, caregiver_id: Optional[UUID], can_miss: bool
+    ) -> dict[str, Any]:
+        if start > self.now:
+            return {"status": "scheduled", "checked_in_at": None, "checked_out_at": None}
+        roll = self.rng.random()
+        if can_miss and (caregiver_id is None or roll < 0.03):
+            return {"status": "no_show", "checked_in_at": None, "checked_out_at": None}
+        if can_miss and roll < 0.08:
+            return {"status": "cancelled", "checked_in_at": None, "checked_out_at": None}
+        checked_in = start + timedelta(minutes=self.rng.randint(-5, 10))
+        if end > self.now:
+            return {"status": "in_progress", "checked_in_at": checked_in, "checked_out_at": None}
+        checked_out = end + timedelta(minutes=self.rng.randint(-5, 10))
+        return {"status": "completed", "checked_in_at": checked_in, "checked_out_at": checked_out}
+
+    def tasks(self, visit: dict[str, Any]) -> None:
+        done = visit["status"] == "completed"
+        for order, (title, category) in enumerate(self.rng.sample(TASKS, self.rng.randint(1, 3))):
+            task_status = "pending"
+            if done:
+                task_status = "completed" if self.rng.random() < 0.9 else "skipped"
+            elif visit["status"] == "cancelled":
+                task_status = "skipped"
+            self.add(
+                Task.__table__,
+                id=self.new_id(),
+                organization_id=self.org_id,
+                care_recipient_id=visit["care_recipient_id"],
+                visit_id=visit["id"],
+                task_date=visit["scheduled_start"].date(),
+                title=title,
+                category=category,
+                status=task_status,
+                completed_at=visit["checked_out_at"] if task_status == "completed" else None,
+                completed_by_id=visit["assigned_caregiver_id"] if task_status == "completed" else None,
+                sort_order=order,
+            )
+
+    def conversation(self, recipient_id: UUID, members: list[UUID]) -> None:
+        """The recipient's care-circle thread, with messages spread over the past weeks."""
+        rng = self.rng
+        conversation_id = self.new_id()
+        started = _at(self.first)
+        span = max(1, int((self.now - started).total_seconds()))
+        sent = sorted(
+            started + timedelta(seconds=rng.randrange(span)) for _ in range(self.scale.messages_per_conversation)
+        )
+        last: dict[str, Any] = {}
+        for at in sent if members else []:
+            last = self.add(
+                Message.__table__,
+                id=self.new_id(),
+                conversation_id=conversation_id,
+                sender_id=rng.choice(members),
+                body=rng.choice(MESSAGES),
+                status="sent",
+                created_at=at,
+            )
+        self.add(
+            Conversation.__table__,
+            id=conversation_id,
+            organization_id=self.org_id,
+            care_recipient_id=recipient_id,
+            title="Care circle",
+            type="care_circle",
+            last_message_id=last.get("id"),
+            last_message_sender_id=last.get("sender_id"),
+            last_message_preview=last.get("body"),
+            last_message_at=last.get("created_at"),
+            last_activity_at=last.get("created_at", started),
+        )
+        for user_id in members:
+            has_read = bool(last) and (user_id == last["sender_id"] or rng.random() < 0.5)
+            self.add(
+                ConversationParticipant.__table__,
+                id=self.new_id(),
+                conversation_id=conversation_id,
+                user_id=user_id,
+                role="member",
+                joined_at=started,
+                last_read_message_id=last.get("id") if has_read else None,
+                last_read_at=last.get("created_at") if has_read else None,
+            )
+
+
+def _chunks(rows: Sequence[dict[str, Any]], size: int) -> Iterator[Sequence[dict[str, Any]]]:
+    for i in range(0, len(rows), size):
+        yield rows[i : i + size]
+
+
+def _csv(value: Any) -> Any:
+    # An unquoted empty field is NULL in COPY's CSV format; generated strings are never empty.
+    return "" if value is None else value
+
+
+def _copy(conn: Connection, table: Table, rows: Sequence[dict[str, Any]]) -> None:
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_csv(row[column]) for column in columns])
+    quoted = ", ".join(conn.dialect.identifier_preparer.quote(column) for column in columns)
+    statement = f"COPY {conn.dialect.identifier_preparer.format_table(table)} ({quoted}) FROM STDIN WITH (FORMAT csv)"
+    cursor = conn.connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+        else:  # psycopg 3
+            with cursor.copy(statement) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
+
+def write(conn: Connection, table: Table, rows: Sequence[dict[str, Any]], batch_size: int = BATCH_SIZE) -> None:
+    """Insert `rows` (dicts with the same keys) in batches: COPY on Postgres, executemany otherwise."""
+    use_copy = conn.dialect.name == "postgresql" and conn.dialect.driver in ("psycopg2", "psycopg")
+    for chunk in _chunks(rows, batch_size):
+        if use_copy:
+            _copy(conn, table, chunk)
+        else:
+            conn.execute(insert(table), list(chunk))
+
+
+def seed(
+    bind: Engine,
+    scale: Scale,
+    seed: int = 0,
+    now: Optional[datetime] = None,
+    batch_size: int = BATCH_SIZE,
+) -> dict[UUID, Counter[str]]:
+    """
+    Generate and write `scale.organizations` agencies, one transaction each,
+    then reconcile the dashboard rollups over the seeded days. Returns the rows
+    written per table, by organization id.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    counts: dict[UUID, Counter[str]] = {}
+    with Session(bind) as db:
+        for n in range(scale.organizations):
+            started = clock.perf_counter()
+            agency = _Agency(rng, scale, now)
+            rows = agency.generate()
+            conn = db.connection()
+            for table in TABLES:
+                write(conn, table, rows[table.name], batch_size)
+            counts[agency.org_id] = Counter({name: len(table_rows) for name, table_rows in rows.items()})
+            db.commit()
+            elapsed = clock.perf_counter() - started
+            total = sum(counts[agency.org_id].values())
+            logger.info(
+                "Seeded organization %s (%d/%d): %d rows in %.1fs (%.0f rows/s)",
+                agency.org_id,
+                n + 1,
+                scale.organizations,
+                total,
+                elapsed,
+                total / elapsed,
+            )
+        first = (now - timedelta(weeks=scale.weeks_back)).date()
+        last = (now + timedelta(weeks=scale.weeks_ahead)).date()
+        reconcile(db, first, last)
+    return counts
+
+
+def _utc(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.database.seed", description=__doc__.strip().splitlines()[0]
+    )
+    for field in fields(Scale):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=int, default=field.default)
+    parser.add_argument("--seed", type=int, default=0, help="random seed; the same seed generates the same rows")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per COPY/INSERT statement")
+    parser.add_argument(
+        "--as-of",
+        type=_utc,
+        help="seed as if it were this UTC time (default now); e.g. 06:00 today leaves all of today scheduled",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    from backend.database.schema import create_schema
+    from backend.database.session import engine
+
+    logging.basicConfig(level=logging.INFO)
+    args = _parse_args()
+    create_schema(engine)
+    written = seed(
+        engine,
+        Scale(**{field.name: getattr(args, field.name) for field in fields(Scale)}),
+        seed=args.seed,
+        now=args.as_of,
+        batch_size=args.batch_size,
+    )
+    for name, count in sum(written.values(), Counter()).items():
+        logger.info("%s: %d rows", name, count)
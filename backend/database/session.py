@@ -2,12 +2,21 @@
 Database engine and session factory.
 
 Uses environment or default connection string. Replace with your config.
+
+Two access paths are available:
+
+- Sync: `engine` / `SessionLocal` / `get_db`, used by handlers that run in the
+  FastAPI threadpool.
+- Async: `async_engine` / `AsyncSessionLocal` / `get_async_db` (asyncpg driver),
+  used by the `backend.apis.routes.aio` handlers when `DATABASE_ASYNC=true`.
 """
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 import os
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from backend.database.base import Base
@@ -18,13 +27,55 @@ DATABASE_URL = os.getenv(
     "postgresql://localhost:5432/homecare",
 )
 
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() == "true"
+
+# Serve the hot routers (visits, tasks, persons, memberships, care relationships)
+# from an AsyncSession instead of the threadpool.
+USE_ASYNC_DB = os.getenv("DATABASE_ASYNC", "false").lower() == "true"
+
+# Async drivers for each sync backend we know how to translate.
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> URL:
+    """Translate a sync database URL into the equivalent async driver URL."""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None or parsed.drivername == driver:
+        return parsed
+    return parsed.set(drivername=driver)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
-    echo=os.getenv("SQL_ECHO", "false").lower() == "true",
+    echo=SQL_ECHO,
+)
+
+# expire_on_commit=False: the flush already fetched server-generated columns
+# (eager defaults), so expiring on commit would only force a reload SELECT.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Only build the async engine when enabled so asyncpg stays optional for
+# deployments that run the sync path.
+async_engine = (
+    create_async_engine(ASYNC_DATABASE_URL, pool_pre_ping=True, echo=SQL_ECHO)
+    if USE_ASYNC_DB
+    else None
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: as above, and because attribute access after commit
+# would otherwise trigger an implicit (under asyncio, illegal) lazy load.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -34,3 +85,9 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that yields an AsyncSession and closes it after the request."""
+    async with AsyncSessionLocal() as db:
+        yield db
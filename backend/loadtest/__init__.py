@@ -0,0 +1,6 @@
+"""
+Load tests: scripted scenarios run against a local app instance.
+
+Seed the database with `backend.database.seed`, start the app, then run
+`python -m backend.loadtest run`; see `backend.loadtest.__main__`.
+"""
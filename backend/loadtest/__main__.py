@@ -0,0 +1,78 @@
+"""
+Load-test command line.
+
+    # Seed, then start the app against the same DATABASE_URL, e.g. with
+    # RATE_LIMIT_ENABLED=false so admission control does not cap the load.
+    python -m backend.database.seed --caregivers 500 --recipients 5000
+    uvicorn backend.apis.main:app --workers 4
+
+    python -m backend.loadtest run --label before --concurrency 50 --duration 60
+    python -m backend.loadtest run --label after --scenario calendar_browse
+    python -m backend.loadtest compare --baseline before --candidate after
+
+`run` reads its context (organization, users, today's visits) from the
+database at DATABASE_URL, runs each scenario in turn, prints its summary, and
+appends it to the results file (loadtest-results.jsonl by default).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Optional, Sequence
+from uuid import UUID
+
+from backend.database.session import SessionLocal
+from backend.loadtest.runner import append_results, compare, read_results, run
+from backend.loadtest.scenarios import SCENARIOS, load_context
+
+logger = logging.getLogger(__name__)
+
+RESULTS_FILE = Path("loadtest-results.jsonl")
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m backend.loadtest")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run scenarios against an app instance")
+    run_parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    run_parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), help="repeatable; all scenarios by default"
+    )
+    run_parser.add_argument("--concurrency", type=int, default=20, help="concurrent simulated users")
+    run_parser.add_argument("--duration", type=float, default=30.0, help="seconds per scenario")
+    run_parser.add_argument("--organization", type=UUID, help="organization to act on; the largest seeded one by default")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--label", help="run label in the results file; the start time by default")
+    run_parser.add_argument("--out", type=Path, default=RESULTS_FILE)
+
+    compare_parser = commands.add_parser("compare", help="compare two runs in a results file")
+    compare_parser.add_argument("--baseline", help="run label; the second to last run by default")
+    compare_parser.add_argument("--candidate", help="run label; the last run by default")
+    compare_parser.add_argument("--results", type=Path, default=RESULTS_FILE)
+    return parser.parse_args(argv)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    with SessionLocal() as db:
+        context = load_context(db, args.organization)
+    results = []
+    for name in args.scenario or SCENARIOS:
+        result = await run(name, SCENARIOS[name], context, args.base_url, args.concurrency, args.duration, args.seed)
+        logger.info("%s", json.dumps(result))
+        results.append(result)
+    label = args.label or results[0]["started_at"]
+    append_results(args.out, label, results)
+    logger.info("Appended run %r to %s", label, args.out)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    arguments = _parse_args()
+    if arguments.command == "run":
+        asyncio.run(_run(arguments))
+    else:
+        print(compare(read_results(arguments.results), arguments.baseline, arguments.candidate))
@@ -0,0 +1,168 @@
+"""
+Closed-loop load generation and the results file.
+
+`run` starts `concurrency` workers that repeat a scenario's step for
+`duration` seconds, each waiting for its requests before the next, against an
+app at a base URL (or any httpx transport). Every request is timed by name
+(method and route template). Latency percentiles and throughput count served
+requests only: a 429 or 503 from admission control is counted under its
+status and kept out of both, so a throttled run does not look fast.
+
+Results are appended to a JSON lines file, one line per scenario run, tagged
+with a run label. `compare` reads two labels back and reports the change.
+"""
+
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+import httpx
+
+API_PREFIX = "/api/v1"
+
+# Statuses of requests turned away before any work was done.
+REJECTED_STATUSES = frozenset({429, 503})
+
+PERCENTILES = (50, 95, 99)
+
+# Per-request timeout, in seconds; a timed-out request counts as an error.
+REQUEST_TIMEOUT = 30.0
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending sequence; 0 for an empty one."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _latency_summary(latencies: list[float]) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    summary: dict[str, Any] = {"requests": len(ordered)}
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = round(percentile(ordered, p) * 1000, 2)
+    summary["max_ms"] = round(ordered[-1] * 1000, 2) if ordered else 0.0
+    return summary
+
+
+class LoadClient:
+    """An httpx client that times every request by name."""
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.client = client
+        self.latencies: defaultdict[str, list[float]] = defaultdict(list)
+        self.statuses: Counter[str] = Counter()
+
+    async def call(self, name: str, method: str, url: str, **kwargs: Any) -> Optional[httpx.Response]:
+        """Send one request; None if it failed before a response (counted as `error`)."""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.statuses["error"] += 1
+            return None
+        elapsed = time.perf_counter() - started
+        self.statuses[str(response.status_code)] += 1
+        if response.status_code not in REJECTED_STATUSES:
+            self.latencies[name].append(elapsed)
+        return response
+
+
+Step = Callable[[LoadClient, Any, random.Random], Awaitable[bool]]
+
+
+async def run(
+    name: str,
+    step: Step,
+    context: Any,
+    base_url: str = "http://127.0.0.1:8000",
+    concurrency: int = 10,
+    duration: float = 30.0,
+    seed: int = 0,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> dict[str, Any]:
+    """Run one scenario and return its result record."""
+    started_at = datetime.now(timezone.utc)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url.rstrip("/") + API_PREFIX, transport=transport, limits=limits, timeout=REQUEST_TIMEOUT
+    ) as http:
+        client = LoadClient(http)
+        started = time.perf_counter()
+        deadline = started + duration
+
+        async def worker(n: int) -> None:
+            rng = random.Random(seed * 1_000_003 + n)
+            while time.perf_counter() < deadline and await step(client, context, rng):
+                pass
+
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    served = [latency for latencies in client.latencies.values() for latency in latencies]
+    return {
+        "scenario": name,
+        "started_at": started_at.isoformat(),
+        "base_url": base_url,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(served) / elapsed, 2) if elapsed else 0.0,
+        **_latency_summary(served),
+        "statuses": dict(sorted(client.statuses.items())),
+        "by_request": {
+            request: _latency_summary(latencies) for request, latencies in sorted(client.latencies.items())
+        },
+    }
+
+
+def append_results(path: Path, label: str, results: Sequence[dict[str, Any]]) -> None:
+    """Append result records to the JSON lines file at `path`, tagged with the run `label`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps({"run": label, **result}) + "\n")
+
+
+def read_results(path: Path) -> list[dict[str, Any]]:
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def compare(records: Sequence[dict[str, Any]], baseline: Optional[str] = None, candidate: Optional[str] = None) -> str:
+    """
+    A table of each scenario's throughput and latency in two runs, and the
+    change. The runs default to the last two labels in the file; a label run
+    more than once is represented by its last record per scenario.
+    """
+    labels = list(dict.fromkeys(record["run"] for record in records))
+    if baseline is None or candidate is None:
+        if len(labels) < 2:
+            raise ValueError("Need two runs to compare")
+        baseline, candidate = baseline or labels[-2], candidate or labels[-1]
+    runs: dict[str, dict[str, dict[str, Any]]] = {baseline: {}, candidate: {}}
+    for record in records:
+        if record["run"] in runs:
+            runs[record["run"]][record["scenario"]] = record
+    metrics = ["throughput_rps", *(f"p{p}_ms" for p in PERCENTILES)]
+    lines = [f"{'scenario':<20} {'metric':<15} {baseline:>12} {candidate:>12} {'change':>9}"]
+    for scenario in sorted(runs[baseline].keys() & runs[candidate].keys()):
+        before, after = runs[baseline][scenario], runs[candidate][scenario]
+        for metric in metrics:
+            lines.append(
+                f"{scenario:<20} {metric:<15} {before[metric]:>12} {after[metric]:>12} "
+                f"{_change(before[metric], after[metric]):>9}"
+            )
+    return "\n".join(lines)
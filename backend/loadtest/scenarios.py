@@ -0,0 +1,214 @@
+"""
+Load-test scenarios against a seeded organization.
+
+A scenario is an async step that a worker repeats until the run ends: it makes
+one user action's requests through a `LoadClient`, which times them, and
+returns False once it has nothing left to do.
+
+- `morning_check_in`: caregivers start today's visits in schedule order, each
+  followed by the visit's task list. Every visit is started once, so a run
+  ends early when the day's visits run out.
+- `calendar_browse`: a week of the calendar around today, for a caregiver or a
+  care recipient, or a recipient's visit list.
+- `dashboard_refresh`: a supervisor's dashboard: today's counters and task list.
+- `bulk_scheduling`: a supervisor schedules `BULK_SIZE` one-off visits with one
+  batch request. Visits are placed an hour apart after the organization's
+  last visit (at least a year out), so they never double-book a caregiver,
+  not even across runs.
+
+Requests carry the identity of the user acting: a token minted with the app's
+signing key (JWT_SIGNING_KEYS) when authentication is on, else the
+`X-User-Id` / `X-Organization-Id` headers.
+"""
+
+import itertools
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.apis import auth
+from backend.database.entities import CareRelationship, Membership, Organization, Visit
+from backend.loadtest.runner import LoadClient
+from backend.scheduling.timeutils import as_utc
+
+# Visits per `bulk_scheduling` request.
+BULK_SIZE = 25
+
+# Earliest `bulk_scheduling` visits, ahead of today.
+BULK_OFFSET = timedelta(days=365)
+
+# Seconds a minted token is valid; longer than any run.
+TOKEN_TTL = 24 * 3600
+
+
+@dataclass
+class Context:
+    """The seeded organization a run acts on."""
+
+    organization_id: UUID
+    today: date
+    supervisors: list[UUID]
+    caregivers: list[UUID]
+    recipients: list[UUID]
+    # (visit id, caregiver id) of today's scheduled visits, in schedule order.
+    check_ins: deque[tuple[UUID, UUID]]
+    # Start of the first `bulk_scheduling` visit.
+    bulk_start: datetime
+    _tokens: dict[UUID, str] = field(default_factory=dict, init=False, repr=False)
+    _slots: itertools.count = field(default_factory=itertools.count, init=False, repr=False)
+
+    def headers(self, user_id: UUID, role: str) -> dict[str, str]:
+        headers = {"X-Organization-Id": str(self.organization_id)}
+        if not auth.auth_enabled():
+            headers["X-User-Id"] = str(user_id)
+            return headers
+        token = self._tokens.get(user_id)
+        if token is None:
+            kid, key = next(iter(auth.SIGNING_KEYS.items()))
+            claims = {"sub": str(user_id), "exp": time.time() + TOKEN_TTL, "orgs": {str(self.organization_id): role}}
+            token = self._tokens[user_id] = auth.encode_token(claims, key, kid)
+        headers["Authorization"] = f"Bearer {token}"
+        return headers
+
+    def next_slot(self) -> datetime:
+        """Start of the next `bulk_scheduling` visit; one hour after the previous one."""
+        return self.bulk_start + timedelta(hours=next(self._slots))
+
+
+def load_context(db: Session, organization_id: Optional[UUID] = None, today: Optional[date] = None) -> Context:
+    """
+    Read the users and today's visits of `organization_id`, or of the seeded
+    organization (slug `agency-...`) with the most caregivers.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    if organization_id is None:
+        organization_id = db.scalar(
+            select(Organization.id)
+            .join(Membership, Membership.organization_id == Organization.id)
+            .where(Organization.slug.like("agency-%"), Membership.role == "caregiver")
+            .group_by(Organization.id)
+            .order_by(func.count().desc(), Organization.id)
+            .limit(1)
+        )
+        if organization_id is None:
+            raise LookupError("No seeded organization; run `python -m backend.database.seed` first")
+
+    def members(*roles: str) -> list[UUID]:
+        return list(
+            db.scalars(
+                select(Membership.user_id)
+                .where(
+                    Membership.organization_id == organization_id,
+                    Membership.role.in_(roles),
+                    Membership.status == "active",
+                )
+                .order_by(Membership.user_id)
+            )
+        )
+
+    recipients = db.scalars(
+        select(CareRelationship.care_recipient_id)
+        .where(CareRelationship.organization_id == organization_id, CareRelationship.status == "active")
+        .distinct()
+        .order_by(CareRelationship.care_recipient_id)
+    )
+    start = datetime.combine(today, datetime.min.time(), timezone.utc)
+    check_ins = db.execute(
+        select(Visit.id, Visit.assigned_caregiver_id)
+        .where(
+            Visit.organization_id == organization_id,
+            Visit.status == "scheduled",
+            Visit.assigned_caregiver_id.is_not(None),
+            Visit.scheduled_start >= start,
+            Visit.scheduled_start < start + timedelta(days=1),
+        )
+        .order_by(Visit.scheduled_start, Visit.id)
+    )
+    last_end = db.scalar(select(func.max(Visit.scheduled_end)).where(Visit.organization_id == organization_id))
+    bulk_start = start + BULK_OFFSET
+    if last_end is not None:
+        bulk_start = max(bulk_start, as_utc(last_end).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1))
+    return Context(
+        organization_id=organization_id,
+        today=today,
+        supervisors=members("supervisor", "agency_admin"),
+        caregivers=members("caregiver"),
+        recipients=list(recipients),
+        check_ins=deque((visit_id, caregiver_id) for visit_id, caregiver_id in check_ins),
+        bulk_start=bulk_start,
+    )
+
+
+def _week(ctx: Context, weeks: int) -> dict[str, str]:
+    monday = ctx.today - timedelta(days=ctx.today.weekday()) + timedelta(weeks=weeks)
+    start = datetime.combine(monday, datetime.min.time(), timezone.utc)
+    return {"from": start.isoformat(), "to": (start + timedelta(days=7)).isoformat()}
+
+
+async def morning_check_in(client: LoadClient, ctx: Context, rng: random.Random) -> bool:
+    if not ctx.check_ins:
+        return False
+    visit_id, caregiver_id = ctx.check_ins.popleft()
+    headers = ctx.headers(caregiver_id, "caregiver")
+    await client.call("POST /visits/{visit_id}/start", "POST", f"/visits/{visit_id}/start", headers=headers)
+    await client.call("GET /tasks", "GET", "/tasks", params={"visit_id": str(visit_id)}, headers=headers)
+    return True
+
+
+async def calendar_browse(client: LoadClient, ctx: Context, rng: random.Random) -> bool:
+    headers = ctx.headers(rng.choice(ctx.supervisors), "supervisor")
+    roll = rng.random()
+    if roll < 0.4:
+        params = {**_week(ctx, rng.randint(-1, 1)), "caregiver_id": str(rng.choice(ctx.caregivers))}
+        await client.call("GET /calendar", "GET", "/calendar", params=params, headers=headers)
+    elif roll < 0.7:
+        params = {**_week(ctx, rng.randint(-1, 1)), "care_recipient_id": str(rng.choice(ctx.recipients))}
+        await client.call("GET /calendar", "GET", "/calendar", params=params, headers=headers)
+    else:
+        params = {"care_recipient_id": str(rng.choice(ctx.recipients))}
+        await client.call("GET /visits", "GET", "/visits", params=params, headers=headers)
+    return True
+
+
+async def dashboard_refresh(client: LoadClient, ctx: Context, rng: random.Random) -> bool:
+    headers = ctx.headers(rng.choice(ctx.supervisors), "supervisor")
+    params = {"date": ctx.today.isoformat()}
+    await client.call("GET /dashboard/stats", "GET", "/dashboard/stats", params=params, headers=headers)
+    await client.call("GET /tasks", "GET", "/tasks", headers=headers)
+    return True
+
+
+async def bulk_scheduling(client: LoadClient, ctx: Context, rng: random.Random) -> bool:
+    items = []
+    for _ in range(BULK_SIZE):
+        start = ctx.next_slot()
+        items.append(
+            {
+                "organization_id": str(ctx.organization_id),
+                "care_recipient_id": str(rng.choice(ctx.recipients)),
+                "assigned_caregiver_id": str(rng.choice(ctx.caregivers)),
+                "visit_type": "personal_care",
+                "scheduled_start": start.isoformat(),
+                "scheduled_end": (start + timedelta(minutes=45)).isoformat(),
+            }
+        )
+    headers = ctx.headers(rng.choice(ctx.supervisors), "supervisor")
+    await client.call("POST /visits:batch", "POST", "/visits:batch", json={"items": items}, headers=headers)
+    return True
+
+
+Scenario = Callable[[LoadClient, Context, random.Random], Awaitable[bool]]
+
+SCENARIOS: dict[str, Scenario] = {
+    "morning_check_in": morning_check_in,
+    "calendar_browse": calendar_browse,
+    "dashboard_refresh": dashboard_refresh,
+    "bulk_scheduling": bulk_scheduling,
+}
@@ -0,0 +1,3 @@
+"""
+Notifications: reminders scheduled ahead of time and the channels that deliver them.
+"""
@@ -0,0 +1,54 @@
+"""
+Delivery channels for due reminders.
+
+A channel writes a batch of reminders in the caller's transaction; the
+scheduler commits once per batch. `InAppChannel` is the default: it stores
+`notification` rows for the app to list. Push, SMS or email channels plug in
+the same way, recording their sends under their own `channel` name.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Protocol, Sequence
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend.database.entities.notification import Notification
+from backend.notifications.reminders import Reminder
+
+
+class Channel(Protocol):
+    name: str
+
+    def send(self, db: Session, reminders: Sequence[Reminder], now: datetime) -> None: ...
+
+
+class InAppChannel:
+    """Notification rows for the in-app list, one executemany insert per batch."""
+
+    name = "in_app"
+
+    def send(self, db: Session, reminders: Sequence[Reminder], now: datetime) -> None:
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "user_id": reminder.user_id,
+                "organization_id": reminder.organization_id,
+                "type": reminder.type,
+                "title": reminder.title,
+                "data": reminder.data,
+                "channel": self.name,
+                "status": "sent",
+                "dedupe_key": reminder.dedupe_key,
+                "sent_at": now,
+            }
+            for reminder in reminders
+        ]
+        if not rows:
+            return
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(Notification).on_conflict_do_nothing(
+            index_elements=[Notification.user_id, Notification.channel, Notification.dedupe_key],
+        )
+        db.execute(stmt, rows)
@@ -0,0 +1,110 @@
+"""
+Reminder sources.
+
+A reminder is a notification due at a known time for one user. Each source
+turns rows into `Reminder`s and loads the ones due in a time window with one
+indexed range query. A reminder's `key` names what it is about (one per visit),
+so a later edit replaces the earlier reminder instead of adding a second one.
+
+Only visits are a source so far: medications exist as a domain model
+(`backend.models.medication`) but have no table to load `reminder_times` from.
+"""
+
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.database.entities.visit import Visit
+from backend.scheduling.timeutils import as_utc
+
+# How long before scheduled_start the assigned caregiver is reminded of a visit.
+VISIT_REMINDER_LEAD = timedelta(minutes=float(os.getenv("VISIT_REMINDER_LEAD_MINUTES", "60")))
+
+VISIT_REMINDER = "visit_reminder"
+
+
+@dataclass(frozen=True)
+class Reminder:
+    key: str
+    due_at: datetime
+    user_id: UUID
+    organization_id: Optional[UUID]
+    type: str
+    title: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def dedupe_key(self) -> str:
+        """Same reminder, same due time: sent once, however many workers try."""
+        return f"{self.key}@{self.due_at.isoformat()}"
+
+
+def _get(row: Any, name: str) -> Any:
+    # Accepts entities, Row objects and the JSON data of visit events.
+    return row[name] if isinstance(row, Mapping) else getattr(row, name)
+
+
+def _uuid(value: Any) -> Optional[UUID]:
+    if value is None or isinstance(value, UUID):
+        return value
+    return UUID(str(value))
+
+
+def _datetime(value: Any) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return as_utc(value)
+
+
+def visit_key(visit_id: Any) -> str:
+    return f"visit:{visit_id}"
+
+
+def visit_reminder(row: Any) -> Optional[Reminder]:
+    """The reminder a visit currently needs, or None (unassigned, or no longer scheduled)."""
+    caregiver = _get(row, "assigned_caregiver_id")
+    if caregiver is None or getattr(_get(row, "status"), "value", _get(row, "status")) != "scheduled":
+        return None
+    start = _datetime(_get(row, "scheduled_start"))
+    return Reminder(
+        key=visit_key(_get(row, "id")),
+        due_at=start - VISIT_REMINDER_LEAD,
+        user_id=_uuid(caregiver),
+        organization_id=_uuid(_get(row, "organization_id")),
+        type=VISIT_REMINDER,
+        title="Upcoming visit",
+        data=jsonable_encoder(
+            {
+                "visit_id": _get(row, "id"),
+                "care_recipient_id": _get(row, "care_recipient_id"),
+                "scheduled_start": start,
+            }
+        ),
+    )
+
+
+def visit_reminders(db: Session, start: datetime, end: datetime) -> list[Reminder]:
+    """Visit reminders due in [start, end): one range scan of `ix_visit_scheduled_start`."""
+    rows = db.execute(
+        select(
+            Visit.id,
+            Visit.organization_id,
+            Visit.care_recipient_id,
+            Visit.assigned_caregiver_id,
+            Visit.status,
+            Visit.scheduled_start,
+        ).where(
+            Visit.scheduled_start >= start + VISIT_REMINDER_LEAD,
+            Visit.scheduled_start < end + VISIT_REMINDER_LEAD,
+            Visit.status == "scheduled",
+            Visit.assigned_caregiver_id.is_not(None),
+        )
+    ).mappings()
+    return [reminder for reminder in map(visit_reminder, rows) if reminder is not None]
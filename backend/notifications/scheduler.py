@@ -0,0 +1,245 @@
+"""
+In-process reminder scheduler.
+
+Instead of polling the visit table every minute, each worker loads the
+reminders due in the next `REMINDER_WINDOW` with one indexed query, keeps them
+in a min-heap keyed by due time and sleeps until the earliest one. Due
+reminders go out in batches of up to `DISPATCH_BATCH_SIZE` to every channel,
+one transaction per batch. The window is reloaded every half window, so a
+reminder is always loaded well before it is due.
+
+Visit events from the realtime hub reschedule a single reminder in place (moved,
+reassigned, cancelled visits), from any worker's writes. Edits the hub does not
+see are picked up by the next reload.
+
+Every worker runs a scheduler and tries to send every reminder; the unique
+dedupe index on `notification` lets only the first insert land. Reminders at
+most `REMINDER_GRACE` late (a restart, a slow pass) are still sent.
+
+Heap changes happen on the event loop only; database work runs in a thread.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+from collections.abc import Iterable, Sequence
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from backend.database.session import SessionLocal
+from backend.notifications.channels import Channel, InAppChannel
+from backend.notifications.reminders import Reminder, visit_key, visit_reminder, visit_reminders
+from backend.realtime.events import Event
+from backend.realtime.hub import hub
+
+logger = logging.getLogger(__name__)
+
+# Look-ahead of each load; 0 disables the scheduler.
+REMINDER_WINDOW = timedelta(minutes=float(os.getenv("REMINDER_WINDOW_MINUTES", "30")))
+REMINDER_GRACE = timedelta(minutes=15)
+DISPATCH_BATCH_SIZE = 500
+# Seconds before retrying after a failed load or dispatch.
+RETRY_DELAY = 30.0
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class SchedulerMetrics:
+    """Counters for `GET /notifications/scheduler`; lag is how late reminders went out."""
+
+    pending: int = 0
+    loaded: int = 0
+    dispatched: int = 0
+    failed_passes: int = 0
+    last_lag_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+    last_load_at: Optional[datetime] = None
+    last_dispatch_at: Optional[datetime] = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class ReminderScheduler:
+    def __init__(
+        self,
+        window: timedelta = REMINDER_WINDOW,
+        grace: timedelta = REMINDER_GRACE,
+        channels: Optional[Sequence[Channel]] = None,
+        batch_size: int = DISPATCH_BATCH_SIZE,
+    ) -> None:
+        self.window = window
+        self.grace = grace
+        self.channels: Sequence[Channel] = channels if channels is not None else (InAppChannel(),)
+        self.batch_size = batch_size
+        self.metrics = SchedulerMetrics()
+        # (due_at, seq, key); entries whose key was rescheduled or cancelled
+        # since are stale and skipped when popped.
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._pending: dict[str, Reminder] = {}
+        self._seq = itertools.count()
+        self._loaded_until: Optional[datetime] = None
+        # Keys changed by events while a load is running; the load must not
+        # overwrite them with what it read before the change.
+        self._changed: Optional[set[str]] = None
+        # Due times already sent per key, so reloads and no-op visit edits
+        # do not send the same reminder again.
+        self._sent: dict[str, datetime] = {}
+        self._wake: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._wake is not None
+
+    def schedule(self, reminder: Reminder) -> None:
+        """Add or replace the reminder for `reminder.key`."""
+        if self._changed is not None:
+            self._changed.add(reminder.key)
+        if self._sent.get(reminder.key) == reminder.due_at:
+            return
+        if self._loaded_until is not None and reminder.due_at >= self._loaded_until:
+            # Beyond the loaded window: the load that covers it will pick it up.
+            self._drop(reminder.key)
+            return
+        self._pending[reminder.key] = reminder
+        heapq.heappush(self._heap, (reminder.due_at, next(self._seq), reminder.key))
+        self._compact()
+        self.metrics.pending = len(self._pending)
+        if self._wake is not None:
+            self._wake.set()
+
+    def cancel(self, key: str) -> None:
+        if self._changed is not None:
+            self._changed.add(key)
+        self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        self._pending.pop(key, None)
+        self.metrics.pending = len(self._pending)
+
+    def _compact(self) -> None:
+        # Rescheduling leaves stale entries behind; rebuild once they dominate.
+        if len(self._heap) > 2 * len(self._pending) + 64:
+            self._heap = [(r.due_at, next(self._seq), key) for key, r in self._pending.items()]
+            heapq.heapify(self._heap)
+
+    def next_due(self) -> Optional[datetime]:
+        while self._heap:
+            due_at, _, key = self._heap[0]
+            reminder = self._pending.get(key)
+            if reminder is not None and reminder.due_at == due_at:
+                return due_at
+            heapq.heappop(self._heap)
+        return None
+
+    def due(self, now: datetime, limit: Optional[int] = None) -> list[Reminder]:
+        """Pop up to `limit` reminders due at `now`, earliest first."""
+        limit = self.batch_size if limit is None else limit
+        batch: list[Reminder] = []
+        while len(batch) < limit:
+            due_at = self.next_due()
+            if due_at is None or due_at > now:
+                break
+            _, _, key = heapq.heappop(self._heap)
+            batch.append(self._pending.pop(key))
+        self.metrics.pending = len(self._pending)
+        return batch
+
+    def on_event(self, event: Event) -> None:
+        """Hub listener: reschedule the reminder of a changed visit."""
+        if not event.type.startswith("visit."):
+            return
+        reminder = visit_reminder(event.data)
+        if reminder is None or reminder.due_at < _utcnow() - self.grace:
+            self.cancel(visit_key(event.data["id"]))
+        else:
+            self.schedule(reminder)
+
+    def fetch(self, now: datetime) -> list[Reminder]:
+        """Reminders due in the window starting at `now`. Blocking; runs in a thread."""
+        with SessionLocal() as db:
+            return visit_reminders(db, now - self.grace, now + self.window)
+
+    def begin_load(self) -> None:
+        self._changed = set()
+
+    def replace(self, reminders: Iterable[Reminder], loaded_until: datetime) -> None:
+        """Swap in a fresh load, keeping reminders that events changed while it ran."""
+        changed, self._changed = self._changed or set(), None
+        kept = {key: r for key, r in self._pending.items() if key in changed}
+        self._pending = {r.key: r for r in reminders if r.key not in changed and self._sent.get(r.key) != r.due_at}
+        self._pending.update(kept)
+        self._heap = [(r.due_at, next(self._seq), key) for key, r in self._pending.items()]
+        heapq.heapify(self._heap)
+        self._loaded_until = loaded_until
+        oldest = loaded_until - self.window - self.grace
+        self._sent = {key: due_at for key, due_at in self._sent.items() if due_at >= oldest}
+        self.metrics.loaded = len(self._pending)
+        self.metrics.pending = len(self._pending)
+
+    async def load(self, now: datetime) -> None:
+        self.begin_load()
+        try:
+            reminders = await asyncio.to_thread(self.fetch, now)
+        except BaseException:
+            self._changed = None
+            raise
+        self.replace(reminders, now + self.window)
+        self.metrics.last_load_at = now
+
+    def send(self, batch: Sequence[Reminder], now: datetime) -> None:
+        """Hand a batch to every channel in one transaction. Blocking; runs in a thread."""
+        with SessionLocal() as db:
+            for channel in self.channels:
+                channel.send(db, batch, now)
+            db.commit()
+
+    def record_dispatch(self, batch: Sequence[Reminder], now: datetime) -> None:
+        self._sent.update((r.key, r.due_at) for r in batch)
+        lag = max((now - r.due_at).total_seconds() for r in batch)
+        self.metrics.dispatched += len(batch)
+        self.metrics.last_lag_seconds = lag
+        self.metrics.max_lag_seconds = max(self.metrics.max_lag_seconds, lag)
+        self.metrics.last_dispatch_at = now
+
+    async def run(self) -> None:
+        """Load, sleep until the next reminder or reload, dispatch; until cancelled."""
+        self._wake = asyncio.Event()
+        hub.add_listener(self.on_event)
+        next_load = _utcnow()
+        try:
+            while True:
+                now = _utcnow()
+                try:
+                    if now >= next_load:
+                        await self.load(now)
+                        next_load = now + self.window / 2
+                    batch = self.due(now)
+                    if batch:
+                        await asyncio.to_thread(self.send, batch, now)
+                        self.record_dispatch(batch, _utcnow())
+                        continue
+                except Exception:
+                    # Popped reminders come back with the reload after the pause.
+                    logger.exception("Reminder scheduler pass failed")
+                    self.metrics.failed_passes += 1
+                    await asyncio.sleep(RETRY_DELAY)
+                    next_load = _utcnow()
+                    continue
+                wake_at = min(filter(None, (next_load, self.next_due())))
+                self._wake.clear()
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wake.wait(), max((wake_at - _utcnow()).total_seconds(), 0.0))
+        finally:
+            hub.remove_listener(self.on_event)
+            self._wake = None
+
+
+scheduler = ReminderScheduler()
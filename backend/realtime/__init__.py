@@ -0,0 +1,18 @@
+"""
+Realtime push of visit, task and message events over WebSocket and SSE.
+"""
+
+from backend.realtime.events import Event, emit, message_event, person_event, task_event, visit_event
+from backend.realtime.hub import Hub, Subscription, hub
+
+__all__ = [
+    "Event",
+    "Hub",
+    "Subscription",
+    "emit",
+    "hub",
+    "message_event",
+    "person_event",
+    "task_event",
+    "visit_event",
+]
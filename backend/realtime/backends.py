@@ -0,0 +1,153 @@
+"""
+Cross-worker transports for the realtime hub.
+
+A backend carries committed events from the worker that wrote them to every
+worker with subscribers, each of which calls its own `Hub.deliver`.
+
+- `InMemoryBackend` delivers straight back to this process. Enough for a single
+  worker, and what the tests use.
+- `PostgresBackend` uses LISTEN/NOTIFY on one asyncpg connection per worker, so
+  no extra infrastructure is needed. NOTIFY payloads are capped at 8000 bytes,
+  which is why events carry ids and short previews rather than full rows.
+
+`REALTIME_BACKEND` (`postgres` or `memory`) picks one; by default Postgres is
+used when `DATABASE_URL` points at Postgres.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Callable, Optional, Protocol
+
+from sqlalchemy.engine import make_url
+
+from backend.database.session import DATABASE_URL
+from backend.realtime.events import Event
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[Event], None]
+
+NOTIFY_CHANNEL = "homecare_events"
+
+# Seconds between attempts to re-establish a dropped LISTEN connection.
+RECONNECT_DELAY = 2.0
+
+
+class Backend(Protocol):
+    async def start(self, deliver: Deliver) -> None: ...
+
+    async def publish(self, events: list[Event]) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+class InMemoryBackend:
+    """Single-process transport: published events are delivered locally."""
+
+    def __init__(self) -> None:
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def publish(self, events: list[Event]) -> None:
+        if self._deliver is not None:
+            for event in events:
+                self._deliver(event)
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+
+class PostgresBackend:
+    """
+    LISTEN/NOTIFY transport.
+
+    Every worker LISTENs on `NOTIFY_CHANNEL` and receives its own NOTIFYs too,
+    so local subscribers are served the same way as remote ones. If the
+    connection drops it is re-established in the background; events published
+    meanwhile are lost, as with any disconnect.
+    """
+
+    def __init__(self, dsn: str, channel: str = NOTIFY_CHANNEL) -> None:
+        self.dsn = dsn
+        self.channel = channel
+        self._deliver: Optional[Deliver] = None
+        self._conn = None
+        self._supervisor: Optional[asyncio.Task] = None
+        self._lost: Optional[asyncio.Event] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        self._lost = asyncio.Event()
+        try:
+            await self._connect()
+        except Exception:
+            # Serve the API anyway; the supervisor keeps retrying.
+            logger.exception("Realtime LISTEN connection failed")
+            self._lost.set()
+        self._supervisor = asyncio.create_task(self._reconnect_forever())
+
+    async def _connect(self) -> None:
+        # asyncpg is only needed when this backend is selected.
+        import asyncpg
+
+        conn = await asyncpg.connect(self.dsn)
+        await conn.add_listener(self.channel, self._on_notify)
+        conn.add_termination_listener(lambda _conn: self._lost.set())
+        self._conn = conn
+        self._lost.clear()
+
+    async def _reconnect_forever(self) -> None:
+        while True:
+            await self._lost.wait()
+            self._conn = None
+            logger.warning("Realtime LISTEN connection lost; reconnecting")
+            while self._conn is None:
+                await asyncio.sleep(RECONNECT_DELAY)
+                try:
+                    await self._connect()
+                except Exception:
+                    logger.exception("Realtime LISTEN reconnect failed")
+
+    def _on_notify(self, conn, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = Event.from_json(json.loads(payload))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed realtime payload on %s", channel)
+            return
+        if self._deliver is not None:
+            self._deliver(event)
+
+    async def publish(self, events: list[Event]) -> None:
+        conn = self._conn
+        if conn is None:
+            raise ConnectionError("realtime LISTEN connection is down")
+        await conn.executemany(
+            "SELECT pg_notify($1, $2)",
+            [(self.channel, json.dumps(event.to_json(), separators=(",", ":"))) for event in events],
+        )
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+        self._deliver = None
+
+
+def make_backend() -> Backend:
+    """The backend selected by `REALTIME_BACKEND` (see module docstring)."""
+    url = make_url(DATABASE_URL)
+    default = "postgres" if url.get_backend_name() == "postgresql" else "memory"
+    kind = os.getenv("REALTIME_BACKEND", default).lower()
+    if kind == "memory":
+        return InMemoryBackend()
+    if kind == "postgres":
+        # asyncpg wants a plain libpq-style URL, without the SQLAlchemy driver suffix.
+        return PostgresBackend(url.set(drivername="postgresql").render_as_string(hide_password=False))
+    raise ValueError(f"Unknown REALTIME_BACKEND {kind!r}; expected 'postgres' or 'memory'")
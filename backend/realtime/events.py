@@ -0,0 +1,146 @@
+"""
+Change events pushed to subscribed clients.
+
+Write handlers call `emit(db, event)` before they commit. Events wait in the
+session until the transaction commits and are then handed to the hub, so a
+client never hears about a write that was rolled back. A rollback discards
+them.
+
+Topics name what a client can subscribe to:
+
+- `organization:<id>` – every visit and task event of the organization
+- `recipient:<organization id>:<id>` – visit and task events of one care recipient
+- `conversation:<id>` – new messages of one conversation (participants only)
+
+`person.updated` events have no topics: no client receives them, only
+in-process listeners such as the person typeahead directory.
+"""
+
+import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.realtime.hub import hub
+
+_PENDING = "realtime_events"
+
+VISIT_FIELDS = (
+    "id",
+    "organization_id",
+    "care_recipient_id",
+    "assigned_caregiver_id",
+    "status",
+    "scheduled_start",
+    "scheduled_end",
+    "checked_in_at",
+    "checked_out_at",
+)
+TASK_FIELDS = (
+    "id",
+    "organization_id",
+    "care_recipient_id",
+    "visit_id",
+    "assignment_24x7_id",
+    "task_date",
+    "title",
+    "status",
+    "completed_at",
+    "overdue_at",
+)
+
+
+@dataclass(frozen=True)
+class Event:
+    """One change; `data` is JSON-ready."""
+
+    type: str
+    topics: tuple[str, ...]
+    data: dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def to_json(self) -> dict[str, Any]:
+        return {"id": self.id, "type": self.type, "topics": list(self.topics), "data": self.data}
+
+    @classmethod
+    def from_json(cls, raw: Mapping[str, Any]) -> "Event":
+        return cls(type=raw["type"], topics=tuple(raw["topics"]), data=raw["data"], id=raw["id"])
+
+
+def organization_topic(organization_id: Any) -> str:
+    return f"organization:{organization_id}"
+
+
+def recipient_topic(organization_id: Any, care_recipient_id: Any) -> str:
+    return f"recipient:{organization_id}:{care_recipient_id}"
+
+
+def conversation_topic(conversation_id: Any) -> str:
+    return f"conversation:{conversation_id}"
+
+
+def _get(row: Any, name: str) -> Any:
+    # Accepts entities, Row objects and RowMappings.
+    return row[name] if isinstance(row, Mapping) else getattr(row, name)
+
+
+def _care_event(kind: str, row: Any, fields: tuple[str, ...]) -> Event:
+    data = jsonable_encoder({name: _get(row, name) for name in fields})
+    org = data["organization_id"]
+    return Event(kind, (organization_topic(org), recipient_topic(org, data["care_recipient_id"])), data)
+
+
+def visit_event(kind: str, row: Any) -> Event:
+    """`visit.<kind>` (created, updated, started, ended, no_show) for a visit as it now is."""
+    return _care_event(f"visit.{kind}", row, VISIT_FIELDS)
+
+
+def task_event(kind: str, row: Any) -> Event:
+    """`task.<kind>` (created, updated, overdue) for a task as it now is."""
+    return _care_event(f"task.{kind}", row, TASK_FIELDS)
+
+
+def message_event(message: Any, preview: str) -> Event:
+    """`message.created`; carries a preview, not the body, to keep NOTIFY payloads small."""
+    data = jsonable_encoder(
+        {
+            "id": message.id,
+            "conversation_id": message.conversation_id,
+            "sender_id": message.sender_id,
+            "preview": preview,
+            "created_at": message.created_at,
+        }
+    )
+    return Event("message.created", (conversation_topic(message.conversation_id),), data)
+
+
+def person_event(user_id: Any) -> Event:
+    """`person.updated` for a changed person or membership of theirs."""
+    return Event("person.updated", (), jsonable_encoder({"user_id": user_id}))
+
+
+def emit(db: Any, *events: Event) -> None:
+    """
+    Queue events on a Session or AsyncSession until it commits.
+
+    A no-op while no hub is running in this process (scripts, most tests).
+    """
+    if hub.running:
+        db.info.setdefault(_PENDING, []).extend(events)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    events = session.info.pop(_PENDING, None)
+    if events:
+        hub.publish(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
@@ -0,0 +1,156 @@
+"""
+Per-process pub/sub hub for pushing change events to WebSocket/SSE clients.
+
+Each worker runs one `Hub`. Committed events go to the hub's backend, which
+fans them out to every worker (Postgres LISTEN/NOTIFY, or straight back to
+this process with the in-memory backend); each worker then delivers them to
+its own subscribers by topic. Delivery is best-effort: a client that falls
+`QUEUE_SIZE` events behind is disconnected and resyncs on reconnect rather than
+holding events in memory for it.
+
+In-process listeners (such as the reminder scheduler) see every delivered
+event, whatever its topics.
+"""
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from contextlib import suppress
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+if TYPE_CHECKING:
+    from backend.realtime.backends import Backend
+    from backend.realtime.events import Event
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before it is cut off as too slow.
+QUEUE_SIZE = int(os.getenv("REALTIME_QUEUE_SIZE", "256"))
+
+
+class Subscription:
+    """One connected client: the topics it listens to and its pending events."""
+
+    def __init__(self, topics: Iterable[str], maxsize: int = QUEUE_SIZE) -> None:
+        self.topics = frozenset(topics)
+        self.overflowed = False
+        self._queue: asyncio.Queue[Optional["Event"]] = asyncio.Queue(maxsize)
+
+    def offer(self, event: "Event") -> None:
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.close()
+
+    def close(self) -> None:
+        """Drop the backlog and wake the reader with the end-of-stream marker."""
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> Optional["Event"]:
+        """The next event, or None once the subscription was cut off."""
+        return await self._queue.get()
+
+
+class Hub:
+    def __init__(self) -> None:
+        self._by_topic: defaultdict[str, set[Subscription]] = defaultdict(set)
+        self._backend: Optional["Backend"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sends: set[asyncio.Task] = set()
+        self._listeners: list[Callable[["Event"], None]] = []
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    async def start(self, backend: "Backend") -> None:
+        """Bind to the running event loop and start receiving from `backend`."""
+        self._loop = asyncio.get_running_loop()
+        self._backend = backend
+        await backend.start(self.deliver)
+
+    async def stop(self) -> None:
+        self._loop = None
+        for task in list(self._sends):
+            task.cancel()
+        if self._backend is not None:
+            await self._backend.stop()
+            self._backend = None
+        for sub in {sub for subscriptions in self._by_topic.values() for sub in subscriptions}:
+            sub.close()
+        self._by_topic.clear()
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        sub = Subscription(topics)
+        for topic in sub.topics:
+            self._by_topic[topic].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        for topic in sub.topics:
+            subscriptions = self._by_topic.get(topic)
+            if subscriptions is not None:
+                subscriptions.discard(sub)
+                if not subscriptions:
+                    del self._by_topic[topic]
+
+    def add_listener(self, listener: Callable[["Event"], None]) -> None:
+        """Call `listener` on the event loop with every event this worker receives."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[["Event"], None]) -> None:
+        with suppress(ValueError):
+            self._listeners.remove(listener)
+
+    def subscriber_count(self) -> int:
+        return len({sub for subscriptions in self._by_topic.values() for sub in subscriptions})
+
+    def publish(self, events: list["Event"]) -> None:
+        """
+        Send committed events to every worker. Safe to call from any thread.
+
+        Called from the session's after_commit hook, which runs on a threadpool
+        worker for the sync routers.
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._send, events)
+        except RuntimeError:
+            # The loop closed during shutdown.
+            pass
+
+    def _send(self, events: list["Event"]) -> None:
+        if self._backend is None:
+            return
+        task = asyncio.ensure_future(self._backend.publish(events))
+        self._sends.add(task)
+        task.add_done_callback(self._sent)
+
+    def _sent(self, task: asyncio.Task) -> None:
+        self._sends.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Dropping realtime events: %s", task.exception())
+
+    def deliver(self, event: "Event") -> None:
+        """Hand an event to this worker's subscribers (once each, whatever topics matched)."""
+        targets: set[Subscription] = set()
+        for topic in event.topics:
+            targets |= self._by_topic.get(topic, set())
+        for sub in targets:
+            sub.offer(event)
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Realtime listener failed on %s", event.type)
+
+
+hub = Hub()
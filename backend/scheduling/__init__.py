@@ -0,0 +1,3 @@
+"""
+Scheduling: recurrence expansion and the background jobs that keep it current.
+"""
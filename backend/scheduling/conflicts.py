@@ -0,0 +1,188 @@
+"""
+Caregiver double-booking detection.
+
+A caregiver is booked by every visit assigned to them whose status is in
+`BOOKED_STATUSES`; two bookings conflict when their [scheduled_start,
+scheduled_end) windows overlap. On Postgres the `ex_visit_caregiver_overlap`
+exclusion constraint (GiST over caregiver + tstzrange) is the final guard
+against races; the checks here run first so callers get a useful 409 instead of
+a constraint error.
+
+Single visits are checked with one indexed query. Batches load every booking of
+the batch's caregivers inside the batch's time span in one query and check each
+item against an in-memory `IntervalTree`, so validating a batch costs one round
+trip however many items it has.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, Iterable, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.exc import IntegrityError
+
+from backend.database.entities.visit import Visit
+from backend.scheduling.timeutils import as_utc
+
+# Statuses that occupy a caregiver's time; cancelled and no-show visits do not.
+BOOKED_STATUSES = ("scheduled", "in_progress", "completed")
+
+# Conflicting visits reported per item in a 409.
+MAX_REPORTED_CONFLICTS = 10
+
+# SQLSTATE of an exclusion constraint violation.
+_EXCLUSION_VIOLATION = "23P01"
+
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class Booking(Generic[V]):
+    start: datetime
+    end: datetime
+    value: V
+
+
+class IntervalTree(Generic[V]):
+    """
+    Static interval tree over half-open [start, end) bookings.
+
+    Bookings are sorted by start and stored as an implicit balanced BST over
+    that array, each node augmented with the latest end in its subtree, so an
+    overlap query visits O(log n + k) nodes.
+    """
+
+    def __init__(self, bookings: Iterable[Booking[V]]) -> None:
+        self._items = sorted(bookings, key=lambda b: b.start)
+        self._max_end: list[Optional[datetime]] = [None] * len(self._items)
+        self._build(0, len(self._items))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _build(self, lo: int, hi: int) -> Optional[datetime]:
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        latest = self._items[mid].end
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and child > latest:
+                latest = child
+        self._max_end[mid] = latest
+        return latest
+
+    def overlapping(self, start: datetime, end: datetime) -> list[Booking[V]]:
+        """Bookings that overlap [start, end), in start order."""
+        found: list[Booking[V]] = []
+        self._query(0, len(self._items), start, end, found)
+        return found
+
+    def _query(self, lo: int, hi: int, start: datetime, end: datetime, found: list[Booking[V]]) -> None:
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self._max_end[mid] <= start:
+            # Nothing in this subtree ends after `start`.
+            return
+        self._query(lo, mid, start, end, found)
+        item = self._items[mid]
+        if item.start < end:
+            if item.end > start:
+                found.append(item)
+            self._query(mid + 1, hi, start, end, found)
+
+
+def is_booked(caregiver_id: Optional[UUID], visit_status: Any) -> bool:
+    status_value = getattr(visit_status, "value", visit_status)
+    return caregiver_id is not None and status_value in BOOKED_STATUSES
+
+
+def overlapping_stmt(
+    caregiver_id: UUID,
+    start: datetime,
+    end: datetime,
+    exclude_visit_id: Optional[UUID] = None,
+) -> Select:
+    """
+    Booked visits of a caregiver overlapping [start, end).
+
+    Runs as a range scan on (assigned_caregiver_id, scheduled_end), which only
+    reaches visits ending after `start`, so history does not slow it down.
+    """
+    stmt = select(Visit.id, Visit.scheduled_start, Visit.scheduled_end).where(
+        Visit.assigned_caregiver_id == caregiver_id,
+        Visit.status.in_(BOOKED_STATUSES),
+        Visit.scheduled_end > as_utc(start),
+        Visit.scheduled_start < as_utc(end),
+    )
+    if exclude_visit_id is not None:
+        stmt = stmt.where(Visit.id != exclude_visit_id)
+    return stmt.order_by(Visit.scheduled_start).limit(MAX_REPORTED_CONFLICTS)
+
+
+def bookings_stmt(caregiver_ids: Iterable[UUID], start: datetime, end: datetime) -> Select:
+    """Every booked visit of the given caregivers overlapping [start, end)."""
+    return select(Visit.id, Visit.assigned_caregiver_id, Visit.scheduled_start, Visit.scheduled_end).where(
+        Visit.assigned_caregiver_id.in_(list(caregiver_ids)),
+        Visit.status.in_(BOOKED_STATUSES),
+        Visit.scheduled_end > as_utc(start),
+        Visit.scheduled_start < as_utc(end),
+    )
+
+
+def describe(booking: Booking[dict]) -> dict:
+    """One conflicting booking as reported in a 409 body."""
+    return dict(booking.value, scheduled_start=booking.start, scheduled_end=booking.end)
+
+
+def batch_conflicts(items: Sequence[Any], existing: Sequence[Any]) -> list[dict]:
+    """
+    Per-item conflicts for a batch of new visits.
+
+    `items` have assigned_caregiver_id, status, scheduled_start and
+    scheduled_end; `existing` are rows from `bookings_stmt`. Items conflict with
+    stored visits (reported by `visit_id`) and with each other (by `index`).
+    Returns `{"index", "conflicts"}` for each item that has any.
+    """
+    by_caregiver: dict[UUID, list[Booking[dict]]] = {}
+    for row in existing:
+        by_caregiver.setdefault(row.assigned_caregiver_id, []).append(
+            Booking(as_utc(row.scheduled_start), as_utc(row.scheduled_end), {"visit_id": row.id})
+        )
+    booked = [(i, item) for i, item in enumerate(items) if is_booked(item.assigned_caregiver_id, item.status)]
+    for index, item in booked:
+        by_caregiver.setdefault(item.assigned_caregiver_id, []).append(
+            Booking(as_utc(item.scheduled_start), as_utc(item.scheduled_end), {"index": index})
+        )
+    trees = {caregiver_id: IntervalTree(bookings) for caregiver_id, bookings in by_caregiver.items()}
+
+    errors = []
+    for index, item in booked:
+        tree = trees[item.assigned_caregiver_id]
+        overlaps = [
+            booking
+            for booking in tree.overlapping(as_utc(item.scheduled_start), as_utc(item.scheduled_end))
+            if booking.value.get("index") != index
+        ]
+        if overlaps:
+            errors.append({"index": index, "conflicts": [describe(b) for b in overlaps[:MAX_REPORTED_CONFLICTS]]})
+    return errors
+
+
+def batch_window(items: Sequence[Any]) -> Optional[tuple[set[UUID], datetime, datetime]]:
+    """Caregivers and overall time span of the booked items in a batch, if any."""
+    booked = [item for item in items if is_booked(item.assigned_caregiver_id, item.status)]
+    if not booked:
+        return None
+    return (
+        {item.assigned_caregiver_id for item in booked},
+        min(as_utc(item.scheduled_start) for item in booked),
+        max(as_utc(item.scheduled_end) for item in booked),
+    )
+
+
+def is_overlap_violation(exc: IntegrityError) -> bool:
+    """True if the database rejected a write under the caregiver exclusion constraint."""
+    orig = exc.orig
+    return _EXCLUSION_VIOLATION in (getattr(orig, "pgcode", None), getattr(orig, "sqlstate", None))
@@ -0,0 +1,356 @@
+"""
+Recurring visit expansion.
+
+A visit with a `recurrence_rule` (and no `parent_visit_id`) is the head of a
+series: its own scheduled_start/scheduled_end are the first occurrence
+(DTSTART) and fix the duration of every occurrence. Later occurrences are
+materialized as child visits (`parent_visit_id` = head id) only up to a
+rolling horizon; `recurrence_materialized_until` on the head records how far
+the series has been expanded. Occurrences past that point are computed on
+demand (`projected`) and only stored once the roller reaches them.
+
+`recurrence_rule` holds an RRULE with optional EXDATE lines:
+
+    RRULE:FREQ=WEEKLY;BYDAY=MO,WE,FR
+    EXDATE:20250421T080000,20250505T080000
+
+A bare `FREQ=...` line is read as an RRULE. Rules are expanded in the series'
+local time (`Visit.timezone`, UTC when unset), so a weekly 08:00 visit stays at
+08:00 across DST changes; EXDATE values without a trailing `Z` are local times.
+"""
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, Optional, Sequence
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from dateutil.rrule import rruleset, rrulestr
+from sqlalchemy import delete, insert, select, union, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from backend.database.entities.task import Task
+from backend.database.entities.visit import Visit
+from backend.database.entities.visit_note import VisitNote
+from backend.scheduling.conflicts import BOOKED_STATUSES, Booking, IntervalTree, bookings_stmt
+from backend.scheduling.timeutils import as_utc
+from backend.stats.rollup import count_visits
+
+# How far ahead of now child visits are materialized.
+HORIZON = timedelta(weeks=int(os.getenv("RECURRENCE_HORIZON_WEEKS", "8")))
+
+# recurrence_materialized_until of a series with no occurrences left to store.
+EXHAUSTED = datetime(9999, 12, 31, tzinfo=timezone.utc)
+
+# Head fields whose change invalidates the series' future children.
+SERIES_FIELDS = (
+    "recurrence_rule",
+    "scheduled_start",
+    "scheduled_end",
+    "timezone",
+    "assigned_caregiver_id",
+    "status",
+)
+
+# Fields copied from the series head onto each materialized child.
+_INHERITED = (
+    "organization_id",
+    "care_recipient_id",
+    "assigned_caregiver_id",
+    "visit_type",
+    "timezone",
+    "address_street",
+    "address_city",
+    "address_region",
+    "address_postal_code",
+    "address_country",
+    "notes",
+    "created_by_id",
+)
+
+
+@dataclass(frozen=True)
+class Occurrence:
+    """One occurrence of a series, in UTC."""
+
+    series_id: UUID
+    start: datetime
+    end: datetime
+
+
+def series_timezone(name: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name}")
+
+
+def build_ruleset(rule: str, dtstart: datetime, tz_name: Optional[str]) -> rruleset:
+    """Parse RRULE/EXDATE lines into a ruleset anchored at `dtstart` in local time."""
+    tz = series_timezone(tz_name)
+    local_start = as_utc(dtstart).astimezone(tz)
+    rules = rruleset()
+    has_rrule = False
+    for line in rule.strip().splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            name, value = "RRULE", line
+        name = name.split(";", 1)[0].upper()
+        if name == "RRULE":
+            try:
+                rules.rrule(rrulestr(value, dtstart=local_start))
+            except (TypeError, ValueError) as exc:
+                raise ValueError(f"Invalid RRULE: {exc}")
+            has_rrule = True
+        elif name == "EXDATE":
+            for item in value.split(","):
+                rules.exdate(_parse_exdate(item.strip(), local_start))
+        else:
+            raise ValueError(f"Unsupported recurrence property: {name}")
+    if not has_rrule:
+        raise ValueError("recurrence_rule must contain an RRULE")
+    return rules
+
+
+def _parse_exdate(value: str, local_start: datetime) -> datetime:
+    try:
+        if value.endswith("Z"):
+            return datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+        if "T" in value:
+            return datetime.strptime(value, "%Y%m%dT%H%M%S").replace(tzinfo=local_start.tzinfo)
+        # Date-only EXDATE: drop the occurrence on that day.
+        day = datetime.strptime(value, "%Y%m%d").date()
+    except ValueError:
+        raise ValueError(f"Invalid EXDATE value: {value}")
+    return datetime.combine(day, local_start.timetz())
+
+
+def validate_rule(rule: str, tz_name: Optional[str]) -> None:
+    """Raise ValueError if `rule` cannot be expanded."""
+    build_ruleset(rule, datetime(2000, 1, 1, tzinfo=timezone.utc), tz_name)
+
+
+def _occurrences(series: Any, rules: rruleset, start: datetime, end: datetime) -> Iterator[Occurrence]:
+    duration = as_utc(series.scheduled_end) - as_utc(series.scheduled_start)
+    for local in rules.between(as_utc(start), as_utc(end), inc=True):
+        occurrence_start = as_utc(local)
+        if occurrence_start < as_utc(end):
+            yield Occurrence(series.id, occurrence_start, occurrence_start + duration)
+
+
+def occurrences(series: Any, start: datetime, end: datetime) -> Iterator[Occurrence]:
+    """All occurrences of a series head starting in [start, end), including the head."""
+    rules = build_ruleset(series.recurrence_rule, series.scheduled_start, series.timezone)
+    return _occurrences(series, rules, start, end)
+
+
+def projected(series: Any, start: datetime, end: datetime) -> Iterator[Occurrence]:
+    """
+    Occurrences in [start, end) that have not been materialized yet.
+
+    Calendar reads combine these with the stored visits; nothing is written.
+    A cancelled series projects nothing.
+    """
+    if not is_active_series(series):
+        return iter(())
+    watermark = series.recurrence_materialized_until
+    if watermark is not None:
+        start = max(as_utc(start), as_utc(watermark))
+    head_start = as_utc(series.scheduled_start)
+    return (o for o in occurrences(series, start, end) if o.start != head_start)
+
+
+def materialize(db: Session, series: Any, until: datetime, held: Sequence[datetime] = ()) -> int:
+    """
+    Store child visits for the series' occurrences up to `until`.
+
+    `held` are the starts of children kept through a reschedule; each one
+    stands in for the occurrence nearest to it on the same local day, which is
+    not stored again. Advances `recurrence_materialized_until` with a conditional UPDATE first, so
+    two workers extending the same series cannot both insert its children; the
+    loser inserts nothing. Runs in the caller's transaction and counts the
+    children on the dashboard. Returns the number of children created.
+    """
+    watermark = series.recurrence_materialized_until
+    head_start = as_utc(series.scheduled_start)
+    lower = as_utc(watermark) if watermark is not None else head_start
+    until = as_utc(until)
+    if lower >= until:
+        return 0
+
+    rules = build_ruleset(series.recurrence_rule, series.scheduled_start, series.timezone)
+    new_watermark = until if rules.after(until, inc=True) is not None else EXHAUSTED
+
+    current = (
+        Visit.recurrence_materialized_until.is_(None)
+        if watermark is None
+        else Visit.recurrence_materialized_until == watermark
+    )
+    claimed = db.execute(
+        update(Visit)
+        .where(Visit.id == series.id, current)
+        .values(recurrence_materialized_until=new_watermark)
+        .execution_options(synchronize_session=False)
+    )
+    if claimed.rowcount == 0:
+        return 0
+    if isinstance(series, Visit):
+        set_committed_value(series, "recurrence_materialized_until", new_watermark)
+
+    shared = {name: getattr(series, name) for name in _INHERITED}
+    rows = [
+        dict(
+            shared,
+            parent_visit_id=series.id,
+            scheduled_start=o.start,
+            scheduled_end=o.end,
+            status="scheduled",
+        )
+        for o in _occurrences(series, rules, lower, until)
+        if o.start != head_start
+    ]
+    if held:
+        rows = _unclaimed(rows, held, series_timezone(series.timezone))
+    if rows and series.assigned_caregiver_id is not None:
+        _unassign_conflicts(db, series.assigned_caregiver_id, rows)
+    if rows:
+        db.execute(insert(Visit), rows)
+        count_visits(db, rows)
+    return len(rows)
+
+
+def _unclaimed(rows: list[dict], held: Sequence[datetime], tz: ZoneInfo) -> list[dict]:
+    """Drop, for each held start, the row nearest to it on the same local day."""
+    taken: set[int] = set()
+    for start in map(as_utc, held):
+        day = start.astimezone(tz).date()
+        same_day = [
+            i for i, row in enumerate(rows) if i not in taken and row["scheduled_start"].astimezone(tz).date() == day
+        ]
+        if same_day:
+            taken.add(min(same_day, key=lambda i: abs(rows[i]["scheduled_start"] - start)))
+    return [row for i, row in enumerate(rows) if i not in taken]
+
+
+def _unassign_conflicts(db: Session, caregiver_id: Any, rows: list[dict]) -> None:
+    """Leave occurrences that would double-book the caregiver unassigned (open shifts)."""
+    existing = db.execute(bookings_stmt([caregiver_id], rows[0]["scheduled_start"], rows[-1]["scheduled_end"])).all()
+    tree = IntervalTree(Booking(as_utc(r.scheduled_start), as_utc(r.scheduled_end), r.id) for r in existing)
+    last_end = None
+    for row in rows:
+        start, end = row["scheduled_start"], row["scheduled_end"]
+        if tree.overlapping(start, end) or (last_end is not None and start < last_end):
+            row["assigned_caregiver_id"] = None
+        else:
+            last_end = end
+
+
+def _plain(value: Any) -> Any:
+    value = getattr(value, "value", value)
+    return as_utc(value) if isinstance(value, datetime) else value
+
+
+def series_state(visit: Any) -> dict[str, Any]:
+    """The head fields its children are generated from; taken before an edit for `reschedule`."""
+    return {name: _plain(getattr(visit, name)) for name in (*SERIES_FIELDS, *_INHERITED)}
+
+
+def series_changed(before: dict[str, Any], series: Any) -> bool:
+    """Whether an edit changed a field the series' future children depend on."""
+    return any(before[name] != _plain(getattr(series, name)) for name in SERIES_FIELDS)
+
+
+def _generated(child: Any, before: dict[str, Any], starts: set[datetime]) -> bool:
+    """Whether a child is exactly as the head described by `before` generated it."""
+    if child.status != "scheduled" or as_utc(child.scheduled_start) not in starts:
+        return False
+    duration = before["scheduled_end"] - before["scheduled_start"]
+    if as_utc(child.scheduled_end) - as_utc(child.scheduled_start) != duration:
+        return False
+    # Occurrences that would have double-booked the caregiver were left open.
+    if child.assigned_caregiver_id not in (before["assigned_caregiver_id"], None):
+        return False
+    return all(_plain(getattr(child, name)) == before[name] for name in _INHERITED if name != "assigned_caregiver_id")
+
+
+def reschedule(db: Session, series: Visit, before: dict[str, Any], now: Optional[datetime] = None) -> None:
+    """
+    Bring a series' future children in line with an edited head.
+
+    `before` is the head's `series_state` from before the edit. If the head was
+    cancelled (or marked no-show), children starting from `now` that are still
+    scheduled are cancelled with it. Otherwise only children still in their
+    generated state (scheduled, not checked into, with the old head's timing
+    and fields) and with no tasks or visit notes are deleted, and the series is
+    re-materialized from `now` under its current rule, timing and caregiver.
+    Every other future child is an exception: it is kept as it is and holds its
+    day's occurrence (see `materialize`). Earlier children are history. Runs in
+    the caller's transaction, dashboard counters included.
+    """
+    now = as_utc(now or datetime.now(timezone.utc))
+    future = (Visit.parent_visit_id == series.id, Visit.scheduled_start >= now)
+    counted = (Visit.organization_id, Visit.scheduled_start, Visit.status)
+    if not is_active_series(series):
+        cancelled = db.execute(
+            update(Visit)
+            .where(*future, Visit.checked_in_at.is_(None), Visit.status == "scheduled")
+            .values(status="cancelled")
+            .returning(*counted)
+            .execution_options(synchronize_session=False)
+        ).all()
+        count_visits(db, [dict(row._mapping, status="scheduled") for row in cancelled], -1)
+        count_visits(db, cancelled)
+        return
+
+    children = db.execute(select(Visit.__table__).where(*future).order_by(Visit.scheduled_start)).all()
+    starts: set[datetime] = set()
+    if children and before["recurrence_rule"]:
+        rules = build_ruleset(before["recurrence_rule"], before["scheduled_start"], before["timezone"])
+        last = as_utc(children[-1].scheduled_start)
+        starts = {as_utc(local) for local in rules.between(now, last, inc=True)}
+    ids = [child.id for child in children]
+    in_use = set(
+        db.scalars(
+            union(
+                select(Task.visit_id).where(Task.visit_id.in_(ids)),
+                select(VisitNote.visit_id).where(VisitNote.visit_id.in_(ids)),
+            )
+        )
+    )
+    replaced = [
+        child.id
+        for child in children
+        if child.checked_in_at is None and child.id not in in_use and _generated(child, before, starts)
+    ]
+    if replaced:
+        deleted = db.execute(
+            delete(Visit)
+            .where(Visit.id.in_(replaced))
+            .returning(*counted)
+            .execution_options(synchronize_session=False)
+        ).all()
+        count_visits(db, deleted, -1)
+    replaced_ids = set(replaced)
+    held = [child.scheduled_start for child in children if child.id not in replaced_ids]
+    series.recurrence_materialized_until = None if as_utc(series.scheduled_start) >= now else now
+    db.flush()
+    materialize(db, series, horizon_end(now), held)
+
+
+def horizon_end(now: Optional[datetime] = None) -> datetime:
+    """Point up to which series are kept materialized."""
+    return (now or datetime.now(timezone.utc)) + HORIZON
+
+
+def is_series_head(visit: Any) -> bool:
+    return bool(visit.recurrence_rule) and visit.parent_visit_id is None
+
+
+def is_active_series(visit: Any) -> bool:
+    """A series head that still produces occurrences; cancelling the head ends the series."""
+    return is_series_head(visit) and getattr(visit.status, "value", visit.status) in BOOKED_STATUSES
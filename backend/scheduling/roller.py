@@ -0,0 +1,107 @@
+"""
+Background roller for recurring visits.
+
+Keeps every series materialized up to `HORIZON` ahead of now. Each pass only
+touches series whose watermark has fallen short of the horizon (an index scan
+on `ix_visit_series_horizon`), in bounded batches, so a pass is cheap when
+nothing is due.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.database.entities.visit import Visit
+from backend.database.session import SessionLocal
+from backend.scheduling.conflicts import BOOKED_STATUSES
+from backend.scheduling.recurrence import EXHAUSTED, horizon_end, materialize
+
+logger = logging.getLogger(__name__)
+
+# Seconds between passes; 0 disables the roller.
+ROLLER_INTERVAL = float(os.getenv("RECURRENCE_ROLLER_INTERVAL_SECONDS", "3600"))
+ROLLER_BATCH_SIZE = 100
+
+
+def roll_forward(db: Session, now: Optional[datetime] = None, batch_size: int = ROLLER_BATCH_SIZE) -> int:
+    """
+    Extend every series short of the horizon, committing once per batch.
+
+    Cancelled and no-show heads have ended their series and are skipped.
+    Series heads are locked with SKIP LOCKED so concurrent rollers split the
+    work. A head whose rule no longer parses is parked (watermark set to
+    `EXHAUSTED`) rather than retried on every pass. A batch that loses a
+    double-booking race to a concurrent write is rolled back and left for the
+    next pass. Stops early if a whole batch moves no watermark, so heads that
+    cannot advance are never reselected forever. Returns children created.
+    """
+    target = horizon_end(now)
+    created = 0
+    while True:
+        heads = db.scalars(
+            select(Visit)
+            .where(
+                Visit.recurrence_rule.is_not(None),
+                Visit.parent_visit_id.is_(None),
+                Visit.status.in_(BOOKED_STATUSES),
+                Visit.scheduled_start < target,
+                or_(
+                    Visit.recurrence_materialized_until.is_(None),
+                    Visit.recurrence_materialized_until < target,
+                ),
+            )
+            .order_by(Visit.recurrence_materialized_until)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .execution_options(populate_existing=True)
+        ).all()
+        if not heads:
+            return created
+        batch_created = 0
+        progressed = False
+        try:
+            for head in heads:
+                before = head.recurrence_materialized_until
+                try:
+                    batch_created += materialize(db, head, target)
+                    progressed = progressed or head.recurrence_materialized_until != before
+                except ValueError:
+                    logger.warning("Parking visit series %s with an invalid recurrence rule", head.id)
+                    db.execute(
+                        update(Visit)
+                        .where(Visit.id == head.id)
+                        .values(recurrence_materialized_until=EXHAUSTED)
+                        .execution_options(synchronize_session=False)
+                    )
+                    progressed = True
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            logger.warning("Recurring visit roller batch hit a booking conflict; retrying next pass")
+            return created
+        created += batch_created
+        if not progressed:
+            return created
+
+
+def _roll_once() -> int:
+    with SessionLocal() as db:
+        return roll_forward(db)
+
+
+async def run_roller(interval: float = ROLLER_INTERVAL) -> None:
+    """Run `roll_forward` every `interval` seconds until cancelled."""
+    while True:
+        try:
+            created = await asyncio.to_thread(_roll_once)
+            if created:
+                logger.info("Materialized %d recurring visits", created)
+        except Exception:
+            logger.exception("Recurring visit roller pass failed")
+        await asyncio.sleep(interval)
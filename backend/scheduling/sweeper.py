@@ -0,0 +1,201 @@
+"""
+Background sweeper for missed visits and overdue 24/7 tasks.
+
+- A visit still `scheduled` `NO_SHOW_GRACE` after its scheduled_start becomes
+  `no_show`. Series heads are left alone: a no-show head would end its series.
+- A 24/7 task still `pending` after its task_date (UTC) gets `overdue_at`; its
+  status stays pending, since it can still be done.
+
+Candidates are read from partial indexes that hold only unswept rows
+(`ix_visit_scheduled_due`, `ix_task_overdue_due`), so each pass is a range scan
+however large the tables grow. Rows are claimed in bounded batches with
+`FOR UPDATE SKIP LOCKED`, so concurrent sweepers split the work, and each
+batch commits its changes, counter updates, alerts and realtime events
+together.
+
+Alerts go in-app to the organization's supervisors, agency admins and family
+editors, and to the caregiver concerned.
+"""
+
+import asyncio
+import logging
+import os
+from collections import Counter, defaultdict
+from collections.abc import Sequence
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Select, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from backend.database.entities.assignment_24_7 import Assignment24_7
+from backend.database.entities.membership import Membership
+from backend.database.entities.task import Task
+from backend.database.entities.visit import Visit
+from backend.database.session import SessionLocal
+from backend.notifications.channels import InAppChannel
+from backend.notifications.reminders import Reminder
+from backend.realtime import emit, task_event, visit_event
+from backend.scheduling.timeutils import as_utc
+from backend.stats.rollup import Key, apply, visit_key
+
+logger = logging.getLogger(__name__)
+
+# Seconds between passes; 0 disables the sweeper.
+SWEEP_INTERVAL = float(os.getenv("SWEEP_INTERVAL_SECONDS", "300"))
+# How long after scheduled_start a visit that was never started counts as missed.
+NO_SHOW_GRACE = timedelta(minutes=float(os.getenv("NO_SHOW_GRACE_MINUTES", "30")))
+SWEEP_BATCH_SIZE = 200
+
+ALERT_ROLES = ("supervisor", "agency_admin", "family_editor")
+
+
+def _no_show_stmt(cutoff: datetime, batch_size: int) -> Select:
+    # The status literal (not a bound parameter) lets the planner match the
+    # partial index predicate.
+    return (
+        select(Visit)
+        .where(
+            Visit.status == literal_column("'scheduled'"),
+            Visit.scheduled_start < cutoff,
+            or_(Visit.recurrence_rule.is_(None), Visit.parent_visit_id.is_not(None)),
+        )
+        .order_by(Visit.scheduled_start)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .execution_options(populate_existing=True)
+    )
+
+
+def _overdue_stmt(today: date, batch_size: int) -> Select:
+    return (
+        select(Task)
+        .where(
+            Task.status == literal_column("'pending'"),
+            Task.assignment_24x7_id.is_not(None),
+            Task.overdue_at.is_(None),
+            Task.task_date < today,
+        )
+        .order_by(Task.task_date)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .execution_options(populate_existing=True)
+    )
+
+
+def _alert_recipients(db: Session, organization_ids: set[UUID]) -> dict[UUID, set[UUID]]:
+    """Users alerted for each organization, one query on `ix_membership_org_role_status`."""
+    rows = db.execute(
+        select(Membership.organization_id, Membership.user_id).where(
+            Membership.organization_id.in_(organization_ids),
+            Membership.role.in_(ALERT_ROLES),
+            Membership.status == "active",
+        )
+    )
+    recipients: defaultdict[UUID, set[UUID]] = defaultdict(set)
+    for organization_id, user_id in rows:
+        recipients[organization_id].add(user_id)
+    return recipients
+
+
+def sweep_no_shows(db: Session, now: Optional[datetime] = None, batch_size: int = SWEEP_BATCH_SIZE) -> int:
+    """Mark missed visits `no_show`, one committed batch at a time. Returns visits marked."""
+    now = as_utc(now or datetime.now(timezone.utc))
+    cutoff = now - NO_SHOW_GRACE
+    swept = 0
+    while True:
+        visits: Sequence[Visit] = db.scalars(_no_show_stmt(cutoff, batch_size)).all()
+        if not visits:
+            return swept
+        changes: Counter[Key] = Counter()
+        for visit in visits:
+            changes[visit_key(visit)] -= 1
+            visit.status = "no_show"
+            changes[visit_key(visit)] += 1
+        db.flush()
+        apply(db, changes)
+        recipients = _alert_recipients(db, {visit.organization_id for visit in visits})
+        alerts: list[Reminder] = []
+        for visit in visits:
+            users = set(recipients[visit.organization_id])
+            if visit.assigned_caregiver_id is not None:
+                users.add(visit.assigned_caregiver_id)
+            data = {
+                "visit_id": str(visit.id),
+                "care_recipient_id": str(visit.care_recipient_id),
+                "scheduled_start": as_utc(visit.scheduled_start).isoformat(),
+            }
+            due_at = as_utc(visit.scheduled_start) + NO_SHOW_GRACE
+            key = f"visit:{visit.id}:no_show"
+            alerts += [
+                Reminder(key, due_at, user, visit.organization_id, "visit_missed", "Missed visit", data)
+                for user in sorted(users)
+            ]
+        InAppChannel().send(db, alerts, now)
+        emit(db, *(visit_event("no_show", visit) for visit in visits))
+        db.commit()
+        swept += len(visits)
+        if len(visits) < batch_size:
+            return swept
+
+
+def sweep_overdue_tasks(db: Session, now: Optional[datetime] = None, batch_size: int = SWEEP_BATCH_SIZE) -> int:
+    """Flag pending 24/7 tasks dated before today (UTC) as overdue. Returns tasks flagged."""
+    now = as_utc(now or datetime.now(timezone.utc))
+    swept = 0
+    while True:
+        tasks: Sequence[Task] = db.scalars(_overdue_stmt(now.date(), batch_size)).all()
+        if not tasks:
+            return swept
+        for task in tasks:
+            task.overdue_at = now
+        db.flush()
+        caregivers = dict(
+            db.execute(
+                select(Assignment24_7.id, Assignment24_7.caregiver_id).where(
+                    Assignment24_7.id.in_({task.assignment_24x7_id for task in tasks})
+                )
+            ).all()
+        )
+        recipients = _alert_recipients(db, {task.organization_id for task in tasks})
+        alerts: list[Reminder] = []
+        for task in tasks:
+            users = set(recipients[task.organization_id])
+            if caregivers.get(task.assignment_24x7_id) is not None:
+                users.add(caregivers[task.assignment_24x7_id])
+            data = {
+                "task_id": str(task.id),
+                "care_recipient_id": str(task.care_recipient_id),
+                "task_date": task.task_date.isoformat(),
+                "title": task.title,
+            }
+            due_at = datetime.combine(task.task_date + timedelta(days=1), time(), timezone.utc)
+            key = f"task:{task.id}:overdue"
+            alerts += [
+                Reminder(key, due_at, user, task.organization_id, "task_overdue", "Overdue task", data)
+                for user in sorted(users)
+            ]
+        InAppChannel().send(db, alerts, now)
+        emit(db, *(task_event("overdue", task) for task in tasks))
+        db.commit()
+        swept += len(tasks)
+        if len(tasks) < batch_size:
+            return swept
+
+
+def _sweep_once() -> tuple[int, int]:
+    with SessionLocal() as db:
+        return sweep_no_shows(db), sweep_overdue_tasks(db)
+
+
+async def run_sweeper(interval: float = SWEEP_INTERVAL) -> None:
+    """Run both sweeps every `interval` seconds until cancelled."""
+    while True:
+        try:
+            no_shows, overdue = await asyncio.to_thread(_sweep_once)
+            if no_shows or overdue:
+                logger.info("Marked %d visits no_show and %d tasks overdue", no_shows, overdue)
+        except Exception:
+            logger.exception("Missed visit and overdue task sweep failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,12 @@
+"""
+Datetime helpers shared by the scheduling modules.
+"""
+
+from datetime import datetime, timezone
+
+
+def as_utc(value: datetime) -> datetime:
+    """Aware UTC datetime; naive values (as read back from SQLite) are already UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,3 @@
+"""
+Dashboard statistics: per-day rollup counters and the job that reconciles them.
+"""
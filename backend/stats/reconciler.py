@@ -0,0 +1,50 @@
+"""
+Background reconciliation of the dashboard rollup counters.
+
+Counters are maintained incrementally by the write endpoints; this job
+recounts a window of days around today from the source tables every pass and
+corrects any drift (rows changed outside the API, inferred transitions that
+guessed wrong).
+"""
+
+import asyncio
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from backend.database.session import SessionLocal
+from backend.stats.rollup import reconcile
+
+logger = logging.getLogger(__name__)
+
+# Seconds between passes; 0 disables the reconciler.
+RECONCILE_INTERVAL = float(os.getenv("STATS_RECONCILE_INTERVAL_SECONDS", "900"))
+
+# Days before and after today recounted each pass.
+RECONCILE_WINDOW = timedelta(days=int(os.getenv("STATS_RECONCILE_WINDOW_DAYS", "7")))
+
+
+def reconcile_recent(db: Session, today: Optional[date] = None) -> int:
+    """Reconcile the counters of every day within `RECONCILE_WINDOW` of today."""
+    today = today or datetime.now(timezone.utc).date()
+    return reconcile(db, today - RECONCILE_WINDOW, today + RECONCILE_WINDOW)
+
+
+def _reconcile_once() -> int:
+    with SessionLocal() as db:
+        return reconcile_recent(db)
+
+
+async def run_reconciler(interval: float = RECONCILE_INTERVAL) -> None:
+    """Run `reconcile_recent` every `interval` seconds until cancelled."""
+    while True:
+        try:
+            fixed = await asyncio.to_thread(_reconcile_once)
+            if fixed:
+                logger.info("Corrected %d dashboard counters", fixed)
+        except Exception:
+            logger.exception("Dashboard stats reconciliation pass failed")
+        await asyncio.sleep(interval)
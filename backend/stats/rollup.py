@@ -0,0 +1,180 @@
+"""
+Per-organization, per-day dashboard counters.
+
+`stat_rollup` holds one row per (organization, day, metric): how many visits
+scheduled that day are in each status (`visits.<status>`, keyed by the UTC date
+of scheduled_start) and how many tasks dated that day are in each status
+(`tasks.<status>`). Every write that creates visits or tasks, or moves one to
+another status or day, adds the change to the touched counters with one
+INSERT ... ON CONFLICT DO UPDATE in the same transaction, so the dashboard reads
+a handful of counter rows instead of scanning the organization.
+
+One transition is inferred rather than read (see `count_check_in`), and rows
+can change outside the API, so `reconcile` periodically recounts recent days
+from the visit and task tables.
+"""
+
+from collections import Counter
+from collections.abc import Mapping
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Iterable
+from uuid import UUID
+
+from sqlalchemy import Date, Select, cast, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend.database.entities.stat_rollup import StatRollup
+from backend.database.entities.task import Task
+from backend.database.entities.visit import Visit
+from backend.scheduling.timeutils import as_utc
+
+Key = tuple[UUID, date, str]
+
+# Blocks counter writes (not reads) while `reconcile` recounts.
+_LOCK_ROLLUP = text("LOCK TABLE stat_rollup IN EXCLUSIVE MODE")
+
+
+def _get(row: Any, name: str) -> Any:
+    # Accepts entities, Row objects, RowMappings and INSERT parameter dicts.
+    return row[name] if isinstance(row, Mapping) else getattr(row, name)
+
+
+def _value(status: Any) -> str:
+    return getattr(status, "value", status)
+
+
+def visit_key(row: Any) -> Key:
+    """The counter a visit currently adds to."""
+    day = as_utc(_get(row, "scheduled_start")).date()
+    return (_get(row, "organization_id"), day, f"visits.{_value(_get(row, 'status'))}")
+
+
+def task_key(row: Any) -> Key:
+    """The counter a task currently adds to."""
+    return (_get(row, "organization_id"), _get(row, "task_date"), f"tasks.{_value(_get(row, 'status'))}")
+
+
+def apply(db: Session, changes: Counter[Key]) -> None:
+    """
+    Add `changes` to their counters in one executemany upsert.
+
+    Keys are written in sorted order so concurrent transactions lock counter
+    rows in the same order and cannot deadlock on each other.
+    """
+    rows = [
+        {"organization_id": org, "stat_date": day, "metric": metric, "value": n}
+        for (org, day, metric), n in sorted(changes.items())
+        if n
+    ]
+    if not rows:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(StatRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StatRollup.organization_id, StatRollup.stat_date, StatRollup.metric],
+        set_={"value": StatRollup.value + stmt.excluded.value, "updated_at": func.now()},
+    )
+    db.execute(stmt, rows)
+
+
+def _tally(keys: Iterable[Key], n: int) -> Counter[Key]:
+    changes: Counter[Key] = Counter()
+    for key in keys:
+        changes[key] += n
+    return changes
+
+
+def count_visits(db: Session, rows: Iterable[Any], n: int = 1) -> None:
+    """Count (n=1) or uncount (n=-1) visits as they currently are."""
+    apply(db, _tally(map(visit_key, rows), n))
+
+
+def count_tasks(db: Session, rows: Iterable[Any], n: int = 1) -> None:
+    """Count (n=1) or uncount (n=-1) tasks as they currently are."""
+    apply(db, _tally(map(task_key, rows), n))
+
+
+def move(db: Session, before: Key, after: Key) -> None:
+    """Move one row from the `before` counter to the `after` counter."""
+    if before != after:
+        apply(db, Counter({before: -1, after: 1}))
+
+
+def count_check_in(db: Session, row: Mapping, now: datetime) -> None:
+    """
+    Count a start/end transition from the row its conditional UPDATE returned.
+
+    RETURNING only has the new values, so the old status is inferred: a
+    `checked_in_at` equal to `now` means this statement checked the visit in,
+    so it was still scheduled; otherwise it was already in progress. A visit
+    whose status was set by PATCH without a check-in can be miscounted here
+    until the next `reconcile`.
+    """
+    checked_in_at = row["checked_in_at"]
+    fresh = checked_in_at is not None and as_utc(checked_in_at) == as_utc(now)
+    before = visit_key(dict(row, status="scheduled" if fresh else "in_progress"))
+    move(db, before, visit_key(row))
+
+
+def stats_stmt(organization_id: UUID, stat_date: date) -> Select:
+    """Every counter of an organization for one day (a primary key range scan)."""
+    return select(StatRollup.metric, StatRollup.value).where(
+        StatRollup.organization_id == organization_id,
+        StatRollup.stat_date == stat_date,
+    )
+
+
+def _recount(db: Session, first: date, last: date) -> Iterable[tuple[Key, int]]:
+    start = datetime.combine(first, time(), timezone.utc)
+    end = datetime.combine(last + timedelta(days=1), time(), timezone.utc)
+    if db.get_bind().dialect.name == "postgresql":
+        visit_date = cast(func.timezone("UTC", Visit.scheduled_start), Date)
+    else:
+        visit_date = func.date(Visit.scheduled_start)
+    visits = db.execute(
+        select(Visit.organization_id, visit_date, Visit.status, func.count())
+        .where(Visit.scheduled_start >= start, Visit.scheduled_start < end)
+        .group_by(Visit.organization_id, visit_date, Visit.status)
+    )
+    for org, day, visit_status, n in visits:
+        # SQLite's date() returns text.
+        day = date.fromisoformat(day) if isinstance(day, str) else day
+        yield (org, day, f"visits.{_value(visit_status)}"), n
+    tasks = db.execute(
+        select(Task.organization_id, Task.task_date, Task.status, func.count())
+        .where(Task.task_date >= first, Task.task_date <= last)
+        .group_by(Task.organization_id, Task.task_date, Task.status)
+    )
+    for org, day, task_status, n in tasks:
+        yield (org, day, f"tasks.{_value(task_status)}"), n
+
+
+def reconcile(db: Session, first: date, last: date) -> int:
+    """
+    Recount days [first, last] from the visit and task tables and fix drifted counters.
+
+    On Postgres the rollup table is locked against other writers (reads go on)
+    for the duration, so an increment committed meanwhile is neither lost nor
+    counted twice. Commits; returns the number of counters corrected.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(_LOCK_ROLLUP)
+    actual = dict(_recount(db, first, last))
+    stored = {
+        (org, day, metric): value
+        for org, day, metric, value in db.execute(
+            select(StatRollup.organization_id, StatRollup.stat_date, StatRollup.metric, StatRollup.value).where(
+                StatRollup.stat_date >= first,
+                StatRollup.stat_date <= last,
+            )
+        )
+    }
+    drift: Counter[Key] = Counter()
+    for key in actual.keys() | stored.keys():
+        n = actual.get(key, 0) - stored.get(key, 0)
+        if n:
+            drift[key] = n
+    apply(db, drift)
+    db.commit()
+    return len(drift)
@@ -0,0 +1,112 @@
+"""
+Micro-benchmarks (pytest-benchmark) of the route handlers and of their layers.
+
+Collected only with `--run-benchmarks`, and only when pytest-benchmark is
+installed, so a plain `pytest` leaves them out. Everything runs in process:
+the app through a TestClient, on the test SQLite database, against one agency
+generated by `backend.database.seed`. Baselines and the regression gate are
+described in docs/api-structure.md.
+"""
+
+import importlib.util
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from backend.apis.admission import RateLimiter
+from backend.apis.main import create_app
+from backend.database import (
+    CareArrangement,
+    CareRelationship,
+    ConversationParticipant,
+    Location,
+    Membership,
+    Message,
+    SessionLocal,
+    Task,
+    Visit,
+    VisitNote,
+    engine,
+)
+from backend.database.seed import Scale, seed
+from backend.loadtest.scenarios import load_context
+
+_INSTALLED = importlib.util.find_spec("pytest_benchmark") is not None
+
+# Six in the morning, so the day's visits are all still to check in.
+NOW = datetime(2032, 5, 10, 6, tzinfo=timezone.utc)
+SCALE = Scale(caregivers=20, recipients=200, weeks_back=1, weeks_ahead=1)
+
+
+@dataclass(frozen=True)
+class Agency:
+    """The seeded agency and one id of each kind, for building requests."""
+
+    ids: dict[str, Any]
+    headers: dict[str, str]
+    participant_headers: dict[str, str]
+
+
+def pytest_ignore_collect(collection_path: Path, config: pytest.Config) -> Optional[bool]:
+    if collection_path.name.startswith("test_") and not (_INSTALLED and config.getoption("--run-benchmarks")):
+        return True
+    return None
+
+
+def _first(db: Any, column: Any, *where: Any) -> UUID:
+    return db.scalar(select(column).where(*where).order_by(column).limit(1))
+
+
+@pytest.fixture(scope="session")
+def agency(schema: None) -> Agency:
+    [org] = seed(engine, SCALE, seed=2032, now=NOW)
+    with SessionLocal() as db:
+        context = load_context(db, org, NOW.date())
+        conversation, participant = db.execute(
+            select(ConversationParticipant.conversation_id, ConversationParticipant.user_id)
+            .join(Message, Message.conversation_id == ConversationParticipant.conversation_id)
+            .where(Message.sender_id == ConversationParticipant.user_id)
+            .order_by(ConversationParticipant.id)
+            .limit(1)
+        ).one()
+        ids = {
+            "org": org,
+            "day": NOW.date().isoformat(),
+            "from": f"{NOW:%Y-%m-%dT%H:%M:%SZ}",
+            "to": f"{NOW + timedelta(weeks=1):%Y-%m-%dT%H:%M:%SZ}",
+            "supervisor": context.supervisors[0],
+            "caregiver": context.caregivers[0],
+            "recipient": context.recipients[0],
+            "check_in": context.check_ins[0][0],
+            "series": _first(db, Visit.id, Visit.organization_id == org, Visit.recurrence_rule.is_not(None)),
+            "visit": _first(db, Visit.id, Visit.organization_id == org, Visit.parent_visit_id.is_not(None)),
+            "task": _first(db, Task.id, Task.organization_id == org),
+            "note": _first(db, VisitNote.id, VisitNote.author_id == context.caregivers[0]),
+            "relationship": _first(db, CareRelationship.id, CareRelationship.organization_id == org),
+            "arrangement": _first(db, CareArrangement.id, CareArrangement.organization_id == org),
+            "membership": _first(db, Membership.id, Membership.organization_id == org),
+            "location": _first(db, Location.id, Location.organization_id == org),
+            "conversation": conversation,
+            "participant": participant,
+            "message": _first(db, Message.id, Message.conversation_id == conversation),
+        }
+    return Agency(
+        ids=ids,
+        headers={"X-Organization-Id": str(org), "X-User-Id": str(ids["supervisor"])},
+        participant_headers={"X-Organization-Id": str(org), "X-User-Id": str(participant)},
+    )
+
+
+@pytest.fixture(scope="session")
+def bench_client() -> TestClient:
+    """The sync app with authentication off and admission limits out of the way."""
+    app = create_app(use_async_db=False)
+    app.state.admission.users = RateLimiter(rate=1e9, burst=1e9)
+    app.state.admission.organizations = RateLimiter(rate=1e9, burst=1e9)
+    return TestClient(app)
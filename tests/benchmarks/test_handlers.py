@@ -0,0 +1,164 @@
+"""
+Route handlers end to end: request validation, SQL, ORM hydration and response
+serialization together, through the sync app in process.
+"""
+
+import itertools
+from typing import Any, Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+API = "/api/v1"
+BATCH_SIZE = 25
+
+# One GET per read handler, by name; `{...}` is filled from `Agency.ids`.
+READS = {
+    "list_visits": "/visits?limit=100",
+    "get_visit": "/visits/{visit}",
+    "visit_occurrences": "/visits/{series}/occurrences?from={from}&to={to}",
+    "export_visits": "/visits/export?from={from}&to={to}",
+    "list_tasks": "/tasks?limit=100",
+    "get_task": "/tasks/{task}",
+    "export_tasks": "/tasks/export?from={day}&to={day}",
+    "calendar": "/calendar?from={from}&to={to}&caregiver_id={caregiver}",
+    "dashboard_stats": "/dashboard/stats?date={day}",
+    "list_visit_notes": "/visit-notes?limit=100",
+    "get_visit_note": "/visit-notes/{note}",
+    "list_care_relationships": "/care-relationships?limit=100",
+    "get_care_relationship": "/care-relationships/{relationship}",
+    "list_care_arrangements": "/care-arrangements?limit=100",
+    "effective_care_arrangements": "/care-arrangements/effective?date={day}",
+    "get_care_arrangement": "/care-arrangements/{arrangement}",
+    "list_memberships": "/memberships?limit=100",
+    "get_membership": "/memberships/{membership}",
+    "list_locations": "/locations",
+    "get_location": "/locations/{location}",
+    "list_persons": "/persons?limit=100",
+    "search_persons": "/persons/search?q=ma",
+    "get_person": "/persons/{recipient}",
+    "list_organizations": "/organizations",
+    "get_organization": "/organizations/{org}",
+    "list_notifications": "/notifications",
+    "search": "/search?q=walk",
+}
+
+# Read by a participant, who can see the thread.
+PARTICIPANT_READS = {
+    "list_conversations": "/conversations",
+    "get_conversation": "/conversations/{conversation}",
+    "list_messages": "/conversations/{conversation}/messages?limit=100",
+}
+
+_n = itertools.count()
+
+
+def _visit(ids: dict[str, Any]) -> dict[str, Any]:
+    """An unassigned visit a year out, so no write is rejected as a double booking."""
+    hour = next(_n) % 10 + 8
+    return {
+        "organization_id": str(ids["org"]),
+        "care_recipient_id": str(ids["recipient"]),
+        "visit_type": "companionship",
+        "scheduled_start": f"2033-05-10T{hour:02}:00:00Z",
+        "scheduled_end": f"2033-05-10T{hour:02}:45:00Z",
+        "timezone": "America/New_York",
+    }
+
+
+def _task(ids: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "organization_id": str(ids["org"]),
+        "care_recipient_id": str(ids["recipient"]),
+        "visit_id": str(ids["visit"]),
+        "task_date": ids["day"],
+        "title": "Evening walk",
+        "category": "exercise",
+    }
+
+
+# One request per write handler: (method, path, payload factory).
+WRITES: dict[str, tuple[str, str, Callable[[dict[str, Any]], dict[str, Any]]]] = {
+    "create_visit": ("POST", "/visits", _visit),
+    "create_visits_batch": ("POST", "/visits:batch", lambda ids: {"items": [_visit(ids) for _ in range(BATCH_SIZE)]}),
+    "update_visit": ("PATCH", "/visits/{visit}", lambda ids: {"notes": f"Gate code {next(_n)}"}),
+    "start_visit": ("POST", "/visits/{check_in}/start", lambda ids: {}),
+    "create_task": ("POST", "/tasks", _task),
+    "create_tasks_batch": ("POST", "/tasks:batch", lambda ids: {"items": [_task(ids) for _ in range(BATCH_SIZE)]}),
+    "update_task": ("PATCH", "/tasks/{task}", lambda ids: {"notes": f"Took {next(_n)} minutes"}),
+    "update_visit_note": ("PATCH", "/visit-notes/{note}", lambda ids: {"summary": f"Settled, note {next(_n)}"}),
+    "create_person": (
+        "POST",
+        "/persons",
+        lambda ids: {"email": f"bench.{next(_n)}@example.com", "first_name": "Bench", "last_name": "Mark"},
+    ),
+    "update_person": ("PATCH", "/persons/{recipient}", lambda ids: {"display_name": f"Client {next(_n)}"}),
+    "create_location": (
+        "POST",
+        "/locations",
+        lambda ids: {"organization_id": str(ids["org"]), "name": f"Branch {next(_n)}", "address_country": "US"},
+    ),
+    "update_location": ("PATCH", "/locations/{location}", lambda ids: {"address_city": f"Springfield {next(_n)}"}),
+    "update_membership": ("PATCH", "/memberships/{membership}", lambda ids: {"title": f"Lead {next(_n)}"}),
+    "create_care_relationship": (
+        "POST",
+        "/care-relationships",
+        lambda ids: {
+            "care_recipient_id": str(ids["recipient"]),
+            "related_user_id": str(ids["caregiver"]),
+            "organization_id": str(ids["org"]),
+            "role": "other",
+        },
+    ),
+    "update_care_relationship": (
+        "PATCH",
+        "/care-relationships/{relationship}",
+        lambda ids: {"notes": f"Prefers mornings {next(_n)}"},
+    ),
+    "update_care_arrangement": (
+        "PATCH",
+        "/care-arrangements/{arrangement}",
+        lambda ids: {"notes": f"Key with neighbour {next(_n)}"},
+    ),
+    "create_conversation": (
+        "POST",
+        "/conversations",
+        lambda ids: {"organization_id": str(ids["org"]), "type": "group", "participant_ids": [str(ids["caregiver"])]},
+    ),
+}
+
+# Sent by a participant of the thread.
+PARTICIPANT_WRITES: dict[str, tuple[str, str, Callable[[dict[str, Any]], dict[str, Any]]]] = {
+    "send_message": ("POST", "/conversations/{conversation}/messages", lambda ids: {"body": f"On my way {next(_n)}"}),
+    "mark_read": ("POST", "/conversations/{conversation}/read", lambda ids: {"message_id": str(ids["message"])}),
+}
+
+
+@pytest.mark.benchmark(group="handlers")
+@pytest.mark.parametrize("name", [*READS, *PARTICIPANT_READS])
+def test_read(benchmark: Any, bench_client: TestClient, agency: Any, name: str) -> None:
+    if name in READS:
+        url, headers = API + READS[name].format(**agency.ids), agency.headers
+    else:
+        url, headers = API + PARTICIPANT_READS[name].format(**agency.ids), agency.participant_headers
+
+    response = benchmark(bench_client.get, url, headers=headers)
+
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.benchmark(group="handlers")
+@pytest.mark.parametrize("name", [*WRITES, *PARTICIPANT_WRITES])
+def test_write(benchmark: Any, bench_client: TestClient, agency: Any, name: str) -> None:
+    if name in WRITES:
+        (method, path, payload), headers = WRITES[name], agency.headers
+    else:
+        (method, path, payload), headers = PARTICIPANT_WRITES[name], agency.participant_headers
+    url = API + path.format(**agency.ids)
+
+    def send() -> Any:
+        return bench_client.request(method, url, json=payload(agency.ids), headers=headers)
+
+    response = benchmark(send)
+
+    assert response.status_code in (200, 201), response.text
@@ -0,0 +1,111 @@
+"""
+The layers of a handler, timed apart: request validation, SQL, ORM hydration
+and response serialization.
+
+`test_sql` fetches the list handlers' page as plain rows and `test_hydrate` the
+same statement as entities, so their difference is the cost of hydration.
+`test_serialize` validates a page of entities into the response model and
+dumps it to JSON, as FastAPI does with a handler's return value.
+"""
+
+from typing import Any, Iterator
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.apis.routes.tasks import TASK_ORDER
+from backend.apis.routes.visits import VISIT_ORDER
+from backend.apis.schemas.pagination import Page
+from backend.apis.schemas.task import TaskResponse, TaskUpdate
+from backend.apis.schemas.visit import VisitCreate, VisitResponse
+from backend.database import SessionLocal, Task, Visit
+
+PAGE_SIZE = 100
+
+ORDERS = {"tasks": (Task, TASK_ORDER), "visits": (Visit, VISIT_ORDER)}
+RESPONSES = {"tasks": TypeAdapter(Page[TaskResponse]), "visits": TypeAdapter(Page[VisitResponse])}
+
+
+def _visit_create(agency: Any) -> dict[str, Any]:
+    return {
+        "organization_id": str(agency.ids["org"]),
+        "care_recipient_id": str(agency.ids["recipient"]),
+        "assigned_caregiver_id": str(agency.ids["caregiver"]),
+        "visit_type": "personal_care",
+        "scheduled_start": "2033-05-10T09:00:00Z",
+        "scheduled_end": "2033-05-10T10:00:00Z",
+        "timezone": "America/New_York",
+        "address_street": "12 Elm Street",
+        "address_city": "Springfield",
+        "notes": "Ring twice",
+    }
+
+
+PAYLOADS = {
+    "VisitCreate": (VisitCreate, _visit_create),
+    "VisitCreate_recurring": (
+        VisitCreate,
+        lambda agency: {**_visit_create(agency), "recurrence_rule": "FREQ=WEEKLY;BYDAY=MO,WE,FR;COUNT=12"},
+    ),
+    "TaskUpdate": (
+        TaskUpdate,
+        lambda agency: {"status": "completed", "notes": "Walked to the park", "sort_order": 2},
+    ),
+}
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    with SessionLocal() as session:
+        yield session
+
+
+def _page_stmt(resource: str, agency: Any, columns: bool) -> Any:
+    entity, order = ORDERS[resource]
+    stmt = select(*entity.__table__.c) if columns else select(entity)
+    return order.apply(stmt.where(entity.organization_id == agency.ids["org"]), None, PAGE_SIZE)
+
+
+@pytest.mark.benchmark(group="validation")
+@pytest.mark.parametrize("name", PAYLOADS)
+def test_validate(benchmark: Any, agency: Any, name: str) -> None:
+    model, payload = PAYLOADS[name]
+
+    benchmark(model.model_validate, payload(agency))
+
+
+@pytest.mark.benchmark(group="sql")
+@pytest.mark.parametrize("resource", ORDERS)
+def test_sql(benchmark: Any, agency: Any, db: Session, resource: str) -> None:
+    stmt = _page_stmt(resource, agency, columns=True)
+
+    rows = benchmark(lambda: db.execute(stmt).all())
+
+    assert len(rows) == PAGE_SIZE + 1
+
+
+@pytest.mark.benchmark(group="hydration")
+@pytest.mark.parametrize("resource", ORDERS)
+def test_hydrate(benchmark: Any, agency: Any, db: Session, resource: str) -> None:
+    stmt = _page_stmt(resource, agency, columns=False)
+
+    def hydrate() -> list[Any]:
+        # A fresh identity map each round, as each request has.
+        db.expunge_all()
+        return db.scalars(stmt).all()
+
+    assert len(benchmark(hydrate)) == PAGE_SIZE + 1
+
+
+@pytest.mark.benchmark(group="serialization")
+@pytest.mark.parametrize("resource", ORDERS)
+def test_serialize(benchmark: Any, agency: Any, db: Session, resource: str) -> None:
+    _, order = ORDERS[resource]
+    page = order.page(db.scalars(_page_stmt(resource, agency, columns=False)).all(), PAGE_SIZE)
+    adapter = RESPONSES[resource]
+
+    body = benchmark(lambda: adapter.dump_json(adapter.validate_python(page, from_attributes=True)))
+
+    assert len(adapter.validate_json(body).items) == PAGE_SIZE
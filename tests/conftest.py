@@ -0,0 +1,102 @@
+"""
+Shared pytest fixtures.
+
+Tests run against a throwaway SQLite file instead of Postgres. DATABASE_URL must
+be set before `backend.database.session` is imported, hence the module-level
+environment setup.
+
+Every API test runs twice: once against the threadpool routers and once against
+the `routes.aio` routers on an aiosqlite AsyncSession, so the two cannot drift.
+"""
+
+import os
+import tempfile
+import uuid
+from collections.abc import AsyncGenerator, Generator
+
+_TMP_DIR = tempfile.mkdtemp(prefix="homecare-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP_DIR}/test.db"
+os.environ["DATABASE_ASYNC"] = "false"
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.apis import dependencies
+from backend.apis.main import create_app
+from backend.database import create_schema, engine
+from backend.database.session import DATABASE_URL, to_async_url
+
+# NullPool: TestClient runs each request on its own event loop, and aiosqlite
+# connections must not outlive the loop that opened them.
+async_engine = create_async_engine(to_async_url(DATABASE_URL), poolclass=NullPool)
+AsyncTestSession = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def _get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncTestSession() as db:
+        yield db
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        help="Also collect the micro-benchmarks in tests/benchmarks (needs pytest-benchmark).",
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema() -> None:
+    """Create every table and index once per test session."""
+    create_schema(engine)
+
+
+@pytest.fixture
+def organization_id() -> uuid.UUID:
+    """A fresh organization per test so tests never see each other's rows."""
+    return uuid.uuid4()
+
+
+@pytest.fixture
+def user_id() -> uuid.UUID:
+    return uuid.uuid4()
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "async"])
+def app(request: pytest.FixtureRequest, organization_id: uuid.UUID, user_id: uuid.UUID) -> FastAPI:
+    """App with the header-based identity stubs pinned to this test's ids."""
+    app = create_app(use_async_db=request.param)
+    app.dependency_overrides[dependencies.get_async_db] = _get_async_db
+    app.dependency_overrides[dependencies.get_current_organization_id] = lambda: organization_id
+    app.dependency_overrides[dependencies.get_current_user_id] = lambda: user_id
+    return app
+
+
+@pytest.fixture
+def client(app: FastAPI) -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture
+def engines() -> list[Engine]:
+    """Engines behind the sync and async routers, for attaching event listeners."""
+    return [engine, async_engine.sync_engine]
+
+
+@pytest.fixture
+def statements(engines: list[Engine]) -> Generator[list[str], None, None]:
+    """Record the SQL statements executed on the engines while the test runs."""
+    seen: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        seen.append(statement)
+
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    yield seen
+    for target in engines:
+        event.remove(target, "before_cursor_execute", record)
@@ -0,0 +1,90 @@
+"""
+Admission control: per-user and per-organization token buckets, and the adaptive concurrency limit.
+"""
+
+import time
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.apis import auth
+from backend.apis.admission import ConcurrencyLimit, PoolWaitMeter, RateLimiter, identify
+from backend.apis.metrics import ADMISSION_REJECTIONS
+
+
+@pytest.fixture
+def limited_client(app: FastAPI) -> TestClient:
+    app.state.admission.users = RateLimiter(rate=1, burst=2)
+    app.state.admission.organizations = RateLimiter(rate=1, burst=3)
+    return TestClient(app)
+
+
+def _get(client: TestClient, user: str, org: str) -> int:
+    response = client.get("/api/v1/visits", headers={"X-User-Id": user, "X-Organization-Id": org})
+    if response.status_code == 429:
+        assert int(response.headers["Retry-After"]) >= 1
+    return response.status_code
+
+
+def test_buckets_limit_users_and_organizations(limited_client: TestClient) -> None:
+    org, other_org = str(uuid.uuid4()), str(uuid.uuid4())
+    throttled = ADMISSION_REJECTIONS.labels("rate_limit").value
+
+    assert [_get(limited_client, "alice", org) for _ in range(3)] == [200, 200, 429]
+    assert _get(limited_client, "bob", other_org) == 200
+    assert _get(limited_client, "carol", org) == 200
+    assert _get(limited_client, "dave", org) == 429
+    assert limited_client.get("/health").status_code == 200
+    assert ADMISSION_REJECTIONS.labels("rate_limit").value == throttled + 2
+
+
+def test_requests_past_the_concurrency_limit_are_shed(limited_client: TestClient) -> None:
+    concurrency = limited_client.app.state.admission.concurrency
+    concurrency.in_flight = int(concurrency.limit)
+
+    response = limited_client.get("/api/v1/visits")
+
+    assert response.status_code == 503 and response.headers["Retry-After"] == "1"
+    concurrency.in_flight = 0
+    assert limited_client.get("/api/v1/visits").status_code == 200
+    assert concurrency.in_flight == 0
+
+
+def test_token_buckets_refill_at_their_rate() -> None:
+    limiter = RateLimiter(rate=4, burst=2)
+    for _ in range(2):
+        assert limiter.wait("k", 0.0) == 0
+        limiter.take("k", 0.0)
+
+    assert limiter.wait("k", 0.0) == 0.25
+    assert limiter.wait("k", 0.25) == 0 and limiter.wait("other", 0.0) == 0
+
+
+def test_the_concurrency_limit_follows_the_pool_wait() -> None:
+    meter = PoolWaitMeter()
+    limit = ConcurrencyLimit(initial=4, minimum=2, maximum=5, target_wait=0.05, meter=meter)
+    assert all(limit.acquire() for _ in range(4)) and not limit.acquire()
+
+    limit.release(now=0.0)
+    assert limit.limit == pytest.approx(4.25)
+
+    meter.observe(1.0)
+    limit.release(now=1.0)
+    limit.release(now=1.5)
+    assert limit.limit == pytest.approx(4.25 * 0.75)
+    limit.release(now=2.0)
+    assert limit.limit == pytest.approx(4.25 * 0.75**2)
+
+
+def test_authenticated_callers_are_keyed_by_their_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth, "SIGNING_KEYS", {None: b"key"})
+    user, org = uuid.uuid4(), uuid.uuid4()
+    token = auth.encode_token({"sub": str(user), "org": str(org), "exp": time.time() + 60}, b"key")
+
+    def scope(authorization: str) -> dict:
+        return {"headers": [(b"authorization", authorization.encode())], "client": ("10.0.0.1", 1234)}
+
+    assert identify(scope(f"Bearer {token}")) == (str(org), str(user))
+    assert identify(scope("Bearer forged")) == (None, "client:10.0.0.1")
@@ -0,0 +1,120 @@
+"""
+Bearer token authentication and cached membership resolution.
+"""
+
+import base64
+import time
+import uuid
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.apis import auth
+from backend.apis.main import create_app
+from backend.database import Membership, SessionLocal
+from backend.realtime import person_event
+
+KEY = b"test-signing-key"
+
+
+@pytest.fixture
+def auth_client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    """A client for an app with authentication on and the real identity dependencies."""
+    monkeypatch.setattr(auth, "SIGNING_KEYS", {"current": KEY, "previous": b"old-key"})
+    return TestClient(create_app(use_async_db=False))
+
+
+def _token(user: uuid.UUID, key: bytes = KEY, kid: str = "current", **claims: Any) -> str:
+    return auth.encode_token({"sub": str(user), "exp": time.time() + 300, **claims}, key, kid)
+
+
+def _get(client: TestClient, token: str, org: uuid.UUID) -> Any:
+    headers = {"Authorization": f"Bearer {token}", "X-Organization-Id": str(org)}
+    return client.get("/api/v1/conversations", headers=headers)
+
+
+def _member(user: uuid.UUID, org: uuid.UUID, status: str = "active") -> Membership:
+    with SessionLocal() as db:
+        membership = Membership(user_id=user, organization_id=org, role="caregiver", status=status)
+        db.add(membership)
+        db.commit()
+    return membership
+
+
+def test_invalid_tokens_are_rejected(auth_client: TestClient, user_id: uuid.UUID, organization_id: uuid.UUID) -> None:
+    orgs = {str(organization_id): "caregiver"}
+    claims = _token(user_id, orgs=orgs).split(".")[1]
+    alg_none = base64.urlsafe_b64encode(b'{"alg":"none"}').decode().rstrip("=") + f".{claims}."
+    for token in (
+        "not-a-token",
+        _token(user_id, key=b"forged", orgs=orgs),
+        _token(user_id, kid="unknown", orgs=orgs),
+        _token(user_id, orgs=orgs, exp=time.time() - 3600),
+        alg_none,
+    ):
+        response = _get(auth_client, token, organization_id)
+        assert response.status_code == 401, token
+        assert response.headers["WWW-Authenticate"] == "Bearer"
+    assert auth_client.get("/api/v1/conversations").status_code == 401
+    assert _get(auth_client, _token(user_id, key=b"old-key", kid="previous", orgs=orgs), organization_id).is_success
+
+
+def test_claimed_organizations_need_no_lookup(
+    auth_client: TestClient, user_id: uuid.UUID, organization_id: uuid.UUID, statements: list[str]
+) -> None:
+    token = _token(user_id, orgs={str(organization_id): "supervisor"})
+
+    assert _get(auth_client, token, organization_id).status_code == 200
+    assert not [sql for sql in statements if "FROM membership" in sql]
+    assert _get(auth_client, token, uuid.uuid4()).status_code == 403
+
+
+def test_memberships_are_cached_until_a_membership_write(
+    auth_client: TestClient, user_id: uuid.UUID, organization_id: uuid.UUID, statements: list[str]
+) -> None:
+    membership = _member(user_id, organization_id)
+    token = _token(user_id)
+
+    def lookups() -> int:
+        return sum("FROM membership" in sql for sql in statements)
+
+    assert _get(auth_client, token, organization_id).status_code == 200
+    assert _get(auth_client, token, organization_id).status_code == 200
+    assert lookups() == 1
+    auth.on_event(person_event(user_id))
+    assert _get(auth_client, token, organization_id).status_code == 200
+    assert lookups() == 2
+
+    admin = uuid.uuid4()
+    admin_token = _token(admin, orgs={str(organization_id): "agency_admin"})
+    response = auth_client.patch(
+        f"/api/v1/memberships/{membership.id}",
+        json={"status": "inactive"},
+        headers={"Authorization": f"Bearer {admin_token}", "X-Organization-Id": str(organization_id)},
+    )
+    assert response.status_code == 200
+
+    assert _get(auth_client, token, organization_id).status_code == 403
+    assert _get(auth_client, _token(user_id, org=str(organization_id)), organization_id).status_code == 403
+
+
+def test_organization_comes_from_header_or_claim(auth_client: TestClient, user_id: uuid.UUID) -> None:
+    org = uuid.uuid4()
+    _member(user_id, org)
+    _member(user_id, uuid.uuid4(), status="invited")
+    headers = {"Authorization": f"Bearer {_token(user_id, org=str(org))}"}
+
+    assert auth_client.get("/api/v1/conversations", headers=headers).status_code == 200
+    bare = {"Authorization": f"Bearer {_token(user_id)}"}
+    assert auth_client.get("/api/v1/conversations", headers=bare).status_code == 400
+    assert auth.membership_roles(str(user_id)) == {str(org): "caregiver"}
+
+
+def test_header_stubs_are_parsed_while_authentication_is_off(organization_id: uuid.UUID) -> None:
+    client = TestClient(create_app(use_async_db=False))
+
+    headers = {"X-Organization-Id": str(organization_id), "X-User-Id": str(uuid.uuid4())}
+    assert client.get("/api/v1/conversations", headers=headers).status_code == 200
+    assert client.get("/api/v1/conversations", headers={"X-Organization-Id": "acme"}).status_code == 400
+    assert client.get("/api/v1/conversations", headers={"X-User-Id": "alice"}).status_code == 400
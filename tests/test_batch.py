@@ -0,0 +1,147 @@
+"""
+Batch create: one INSERT per batch (plus the dashboard counter upsert),
+per-item errors, all-or-nothing writes.
+"""
+
+import uuid
+from collections.abc import Generator
+from typing import Any, Callable
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import IntegrityError
+
+
+def _verbs(statements: list[str]) -> list[str]:
+    return [s.split(None, 1)[0].upper() for s in statements]
+
+
+def _visit(org: uuid.UUID, **extra: Any) -> dict[str, Any]:
+    return {
+        "organization_id": str(org),
+        "care_recipient_id": str(uuid.uuid4()),
+        "visit_type": "personal_care",
+        "scheduled_start": "2025-03-03T08:00:00+00:00",
+        "scheduled_end": "2025-03-03T09:00:00+00:00",
+        **extra,
+    }
+
+
+def _task(org: uuid.UUID) -> dict[str, Any]:
+    return {
+        "organization_id": str(org),
+        "care_recipient_id": str(uuid.uuid4()),
+        "visit_id": str(uuid.uuid4()),
+        "task_date": "2025-03-03",
+        "title": "Morning medication",
+    }
+
+
+def _visit_ids(client: TestClient) -> list[str]:
+    response = client.get("/api/v1/visits", params={"limit": 100})
+    assert response.status_code == 200, response.text
+    return [v["id"] for v in response.json()["items"]]
+
+
+@pytest.mark.parametrize("path,build", [("/api/v1/visits:batch", _visit), ("/api/v1/tasks:batch", _task)])
+def test_batch_create_is_one_insert(
+    client: TestClient,
+    statements: list[str],
+    organization_id: uuid.UUID,
+    path: str,
+    build: Callable[[uuid.UUID], dict[str, Any]],
+) -> None:
+    items = [build(organization_id) for _ in range(25)]
+
+    response = client.post(path, json={"items": items})
+
+    assert response.status_code == 201, response.text
+    created = response.json()["items"]
+    assert [c["care_recipient_id"] for c in created] == [i["care_recipient_id"] for i in items]
+    assert _verbs(statements) == ["INSERT", "INSERT"]
+
+
+def test_batch_reports_every_invalid_item(
+    client: TestClient,
+    statements: list[str],
+    organization_id: uuid.UUID,
+) -> None:
+    unscoped = dict(_task(organization_id), visit_id=None)
+    items = [_task(organization_id), unscoped, _task(organization_id), unscoped]
+
+    response = client.post("/api/v1/tasks:batch", json={"items": items})
+
+    assert response.status_code == 400
+    assert [e["index"] for e in response.json()["detail"]] == [1, 3]
+    assert statements == []
+
+
+def test_invalid_visit_is_reported_by_index(
+    client: TestClient,
+    statements: list[str],
+    organization_id: uuid.UUID,
+) -> None:
+    backwards = _visit(organization_id, scheduled_end="2025-03-03T07:00:00+00:00")
+    items = [_visit(organization_id), backwards, _visit(organization_id, visit_type="gardening")]
+
+    response = client.post("/api/v1/visits:batch", json={"items": items})
+
+    assert response.status_code == 422
+    assert sorted(tuple(e["loc"]) for e in response.json()["detail"]) == [
+        ("body", "items", 1, "scheduled_end"),
+        ("body", "items", 2, "visit_type"),
+    ]
+    assert statements == []
+    assert _visit_ids(client) == []
+
+
+def test_batch_expands_series_heads(client: TestClient, organization_id: uuid.UUID) -> None:
+    items = [
+        _visit(organization_id, recurrence_rule="FREQ=DAILY;COUNT=3"),
+        _visit(organization_id),
+        _visit(organization_id, recurrence_rule="FREQ=WEEKLY;COUNT=2"),
+    ]
+
+    response = client.post("/api/v1/visits:batch", json={"items": items})
+
+    assert response.status_code == 201, response.text
+    created = response.json()["items"]
+    assert [c["recurrence_rule"] for c in created] == [i.get("recurrence_rule") for i in items]
+    # The batch response lists the requested visits only; the series' children are stored alongside.
+    assert len(_visit_ids(client)) == 3 + 2 + 1
+
+
+@pytest.fixture
+def failing_children_insert(engines: list[Engine]) -> Generator[None, None, None]:
+    """Fail the second INSERT into visit (a series' children) as a lost booking race would."""
+    seen = {"inserts": 0}
+
+    class ExclusionViolation(Exception):
+        pgcode = "23P01"
+
+    def reject(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("INSERT INTO VISIT"):
+            seen["inserts"] += 1
+            if seen["inserts"] == 2:
+                raise IntegrityError(statement, parameters, ExclusionViolation())
+
+    for target in engines:
+        event.listen(target, "before_cursor_execute", reject)
+    yield
+    for target in engines:
+        event.remove(target, "before_cursor_execute", reject)
+
+
+def test_failed_batch_is_rolled_back(
+    client: TestClient,
+    organization_id: uuid.UUID,
+    failing_children_insert: None,
+) -> None:
+    items = [_visit(organization_id), _visit(organization_id, recurrence_rule="FREQ=DAILY;COUNT=3")]
+
+    response = client.post("/api/v1/visits:batch", json={"items": items})
+
+    assert response.status_code == 409, response.text
+    # The batch INSERT itself succeeded; the rollback must take its rows with it.
+    assert _visit_ids(client) == []
@@ -0,0 +1,114 @@
+"""
+Calendar: visits, projected recurring occurrences and 24/7 assignments in one stream.
+"""
+
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from backend.database import SessionLocal
+from backend.database.entities.assignment_24_7 import Assignment24_7
+from backend.database.entities.organization import Organization
+from backend.database.entities.visit import Visit
+
+
+def _visit(client: TestClient, org: uuid.UUID, caregiver: uuid.UUID, start: datetime, **extra: str) -> str:
+    response = client.post(
+        "/api/v1/visits",
+        json={
+            "organization_id": str(org),
+            "care_recipient_id": str(uuid.uuid4()),
+            "assigned_caregiver_id": str(caregiver),
+            "visit_type": "nursing",
+            "scheduled_start": start.isoformat(),
+            "scheduled_end": (start + timedelta(hours=1)).isoformat(),
+            **extra,
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def test_calendar_merges_sources_in_start_order(client: TestClient, organization_id: uuid.UUID) -> None:
+    caregiver = uuid.uuid4()
+    # Far enough ahead that the weekly series is past its materialization horizon.
+    monday = datetime(2030, 1, 7, 9, tzinfo=timezone.utc)
+    week_before = monday - timedelta(weeks=20)
+    series_id = _visit(client, organization_id, caregiver, week_before, recurrence_rule="FREQ=WEEKLY")
+    single_id = _visit(client, organization_id, caregiver, monday + timedelta(days=1))
+    _visit(client, organization_id, caregiver, monday + timedelta(days=10))  # outside the range
+    _visit(client, organization_id, uuid.uuid4(), monday + timedelta(days=2))  # other caregiver
+
+    with SessionLocal() as db:
+        assignment = Assignment24_7(
+            organization_id=organization_id,
+            care_recipient_id=uuid.uuid4(),
+            caregiver_id=caregiver,
+            start_date=date(2030, 1, 8),
+            end_date=date(2030, 1, 9),
+        )
+        db.add(assignment)
+        db.commit()
+        assignment_id = str(assignment.id)
+
+    response = client.get(
+        "/api/v1/calendar",
+        params={
+            "from": monday.isoformat(),
+            "to": (monday + timedelta(weeks=1)).isoformat(),
+            "caregiver_id": str(caregiver),
+        },
+    )
+
+    assert response.status_code == 200, response.text
+    items = response.json()["items"]
+    assert [(i["kind"], i.get("id"), i.get("series_id")) for i in items] == [
+        ("visit", None, series_id),
+        ("assignment_24x7", assignment_id, None),
+        ("visit", single_id, None),
+    ]
+    assert items[1]["start"] == "2030-01-08T00:00:00Z"
+    assert items[1]["end"] == "2030-01-10T00:00:00Z"
+    assert "address_street" not in items[2]
+
+
+def test_calendar_rejects_oversized_range(client: TestClient) -> None:
+    response = client.get("/api/v1/calendar", params={"from": "2030-01-01T00:00:00Z", "to": "2030-06-01T00:00:00Z"})
+    assert response.status_code == 400
+
+
+def test_assignment_times_are_local_to_the_organization(client: TestClient, organization_id: uuid.UUID) -> None:
+    with SessionLocal() as db:
+        db.add(Organization(id=organization_id, name="Calendar org", type="agency", timezone="America/New_York"))
+        db.add(
+            Assignment24_7(
+                organization_id=organization_id,
+                care_recipient_id=uuid.uuid4(),
+                caregiver_id=uuid.uuid4(),
+                start_date=date(2030, 1, 8),
+                start_time=time(8, 0),
+                end_date=date(2030, 1, 9),
+            )
+        )
+        db.commit()
+
+    response = client.get("/api/v1/calendar", params={"from": "2030-01-07T00:00:00Z", "to": "2030-01-14T00:00:00Z"})
+
+    assert response.status_code == 200, response.text
+    [item] = response.json()["items"]
+    assert item["start"] == "2030-01-08T13:00:00Z"
+    assert item["end"] == "2030-01-10T05:00:00Z"
+
+
+def test_cancelled_series_is_not_projected(client: TestClient, organization_id: uuid.UUID) -> None:
+    start = datetime(2030, 1, 7, 9, tzinfo=timezone.utc) - timedelta(weeks=20)
+    series_id = _visit(client, organization_id, uuid.uuid4(), start, recurrence_rule="FREQ=WEEKLY")
+    with SessionLocal() as db:
+        db.get(Visit, uuid.UUID(series_id)).status = "cancelled"
+        db.commit()
+
+    response = client.get("/api/v1/calendar", params={"from": "2030-01-07T00:00:00Z", "to": "2030-01-14T00:00:00Z"})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["items"] == []
@@ -0,0 +1,172 @@
+"""
+Care arrangements: non-overlapping effective ranges, set-based close, and the
+cached effective-on-a-date lookup.
+"""
+
+import uuid
+from typing import Any, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_mock_engine
+
+from backend.apis.cache import TTLCache
+from backend.database.base import Base
+
+
+def _verbs(statements: list[str]) -> list[str]:
+    return [s.split(None, 1)[0].upper() for s in statements]
+
+
+def _create(
+    client: TestClient,
+    org: uuid.UUID,
+    recipient: uuid.UUID,
+    mode: str,
+    effective_from: str,
+    effective_to: Optional[str] = None,
+    expected: int = 201,
+) -> dict[str, Any]:
+    response = client.post(
+        "/api/v1/care-arrangements",
+        json={
+            "care_recipient_id": str(recipient),
+            "organization_id": str(org),
+            "mode": mode,
+            "effective_from": effective_from,
+            "effective_to": effective_to,
+        },
+    )
+    assert response.status_code == expected, response.text
+    return response.json()
+
+
+def _effective(client: TestClient, on: str, *recipients: uuid.UUID) -> dict[str, str]:
+    params: dict[str, Any] = {"date": on}
+    if recipients:
+        params["care_recipient_id"] = [str(r) for r in recipients]
+    response = client.get("/api/v1/care-arrangements/effective", params=params)
+    assert response.status_code == 200, response.text
+    return {item["care_recipient_id"]: item["mode"] for item in response.json()["items"]}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache() -> None:
+    from backend.apis.routes import care_arrangements
+
+    care_arrangements._effective_cache.clear()
+
+
+def test_new_arrangement_closes_the_open_one(client: TestClient, organization_id: uuid.UUID) -> None:
+    recipient = uuid.uuid4()
+    first = _create(client, organization_id, recipient, "visits_only", "2025-01-01")
+
+    _create(client, organization_id, recipient, "caregiver_24x7_only", "2025-03-01")
+
+    closed = client.get(f"/api/v1/care-arrangements/{first['id']}").json()
+    assert closed["effective_to"] == "2025-03-01"
+
+
+def test_overlapping_arrangement_is_a_409(client: TestClient, organization_id: uuid.UUID) -> None:
+    recipient = uuid.uuid4()
+    bounded = _create(client, organization_id, recipient, "visits_only", "2025-01-01", "2025-06-01")
+
+    conflict = _create(client, organization_id, recipient, "caregiver_24x7_only", "2025-05-01", expected=409)
+
+    assert [c["arrangement_id"] for c in conflict["detail"]["conflicts"]] == [bounded["id"]]
+    # The rejected create did not close anything.
+    assert client.get(f"/api/v1/care-arrangements/{bounded['id']}").json()["effective_to"] == "2025-06-01"
+
+
+def test_patch_into_an_overlap_is_a_409(client: TestClient, organization_id: uuid.UUID) -> None:
+    recipient = uuid.uuid4()
+    _create(client, organization_id, recipient, "visits_only", "2025-01-01", "2025-02-01")
+    later = _create(client, organization_id, recipient, "visits_only", "2025-03-01", "2025-04-01")
+
+    response = client.patch(f"/api/v1/care-arrangements/{later['id']}", json={"effective_from": "2025-01-15"})
+
+    assert response.status_code == 409, response.text
+
+
+def test_effective_modes_by_date(client: TestClient, organization_id: uuid.UUID) -> None:
+    switching, steady, none_yet = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    _create(client, organization_id, switching, "visits_only", "2025-01-01")
+    _create(client, organization_id, switching, "caregiver_24x7_only", "2025-03-01")
+    _create(client, organization_id, steady, "caregiver_24x7_plus_visits", "2024-06-01")
+    _create(client, organization_id, none_yet, "visits_only", "2025-12-01")
+
+    assert _effective(client, "2025-02-28") == {
+        str(switching): "visits_only",
+        str(steady): "caregiver_24x7_plus_visits",
+    }
+    assert _effective(client, "2025-03-01", switching) == {str(switching): "caregiver_24x7_only"}
+
+
+def test_effective_lookup_is_cached_until_a_write(
+    client: TestClient, statements: list[str], organization_id: uuid.UUID
+) -> None:
+    recipient = uuid.uuid4()
+    _create(client, organization_id, recipient, "visits_only", "2025-01-01")
+    assert _effective(client, "2025-06-01") == {str(recipient): "visits_only"}
+    statements.clear()
+
+    assert _effective(client, "2025-06-01") == {str(recipient): "visits_only"}
+    assert _verbs(statements) == []
+
+    _create(client, organization_id, recipient, "caregiver_24x7_only", "2025-05-01")
+    assert _effective(client, "2025-06-01") == {str(recipient): "caregiver_24x7_only"}
+
+
+def test_cache_drops_a_value_loaded_before_an_invalidation() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    version = cache.version("org")
+    cache.invalidate("org")  # a write committed while the value was being loaded
+
+    assert cache.put("org", 1, version) is False
+    assert cache.get("org") is None
+    assert cache.put("org", 2, cache.version("org")) is True
+    assert cache.get("org") == 2
+
+
+def test_cache_keeps_versions_bounded_and_still_drops_stale_values() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    version = cache.version("org")
+    for n in range(100):
+        cache.invalidate(f"org-{n}")
+    cache.invalidate("org")
+    for n in range(100, 102):
+        cache.invalidate(f"org-{n}")  # pushes "org" out of the version table
+
+    assert len(cache._versions) == 2
+    assert cache.put("org", 1, version) is False
+    assert cache.put("org", 2, cache.version("org")) is True
+    assert cache.get("org") == 2
+
+
+def test_cache_expires_and_evicts_least_recently_used() -> None:
+    now = [0.0]
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    now[0] = 10
+    assert cache.get("a") is None
+
+
+def test_exclusion_constraint_is_created_with_the_table_on_postgres() -> None:
+    emitted: list[str] = []
+    mock = create_mock_engine(
+        "postgresql+psycopg2://",
+        lambda sql, *args, **kwargs: emitted.append(str(sql.compile(dialect=mock.dialect))),
+    )
+
+    Base.metadata.create_all(mock, tables=[Base.metadata.tables["care_arrangement"]], checkfirst=False)
+
+    assert emitted[0] == "CREATE EXTENSION IF NOT EXISTS btree_gist"
+    assert (
+        "CONSTRAINT ex_care_arrangement_overlap EXCLUDE USING gist (care_recipient_id WITH =, "
+        "organization_id WITH =, daterange(effective_from, effective_to, '[)') WITH &&)"
+    ) in emitted[1]
@@ -0,0 +1,134 @@
+"""
+One active 24/7 caregiver per care recipient: partial unique index, set-based demote, retry.
+"""
+
+import uuid
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import IntegrityError
+
+from backend.database import SessionLocal
+from backend.database.entities.care_relationship import CareRelationship
+
+
+def _verbs(statements: list[str]) -> list[str]:
+    return [s.split(None, 1)[0].upper() for s in statements]
+
+
+def _relationship(org: uuid.UUID, recipient: uuid.UUID, **extra: Any) -> dict[str, Any]:
+    return {
+        "care_recipient_id": str(recipient),
+        "related_user_id": str(uuid.uuid4()),
+        "organization_id": str(org),
+        "role": "aide",
+        "is_24x7_caregiver": True,
+        **extra,
+    }
+
+
+def _create(client: TestClient, payload: dict[str, Any]) -> dict[str, Any]:
+    response = client.post("/api/v1/care-relationships", json=payload)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _holders(client: TestClient, recipient: uuid.UUID) -> list[str]:
+    response = client.get("/api/v1/care-relationships", params={"care_recipient_id": str(recipient)})
+    assert response.status_code == 200, response.text
+    return [r["id"] for r in response.json()["items"] if r["is_24x7_caregiver"] and r["status"] == "active"]
+
+
+def test_new_24x7_caregiver_demotes_the_previous_one_in_one_update(
+    client: TestClient, statements: list[str], organization_id: uuid.UUID
+) -> None:
+    recipient = uuid.uuid4()
+    _create(client, _relationship(organization_id, recipient))
+    statements.clear()
+
+    second = _create(client, _relationship(organization_id, recipient))
+
+    assert _verbs(statements) == ["UPDATE", "INSERT"]
+    assert _holders(client, recipient) == [second["id"]]
+
+
+def test_reactivating_a_24x7_caregiver_demotes_the_current_one(
+    client: TestClient, organization_id: uuid.UUID
+) -> None:
+    recipient = uuid.uuid4()
+    old = _create(client, _relationship(organization_id, recipient, status="inactive"))
+    _create(client, _relationship(organization_id, recipient))
+
+    response = client.patch(f"/api/v1/care-relationships/{old['id']}", json={"status": "active"})
+
+    assert response.status_code == 200, response.text
+    assert _holders(client, recipient) == [old["id"]]
+
+
+def test_unique_index_rejects_a_second_active_24x7_caregiver(organization_id: uuid.UUID) -> None:
+    recipient = uuid.uuid4()
+
+    def row() -> CareRelationship:
+        return CareRelationship(
+            care_recipient_id=recipient,
+            related_user_id=uuid.uuid4(),
+            organization_id=organization_id,
+            role="aide",
+            is_24x7_caregiver=True,
+            status="active",
+        )
+
+    with SessionLocal() as db:
+        db.add(row())
+        db.commit()
+        db.add(row())
+        with pytest.raises(IntegrityError):
+            db.commit()
+
+
+@pytest.fixture
+def lost_races(engines: list[Engine]) -> Generator[list[int], None, None]:
+    """
+    Fail INSERTs into care_relationship the way a lost race on the 24/7 index
+    fails on Postgres, as many times as the yielded list's first item says.
+    """
+    remaining = [1]
+
+    def reject(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("INSERT INTO CARE_RELATIONSHIP") and remaining[0] > 0:
+            remaining[0] -= 1
+            raise IntegrityError(
+                statement,
+                parameters,
+                Exception('duplicate key value violates unique constraint "uq_care_relationship_24x7_caregiver"'),
+            )
+
+    for target in engines:
+        event.listen(target, "before_cursor_execute", reject)
+    yield remaining
+    for target in engines:
+        event.remove(target, "before_cursor_execute", reject)
+
+
+def test_lost_race_is_retried(
+    client: TestClient, statements: list[str], organization_id: uuid.UUID, lost_races: list[int]
+) -> None:
+    recipient = uuid.uuid4()
+
+    created = _create(client, _relationship(organization_id, recipient))
+
+    assert _verbs(statements).count("INSERT") == 2
+    assert _holders(client, recipient) == [created["id"]]
+
+
+def test_repeatedly_lost_race_is_a_409(
+    client: TestClient, organization_id: uuid.UUID, lost_races: list[int]
+) -> None:
+    lost_races[0] = 10
+
+    response = client.post("/api/v1/care-relationships", json=_relationship(organization_id, uuid.uuid4()))
+
+    assert response.status_code == 409, response.text
@@ -0,0 +1,174 @@
+"""
+Messaging: thread list from denormalized columns, keyset history, read watermarks.
+"""
+
+import uuid
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.apis import dependencies
+
+
+def _verbs(statements: list[str]) -> list[str]:
+    return [s.split(None, 1)[0].upper() for s in statements]
+
+
+def _conversation(org: uuid.UUID, *participants: uuid.UUID, **extra: Any) -> dict[str, Any]:
+    return {
+        "organization_id": str(org),
+        "type": "group",
+        "participant_ids": [str(p) for p in participants],
+        **extra,
+    }
+
+
+def _post(client: TestClient, path: str, payload: dict[str, Any]) -> dict[str, Any]:
+    response = client.post(path, json=payload)
+    assert response.status_code in (200, 201), response.text
+    return response.json()
+
+
+def _send(client: TestClient, conversation_id: str, body: str) -> dict[str, Any]:
+    return _post(client, f"/api/v1/conversations/{conversation_id}/messages", {"body": body})
+
+
+def _inbox(client: TestClient) -> list[dict[str, Any]]:
+    response = client.get("/api/v1/conversations")
+    assert response.status_code == 200, response.text
+    return response.json()["items"]
+
+
+@pytest.fixture
+def act_as(app: FastAPI):
+    """Switch the current user of `client` to another id."""
+
+    def switch(user: uuid.UUID) -> None:
+        app.dependency_overrides[dependencies.get_current_user_id] = lambda: user
+
+    return switch
+
+
+def test_care_circle_adds_the_recipients_active_relationships(
+    client: TestClient, organization_id: uuid.UUID, user_id: uuid.UUID
+) -> None:
+    recipient = uuid.uuid4()
+    related = {}
+    for state in ("active", "inactive"):
+        related[state] = uuid.uuid4()
+        _post(
+            client,
+            "/api/v1/care-relationships",
+            {
+                "care_recipient_id": str(recipient),
+                "related_user_id": str(related[state]),
+                "organization_id": str(organization_id),
+                "role": "nurse",
+                "status": state,
+            },
+        )
+
+    created = _post(
+        client,
+        "/api/v1/conversations",
+        _conversation(organization_id, type="care_circle", care_recipient_id=str(recipient)),
+    )
+
+    assert {p["user_id"] for p in created["participants"]} == {str(user_id), str(related["active"])}
+
+
+def test_conversation_type_rules_are_validated(client: TestClient, organization_id: uuid.UUID) -> None:
+    circle = client.post("/api/v1/conversations", json=_conversation(organization_id, type="care_circle"))
+    direct = client.post(
+        "/api/v1/conversations",
+        json=_conversation(organization_id, uuid.uuid4(), uuid.uuid4(), type="direct"),
+    )
+
+    assert (circle.status_code, direct.status_code) == (422, 422)
+
+
+def test_send_updates_the_thread_and_the_senders_watermark(
+    client: TestClient, statements: list[str], organization_id: uuid.UUID, act_as
+) -> None:
+    other = uuid.uuid4()
+    thread = _post(client, "/api/v1/conversations", _conversation(organization_id, other))
+    statements.clear()
+
+    message = _send(client, thread["id"], "Mum had a good lunch today.")
+
+    assert _verbs(statements) == ["UPDATE", "UPDATE", "INSERT"]
+    [mine] = _inbox(client)
+    assert mine["last_message_id"] == message["id"]
+    assert mine["last_message_preview"] == "Mum had a good lunch today."
+    assert mine["unread"] is False
+
+    act_as(other)
+    assert _inbox(client)[0]["unread"] is True
+    statements.clear()
+    read = _post(client, f"/api/v1/conversations/{thread['id']}/read", {"message_id": message["id"]})
+
+    assert _verbs(statements) == ["SELECT", "UPDATE"]
+    assert read["last_read_message_id"] == message["id"]
+    assert _inbox(client)[0]["unread"] is False
+
+
+def test_watermark_never_moves_backward(client: TestClient, organization_id: uuid.UUID, act_as) -> None:
+    other = uuid.uuid4()
+    thread = _post(client, "/api/v1/conversations", _conversation(organization_id, other))
+    first, second = (_send(client, thread["id"], body) for body in ("one", "two"))
+    act_as(other)
+    _post(client, f"/api/v1/conversations/{thread['id']}/read", {"message_id": second["id"]})
+
+    read = _post(client, f"/api/v1/conversations/{thread['id']}/read", {"message_id": first["id"]})
+
+    assert read["last_read_message_id"] == second["id"]
+
+
+def test_inbox_is_one_query_ordered_by_last_activity(
+    client: TestClient, statements: list[str], organization_id: uuid.UUID
+) -> None:
+    older = _post(client, "/api/v1/conversations", _conversation(organization_id, title="Older"))
+    newer = _post(client, "/api/v1/conversations", _conversation(organization_id, title="Newer"))
+    assert [t["id"] for t in _inbox(client)] == [newer["id"], older["id"]]
+
+    _send(client, older["id"], "Bumping this thread")
+    statements.clear()
+
+    assert [t["id"] for t in _inbox(client)] == [older["id"], newer["id"]]
+    assert _verbs(statements) == ["SELECT"]
+    assert "FROM message" not in statements[0] and "JOIN message" not in statements[0]
+
+
+def test_history_pages_newest_first(client: TestClient, organization_id: uuid.UUID) -> None:
+    thread = _post(client, "/api/v1/conversations", _conversation(organization_id))
+    sent = [_send(client, thread["id"], f"message {i}")["id"] for i in range(5)]
+
+    seen, cursor = [], None
+    while True:
+        params: dict[str, Any] = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get(f"/api/v1/conversations/{thread['id']}/messages", params=params).json()
+        seen += [m["id"] for m in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sent[::-1]
+
+
+def test_non_participants_cannot_read_or_post(
+    client: TestClient, statements: list[str], organization_id: uuid.UUID, act_as
+) -> None:
+    thread = _post(client, "/api/v1/conversations", _conversation(organization_id))
+    _send(client, thread["id"], "Private")
+    act_as(uuid.uuid4())
+    statements.clear()
+
+    assert client.get(f"/api/v1/conversations/{thread['id']}").status_code == 404
+    assert client.get(f"/api/v1/conversations/{thread['id']}/messages").status_code == 404
+    assert client.post(f"/api/v1/conversations/{thread['id']}/messages", json={"body": "Hi"}).status_code == 404
+    assert "INSERT" not in _verbs(statements)
+    assert _inbox(client) == []
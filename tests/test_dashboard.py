@@ -0,0 +1,139 @@
+"""
+Dashboard stats: counters kept in step with visit/task writes, and reconciliation.
+"""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from backend.database import SessionLocal
+from backend.database.entities.stat_rollup import StatRollup
+from backend.stats.rollup import reconcile
+
+DAY = date(2025, 3, 3)
+
+
+def _visit(org: uuid.UUID, hour: int, **extra: Any) -> dict[str, Any]:
+    start = datetime(DAY.year, DAY.month, DAY.day, hour, tzinfo=timezone.utc)
+    return {
+        "organization_id": str(org),
+        "care_recipient_id": str(uuid.uuid4()),
+        "visit_type": "personal_care",
+        "scheduled_start": start.isoformat(),
+        "scheduled_end": (start + timedelta(hours=1)).isoformat(),
+        **extra,
+    }
+
+
+def _task(org: uuid.UUID) -> dict[str, Any]:
+    return {
+        "organization_id": str(org),
+        "care_recipient_id": str(uuid.uuid4()),
+        "visit_id": str(uuid.uuid4()),
+        "task_date": DAY.isoformat(),
+        "title": "Morning medication",
+    }
+
+
+def _stats(client: TestClient, day: date = DAY) -> dict[str, Any]:
+    response = client.get("/api/v1/dashboard/stats", params={"date": day.isoformat()})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _post(client: TestClient, path: str, payload: dict[str, Any] | None = None) -> dict[str, Any]:
+    response = client.post(path, json=payload)
+    assert response.status_code in (200, 201), response.text
+    return response.json()
+
+
+def test_counters_follow_visit_and_task_writes(client: TestClient, organization_id: uuid.UUID) -> None:
+    visits = [_post(client, "/api/v1/visits", _visit(organization_id, hour)) for hour in (8, 10, 12, 14)]
+    _post(client, f"/api/v1/visits/{visits[0]['id']}/start")
+    _post(client, f"/api/v1/visits/{visits[1]['id']}/end")
+    assert client.post(f"/api/v1/visits/{visits[1]['id']}/start").status_code == 409
+    client.patch(f"/api/v1/visits/{visits[2]['id']}", json={"status": "no_show"})
+    client.patch(
+        f"/api/v1/visits/{visits[3]['id']}",
+        json={"scheduled_start": "2025-03-04T09:00:00+00:00", "scheduled_end": "2025-03-04T10:00:00+00:00"},
+    )
+    _post(client, "/api/v1/tasks:batch", {"items": [_task(organization_id) for _ in range(3)]})
+    task = _post(client, "/api/v1/tasks", _task(organization_id))
+    client.patch(f"/api/v1/tasks/{task['id']}", json={"status": "completed"})
+
+    stats = _stats(client)
+
+    assert stats["visits"] == {"total": 3, "by_status": {"in_progress": 1, "completed": 1, "no_show": 1}}
+    assert stats["tasks"] == {"total": 4, "by_status": {"pending": 3, "completed": 1}}
+    assert _stats(client, DAY + timedelta(days=1))["visits"] == {"total": 1, "by_status": {"scheduled": 1}}
+
+
+def test_reconcile_corrects_drifted_counters(client: TestClient, organization_id: uuid.UUID) -> None:
+    _post(client, "/api/v1/visits", _visit(organization_id, 8))
+    with SessionLocal() as db:
+        db.execute(
+            update(StatRollup)
+            .where(StatRollup.organization_id == organization_id, StatRollup.metric == "visits.scheduled")
+            .values(value=5)
+        )
+        db.commit()
+    assert _stats(client)["visits"]["total"] == 5
+
+    with SessionLocal() as db:
+        assert reconcile(db, DAY, DAY) >= 1
+
+    assert _stats(client)["visits"] == {"total": 1, "by_status": {"scheduled": 1}}
+
+
+def test_series_children_are_counted_and_cancelled_with_the_head(
+    client: TestClient, organization_id: uuid.UUID
+) -> None:
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    head = _post(
+        client,
+        "/api/v1/visits",
+        {
+            "organization_id": str(organization_id),
+            "care_recipient_id": str(uuid.uuid4()),
+            "visit_type": "companionship",
+            "scheduled_start": start.isoformat(),
+            "scheduled_end": (start + timedelta(hours=1)).isoformat(),
+            "recurrence_rule": "FREQ=DAILY",
+        },
+    )
+    later = (start + timedelta(days=3)).date()
+    assert _stats(client, later)["visits"]["by_status"] == {"scheduled": 1}
+
+    client.patch(f"/api/v1/visits/{head['id']}", json={"status": "cancelled"})
+
+    assert _stats(client, later)["visits"]["by_status"] == {"cancelled": 1}
+
+
+def test_active_people_counts(client: TestClient, organization_id: uuid.UUID) -> None:
+    members = [("caregiver", "active"), ("caregiver", "active"), ("caregiver", "invited"), ("supervisor", "active")]
+    for role, status in members:
+        _post(
+            client,
+            "/api/v1/memberships",
+            {"user_id": str(uuid.uuid4()), "organization_id": str(organization_id), "role": role, "status": status},
+        )
+    recipient = str(uuid.uuid4())
+    for role in ("nurse", "primary_contact"):
+        _post(
+            client,
+            "/api/v1/care-relationships",
+            {
+                "care_recipient_id": recipient,
+                "related_user_id": str(uuid.uuid4()),
+                "organization_id": str(organization_id),
+                "role": role,
+            },
+        )
+
+    stats = _stats(client)
+
+    assert stats["active_caregivers"] == 2
+    assert stats["active_care_recipients"] == 1
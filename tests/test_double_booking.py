@@ -0,0 +1,226 @@
+"""
+Caregiver double-booking: overlap checks on create, update, batch and recurrence.
+"""
+
+import os
+import random
+import uuid
+from collections.abc import Generator
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine, create_mock_engine, event, text
+from sqlalchemy.exc import IntegrityError
+
+from backend.database import create_schema
+from backend.database.base import Base
+from backend.scheduling.conflicts import Booking, IntervalTree, is_overlap_violation
+
+BASE = datetime(2025, 6, 2, tzinfo=timezone.utc)
+
+
+def test_interval_tree_matches_brute_force() -> None:
+    rng = random.Random(7)
+    bookings = []
+    for i in range(500):
+        start = BASE + timedelta(minutes=rng.randrange(0, 60 * 24 * 30, 15))
+        bookings.append(Booking(start, start + timedelta(minutes=rng.randrange(15, 600, 15)), i))
+    tree = IntervalTree(bookings)
+
+    for _ in range(200):
+        start = BASE + timedelta(minutes=rng.randrange(0, 60 * 24 * 30, 15))
+        end = start + timedelta(minutes=rng.randrange(15, 300, 15))
+        expected = {b.value for b in bookings if b.start < end and b.end > start}
+        assert {b.value for b in tree.overlapping(start, end)} == expected
+
+
+def _visit(
+    org: uuid.UUID,
+    caregiver: uuid.UUID,
+    start_hour: int,
+    end_hour: int,
+    **extra: Any,
+) -> dict[str, Any]:
+    return {
+        "organization_id": str(org),
+        "care_recipient_id": str(uuid.uuid4()),
+        "assigned_caregiver_id": str(caregiver),
+        "visit_type": "personal_care",
+        "scheduled_start": (BASE + timedelta(hours=start_hour)).isoformat(),
+        "scheduled_end": (BASE + timedelta(hours=end_hour)).isoformat(),
+        **extra,
+    }
+
+
+def _create(client: TestClient, body: dict[str, Any], expected: int = 201) -> dict[str, Any]:
+    response = client.post("/api/v1/visits", json=body)
+    assert response.status_code == expected, response.text
+    return response.json()
+
+
+def test_overlapping_create_is_rejected_with_conflicts(client: TestClient, organization_id: uuid.UUID) -> None:
+    caregiver = uuid.uuid4()
+    first = _create(client, _visit(organization_id, caregiver, 8, 10))
+
+    body = _create(client, _visit(organization_id, caregiver, 9, 11), expected=409)
+
+    assert [c["visit_id"] for c in body["detail"]["conflicts"]] == [first["id"]]
+    # Back-to-back visits, other caregivers and cancelled visits do not conflict.
+    _create(client, _visit(organization_id, caregiver, 10, 12))
+    _create(client, _visit(organization_id, uuid.uuid4(), 9, 11))
+    _create(client, _visit(organization_id, caregiver, 9, 11, status="cancelled"))
+
+
+def test_update_into_overlap_is_rejected(client: TestClient, organization_id: uuid.UUID) -> None:
+    caregiver = uuid.uuid4()
+    _create(client, _visit(organization_id, caregiver, 8, 10))
+    other = _create(client, _visit(organization_id, uuid.uuid4(), 9, 11))
+
+    response = client.patch(f"/api/v1/visits/{other['id']}", json={"assigned_caregiver_id": str(caregiver)})
+    assert response.status_code == 409, response.text
+
+    # Assigning into a free slot works, and a visit never conflicts with its own previous slot.
+    for start_hour in (10, 11):
+        window = {
+            "assigned_caregiver_id": str(caregiver),
+            "scheduled_start": (BASE + timedelta(hours=start_hour)).isoformat(),
+            "scheduled_end": (BASE + timedelta(hours=start_hour + 2)).isoformat(),
+        }
+        response = client.patch(f"/api/v1/visits/{other['id']}", json=window)
+        assert response.status_code == 200, response.text
+
+
+def test_batch_reports_overlaps_with_stored_visits_and_other_items(
+    client: TestClient, organization_id: uuid.UUID
+) -> None:
+    caregiver = uuid.uuid4()
+    stored = _create(client, _visit(organization_id, caregiver, 8, 10))
+    items = [
+        _visit(organization_id, caregiver, 9, 10),  # overlaps the stored visit
+        _visit(organization_id, caregiver, 12, 14),
+        _visit(organization_id, caregiver, 13, 15),  # overlaps item 1
+        _visit(organization_id, caregiver, 15, 16),
+    ]
+
+    response = client.post("/api/v1/visits:batch", json={"items": items})
+
+    assert response.status_code == 409, response.text
+    errors = {e["index"]: e["conflicts"] for e in response.json()["detail"]}
+    assert sorted(errors) == [0, 1, 2]
+    assert errors[0][0]["visit_id"] == stored["id"]
+    assert errors[1][0]["index"] == 2 and errors[2][0]["index"] == 1
+
+
+def _occurrence_caregivers(client: TestClient, series_id: str, weeks: int) -> list[Optional[str]]:
+    response = client.get(
+        f"/api/v1/visits/{series_id}/occurrences",
+        params={"from": BASE.isoformat(), "to": (BASE + timedelta(weeks=weeks)).isoformat()},
+    )
+    assert response.status_code == 200, response.text
+    return [
+        client.get(f"/api/v1/visits/{o['visit_id']}").json()["assigned_caregiver_id"]
+        for o in response.json()
+        if o["visit_id"]
+    ]
+
+
+def test_recurring_occurrence_that_would_double_book_is_left_unassigned(
+    client: TestClient, organization_id: uuid.UUID
+) -> None:
+    caregiver = uuid.uuid4()
+    _create(client, _visit(organization_id, caregiver, 24 * 7 + 8, 24 * 7 + 9))
+    series = _create(
+        client,
+        _visit(organization_id, caregiver, 8, 9, recurrence_rule="FREQ=WEEKLY;COUNT=3"),
+    )
+
+    assert _occurrence_caregivers(client, series["id"], weeks=3) == [str(caregiver), None, str(caregiver)]
+
+
+def test_exclusion_constraint_is_created_with_the_table_on_postgres() -> None:
+    emitted: list[str] = []
+    mock = create_mock_engine(
+        "postgresql+psycopg2://",
+        lambda sql, *args, **kwargs: emitted.append(str(sql.compile(dialect=mock.dialect))),
+    )
+
+    Base.metadata.create_all(mock, tables=[Base.metadata.tables["visit"]], checkfirst=False)
+
+    assert emitted[0] == "CREATE EXTENSION IF NOT EXISTS btree_gist"
+    assert "CONSTRAINT ex_visit_caregiver_overlap EXCLUDE USING gist" in emitted[1]
+
+
+class _ExclusionViolation(Exception):
+    """Stands in for the driver error Postgres raises for the exclusion constraint."""
+
+    pgcode = "23P01"
+
+
+@pytest.fixture
+def lost_race(engines: list[Engine]) -> Generator[None, None, None]:
+    """Make every INSERT into visit fail the way a lost race fails on Postgres."""
+
+    def reject(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("INSERT INTO VISIT"):
+            raise IntegrityError(statement, parameters, _ExclusionViolation())
+
+    for target in engines:
+        event.listen(target, "before_cursor_execute", reject)
+    yield
+    for target in engines:
+        event.remove(target, "before_cursor_execute", reject)
+
+
+@pytest.mark.parametrize(
+    "path, body",
+    [
+        ("/api/v1/visits", {"recurrence_rule": "FREQ=DAILY;COUNT=3"}),  # flushed before commit
+        ("/api/v1/visits:batch", None),  # multi-row INSERT before commit
+    ],
+)
+def test_exclusion_violation_on_write_is_a_409(
+    client: TestClient, organization_id: uuid.UUID, lost_race: None, path: str, body: Optional[dict]
+) -> None:
+    visit = _visit(organization_id, uuid.uuid4(), 8, 9, **(body or {}))
+    payload = visit if body is not None else {"items": [visit]}
+
+    response = client.post(path, json=payload)
+
+    assert response.status_code == 409, response.text
+    assert response.json()["detail"]["conflicts"] == []
+
+
+@pytest.mark.skipif("TEST_POSTGRES_URL" not in os.environ, reason="set TEST_POSTGRES_URL to run against Postgres")
+def test_exclusion_constraint_rejects_overlap_on_postgres() -> None:
+    pg = create_engine(os.environ["TEST_POSTGRES_URL"])
+    create_schema(pg)
+    caregiver = uuid.uuid4()
+    insert = text(
+        "INSERT INTO visit (id, organization_id, care_recipient_id, assigned_caregiver_id, visit_type,"
+        " scheduled_start, scheduled_end, status, created_at, updated_at)"
+        " VALUES (:id, :org, :recipient, :caregiver, 'nursing', :start, :end, 'scheduled', now(), now())"
+    )
+
+    def row(start_hour: int, end_hour: int) -> dict[str, Any]:
+        return {
+            "id": uuid.uuid4(),
+            "org": uuid.uuid4(),
+            "recipient": uuid.uuid4(),
+            "caregiver": caregiver,
+            "start": BASE + timedelta(hours=start_hour),
+            "end": BASE + timedelta(hours=end_hour),
+        }
+
+    with pg.connect() as conn:
+        # Skip foreign key triggers; the exclusion constraint is not a trigger and still applies.
+        conn.execute(text("SET session_replication_role = replica"))
+        conn.execute(insert, row(8, 10))
+        conn.execute(insert, row(10, 11))  # back-to-back is fine
+        with pytest.raises(IntegrityError) as raised:
+            conn.execute(insert, row(9, 11))
+        conn.rollback()
+    pg.dispose()
+
+    assert is_overlap_violation(raised.value)
@@ -0,0 +1,73 @@
+"""
+Streaming export: same rows and shape as the list endpoints, in NDJSON or CSV.
+"""
+
+import csv
+import io
+import json
+import uuid
+
+from fastapi.testclient import TestClient
+
+from backend.apis.schemas.task import TaskResponse
+from backend.apis.schemas.visit import VisitResponse
+
+
+def _create_visits(client: TestClient, organization_id: uuid.UUID, recipient: str) -> None:
+    for day in (5, 3, 4, 6):
+        response = client.post(
+            "/api/v1/visits",
+            json={
+                "organization_id": str(organization_id),
+                "care_recipient_id": recipient,
+                "visit_type": "nursing",
+                "scheduled_start": f"2025-04-0{day}T08:00:00+00:00",
+                "scheduled_end": f"2025-04-0{day}T09:00:00+00:00",
+            },
+        )
+        assert response.status_code == 201, response.text
+
+
+def test_visit_export_ndjson_matches_list(client: TestClient, organization_id: uuid.UUID) -> None:
+    recipient = str(uuid.uuid4())
+    _create_visits(client, organization_id, recipient)
+
+    response = client.get(
+        "/api/v1/visits/export",
+        params={"care_recipient_id": recipient, "from": "2025-04-04T00:00:00+00:00", "to": "2025-04-06T00:00:00+00:00"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+
+    listed = client.get("/api/v1/visits", params={"care_recipient_id": recipient}).json()["items"]
+    expected = [v["id"] for v in listed if "2025-04-04" <= v["scheduled_start"] < "2025-04-06"]
+    assert [row["id"] for row in rows] == expected
+    assert len(rows) == 2
+    assert list(rows[0]) == list(VisitResponse.model_fields)
+
+
+def test_task_export_csv(client: TestClient, organization_id: uuid.UUID) -> None:
+    recipient = str(uuid.uuid4())
+    for day in (2, 1):
+        response = client.post(
+            "/api/v1/tasks",
+            json={
+                "organization_id": str(organization_id),
+                "care_recipient_id": recipient,
+                "visit_id": str(uuid.uuid4()),
+                "task_date": f"2025-04-0{day}",
+                "title": "Meds, with water",
+            },
+        )
+        assert response.status_code == 201, response.text
+
+    response = client.get("/api/v1/tasks/export", params={"format": "csv", "care_recipient_id": recipient})
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    records = list(csv.reader(io.StringIO(response.text)))
+
+    assert records[0] == list(TaskResponse.model_fields)
+    date_index = records[0].index("task_date")
+    assert [r[date_index] for r in records[1:]] == ["2025-04-01", "2025-04-02"]
+    assert records[1][records[0].index("title")] == "Meds, with water"
@@ -0,0 +1,71 @@
+"""
+Load-test suite: scenarios run against the app in process, and the results file.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend.apis import dependencies
+from backend.apis.admission import RateLimiter
+from backend.database import SessionLocal, engine
+from backend.database.seed import Scale, seed
+from backend.loadtest.runner import append_results, compare, percentile, read_results, run
+from backend.loadtest.scenarios import SCENARIOS, load_context
+
+# Early enough that all of the day's visits are still to check in.
+NOW = datetime(2031, 9, 10, 6, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def agency_id() -> uuid.UUID:
+    """A fresh seeded agency per test: check-ins are used up by the run."""
+    scale = Scale(caregivers=5, recipients=20, weeks_back=1, weeks_ahead=1)
+    [agency_id] = seed(engine, scale, seed=uuid.uuid4().int, now=NOW)
+    return agency_id
+
+
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+def test_scenarios_run_against_a_seeded_agency(app: FastAPI, agency_id: uuid.UUID, scenario: str) -> None:
+    app.dependency_overrides.pop(dependencies.get_current_organization_id)
+    app.dependency_overrides.pop(dependencies.get_current_user_id)
+    app.state.admission.users = RateLimiter(rate=10_000, burst=10_000)
+    app.state.admission.organizations = RateLimiter(rate=10_000, burst=10_000)
+    with SessionLocal() as db:
+        context = load_context(db, agency_id, NOW.date())
+    check_ins = len(context.check_ins)
+
+    transport = httpx.ASGITransport(app=app)
+    result = asyncio.run(run(scenario, SCENARIOS[scenario], context, concurrency=2, duration=0.3, transport=transport))
+
+    assert result["requests"] > 0 and result["throughput_rps"] > 0
+    assert set(result["statuses"]) <= {"200", "201"}
+    assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"] <= result["max_ms"]
+    if scenario == "morning_check_in":
+        assert check_ins > 0
+        assert result["by_request"]["POST /visits/{visit_id}/start"]["requests"] == check_ins - len(context.check_ins)
+
+
+def test_percentiles_are_nearest_rank() -> None:
+    values = [float(n) for n in range(1, 101)]
+
+    assert [percentile(values, p) for p in (50, 95, 99, 100)] == [50.0, 95.0, 99.0, 100.0]
+    assert percentile([3.0], 99) == 3.0 and percentile([], 50) == 0.0
+
+
+def test_runs_are_compared_from_the_results_file(tmp_path: Path) -> None:
+    path = tmp_path / "results.jsonl"
+    record = {"scenario": "calendar_browse", "throughput_rps": 100.0, "p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 40.0}
+    append_results(path, "before", [record])
+    append_results(path, "after", [{**record, "throughput_rps": 150.0, "p99_ms": 30.0}])
+
+    table = compare(read_results(path)).splitlines()
+
+    assert table[0].split() == ["scenario", "metric", "before", "after", "change"]
+    assert table[1].split() == ["calendar_browse", "throughput_rps", "100.0", "150.0", "+50.0%"]
+    assert table[4].split() == ["calendar_browse", "p99_ms", "40.0", "30.0", "-25.0%"]
@@ -0,0 +1,89 @@
+"""
+Prometheus metrics: per-route request and SQL instruments, and the text exposition format.
+"""
+
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+from backend.apis import metrics
+
+
+def _sample(body: str, name: str, **labels: str) -> float:
+    """The value of one sample in an exposition body, 0 if absent."""
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}{re.escape('{' + rendered + '}' if labels else '')} (\S+)$", body, re.M)
+    return float(match.group(1)) if match else 0.0
+
+
+def _scrape(client: TestClient) -> str:
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    return response.text
+
+
+def test_requests_and_their_sql_are_recorded_by_route(client: TestClient, engines: list[Engine]) -> None:
+    for engine in engines:
+        metrics.instrument(engine)
+    route = "/api/v1/visits/{visit_id}"
+    before = _scrape(client)
+
+    client.get("/api/v1/visits/00000000-0000-0000-0000-000000000001")
+    client.get("/api/v1/visits/00000000-0000-0000-0000-000000000002")
+    client.get("/api/v1/no-such-thing")
+    after = _scrape(client)
+
+    def delta(name: str, **labels: str) -> float:
+        return _sample(after, name, **labels) - _sample(before, name, **labels)
+
+    assert delta("http_requests_total", method="GET", route=route, status="404") == 2
+    assert delta("http_request_duration_seconds_count", method="GET", route=route) == 2
+    assert delta("http_request_duration_seconds_bucket", method="GET", route=route, le="+Inf") == 2
+    assert delta("http_requests_total", method="GET", route=metrics.UNMATCHED, status="404") == 1
+    assert delta("db_statements_total", route=route) == 2
+    assert delta("db_statement_seconds_total", route=route) > 0
+    assert delta("db_pool_checkout_wait_seconds_count") == 2
+    assert _sample(after, "http_requests_in_flight") == 1
+    assert _sample(after, "threadpool_threads_max") > 0
+
+
+def test_failed_statements_are_recorded_and_leave_nothing_open(engines: list[Engine]) -> None:
+    engine = engines[0]
+    metrics.instrument(engine)
+    before = metrics.SQL_DURATION.count
+
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(DBAPIError):
+                conn.exec_driver_sql("SELECT * FROM no_such_table")
+        conn.exec_driver_sql("SELECT 1")
+
+    assert metrics.SQL_DURATION.count - before == 4
+
+
+def test_histograms_render_cumulative_buckets() -> None:
+    registry_size = len(metrics.REGISTRY)
+    histogram = metrics.Histogram("test_seconds", "A test histogram.", ("path",), buckets=(0.1, 1.0))
+    counter = metrics.Counter("test_total", "A test counter.", ("path",))
+    try:
+        child = histogram.labels('a"b')
+        for value in (0.05, 0.1, 0.5, 3.0):
+            child.observe(value)
+        counter.labels("x").inc(2)
+
+        assert histogram.render() == [
+            "# HELP test_seconds A test histogram.",
+            "# TYPE test_seconds histogram",
+            'test_seconds_bucket{path="a\\"b",le="0.1"} 2',
+            'test_seconds_bucket{path="a\\"b",le="1"} 3',
+            'test_seconds_bucket{path="a\\"b",le="+Inf"} 4',
+            'test_seconds_sum{path="a\\"b"} 3.65',
+            'test_seconds_count{path="a\\"b"} 4',
+        ]
+        assert counter.render()[-1] == 'test_total{path="x"} 2'
+    finally:
+        del metrics.REGISTRY[registry_size:]
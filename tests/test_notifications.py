@@ -0,0 +1,155 @@
+"""
+Reminder scheduler: window loads, heap order and rescheduling, deduplicated in-app delivery.
+"""
+
+import time
+import uuid
+from collections.abc import Generator
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from backend.apis import main
+from backend.database import Notification, SessionLocal
+from backend.notifications.channels import InAppChannel
+from backend.notifications.reminders import VISIT_REMINDER_LEAD, Reminder, visit_reminders
+from backend.notifications.scheduler import ReminderScheduler
+from backend.realtime import Event
+
+NOW = datetime(2031, 5, 6, 9, 0, tzinfo=timezone.utc)
+
+
+def _visit(org: uuid.UUID, start: datetime, caregiver: Optional[uuid.UUID]) -> dict[str, Any]:
+    return {
+        "organization_id": str(org),
+        "care_recipient_id": str(uuid.uuid4()),
+        "assigned_caregiver_id": str(caregiver) if caregiver else None,
+        "visit_type": "personal_care",
+        "scheduled_start": start.isoformat(),
+        "scheduled_end": (start + timedelta(hours=1)).isoformat(),
+    }
+
+
+def _reminder(key: str, due_at: datetime, user_id: Optional[uuid.UUID] = None) -> Reminder:
+    return Reminder(key, due_at, user_id or uuid.uuid4(), None, "visit_reminder", "Upcoming visit")
+
+
+def test_window_load_is_one_range_query(
+    client: TestClient, organization_id: uuid.UUID, statements: list[str]
+) -> None:
+    caregivers = [uuid.uuid4() for _ in range(3)]
+    starts = [NOW + VISIT_REMINDER_LEAD + timedelta(minutes=m) for m in (5, 20, 45)]
+    due = [client.post("/api/v1/visits", json=_visit(organization_id, s, c)).json() for s, c in zip(starts, caregivers)]
+    client.post("/api/v1/visits", json=_visit(organization_id, starts[0], None))
+    client.patch(f"/api/v1/visits/{due[1]['id']}", json={"status": "cancelled"})
+    statements.clear()
+
+    with SessionLocal() as db:
+        reminders = visit_reminders(db, NOW, NOW + timedelta(minutes=30))
+
+    mine = [r for r in reminders if r.organization_id == organization_id]
+    assert [r.data["visit_id"] for r in mine] == [due[0]["id"]]
+    assert mine[0].user_id == caregivers[0]
+    assert mine[0].due_at == NOW + timedelta(minutes=5)
+    assert len(statements) == 1
+
+
+def test_heap_pops_due_reminders_in_order_and_honours_edits() -> None:
+    scheduler = ReminderScheduler(batch_size=2)
+    scheduler.replace(
+        [_reminder("visit:a", NOW + timedelta(minutes=3)), _reminder("visit:b", NOW + timedelta(minutes=1))],
+        NOW + timedelta(minutes=30),
+    )
+    scheduler.schedule(_reminder("visit:c", NOW + timedelta(minutes=2)))
+    scheduler.schedule(_reminder("visit:a", NOW - timedelta(minutes=1)))
+    scheduler.schedule(_reminder("visit:late", NOW + timedelta(hours=2)))
+    scheduler.cancel("visit:c")
+
+    assert [r.key for r in scheduler.due(NOW + timedelta(minutes=5))] == ["visit:a", "visit:b"]
+    assert scheduler.due(NOW + timedelta(minutes=5)) == []
+    assert scheduler.metrics.pending == 0
+
+
+def test_reloads_and_events_keep_already_sent_reminders_out() -> None:
+    scheduler = ReminderScheduler()
+    sent = _reminder("visit:a", NOW)
+    scheduler.replace([sent], NOW + timedelta(minutes=30))
+    scheduler.record_dispatch(scheduler.due(NOW), NOW + timedelta(seconds=2))
+
+    scheduler.replace([sent], NOW + timedelta(minutes=45))
+    scheduler.schedule(sent)
+
+    assert scheduler.due(NOW + timedelta(minutes=1)) == []
+    assert scheduler.metrics.last_lag_seconds == 2.0
+    assert scheduler.metrics.dispatched == 1
+
+
+def test_visit_event_reschedules_and_cancels() -> None:
+    scheduler = ReminderScheduler()
+    scheduler.replace([], datetime.now(timezone.utc) + timedelta(days=1))
+    start = datetime.now(timezone.utc) + timedelta(hours=3)
+    data = {
+        "id": str(uuid.uuid4()),
+        "organization_id": str(uuid.uuid4()),
+        "care_recipient_id": str(uuid.uuid4()),
+        "assigned_caregiver_id": str(uuid.uuid4()),
+        "status": "scheduled",
+        "scheduled_start": start.isoformat(),
+    }
+
+    scheduler.on_event(Event("visit.updated", (), data))
+    assert scheduler.next_due() == start - VISIT_REMINDER_LEAD
+
+    scheduler.on_event(Event("visit.updated", (), {**data, "status": "cancelled"}))
+    assert scheduler.next_due() is None
+
+
+def test_in_app_channel_inserts_each_reminder_once(user_id: uuid.UUID) -> None:
+    reminder = _reminder(f"visit:{uuid.uuid4()}", NOW, user_id)
+
+    for _ in range(2):
+        with SessionLocal() as db:
+            InAppChannel().send(db, [reminder], NOW)
+            db.commit()
+
+    with SessionLocal() as db:
+        count = db.scalar(select(func.count()).select_from(Notification).where(Notification.user_id == user_id))
+    assert count == 1
+
+
+@pytest.fixture
+def live_client(app: FastAPI, monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]:
+    """A client running the lifespan with the reminder scheduler but no other background jobs."""
+    monkeypatch.setattr(main, "ROLLER_INTERVAL", 0)
+    monkeypatch.setattr(main, "RECONCILE_INTERVAL", 0)
+    monkeypatch.setattr(main, "SWEEP_INTERVAL", 0)
+    monkeypatch.setattr(main, "TYPEAHEAD_INDEX", False)
+    monkeypatch.setenv("REALTIME_BACKEND", "memory")
+    with TestClient(app) as client:
+        yield client
+
+
+def test_new_visit_reminds_caregiver_in_app(
+    live_client: TestClient, organization_id: uuid.UUID, user_id: uuid.UUID
+) -> None:
+    start = datetime.now(timezone.utc).replace(microsecond=0) + VISIT_REMINDER_LEAD - timedelta(minutes=1)
+    visit = live_client.post("/api/v1/visits", json=_visit(organization_id, start, user_id)).json()
+
+    deadline = time.monotonic() + 5
+    while not (page := live_client.get("/api/v1/notifications").json())["items"] and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    [notification] = page["items"]
+    assert notification["type"] == "visit_reminder"
+    assert notification["data"]["visit_id"] == visit["id"]
+    stats = live_client.get("/api/v1/notifications/scheduler").json()
+    assert stats["running"] and stats["dispatched"] >= 1
+
+    read = live_client.post(f"/api/v1/notifications/{notification['id']}/read").json()
+    assert read["read_at"] is not None
+    assert live_client.get("/api/v1/notifications?unread=true").json()["items"] == []
+    assert live_client.post(f"/api/v1/notifications/{uuid.uuid4()}/read").status_code == 404
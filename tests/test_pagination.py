@@ -0,0 +1,82 @@
+"""
+Keyset pagination: walking every page returns each row exactly once, in order.
+"""
+
+import uuid
+
+from fastapi.testclient import TestClient
+
+
+def _walk(client: TestClient, path: str, limit: int, **params: str) -> list[dict]:
+    items: list[dict] = []
+    cursor = None
+    while True:
+        query = {"limit": limit, **params}
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get(path, params=query)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page["items"]) <= limit
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def test_visits_paginate_in_schedule_order_with_ties(client: TestClient, organization_id: uuid.UUID) -> None:
+    recipient = str(uuid.uuid4())
+    for hour in (9, 8, 8, 8, 10, 7, 8):
+        response = client.post(
+            "/api/v1/visits",
+            json={
+                "organization_id": str(organization_id),
+                "care_recipient_id": recipient,
+                "visit_type": "nursing",
+                "scheduled_start": f"2025-03-03T{hour:02d}:00:00+00:00",
+                "scheduled_end": f"2025-03-03T{hour:02d}:30:00+00:00",
+            },
+        )
+        assert response.status_code == 201, response.text
+
+    visits = _walk(client, "/api/v1/visits", limit=2, care_recipient_id=recipient)
+
+    assert len({v["id"] for v in visits}) == 7
+    keys = [(v["scheduled_start"], v["id"]) for v in visits]
+    assert keys == sorted(keys)
+
+
+def test_tasks_paginate_with_null_sort_order_last(client: TestClient, organization_id: uuid.UUID) -> None:
+    visit_id = str(uuid.uuid4())
+    for day, sort_order in [(3, None), (3, 2), (3, 1), (4, None), (3, None), (4, 1), (3, 1)]:
+        response = client.post(
+            "/api/v1/tasks",
+            json={
+                "organization_id": str(organization_id),
+                "care_recipient_id": str(uuid.uuid4()),
+                "visit_id": visit_id,
+                "task_date": f"2025-03-0{day}",
+                "title": "Task",
+                "sort_order": sort_order,
+            },
+        )
+        assert response.status_code == 201, response.text
+
+    tasks = _walk(client, "/api/v1/tasks", limit=3, visit_id=visit_id)
+
+    assert len({t["id"] for t in tasks}) == 7
+    assert [(t["task_date"][-1], t["sort_order"]) for t in tasks] == [
+        ("3", 1),
+        ("3", 1),
+        ("3", 2),
+        ("3", None),
+        ("3", None),
+        ("4", 1),
+        ("4", None),
+    ]
+
+
+def test_invalid_cursor_is_rejected(client: TestClient) -> None:
+    response = client.get("/api/v1/visits", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
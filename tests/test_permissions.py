@@ -0,0 +1,188 @@
+"""
+Care-circle authorization: scoped lists and lookups, the cached circle and its invalidation.
+"""
+
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.apis import auth, dependencies, permissions
+from backend.database import CareRelationship, SessionLocal
+
+KEY = b"test-signing-key"
+
+
+@pytest.fixture
+def auth_client(app: FastAPI, monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    """The sync or async app with authentication on and the real identity dependencies."""
+    monkeypatch.setattr(auth, "SIGNING_KEYS", {None: KEY})
+    app.dependency_overrides.pop(dependencies.get_current_organization_id)
+    app.dependency_overrides.pop(dependencies.get_current_user_id)
+    return TestClient(app)
+
+
+def _headers(user: uuid.UUID, org: uuid.UUID, role: str) -> dict[str, str]:
+    token = auth.encode_token({"sub": str(user), "exp": time.time() + 300, "orgs": {str(org): role}}, KEY)
+    return {"Authorization": f"Bearer {token}", "X-Organization-Id": str(org)}
+
+
+def _visit(client: TestClient, headers: dict[str, str], org: uuid.UUID, recipient: uuid.UUID) -> dict[str, Any]:
+    start = datetime(2025, 6, 2, 9, tzinfo=timezone.utc)
+    response = client.post(
+        "/api/v1/visits",
+        headers=headers,
+        json={
+            "organization_id": str(org),
+            "care_recipient_id": str(recipient),
+            "visit_type": "personal_care",
+            "scheduled_start": start.isoformat(),
+            "scheduled_end": (start + timedelta(hours=1)).isoformat(),
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _relate(user: uuid.UUID, org: uuid.UUID, recipient: uuid.UUID) -> CareRelationship:
+    with SessionLocal() as db:
+        rel = CareRelationship(care_recipient_id=recipient, related_user_id=user, organization_id=org, role="aide")
+        db.add(rel)
+        db.commit()
+    return rel
+
+
+@pytest.fixture
+def circle(auth_client: TestClient, organization_id: uuid.UUID) -> dict[str, Any]:
+    """A caregiver related to one of two recipients, each with a visit and a task."""
+    supervisor = _headers(uuid.uuid4(), organization_id, "supervisor")
+    caregiver, mine, other = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    rel = _relate(caregiver, organization_id, mine)
+    visits = {recipient: _visit(auth_client, supervisor, organization_id, recipient) for recipient in (mine, other)}
+    tasks = {
+        recipient: auth_client.post(
+            "/api/v1/tasks",
+            headers=supervisor,
+            json={
+                "organization_id": str(organization_id),
+                "care_recipient_id": str(recipient),
+                "visit_id": visits[recipient]["id"],
+                "task_date": "2025-06-02",
+                "title": "Medication",
+            },
+        ).json()
+        for recipient in (mine, other)
+    }
+    return {
+        "supervisor": supervisor,
+        "caregiver": _headers(caregiver, organization_id, "caregiver"),
+        "mine": mine,
+        "other": other,
+        "rel": rel,
+        "visits": visits,
+        "tasks": tasks,
+    }
+
+
+def _ids(client: TestClient, path: str, headers: dict[str, str]) -> set[str]:
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    return {item["id"] for item in response.json()["items"]}
+
+
+def test_caregivers_see_only_their_care_circle(auth_client: TestClient, circle: dict[str, Any]) -> None:
+    visits, tasks = circle["visits"], circle["tasks"]
+    mine, other = circle["mine"], circle["other"]
+
+    assert _ids(auth_client, "/api/v1/visits", circle["caregiver"]) == {visits[mine]["id"]}
+    assert _ids(auth_client, "/api/v1/tasks", circle["caregiver"]) == {tasks[mine]["id"]}
+    assert _ids(auth_client, "/api/v1/visits", circle["supervisor"]) == {v["id"] for v in visits.values()}
+
+    assert auth_client.get(f"/api/v1/visits/{visits[mine]['id']}", headers=circle["caregiver"]).status_code == 200
+    assert auth_client.get(f"/api/v1/visits/{visits[other]['id']}", headers=circle["caregiver"]).status_code == 404
+    assert auth_client.get(f"/api/v1/tasks/{tasks[other]['id']}", headers=circle["caregiver"]).status_code == 404
+    assert auth_client.get(f"/api/v1/tasks/{tasks[other]['id']}", headers=circle["supervisor"]).status_code == 200
+
+    notes = {
+        recipient: auth_client.post(
+            "/api/v1/visit-notes",
+            headers=circle["supervisor"],
+            json={"visit_id": visits[recipient]["id"], "author_id": str(uuid.uuid4()), "summary": "Fine"},
+        ).json()
+        for recipient in (mine, other)
+    }
+    assert _ids(auth_client, "/api/v1/visit-notes", circle["caregiver"]) == {notes[mine]["id"]}
+    assert auth_client.get(f"/api/v1/visit-notes/{notes[other]['id']}", headers=circle["caregiver"]).status_code == 404
+
+
+def test_the_circle_is_cached_until_a_relationship_write(
+    auth_client: TestClient, circle: dict[str, Any], statements: list[str]
+) -> None:
+    def loads() -> int:
+        return sum(sql.startswith("SELECT care_relationship.related_user_id") for sql in statements)
+
+    _ids(auth_client, "/api/v1/visits", circle["caregiver"])
+    _ids(auth_client, "/api/v1/tasks", circle["caregiver"])
+    assert loads() == 1
+
+    response = auth_client.patch(
+        f"/api/v1/care-relationships/{circle['rel'].id}", headers=circle["supervisor"], json={"status": "inactive"}
+    )
+    assert response.status_code == 200
+    assert _ids(auth_client, "/api/v1/visits", circle["caregiver"]) == set()
+    assert loads() == 2
+
+
+def test_scopes_check_recipients_in_batches(organization_id: uuid.UUID) -> None:
+    caregiver, mine, other = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    _relate(caregiver, organization_id, mine)
+    scope = permissions.scope_for(organization_id, caregiver, "caregiver")
+
+    assert scope.visible([mine, other, str(caregiver)]) == {mine, caregiver}
+    assert scope.can_see(organization_id, mine) and not scope.can_see(uuid.uuid4(), mine)
+    assert permissions.scope_for(organization_id, caregiver, "agency_admin").visible([other]) == {other}
+    assert permissions.UNRESTRICTED.where(CareRelationship.care_recipient_id) == []
+
+
+def _export_ids(client: TestClient, path: str, headers: dict[str, str]) -> set[str]:
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    return {json.loads(line)["id"] for line in response.text.splitlines()}
+
+
+def test_exports_calendar_and_search_stay_inside_the_circle(auth_client: TestClient, circle: dict[str, Any]) -> None:
+    visits, tasks, caregiver = circle["visits"], circle["tasks"], circle["caregiver"]
+    mine, other = circle["mine"], circle["other"]
+
+    assert _export_ids(auth_client, "/api/v1/visits/export", caregiver) == {visits[mine]["id"]}
+    assert _export_ids(auth_client, "/api/v1/tasks/export", caregiver) == {tasks[mine]["id"]}
+
+    calendar = auth_client.get(
+        "/api/v1/calendar?from=2025-06-02T00:00:00Z&to=2025-06-03T00:00:00Z", headers=caregiver
+    ).json()["items"]
+    assert {entry["id"] for entry in calendar} == {visits[mine]["id"]}
+
+    for recipient in (mine, other):
+        auth_client.post(
+            "/api/v1/visit-notes",
+            headers=circle["supervisor"],
+            json={"visit_id": visits[recipient]["id"], "author_id": str(uuid.uuid4()), "summary": "Dizzy after lunch"},
+        )
+    hits = auth_client.get("/api/v1/search?q=dizzy", headers=caregiver).json()["items"]
+    assert {hit["visit_id"] for hit in hits} == {visits[mine]["id"]}
+
+
+def test_hidden_visits_and_tasks_cannot_be_written(auth_client: TestClient, circle: dict[str, Any]) -> None:
+    visit, task = circle["visits"][circle["other"]], circle["tasks"][circle["other"]]
+    caregiver = circle["caregiver"]
+
+    assert auth_client.patch(f"/api/v1/visits/{visit['id']}", headers=caregiver, json={"notes": "x"}).status_code == 404
+    assert auth_client.post(f"/api/v1/visits/{visit['id']}/start", headers=caregiver).status_code == 404
+    assert auth_client.post(f"/api/v1/visits/{visit['id']}/end", headers=caregiver).status_code == 404
+    assert auth_client.patch(f"/api/v1/tasks/{task['id']}", headers=caregiver, json={"notes": "x"}).status_code == 404
+    assert auth_client.get(f"/api/v1/visits/{visit['id']}", headers=circle["supervisor"]).json()["status"] == "scheduled"
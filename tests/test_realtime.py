@@ -0,0 +1,143 @@
+"""
+Realtime push: committed visit, task and message events reach WebSocket subscribers by topic.
+"""
+
+import asyncio
+import uuid
+from collections.abc import Generator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from starlette.websockets import WebSocketDisconnect
+
+from backend.apis import main
+from backend.apis.routes.realtime import _sse
+from backend.database import SessionLocal
+from backend.realtime import Event, Subscription, emit, hub
+from backend.realtime.backends import InMemoryBackend
+
+
+def _visit(org: uuid.UUID, recipient: uuid.UUID) -> dict[str, Any]:
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=1)
+    return {
+        "organization_id": str(org),
+        "care_recipient_id": str(recipient),
+        "visit_type": "personal_care",
+        "scheduled_start": start.isoformat(),
+        "scheduled_end": (start + timedelta(hours=1)).isoformat(),
+    }
+
+
+@pytest.fixture
+def live_client(app: FastAPI, monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]:
+    """A client that runs the app lifespan (and so the hub), without the background jobs."""
+    monkeypatch.setattr(main, "ROLLER_INTERVAL", 0)
+    monkeypatch.setattr(main, "RECONCILE_INTERVAL", 0)
+    monkeypatch.setattr(main, "SWEEP_INTERVAL", 0)
+    monkeypatch.setattr(main, "TYPEAHEAD_INDEX", False)
+    monkeypatch.setattr(main, "REMINDER_WINDOW", timedelta(0))
+    monkeypatch.setenv("REALTIME_BACKEND", "memory")
+    with TestClient(app) as client:
+        yield client
+
+
+def test_visit_events_reach_the_recipients_subscribers(live_client: TestClient, organization_id: uuid.UUID) -> None:
+    recipient = uuid.uuid4()
+    with live_client.websocket_connect(f"/api/v1/ws?care_recipient_id={recipient}") as ws:
+        live_client.post("/api/v1/visits", json=_visit(organization_id, uuid.uuid4()))
+        visit = live_client.post("/api/v1/visits", json=_visit(organization_id, recipient)).json()
+        live_client.post(f"/api/v1/visits/{visit['id']}/start")
+
+        created, started = ws.receive_json(), ws.receive_json()
+
+    assert (created["type"], created["data"]["id"]) == ("visit.created", visit["id"])
+    assert (started["type"], started["data"]["status"]) == ("visit.started", "in_progress")
+
+
+def test_organization_subscribers_get_task_events(live_client: TestClient, organization_id: uuid.UUID) -> None:
+    task = {
+        "organization_id": str(organization_id),
+        "care_recipient_id": str(uuid.uuid4()),
+        "visit_id": str(uuid.uuid4()),
+        "task_date": "2025-03-03",
+        "title": "Morning medication",
+    }
+    with live_client.websocket_connect("/api/v1/ws") as ws:
+        created = live_client.post("/api/v1/tasks", json=task).json()
+        live_client.patch(f"/api/v1/tasks/{created['id']}", json={"notes": "Taken with food"})
+
+        events = [ws.receive_json(), ws.receive_json()]
+
+    assert [(e["type"], e["data"]["id"]) for e in events] == [
+        ("task.created", created["id"]),
+        ("task.updated", created["id"]),
+    ]
+
+
+def test_message_events_go_to_participants_only(live_client: TestClient, organization_id: uuid.UUID) -> None:
+    thread = live_client.post(
+        "/api/v1/conversations", json={"organization_id": str(organization_id), "type": "group"}
+    ).json()
+
+    with live_client.websocket_connect(f"/api/v1/ws?conversation_id={thread['id']}") as ws:
+        message = live_client.post(f"/api/v1/conversations/{thread['id']}/messages", json={"body": "On my way"}).json()
+        event = ws.receive_json()
+
+    assert event["type"] == "message.created"
+    assert event["data"]["id"] == message["id"]
+    assert event["data"]["preview"] == "On my way"
+    with pytest.raises(WebSocketDisconnect):
+        with live_client.websocket_connect(f"/api/v1/ws?conversation_id={uuid.uuid4()}") as ws:
+            ws.receive_json()
+
+
+def test_push_endpoints_need_a_running_hub(client: TestClient) -> None:
+    assert client.get("/api/v1/events").status_code == 503
+
+
+def test_only_committed_events_are_published() -> None:
+    kept, dropped = Event("visit.updated", ("t",), {"n": 1}), Event("visit.updated", ("t",), {"n": 2})
+
+    async def run() -> list[Event]:
+        await hub.start(InMemoryBackend())
+        sub = hub.subscribe(["t"])
+        try:
+            with SessionLocal() as db:
+                db.execute(text("SELECT 1"))
+                emit(db, dropped)
+                db.rollback()
+                db.execute(text("SELECT 1"))
+                emit(db, kept)
+                db.commit()
+            received = [await asyncio.wait_for(sub.get(), 1)]
+            await asyncio.sleep(0.01)
+            while not sub._queue.empty():
+                received.append(sub._queue.get_nowait())
+            return received
+        finally:
+            await hub.stop()
+
+    assert asyncio.run(run()) == [kept]
+
+
+def test_slow_subscriber_is_cut_off() -> None:
+    async def run() -> Any:
+        sub = Subscription(["t"], maxsize=2)
+        for n in range(3):
+            sub.offer(Event("visit.updated", ("t",), {"n": n}))
+        return await sub.get()
+
+    assert asyncio.run(run()) is None
+
+
+def test_sse_frame() -> None:
+    event = Event("visit.started", ("organization:o",), {"id": "v"}, id="e1")
+
+    assert _sse(event) == (
+        'id: e1\nevent: visit.started\ndata: {"id":"e1","type":"visit.started","topics":["organization:o"],'
+        '"data":{"id":"v"}}\n\n'
+    )
@@ -0,0 +1,205 @@
+"""
+Recurring visits: rule expansion, horizon materialization and the roller.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+from fastapi.testclient import TestClient
+
+from backend.database import SessionLocal
+from backend.scheduling.recurrence import occurrences
+from backend.scheduling.roller import roll_forward
+
+
+def _series(**fields: object) -> SimpleNamespace:
+    return SimpleNamespace(**{"id": uuid.uuid4(), "recurrence_materialized_until": None, **fields})
+
+
+def test_weekly_rule_keeps_local_time_across_dst_and_skips_exdate() -> None:
+    series = _series(
+        scheduled_start=datetime(2025, 3, 3, 13, 0, tzinfo=timezone.utc),  # 08:00 EST
+        scheduled_end=datetime(2025, 3, 3, 14, 0, tzinfo=timezone.utc),
+        timezone="America/New_York",
+        recurrence_rule="RRULE:FREQ=WEEKLY;BYDAY=MO\nEXDATE:20250317T080000",
+    )
+
+    found = list(occurrences(series, datetime(2025, 3, 1, tzinfo=timezone.utc), datetime(2025, 4, 1, tzinfo=timezone.utc)))
+
+    assert [(o.start.day, o.start.hour) for o in found] == [(3, 13), (10, 12), (24, 12), (31, 12)]
+    assert all(o.end - o.start == timedelta(hours=1) for o in found)
+
+
+def _create_daily_series(client: TestClient, organization_id: uuid.UUID) -> tuple[str, datetime]:
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    response = client.post(
+        "/api/v1/visits",
+        json={
+            "organization_id": str(organization_id),
+            "care_recipient_id": str(uuid.uuid4()),
+            "visit_type": "companionship",
+            "scheduled_start": start.isoformat(),
+            "scheduled_end": (start + timedelta(hours=1)).isoformat(),
+            "timezone": "Europe/London",
+            "recurrence_rule": "FREQ=DAILY",
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"], start
+
+
+def _occurrences(client: TestClient, series_id: str, start: datetime, weeks: int) -> list[dict]:
+    response = client.get(
+        f"/api/v1/visits/{series_id}/occurrences",
+        params={"from": start.isoformat(), "to": (start + timedelta(weeks=weeks)).isoformat()},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_series_is_materialized_up_to_horizon_and_projected_beyond(
+    client: TestClient, organization_id: uuid.UUID
+) -> None:
+    series_id, start = _create_daily_series(client, organization_id)
+
+    found = _occurrences(client, series_id, start, weeks=12)
+
+    assert len(found) == 12 * 7
+    stored = [o for o in found if o["visit_id"] is not None]
+    assert found[: len(stored)] == stored
+    assert found[0]["visit_id"] == series_id
+    assert 7 * 8 - 2 <= len(stored) <= 7 * 8
+
+
+def test_roller_extends_the_horizon(client: TestClient, organization_id: uuid.UUID) -> None:
+    series_id, start = _create_daily_series(client, organization_id)
+    before = [o for o in _occurrences(client, series_id, start, weeks=12) if o["visit_id"]]
+
+    with SessionLocal() as db:
+        roll_forward(db, now=datetime.now(timezone.utc) + timedelta(weeks=2))
+
+    after = _occurrences(client, series_id, start, weeks=12)
+    stored = [o for o in after if o["visit_id"]]
+    assert len(stored) == len(before) + 14
+    assert after[: len(before)] == before
+
+
+def test_invalid_rule_is_rejected(client: TestClient, organization_id: uuid.UUID) -> None:
+    response = client.post(
+        "/api/v1/visits",
+        json={
+            "organization_id": str(organization_id),
+            "care_recipient_id": str(uuid.uuid4()),
+            "visit_type": "nursing",
+            "scheduled_start": "2025-03-03T08:00:00+00:00",
+            "scheduled_end": "2025-03-03T09:00:00+00:00",
+            "recurrence_rule": "FREQ=SOMETIMES",
+        },
+    )
+    assert response.status_code == 422
+
+
+def test_roller_skips_series_starting_beyond_the_horizon(client: TestClient, organization_id: uuid.UUID) -> None:
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=200)
+    response = client.post(
+        "/api/v1/visits",
+        json={
+            "organization_id": str(organization_id),
+            "care_recipient_id": str(uuid.uuid4()),
+            "visit_type": "companionship",
+            "scheduled_start": start.isoformat(),
+            "scheduled_end": (start + timedelta(hours=1)).isoformat(),
+            "recurrence_rule": "FREQ=DAILY",
+        },
+    )
+    assert response.status_code == 201, response.text
+
+    with SessionLocal() as db:
+        roll_forward(db)
+
+    found = _occurrences(client, response.json()["id"], start, weeks=1)
+    assert [o["visit_id"] for o in found if o["visit_id"]] == [response.json()["id"]]
+
+
+def test_invalid_rule_is_rejected_on_update(client: TestClient, organization_id: uuid.UUID) -> None:
+    series_id, _ = _create_daily_series(client, organization_id)
+
+    for patch in ({"recurrence_rule": "FREQ=SOMETIMES"}, {"timezone": "Mars/Olympus_Mons"}):
+        response = client.patch(f"/api/v1/visits/{series_id}", json=patch)
+        assert response.status_code == 422, response.text
+
+    assert client.get(f"/api/v1/visits/{series_id}").status_code == 200
+
+
+def test_changing_the_rule_regenerates_future_children(client: TestClient, organization_id: uuid.UUID) -> None:
+    series_id, start = _create_daily_series(client, organization_id)
+
+    response = client.patch(f"/api/v1/visits/{series_id}", json={"recurrence_rule": "FREQ=WEEKLY"})
+    assert response.status_code == 200, response.text
+
+    found = _occurrences(client, series_id, start, weeks=12)
+    assert len(found) == 12
+    assert all(o["visit_id"] for o in found[:8])
+    assert all((datetime.fromisoformat(o["scheduled_start"]).weekday() == start.weekday()) for o in found)
+
+
+def test_cancelling_the_head_cancels_the_series(client: TestClient, organization_id: uuid.UUID) -> None:
+    series_id, start = _create_daily_series(client, organization_id)
+
+    response = client.patch(f"/api/v1/visits/{series_id}", json={"status": "cancelled"})
+    assert response.status_code == 200, response.text
+
+    found = _occurrences(client, series_id, start, weeks=12)
+    assert all(o["visit_id"] for o in found)
+    assert {o["status"] for o in found} == {"cancelled"}
+    assert 7 * 8 - 2 <= len(found) <= 7 * 8
+
+
+def test_unchanged_head_fields_leave_the_series_alone(client: TestClient, organization_id: uuid.UUID) -> None:
+    series_id, start = _create_daily_series(client, organization_id)
+    before = _occurrences(client, series_id, start, weeks=12)
+
+    response = client.patch(f"/api/v1/visits/{series_id}", json={"status": "scheduled", "timezone": "Europe/London"})
+    assert response.status_code == 200, response.text
+
+    assert _occurrences(client, series_id, start, weeks=12) == before
+
+
+def test_edited_children_and_their_tasks_survive_a_head_edit(client: TestClient, organization_id: uuid.UUID) -> None:
+    series_id, start = _create_daily_series(client, organization_id)
+    cancelled, edited, with_task = [o["visit_id"] for o in _occurrences(client, series_id, start, weeks=1)[1:4]]
+    assert client.patch(f"/api/v1/visits/{cancelled}", json={"status": "cancelled"}).status_code == 200
+    assert client.patch(f"/api/v1/visits/{edited}", json={"notes": "Side door"}).status_code == 200
+    visit = client.get(f"/api/v1/visits/{with_task}").json()
+    task = client.post(
+        "/api/v1/tasks",
+        json={
+            "organization_id": str(organization_id),
+            "care_recipient_id": visit["care_recipient_id"],
+            "visit_id": with_task,
+            "task_date": visit["scheduled_start"][:10],
+            "title": "Prepare lunch",
+        },
+    )
+    assert task.status_code == 201, task.text
+
+    later = start + timedelta(hours=2)
+    response = client.patch(
+        f"/api/v1/visits/{series_id}",
+        json={"scheduled_start": later.isoformat(), "scheduled_end": (later + timedelta(hours=1)).isoformat()},
+    )
+    assert response.status_code == 200, response.text
+
+    assert client.get(f"/api/v1/visits/{cancelled}").json()["status"] == "cancelled"
+    assert client.get(f"/api/v1/visits/{edited}").json()["notes"] == "Side door"
+    assert client.get(f"/api/v1/visits/{with_task}").status_code == 200
+    assert client.get(f"/api/v1/tasks/{task.json()['id']}").status_code == 200
+    found = _occurrences(client, series_id, start, weeks=12)
+    days = [datetime.fromisoformat(o["scheduled_start"]).date() for o in found]
+    assert len(days) == len(set(days)) == 12 * 7
+    assert [o["visit_id"] for o in found[1:4]] == [cancelled, edited, with_task]
+    london = ZoneInfo("Europe/London")
+    hour = later.astimezone(london).hour
+    assert all(datetime.fromisoformat(o["scheduled_start"]).astimezone(london).hour == hour for o in found[4:])
@@ -0,0 +1,24 @@
+"""
+create_schema on a database that predates newer entity columns and indexes.
+"""
+
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+from backend.database import create_schema
+
+
+def test_create_schema_adds_missing_columns_and_their_indexes(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path}/old.db")
+    create_schema(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_visit_series_horizon"))
+        conn.execute(text("ALTER TABLE visit DROP COLUMN recurrence_materialized_until"))
+
+    create_schema(engine)
+
+    inspector = inspect(engine)
+    assert "recurrence_materialized_until" in {c["name"] for c in inspector.get_columns("visit")}
+    assert "ix_visit_series_horizon" in {ix["name"] for ix in inspector.get_indexes("visit")}
+    engine.dispose()
@@ -0,0 +1,122 @@
+"""
+Full-text search: scoping, ranking, snippets and keyset paging over the SQLite FTS5 stand-in.
+"""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from backend.apis.permissions import UNRESTRICTED
+from backend.apis.routes.search import _postgres_hits
+from backend.apis.schemas.search import SearchKind
+from backend.database import CareNote, Conversation, Message, SessionLocal
+from backend.database.search import POSTGRES_DDL
+
+
+def _visit_note(client: TestClient, org: uuid.UUID, recipient: uuid.UUID, **text: str) -> dict[str, Any]:
+    start = datetime(2025, 6, 2, 9, tzinfo=timezone.utc) + timedelta(days=len(text))
+    visit = client.post(
+        "/api/v1/visits",
+        json={
+            "organization_id": str(org),
+            "care_recipient_id": str(recipient),
+            "visit_type": "personal_care",
+            "scheduled_start": start.isoformat(),
+            "scheduled_end": (start + timedelta(hours=1)).isoformat(),
+        },
+    ).json()
+    return client.post(
+        "/api/v1/visit-notes", json={"visit_id": visit["id"], "author_id": str(uuid.uuid4()), **text}
+    ).json()
+
+
+@pytest.fixture
+def documents(client: TestClient, organization_id: uuid.UUID) -> dict[str, Any]:
+    recipient, other_recipient = uuid.uuid4(), uuid.uuid4()
+    fall = _visit_note(client, organization_id, recipient, incidents="Had a fall in the bathroom", summary="Fall risk")
+    _visit_note(client, organization_id, other_recipient, summary="Quiet day, no falls")
+    _visit_note(client, uuid.uuid4(), recipient, incidents="A fall in another organization")
+    thread = client.post(
+        "/api/v1/conversations",
+        json={"organization_id": str(organization_id), "care_recipient_id": str(recipient), "type": "group"},
+    ).json()
+    message = client.post(
+        f"/api/v1/conversations/{thread['id']}/messages", json={"body": "She falls more often after dinner"}
+    ).json()
+    with SessionLocal() as db:
+        care_note = CareNote(
+            organization_id=organization_id,
+            care_recipient_id=recipient,
+            author_id=uuid.uuid4(),
+            note_date=date(2025, 6, 3),
+            summary="Refused meds at breakfast, took them at lunch",
+        )
+        private = Conversation(organization_id=organization_id, type="direct")
+        db.add_all([care_note, private])
+        db.flush()
+        db.add(Message(conversation_id=private.id, sender_id=uuid.uuid4(), body="A fall nobody here may read"))
+        db.commit()
+    return {"recipient": recipient, "fall": fall, "message": message, "care_note": care_note}
+
+
+def _search(client: TestClient, **params: Any) -> dict[str, Any]:
+    response = client.get("/api/v1/search", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_search_is_scoped_ranked_and_highlighted(client: TestClient, documents: dict[str, Any]) -> None:
+    hits = _search(client, q="fall")["items"]
+
+    assert [hit["kind"] for hit in hits] == ["visit_note", "visit_note", "message"]
+    assert hits[0]["id"] == documents["fall"]["id"]
+    assert hits[0]["visit_id"] == documents["fall"]["visit_id"]
+    assert "<mark>fall</mark>" in hits[0]["snippet"].lower()
+    assert hits[0]["rank"] >= hits[1]["rank"] >= hits[2]["rank"]
+    assert hits[2]["conversation_id"] == documents["message"]["conversation_id"]
+
+    recipient = str(documents["recipient"])
+    scoped = _search(client, q="fall", care_recipient_id=recipient, type="message")["items"]
+    assert [hit["id"] for hit in scoped] == [documents["message"]["id"]]
+    [care_note] = _search(client, q="refused meds")["items"]
+    assert (care_note["kind"], care_note["id"]) == ("care_note", str(documents["care_note"].id))
+
+
+def test_search_pages_with_a_cursor(client: TestClient, documents: dict[str, Any]) -> None:
+    first = _search(client, q="fall", limit=2)
+    second = _search(client, q="fall", limit=2, cursor=first["next_cursor"])
+
+    assert len(first["items"]) == 2 and second["next_cursor"] is None
+    assert [h["id"] for h in first["items"] + second["items"]] == [h["id"] for h in _search(client, q="fall")["items"]]
+
+
+def test_edited_notes_are_reindexed(client: TestClient, documents: dict[str, Any]) -> None:
+    note = documents["fall"]
+    client.patch(f"/api/v1/visit-notes/{note['id']}", json={"incidents": "Dizzy when standing", "summary": ""})
+
+    assert note["id"] not in {hit["id"] for hit in _search(client, q="fall")["items"]}
+    assert [hit["id"] for hit in _search(client, q="dizzy")["items"]] == [note["id"]]
+    assert _search(client, q="&&")["items"] == []
+
+
+def test_snippets_escape_the_stored_text(client: TestClient, organization_id: uuid.UUID) -> None:
+    _visit_note(client, organization_id, uuid.uuid4(), summary='<script>alert("fall")</script> after a fall & bruise')
+
+    [hit] = _search(client, q="bruise")["items"]
+
+    assert "<script>" not in hit["snippet"]
+    assert "&lt;script&gt;" in hit["snippet"] and "&amp; <mark>bruise</mark>" in hit["snippet"]
+
+
+def test_postgres_search_uses_the_generated_tsvector_columns() -> None:
+    hits = _postgres_hits("refused meds", str(uuid.uuid4()), str(uuid.uuid4()), None, set(SearchKind), UNRESTRICTED)
+    sql = str(hits.compile(dialect=postgresql.dialect()))
+
+    assert sql.count("search_vector @@ websearch_to_tsquery") == 3
+    assert "CAST(ts_rank(message.search_vector, websearch_to_tsquery(" in sql
+    assert "AS DOUBLE PRECISION) AS rank" in sql
+    assert "CREATE INDEX IF NOT EXISTS ix_message_search ON message USING gin (search_vector)" in POSTGRES_DDL
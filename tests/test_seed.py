@@ -0,0 +1,94 @@
+"""
+Synthetic data: a seeded agency is complete and consistent with what the API maintains.
+"""
+
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from backend.database import (
+    CareRelationship,
+    Conversation,
+    Membership,
+    Message,
+    SessionLocal,
+    Visit,
+    engine,
+)
+from backend.database.seed import Scale, seed
+from backend.scheduling.recurrence import occurrences
+from backend.scheduling.timeutils import as_utc
+from backend.stats.rollup import reconcile
+
+NOW = datetime(2031, 3, 5, 10, 30, tzinfo=timezone.utc)
+SCALE = Scale(caregivers=4, recipients=12, family_per_recipient=2, staff=2, weeks_back=1, weeks_ahead=1)
+
+
+@pytest.fixture(scope="module")
+def seeded() -> tuple[uuid.UUID, Counter[str]]:
+    [(organization_id, counts)] = seed(engine, SCALE, seed=24, now=NOW, batch_size=7).items()
+    return organization_id, counts
+
+
+def test_an_agency_is_seeded_at_the_requested_scale(seeded: tuple[uuid.UUID, Counter[str]]) -> None:
+    organization_id, counts = seeded
+    with SessionLocal() as db:
+        roles = Counter(
+            dict(
+                db.execute(
+                    select(Membership.role, func.count())
+                    .where(Membership.organization_id == organization_id)
+                    .group_by(Membership.role)
+                ).all()
+            )
+        )
+        recipients = db.scalar(
+            select(func.count(CareRelationship.care_recipient_id.distinct())).where(
+                CareRelationship.organization_id == organization_id
+            )
+        )
+        visits = db.scalar(select(func.count()).where(Visit.organization_id == organization_id))
+
+    assert roles == {"agency_admin": 1, "supervisor": 1, "caregiver": 4, "family_editor": 12, "family_viewer": 12}
+    assert recipients == 12
+    assert visits == counts["visit"] > 0
+    assert counts["user"] == 2 + 4 + 12 * 3
+    assert counts["conversation"] == 12 and counts["message"] == 12 * SCALE.messages_per_conversation
+    assert counts["task"] >= counts["visit"] and counts["visit_note"] > 0
+
+
+def test_seeded_visits_are_consistent(seeded: tuple[uuid.UUID, Counter[str]]) -> None:
+    organization_id, _ = seeded
+    with SessionLocal() as db:
+        visits = db.scalars(select(Visit).where(Visit.organization_id == organization_id)).all()
+        conversations = db.scalars(select(Conversation).where(Conversation.organization_id == organization_id)).all()
+        newest = {
+            conversation_id: created_at
+            for conversation_id, created_at in db.execute(
+                select(Message.conversation_id, func.max(Message.created_at)).group_by(Message.conversation_id)
+            )
+        }
+        corrected = reconcile(db, (NOW - timedelta(weeks=1)).date(), (NOW + timedelta(weeks=1)).date())
+
+    booked: defaultdict[uuid.UUID, list[tuple[datetime, datetime]]] = defaultdict(list)
+    for visit in visits:
+        if visit.assigned_caregiver_id and visit.status in ("scheduled", "in_progress", "completed"):
+            booked[visit.assigned_caregiver_id].append((as_utc(visit.scheduled_start), as_utc(visit.scheduled_end)))
+        assert (visit.status == "scheduled") == (as_utc(visit.scheduled_start) > NOW)
+    for intervals in booked.values():
+        intervals.sort()
+        assert all(end <= next_start for (_, end), (next_start, _) in zip(intervals, intervals[1:]))
+
+    heads = [visit for visit in visits if visit.recurrence_rule]
+    children = Counter(visit.parent_visit_id for visit in visits if visit.parent_visit_id)
+    assert len(heads) == 12
+    for head in heads:
+        end = as_utc(head.recurrence_materialized_until)
+        assert children[head.id] == len(list(occurrences(head, head.scheduled_start, end))) - 1
+
+    for conversation in conversations:
+        assert as_utc(conversation.last_message_at) == as_utc(newest[conversation.id])
+    assert corrected == 0
@@ -0,0 +1,141 @@
+"""
+Sweeper: missed visits become no_show, pending 24/7 tasks are flagged overdue, both alert in-app.
+
+Rows are dated in 2001 and swept "as of" 2001 so the sweeps never reach rows of other tests.
+"""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+
+from backend.database import Assignment24_7, Notification, SessionLocal, StatRollup, Visit
+from backend.scheduling.sweeper import (
+    NO_SHOW_GRACE,
+    _no_show_stmt,
+    _overdue_stmt,
+    sweep_no_shows,
+    sweep_overdue_tasks,
+)
+
+NOW = datetime(2001, 3, 5, 12, 0, tzinfo=timezone.utc)
+
+
+def _visit(org: uuid.UUID, start: datetime, caregiver: uuid.UUID) -> dict[str, Any]:
+    return {
+        "organization_id": str(org),
+        "care_recipient_id": str(uuid.uuid4()),
+        "assigned_caregiver_id": str(caregiver),
+        "visit_type": "personal_care",
+        "scheduled_start": start.isoformat(),
+        "scheduled_end": (start + timedelta(minutes=30)).isoformat(),
+    }
+
+
+def _supervisor(client: TestClient, org: uuid.UUID) -> uuid.UUID:
+    supervisor = uuid.uuid4()
+    body = {"user_id": str(supervisor), "organization_id": str(org), "role": "supervisor", "status": "active"}
+    assert client.post("/api/v1/memberships", json=body).status_code == 201
+    return supervisor
+
+
+def _notified(user_id: uuid.UUID) -> list[tuple[str, Any]]:
+    with SessionLocal() as db:
+        rows = db.execute(select(Notification.type, Notification.data).where(Notification.user_id == user_id)).all()
+        return sorted(((kind, data) for kind, data in rows), key=str)
+
+
+def test_missed_visits_become_no_show_in_batches(client: TestClient, organization_id: uuid.UUID) -> None:
+    supervisor = _supervisor(client, organization_id)
+    caregiver = uuid.uuid4()
+    missed = [
+        client.post("/api/v1/visits", json=_visit(organization_id, NOW - timedelta(hours=h), caregiver)).json()
+        for h in (3, 2)
+    ]
+    in_grace = client.post("/api/v1/visits", json=_visit(organization_id, NOW - NO_SHOW_GRACE / 2, caregiver)).json()
+    started = client.post("/api/v1/visits", json=_visit(organization_id, NOW - timedelta(hours=1), caregiver)).json()
+    client.post(f"/api/v1/visits/{started['id']}/start")
+    with SessionLocal() as db:
+        head = Visit(
+            organization_id=organization_id,
+            care_recipient_id=uuid.uuid4(),
+            visit_type="personal_care",
+            scheduled_start=NOW - timedelta(hours=5),
+            scheduled_end=NOW - timedelta(hours=4),
+            recurrence_rule="FREQ=WEEKLY",
+        )
+        db.add(head)
+        db.commit()
+
+    with SessionLocal() as db:
+        assert sweep_no_shows(db, NOW, batch_size=1) == 2
+        assert sweep_no_shows(db, NOW) == 0
+        stmt = select(Visit.id, Visit.status).where(Visit.organization_id == organization_id)
+        statuses = dict(db.execute(stmt).all())
+        counters = dict(
+            db.execute(
+                select(StatRollup.metric, StatRollup.value).where(StatRollup.organization_id == organization_id)
+            ).all()
+        )
+
+    assert [statuses[uuid.UUID(v["id"])] for v in missed] == ["no_show", "no_show"]
+    assert statuses[uuid.UUID(in_grace["id"])] == "scheduled"
+    assert statuses[uuid.UUID(started["id"])] == "in_progress"
+    assert statuses[head.id] == "scheduled"
+    assert (counters["visits.no_show"], counters["visits.scheduled"]) == (2, 1)
+    for user in (supervisor, caregiver):
+        assert [(kind, data["visit_id"]) for kind, data in _notified(user)] == sorted(
+            ("visit_missed", v["id"]) for v in missed
+        )
+
+
+def test_pending_24x7_tasks_are_flagged_overdue(client: TestClient, organization_id: uuid.UUID) -> None:
+    supervisor = _supervisor(client, organization_id)
+    with SessionLocal() as db:
+        assignment = Assignment24_7(
+            organization_id=organization_id,
+            care_recipient_id=uuid.uuid4(),
+            caregiver_id=uuid.uuid4(),
+            start_date=date(2001, 1, 1),
+        )
+        db.add(assignment)
+        db.commit()
+
+    def task(day: date, **extra: Any) -> dict[str, Any]:
+        body = {
+            "organization_id": str(organization_id),
+            "care_recipient_id": str(assignment.care_recipient_id),
+            "assignment_24x7_id": str(assignment.id),
+            "task_date": day.isoformat(),
+            "title": "Evening medication",
+            **extra,
+        }
+        return client.post("/api/v1/tasks", json=body).json()
+
+    overdue = task(NOW.date() - timedelta(days=1))
+    today = task(NOW.date())
+    done = task(NOW.date() - timedelta(days=1), status="completed")
+    visit_task = task(NOW.date() - timedelta(days=1), assignment_24x7_id=None, visit_id=str(uuid.uuid4()))
+
+    with SessionLocal() as db:
+        assert sweep_overdue_tasks(db, NOW) == 1
+        assert sweep_overdue_tasks(db, NOW) == 0
+
+    flagged = {t["id"]: client.get(f"/api/v1/tasks/{t['id']}").json() for t in (overdue, today, done, visit_task)}
+    assert [t["id"] for t in flagged.values() if t["overdue_at"]] == [overdue["id"]]
+    assert flagged[overdue["id"]]["status"] == "pending"
+    for user in (supervisor, assignment.caregiver_id):
+        assert [(kind, data["task_id"]) for kind, data in _notified(user)] == [("task_overdue", overdue["id"])]
+
+
+def test_sweeps_range_scan_their_partial_indexes() -> None:
+    with SessionLocal() as db:
+        plans = []
+        for stmt in (_no_show_stmt(NOW, 10), _overdue_stmt(NOW.date(), 10)):
+            sql = stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+            plans.append(" ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))))
+
+    assert "SEARCH visit USING INDEX ix_visit_scheduled_due (scheduled_start<?)" in plans[0]
+    assert "SEARCH task USING INDEX ix_task_overdue_due (task_date<?)" in plans[1]
@@ -0,0 +1,142 @@
+"""
+Person typeahead: organization-scoped word-start matching, from the database and from the in-memory index.
+"""
+
+import time
+import uuid
+from collections.abc import Generator
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from backend.apis import main
+from backend.apis.typeahead import PersonDirectory, PersonEntry, PrefixIndex, directory, match_stmt
+from backend.database.search import PERSON_DOCUMENT, POSTGRES_DDL
+
+QUERIES = ["ann", "SMI", "ann smi", "smith-", "bob.", "b", "a_", "nobody"]
+
+
+def _member(client: TestClient, org: uuid.UUID, first: str, last: str, role: str = "caregiver", **extra: Any) -> str:
+    email = f"{first.lower()}.{uuid.uuid4().hex[:8]}@example.com"
+    person = client.post("/api/v1/persons", json={"email": email, "first_name": first, "last_name": last}).json()
+    body = {"user_id": person["id"], "organization_id": str(org), "role": role, **extra}
+    assert client.post("/api/v1/memberships", json=body).status_code == 201
+    return person["id"]
+
+
+@pytest.fixture
+def people(client: TestClient, organization_id: uuid.UUID) -> dict[str, str]:
+    return {
+        "ann": _member(client, organization_id, "Ann", "Smith-Jones"),
+        "annabel": _member(client, organization_id, "Annabel", "Lee", role="supervisor"),
+        "bob": _member(client, organization_id, "Bob", "Smithers"),
+        "left": _member(client, organization_id, "Anna", "Smith", status="inactive"),
+        "elsewhere": _member(client, uuid.uuid4(), "Ann", "Smith"),
+    }
+
+
+def _search(client: TestClient, q: str, **params: Any) -> list[dict[str, Any]]:
+    response = client.get("/api/v1/persons/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_search_matches_word_starts_of_organization_members(client: TestClient, people: dict[str, str]) -> None:
+    def ids(q: str, **params: Any) -> list[str]:
+        return [person["id"] for person in _search(client, q, **params)]
+
+    assert ids("ann") == [people["annabel"], people["ann"]]
+    assert ids("ann smi") == ids("SMITH-j") == [people["ann"]]
+    assert ids("smi") == [people["ann"], people["bob"]]
+    assert ids("bob.") == [people["bob"]]
+    assert ids("ann", role="supervisor") == [people["annabel"]]
+    assert ids("ann", limit=1) == [people["annabel"]]
+    assert ids("mith") == ids("a%") == ids("a_") == []
+    assert _search(client, "bob")[0]["role"] == "caregiver"
+
+
+def test_memory_index_agrees_with_the_database(
+    client: TestClient, organization_id: uuid.UUID, people: dict[str, str]
+) -> None:
+    warmed = PersonDirectory()
+    warmed.warm()
+
+    for q in QUERIES:
+        words = q.lower().split()
+        from_memory = [str(entry.id) for entry in warmed.search(organization_id, words)]
+        assert from_memory == [person["id"] for person in _search(client, q)], q
+    assert warmed.search(uuid.uuid4(), ["ann"]) == []
+
+
+def test_prefix_index_updates_in_place() -> None:
+    def entry(first: str, last: str, role: str = "caregiver") -> PersonEntry:
+        return PersonEntry(uuid.uuid4(), f"{first}@example.com".lower(), first, last, None, role)
+
+    ann, bob = entry("Ann", "Smith"), entry("Bob", "Smith")
+    index = PrefixIndex([ann, bob])
+    renamed = PersonEntry(ann.id, ann.email, "Annie", "Jones", "Nan", "supervisor")
+    index.add(renamed)
+    index.remove(bob.id)
+
+    assert len(index) == 1 and bob.id not in index
+    assert index.search(["smi"]) == []
+    assert index.search(["nan"]) == index.search(["ann", "jo"], roles={"supervisor"}) == [renamed]
+    assert index.search(["ann"], roles={"caregiver"}) == []
+
+
+@pytest.fixture
+def live_client(app: FastAPI, monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]:
+    """A client running the lifespan with the person directory but no other background jobs."""
+    monkeypatch.setattr(main, "ROLLER_INTERVAL", 0)
+    monkeypatch.setattr(main, "RECONCILE_INTERVAL", 0)
+    monkeypatch.setattr(main, "SWEEP_INTERVAL", 0)
+    monkeypatch.setattr(main, "REMINDER_WINDOW", timedelta(0))
+    monkeypatch.setattr(main, "TYPEAHEAD_INDEX", True)
+    monkeypatch.setenv("REALTIME_BACKEND", "memory")
+    with TestClient(app) as client:
+        yield client
+
+
+def _eventually(check: Any) -> Any:
+    deadline = time.monotonic() + 5
+    while not (result := check()) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return result
+
+
+def test_directory_follows_person_and_membership_writes(
+    live_client: TestClient, organization_id: uuid.UUID
+) -> None:
+    assert _eventually(lambda: directory.ready)
+    person = _member(live_client, organization_id, "Carla", "Diaz")
+
+    def found(q: str) -> list[str]:
+        return [str(entry.id) for entry in directory.search(organization_id, [q]) or []]
+
+    assert _eventually(lambda: found("carla")) == [person]
+    live_client.patch(f"/api/v1/persons/{person}", json={"first_name": "Carmen"})
+    assert _eventually(lambda: found("carmen")) == [person]
+    assert [entry.first_name for entry in directory.search(organization_id, ["diaz"])] == ["Carmen"]
+
+    [membership] = [m for m in live_client.get("/api/v1/memberships").json()["items"] if m["user_id"] == person]
+    live_client.patch(f"/api/v1/memberships/{membership['id']}", json={"status": "inactive"})
+    assert _eventually(lambda: not found("carmen"))
+
+
+def test_directory_is_dropped_when_the_app_stops(live_client: TestClient) -> None:
+    assert _eventually(lambda: directory.ready)
+    live_client.__exit__(None, None, None)
+
+    assert not directory.ready and directory.search(uuid.uuid4(), ["ann"]) is None
+
+
+def test_postgres_search_uses_the_trigram_indexed_expression() -> None:
+    stmt = match_stmt(uuid.uuid4(), ["ann"], (), 10)
+    sql = str(stmt.compile(dialect=postgresql.dialect())).replace('"user".', "")
+
+    assert f"({PERSON_DOCUMENT}) LIKE" in sql
+    assert f'ON "user" USING gin (({PERSON_DOCUMENT}) gin_trgm_ops)' in POSTGRES_DDL[-1]
@@ -0,0 +1,199 @@
+"""
+Statement budgets for write endpoints.
+
+Every create/patch must be answered from what the flush returned (eager
+defaults + RETURNING); a SELECT after the INSERT/UPDATE means a refresh round
+trip crept back in. Visit and task writes that change a dashboard counter add
+exactly one upsert (the trailing INSERT).
+"""
+
+import uuid
+from typing import Any, Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _verbs(statements: list[str]) -> list[str]:
+    return [s.split(None, 1)[0].upper() for s in statements]
+
+
+def _visit(org: uuid.UUID) -> dict[str, Any]:
+    return {
+        "organization_id": str(org),
+        "care_recipient_id": str(uuid.uuid4()),
+        "visit_type": "personal_care",
+        "scheduled_start": "2025-03-03T08:00:00+00:00",
+        "scheduled_end": "2025-03-03T09:00:00+00:00",
+    }
+
+
+def _task(org: uuid.UUID) -> dict[str, Any]:
+    return {
+        "organization_id": str(org),
+        "care_recipient_id": str(uuid.uuid4()),
+        "visit_id": str(uuid.uuid4()),
+        "task_date": "2025-03-03",
+        "title": "Morning medication",
+    }
+
+
+def _person(org: uuid.UUID) -> dict[str, Any]:
+    return {
+        "email": f"{uuid.uuid4().hex}@example.com",
+        "first_name": "Ada",
+        "last_name": "Lovelace",
+    }
+
+
+def _membership(org: uuid.UUID) -> dict[str, Any]:
+    return {"user_id": str(uuid.uuid4()), "organization_id": str(org), "role": "caregiver"}
+
+
+def _location(org: uuid.UUID) -> dict[str, Any]:
+    return {"organization_id": str(org), "name": "North office"}
+
+
+def _care_arrangement(org: uuid.UUID) -> dict[str, Any]:
+    return {
+        "care_recipient_id": str(uuid.uuid4()),
+        "organization_id": str(org),
+        "mode": "visits_only",
+        "effective_from": "2025-01-01",
+    }
+
+
+def _care_relationship(org: uuid.UUID) -> dict[str, Any]:
+    return {
+        "care_recipient_id": str(uuid.uuid4()),
+        "related_user_id": str(uuid.uuid4()),
+        "organization_id": str(org),
+        "role": "nurse",
+    }
+
+
+def _visit_note(org: uuid.UUID) -> dict[str, Any]:
+    return {"visit_id": str(uuid.uuid4()), "author_id": str(uuid.uuid4()), "summary": "Quiet day"}
+
+
+# (path, payload factory, create statements, patch body, patch statements)
+WRITE_ENDPOINTS: list[tuple[str, Callable[[uuid.UUID], dict[str, Any]], list[str], dict[str, Any], list[str]]] = [
+    ("/api/v1/visits", _visit, ["INSERT", "INSERT"], {"notes": "Gate code 1234"}, ["SELECT", "UPDATE"]),
+    ("/api/v1/tasks", _task, ["INSERT", "INSERT"], {"status": "completed"}, ["SELECT", "UPDATE", "INSERT"]),
+    ("/api/v1/persons", _person, ["SELECT", "INSERT"], {"display_name": "Ada L."}, ["SELECT", "UPDATE"]),
+    ("/api/v1/memberships", _membership, ["INSERT"], {"status": "active"}, ["SELECT", "UPDATE"]),
+    ("/api/v1/locations", _location, ["INSERT"], {"name": "South office"}, ["SELECT", "UPDATE"]),
+    (
+        "/api/v1/care-arrangements",
+        _care_arrangement,
+        ["UPDATE", "SELECT", "INSERT"],  # close the open arrangement, overlap check, insert
+        {"notes": "Reviewed"},
+        ["SELECT", "UPDATE"],
+    ),
+    ("/api/v1/care-relationships", _care_relationship, ["INSERT"], {"notes": "Weekdays"}, ["SELECT", "UPDATE"]),
+    ("/api/v1/visit-notes", _visit_note, ["SELECT", "INSERT"], {"mood": "cheerful"}, ["SELECT", "UPDATE"]),
+]
+
+
+@pytest.mark.parametrize(
+    "path,make_payload,expected",
+    [(path, make, expected) for path, make, expected, _, _ in WRITE_ENDPOINTS],
+    ids=[path.rsplit("/", 1)[-1] for path, *_ in WRITE_ENDPOINTS],
+)
+def test_create_statement_count(
+    client: TestClient,
+    statements: list[str],
+    organization_id: uuid.UUID,
+    path: str,
+    make_payload: Callable[[uuid.UUID], dict[str, Any]],
+    expected: list[str],
+) -> None:
+    payload = make_payload(organization_id)
+    statements.clear()
+
+    response = client.post(path, json=payload)
+
+    assert response.status_code == 201, response.text
+    assert _verbs(statements) == expected
+    assert response.json()["id"]
+
+
+@pytest.mark.parametrize(
+    "path,make_payload,patch,expected",
+    [(path, make, patch, expected) for path, make, _, patch, expected in WRITE_ENDPOINTS],
+    ids=[path.rsplit("/", 1)[-1] for path, *_ in WRITE_ENDPOINTS],
+)
+def test_patch_statement_count(
+    client: TestClient,
+    statements: list[str],
+    organization_id: uuid.UUID,
+    path: str,
+    make_payload: Callable[[uuid.UUID], dict[str, Any]],
+    patch: dict[str, Any],
+    expected: list[str],
+) -> None:
+    created = client.post(path, json=make_payload(organization_id))
+    assert created.status_code == 201, created.text
+    statements.clear()
+
+    response = client.patch(f"{path}/{created.json()['id']}", json=patch)
+
+    assert response.status_code == 200, response.text
+    assert _verbs(statements) == expected
+    for field, value in patch.items():
+        assert response.json()[field] == value
+
+
+@pytest.mark.parametrize("action,expected_status", [("start", "in_progress"), ("end", "completed")])
+def test_visit_transition_is_one_update(
+    client: TestClient,
+    statements: list[str],
+    organization_id: uuid.UUID,
+    action: str,
+    expected_status: str,
+) -> None:
+    created = client.post("/api/v1/visits", json=_visit(organization_id))
+    statements.clear()
+
+    response = client.post(f"/api/v1/visits/{created.json()['id']}/{action}")
+
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == expected_status
+    assert _verbs(statements) == ["UPDATE", "INSERT"]
+
+
+@pytest.mark.parametrize("action", ["start", "end"])
+def test_visit_transition_on_unknown_visit_is_404(client: TestClient, statements: list[str], action: str) -> None:
+    response = client.post(f"/api/v1/visits/{uuid.uuid4()}/{action}")
+
+    assert response.status_code == 404, response.text
+    # The existence check only runs once the conditional UPDATE matched nothing.
+    assert _verbs(statements) == ["UPDATE", "SELECT"]
+
+
+@pytest.mark.parametrize("initial_status,action", [("completed", "start"), ("completed", "end"), ("cancelled", "start")])
+def test_disallowed_visit_transition_is_409(
+    client: TestClient,
+    organization_id: uuid.UUID,
+    initial_status: str,
+    action: str,
+) -> None:
+    created = client.post("/api/v1/visits", json=dict(_visit(organization_id), status=initial_status))
+    assert created.status_code == 201, created.text
+
+    response = client.post(f"/api/v1/visits/{created.json()['id']}/{action}")
+
+    assert response.status_code == 409, response.text
+    assert client.get(f"/api/v1/visits/{created.json()['id']}").json()["status"] == initial_status
+
+
+def test_repeat_start_keeps_first_check_in(client: TestClient, organization_id: uuid.UUID) -> None:
+    visit_id = client.post("/api/v1/visits", json=_visit(organization_id)).json()["id"]
+    first = client.post(f"/api/v1/visits/{visit_id}/start")
+    assert first.status_code == 200, first.text
+
+    again = client.post(f"/api/v1/visits/{visit_id}/start")
+
+    assert again.status_code == 200, again.text
+    assert again.json()["status"] == "in_progress"
+    assert again.json()["checked_in_at"] == first.json()["checked_in_at"]